@@ -12,8 +12,15 @@ __all__ = [
     "List",
     "Term",
     "Rule",
+    "RuleView",
     "Search",
+    "Step",
+    "Stats",
+    "Profile",
     "Chain",
+    "ShardedSearch",
+    "Prove",
+    "Rete",
 ]
 
 from .buffer_size import buffer_size, scoped_buffer_size
@@ -22,6 +29,10 @@ from .variable_t import Variable
 from .item_t import Item
 from .list_t import List
 from .term_t import Term
-from .rule_t import Rule
-from .search_t import Search
+from .rule_t import Rule, RuleView
+from .search_t import Search, Step
+from .stats_t import Stats, Profile
 from .chain_t import Chain
+from .sharded_search import ShardedSearch
+from .prove_t import Prove
+from .rete_t import Rete
@@ -5,7 +5,7 @@ All classes are implemented in C++ using pybind11.
 """
 
 from enum import Enum
-from typing import Callable, Optional
+from typing import Callable, Iterable, Optional
 
 class String:
     """C++ binding for ds::string_t."""
@@ -620,6 +620,22 @@ class Rule:
         """
         ...
 
+class Stats:
+    """C++ binding for ds::stats_t."""
+
+    cycle: int
+    pairs: int
+    skipped: int
+    failures: int
+    overflows: int
+    oversize: int
+    duplicates: int
+    subsumed: int
+    rules: int
+    facts: int
+    bytes: int
+    seconds: float
+
 class Search:
     """C++ binding for ds::search_t."""
 
@@ -648,6 +664,87 @@ class Search:
         """
         ...
 
+    def set_threads(self, threads: int) -> None:
+        """Set the number of threads used to match rules and facts in each cycle.
+
+        Args:
+            threads: The new number of threads.
+        """
+        ...
+
+    def set_subsumption(self, forward: bool, backward: bool) -> None:
+        """Enable or disable subsumption checks on newly inferred facts.
+
+        Args:
+            forward: Drop a new fact if an existing fact is more general than it.
+            backward: Retire existing facts that are instances of a new fact.
+        """
+        ...
+
+    def set_shard(self, shards: int, shard: int) -> None:
+        """Set the shard of facts kept by this engine.
+
+        Args:
+            shards: The total number of shards, 1 means not sharded.
+            shard: The shard kept by this engine, from 0 to shards - 1.
+        """
+        ...
+
+    @staticmethod
+    def shard_of(rule: Rule, shards: int) -> int:
+        """Get the shard of a rule or fact.
+
+        Args:
+            rule: The rule or fact.
+            shards: The total number of shards.
+
+        Returns:
+            The shard, which only depends on the binary data.
+        """
+        ...
+
+    def set_priority(self, priority: Optional[Callable[[Rule, int], float]]) -> None:
+        """Set the cost function of the priority mode.
+
+        Args:
+            priority: A function of the rule and its derivation depth, or None to disable the priority mode.
+        """
+        ...
+
+    class Eviction(Enum):
+        """Policy to choose the facts to evict when the capacity is exceeded."""
+
+        largest = ...
+        oldest = ...
+        least_used = ...
+
+    def set_capacity(
+        self,
+        max_facts: int,
+        max_bytes: int,
+        eviction: Search.Eviction,
+        evicted: Optional[Callable[[Rule], None]],
+    ) -> None:
+        """Set the capacity of facts and the eviction policy when it is exceeded.
+
+        Args:
+            max_facts: The maximum number of facts, 0 means unlimited.
+            max_bytes: The maximum number of bytes used by all rules and facts, 0 means unlimited.
+            eviction: The policy to choose the facts to evict.
+            evicted: Function called for each evicted fact, or None.
+        """
+        ...
+
+    @staticmethod
+    def size_cost(rule: Rule, depth: int) -> float:
+        """Cost function using the data size of the rule."""
+        ...
+
+    @staticmethod
+    def depth_cost(rule: Rule, depth: int) -> float:
+        """Cost function using the derivation depth of the rule."""
+        ...
+
     def reset(self) -> None:
         """Reset the search engine, clearing all rules and facts."""
         ...
@@ -663,18 +760,173 @@ class Search:
         """
         ...
 
-    def execute(self, callback: Callable[[Rule], bool]) -> int:
-        """Execute the search engine with a callback for each inferred rule.
+    def remove(self, rule: str | Rule) -> int:
+        """Remove a rule or fact that was added, and incrementally maintain what was inferred from it.
+
+        Args:
+            rule: The rule or fact as a string or a Rule.
+
+        Returns:
+            The number of rules and facts removed.
+        """
+        ...
+
+    def contains(self, rule: Rule) -> bool:
+        """Check whether a rule or fact is in the knowledge base.
+
+        Args:
+            rule: The rule or fact to look up.
+
+        Returns:
+            True if it was added or inferred and has not been evicted, False otherwise.
+        """
+        ...
+
+    def add_many(self, items: Iterable[str | Rule | bytes]) -> list[bool]:
+        """Add multiple rules or facts with the GIL released.
+
+        Args:
+            items: The rules or facts as strings, Rules or binary data.
+
+        Returns:
+            Whether each rule or fact was successfully added.
+        """
+        ...
+
+    def add_file(self, path: str) -> Optional[list[bool]]:
+        """Add all rules and facts from a text file, separated by blank lines.
+
+        Args:
+            path: The path of the file.
+
+        Returns:
+            Whether each rule or fact was successfully added, or None if the file cannot be read.
+        """
+        ...
+
+    def save(self, path: str) -> bool:
+        """Save all rules and facts and the progress of the search to a binary file.
+
+        Args:
+            path: The path of the file.
+
+        Returns:
+            True if successfully saved, False otherwise.
+        """
+        ...
+
+    def load(self, path: str) -> bool:
+        """Load all rules and facts and the progress of the search from a file written by save.
+
+        Args:
+            path: The path of the file.
+
+        Returns:
+            True if successfully loaded, False otherwise.
+        """
+        ...
+
+    def execute(self, callback: Callable[[Rule], bool], timeout: float, max_results: int, max_pairs: int) -> int:
+        """Execute the search engine within a budget with the GIL released.
 
         Args:
             callback: Function called for each candidate rule.
                      Return False to continue, True to stop.
+            timeout: The maximum wall time in seconds, 0 means unlimited.
+            max_results: The maximum number of rules produced, 0 means unlimited.
+            max_pairs: The maximum number of matched pairs, 0 means unlimited.
 
         Returns:
             The number of rules processed.
         """
         ...
 
+    def saturate(self, max_cycles: int, timeout: float, max_results: int, max_pairs: int) -> int:
+        """Execute cycles within a budget until nothing new can be inferred, with the GIL released.
+
+        Args:
+            max_cycles: The maximum number of cycles, 0 means unlimited.
+            timeout: The maximum wall time in seconds, 0 means unlimited.
+            max_results: The maximum number of rules produced, 0 means unlimited.
+            max_pairs: The maximum number of matched pairs, 0 means unlimited.
+
+        Returns:
+            The number of rules produced.
+        """
+        ...
+
+    def exhausted(self) -> bool:
+        """Whether the last execute or saturate stopped early because a budget was used up.
+
+        Returns:
+            True if a budget was used up, False otherwise.
+        """
+        ...
+
+    def find(self, targets: list[Rule], patterns: bool, max_cycles: int) -> Optional[Rule]:
+        """Execute cycles until one of the targets is inferred, with the GIL released.
+
+        Args:
+            targets: The target rules.
+            patterns: Whether the targets are patterns matched by subsumption.
+            max_cycles: The maximum number of cycles, 0 means unlimited.
+
+        Returns:
+            A copy of the first inferred target, or None if not found.
+        """
+        ...
+
+    def set_provenance(self, provenance: bool) -> None:
+        """Enable or disable recording the source of each rule and fact.
+
+        Args:
+            provenance: Whether to record the sources.
+        """
+        ...
+
+    def proof(self, rule: Rule) -> list[tuple[Rule, Optional[int], Optional[int], int]]:
+        """Get the derivation of a rule or fact.
+
+        Args:
+            rule: The rule or fact to explain.
+
+        Returns:
+            Tuples of the rule, the index of its parent rule, the index of its parent fact and its cycle.
+        """
+        ...
+
+    def set_statistics(self, statistics: bool) -> None:
+        """Enable or disable recording statistics of each cycle.
+
+        Args:
+            statistics: Whether to record the statistics.
+        """
+        ...
+
+    def stats(self) -> list[Stats]:
+        """Get the statistics of each cycle since the statistics were enabled.
+
+        Returns:
+            The statistics of each finished cycle in order.
+        """
+        ...
+
+    def set_profiling(self, profiling: bool) -> None:
+        """Enable or disable profiling each rule.
+
+        Args:
+            profiling: Whether to profile the rules.
+        """
+        ...
+
+    def profile(self) -> list[tuple[Rule, int, int, int, int, int, int, float]]:
+        """Get the profile of each rule in the knowledge base.
+
+        Returns:
+            Tuples of the rule, attempts, successes, oversize, duplicates, subsumed, produced and seconds.
+        """
+        ...
+
     def iter(self) -> Iterator:
         """Return an iterator over the search results.
 
@@ -711,6 +963,23 @@ class Chain:
         """
         ...
 
+    def set_subsumption(self, forward: bool, backward: bool) -> None:
+        """Enable or disable subsumption checks on newly inferred facts.
+
+        Args:
+            forward: Drop a new fact if an existing fact is more general than it.
+            backward: Retire existing facts that are instances of a new fact.
+        """
+        ...
+
+    def set_join_ordering(self, join_ordering: bool) -> None:
+        """Enable or disable choosing the order of premises by selectivity.
+
+        Args:
+            join_ordering: Whether to match first the premise with the fewest candidate facts.
+        """
+        ...
+
     def reset(self) -> None:
         """Reset the chain engine, clearing all rules and facts."""
         ...
@@ -726,6 +995,50 @@ class Chain:
         """
         ...
 
+    def add_many(self, items: Iterable[str | Rule | bytes]) -> list[bool]:
+        """Add multiple rules or facts with the GIL released.
+
+        Args:
+            items: The rules or facts as strings, Rules or binary data.
+
+        Returns:
+            Whether each rule or fact was successfully added.
+        """
+        ...
+
+    def add_file(self, path: str) -> Optional[list[bool]]:
+        """Add all rules and facts from a text file, separated by blank lines.
+
+        Args:
+            path: The path of the file.
+
+        Returns:
+            Whether each rule or fact was successfully added, or None if the file cannot be read.
+        """
+        ...
+
+    def save(self, path: str) -> bool:
+        """Save all rules and facts and the progress of the chain to a binary file.
+
+        Args:
+            path: The path of the file.
+
+        Returns:
+            True if successfully saved, False otherwise.
+        """
+        ...
+
+    def load(self, path: str) -> bool:
+        """Load all rules and facts and the progress of the chain from a file written by save.
+
+        Args:
+            path: The path of the file.
+
+        Returns:
+            True if successfully loaded, False otherwise.
+        """
+        ...
+
     def execute(self, callback: Callable[[Rule], bool]) -> int:
         """Execute the chain engine with a callback for each inferred rule.
 
@@ -738,6 +1051,38 @@ class Chain:
         """
         ...
 
+    def set_statistics(self, statistics: bool) -> None:
+        """Enable or disable recording statistics of each cycle.
+
+        Args:
+            statistics: Whether to record the statistics.
+        """
+        ...
+
+    def stats(self) -> list[Stats]:
+        """Get the statistics of each cycle since the statistics were enabled.
+
+        Returns:
+            The statistics of each finished cycle in order.
+        """
+        ...
+
+    def set_profiling(self, profiling: bool) -> None:
+        """Enable or disable profiling each rule.
+
+        Args:
+            profiling: Whether to profile the rules.
+        """
+        ...
+
+    def profile(self) -> list[tuple[Rule, int, int, int, int, int, int, float]]:
+        """Get the profile of each rule in the knowledge base.
+
+        Returns:
+            Tuples of the rule, attempts, successes, oversize, duplicates, subsumed, produced and seconds.
+        """
+        ...
+
     def iter(self) -> Iterator:
         """Return an iterator over the chain results.
 
@@ -746,8 +1091,157 @@ class Chain:
         """
         ...
 
+class Prove:
+    """C++ binding for ds::prove_t."""
+
+    def __init__(self, limit_size: int, buffer_size: int) -> None:
+        """Create a new prove engine instance.
+
+        Args:
+            limit_size: Size of the buffer for storing final objects.
+            buffer_size: Size of the buffer for internal operations.
+        """
+        ...
+
+    def set_limit_size(self, limit_size: int) -> None:
+        """Set the size of the buffer for storing final objects.
+
+        Args:
+            limit_size: The new limit size.
+        """
+        ...
+
+    def set_buffer_size(self, buffer_size: int) -> None:
+        """Set the buffer size for internal operations.
+
+        Args:
+            buffer_size: The new buffer size.
+        """
+        ...
+
+    def reset(self) -> None:
+        """Reset the prove engine, clearing all rules and facts."""
+        ...
+
+    def add(self, text: str) -> bool:
+        """Add a rule or fact to the knowledge base.
+
+        Args:
+            text: The rule or fact as a string.
+
+        Returns:
+            True if successfully added, False otherwise.
+        """
+        ...
+
+    def execute(self, goal: str, callback: Callable[[Rule], bool]) -> int:
+        """Prove a goal with a callback for each answer.
+
+        Args:
+            goal: The goal as a fact string.
+            callback: Function called for each answer.
+                     Return False to continue, True to stop.
+
+        Returns:
+            The number of answers processed.
+        """
+        ...
+
+    def iter(self, goal: str) -> Iterator:
+        """Return an iterator over the answers of a goal.
+
+        Args:
+            goal: The goal as a fact string.
+
+        Returns:
+            An Iterator object that can be used to iterate over answers.
+        """
+        ...
+
+class Rete:
+    """C++ binding for ds::rete_t."""
+
+    def __init__(self, limit_size: int, buffer_size: int) -> None:
+        """Create a new rete engine instance.
+
+        Args:
+            limit_size: Size of the buffer for storing final objects.
+            buffer_size: Size of the buffer for internal operations.
+        """
+        ...
+
+    def set_limit_size(self, limit_size: int) -> None:
+        """Set the size of the buffer for storing final objects.
+
+        Args:
+            limit_size: The new limit size.
+        """
+        ...
+
+    def set_buffer_size(self, buffer_size: int) -> None:
+        """Set the buffer size for internal operations.
+
+        Args:
+            buffer_size: The new buffer size.
+        """
+        ...
+
+    def reset(self) -> None:
+        """Reset the rete engine, clearing all rules, partial matches and facts."""
+        ...
+
+    def add(self, text: str) -> bool:
+        """Add a rule or fact to the knowledge base.
+
+        Args:
+            text: The rule or fact as a string.
+
+        Returns:
+            True if successfully added, False otherwise.
+        """
+        ...
+
+    def add_many(self, items: Iterable[str | Rule | bytes]) -> list[bool]:
+        """Add multiple rules or facts with the GIL released.
+
+        Args:
+            items: The rules or facts as strings, Rules or binary data.
+
+        Returns:
+            Whether each rule or fact was successfully added.
+        """
+        ...
+
+    def pending(self) -> int:
+        """Get the number of rules and facts waiting to be propagated.
+
+        Returns:
+            The number of waiting rules and facts, including newly inferred facts.
+        """
+        ...
+
+    def execute(self, callback: Callable[[Rule], bool]) -> int:
+        """Propagate the waiting rules and facts with a callback for each inferred fact.
+
+        Args:
+            callback: Function called for each inferred fact.
+                     Return False to continue, True to stop.
+
+        Returns:
+            The number of facts processed.
+        """
+        ...
+
+    def iter(self) -> Iterator:
+        """Return an iterator over the inferred facts.
+
+        Returns:
+            An Iterator object that can be used to iterate over facts.
+        """
+        ...
+
 class Iterator:
-    """Iterator for Search and Chain results."""
+    """Iterator for Search, Chain, Prove and Rete results."""
 
     def next(self) -> Optional[Rule]:
         """Get the next rule in the iteration.
@@ -756,3 +1250,18 @@ class Iterator:
             The next Rule object, or None if iteration is complete.
         """
         ...
+
+    def next_batch(self, count: int) -> list[Rule]:
+        """Get copies of the next rules in the iteration with the GIL released.
+
+        Args:
+            count: The maximum number of rules.
+
+        Returns:
+            The next rules, fewer than count only if iteration is complete.
+        """
+        ...
+
+    def close(self) -> None:
+        """End the iteration early, after which next returns None."""
+        ...
@@ -0,0 +1,81 @@
+"""Asynchronous iteration over the results of the inference engines."""
+
+__all__ = [
+    "aiterate",
+]
+
+import asyncio
+import collections
+import typing
+from . import ds
+from .rule_t import Rule
+
+
+def aiterate(iterator: ds.Iterator, batch_size: int) -> typing.AsyncIterator[Rule]:
+    """Iterate over a native iterator without blocking the event loop.
+
+    Each batch is produced in the default executor with the GIL released, so other tasks keep
+    running during a cycle. The next batch is only requested after the previous one has been consumed.
+    The native iterator is released as soon as the returned iterator is closed or dropped, so
+    leaving the loop early ends the cycle right away.
+
+    Args:
+        iterator: The native iterator of a cycle.
+        batch_size: The maximum number of rules produced in each batch.
+
+    Returns:
+        An asynchronous iterator over Rule objects.
+
+    Raises:
+        ValueError: If the batch size is not positive.
+    """
+    if batch_size <= 0:
+        raise ValueError("The batch size must be positive.")
+    return _AsyncIterator(iterator, batch_size)
+
+
+class _AsyncIterator:
+    # Not an async generator: those are only finalized by the event loop, which would keep the
+    # cycle open after a plain break until the loop shuts down. The native iterator is closed
+    # explicitly, since a finished batch may still hold a reference to it in the executor.
+
+    def __init__(self, iterator: ds.Iterator, batch_size: int) -> None:
+        self._iterator: ds.Iterator | None = iterator
+        self._batch_size = batch_size
+        self._batch: collections.deque[ds.Rule] = collections.deque()
+
+    def __aiter__(self) -> "_AsyncIterator":
+        return self
+
+    async def __anext__(self) -> Rule:
+        while not self._batch:
+            if self._iterator is None:
+                raise StopAsyncIteration
+            await self._fetch(self._iterator)
+        return Rule(self._batch.popleft())
+
+    async def _fetch(self, iterator: ds.Iterator) -> None:
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(None, iterator.next_batch, self._batch_size)
+        try:
+            batch = await asyncio.shield(future)
+        except asyncio.CancelledError:
+            # A batch being produced cannot be interrupted, the cycle ends once it finishes
+            await asyncio.wait([future])
+            self._close()
+            raise
+        self._batch.extend(batch)
+        if len(batch) < self._batch_size:
+            self._close()
+
+    def _close(self) -> None:
+        if self._iterator is not None:
+            self._iterator.close()
+            self._iterator = None
+
+    async def aclose(self) -> None:
+        self._close()
+        self._batch.clear()
+
+    def __del__(self) -> None:
+        self._close()
@@ -4,9 +4,12 @@ __all__ = [
     "Chain",
 ]
 
+import os
 import typing
 from . import ds
-from .rule_t import Rule
+from .rule_t import Rule, RuleView
+from .aiterate import aiterate
+from .stats_t import Stats, Profile
 
 
 class Chain:
@@ -52,6 +55,49 @@ class Chain:
         """
         self._chain.set_buffer_size(buffer_size)
 
+    def set_subsumption(self, forward: bool, backward: bool = False) -> None:
+        """Enable or disable subsumption checks on newly inferred facts.
+
+        Args:
+            forward: Drop a new fact if an existing fact is more general than it.
+            backward: Retire existing facts that are instances of a new fact.
+        """
+        self._chain.set_subsumption(forward, backward)
+
+    def set_join_ordering(self, join_ordering: bool) -> None:
+        """Enable or disable choosing the order of premises by selectivity.
+
+        When enabled, each step matches first the premise with the fewest candidate facts, estimated
+        from the counts of facts per top symbol, instead of the first premise. The inferred facts are
+        the same, but the intermediate rules keep the remaining premises, so they differ.
+
+        Args:
+            join_ordering: Whether to match first the premise with the fewest candidate facts.
+        """
+        self._chain.set_join_ordering(join_ordering)
+
+    def set_statistics(self, statistics: bool) -> None:
+        """Enable or disable recording statistics of each cycle.
+
+        When enabled, the skipped pairs, the overflows and the time are also measured, and the
+        statistics of each cycle are kept until reset. Disabling it clears the records.
+
+        Args:
+            statistics: Whether to record the statistics.
+        """
+        self._chain.set_statistics(statistics)
+
+    def set_profiling(self, profiling: bool) -> None:
+        """Enable or disable profiling each rule.
+
+        When enabled, the matches with each rule, their results and the time spent are recorded,
+        which costs a lookup and a timer per match. Disabling it clears the records.
+
+        Args:
+            profiling: Whether to profile the rules.
+        """
+        self._chain.set_profiling(profiling)
+
     def reset(self) -> None:
         """Reset the chain engine, clearing all rules and facts."""
         self._chain.reset()
@@ -67,17 +113,110 @@ class Chain:
         """
         return self._chain.add(text)
 
-    def execute(self, callback: typing.Callable[[Rule], bool]) -> int:
+    def add_many(self, items: typing.Iterable[str | Rule | bytes]) -> list[bool]:
+        """Add multiple rules or facts to the knowledge base in a single call.
+
+        Texts are parsed natively without holding the GIL, and Rule objects or their binary
+        data from Rule.data() are copied without being parsed again. Binary data is checked in
+        full first, and malformed data is not added.
+
+        Args:
+            items: The rules or facts as strings, Rule objects or binary data.
+
+        Returns:
+            Whether each rule or fact was successfully added.
+
+        Raises:
+            TypeError: If an item has an unsupported type.
+        """
+        return self._chain.add_many(item.value if isinstance(item, Rule) else item for item in items)
+
+    def add_file(self, path: str | os.PathLike[str]) -> list[bool]:
+        """Add all rules and facts from a text file, separated by blank lines.
+
+        Args:
+            path: The path of the file.
+
+        Returns:
+            Whether each rule or fact was successfully added.
+
+        Raises:
+            OSError: If the file cannot be read.
+        """
+        result = self._chain.add_file(os.fspath(path))
+        if result is None:
+            raise OSError("Cannot read the file.")
+        return result
+
+    def save(self, path: str | os.PathLike[str]) -> bool:
+        """Save all rules and facts and the progress of the chain to a binary file.
+
+        Only the rules and facts in the knowledge base are saved, settings are not.
+
+        Args:
+            path: The path of the file.
+
+        Returns:
+            True if successfully saved, False otherwise.
+        """
+        return self._chain.save(os.fspath(path))
+
+    def load(self, path: str | os.PathLike[str]) -> bool:
+        """Load all rules and facts and the progress of the chain from a file written by save.
+
+        The current knowledge base is replaced. The file is read into memory at once and the rules
+        are used in place, so no text parsing or re-inference is needed.
+
+        Args:
+            path: The path of the file.
+
+        Returns:
+            True if successfully loaded, False otherwise, in which case the knowledge base is empty.
+        """
+        return self._chain.load(os.fspath(path))
+
+    def execute(self, callback: typing.Callable[[Rule], bool], view: bool = False) -> int:
         """Execute the chain engine with a callback for each inferred rule.
 
         Args:
             callback: Function called for each candidate rule. Return False to continue,
                      True to stop.
+            view: Whether to pass read-only views of the engine buffer instead of copies. A view is
+                 only valid during the callback, call copy() on it to keep the rule.
 
         Returns:
             The number of rules processed.
         """
-        return self._chain.execute(lambda candidate: callback(Rule(candidate.clone())))
+        return self._chain.execute(RuleView.wrap(callback, view))
+
+    def stats(self) -> list[Stats]:
+        """Get the statistics of each cycle since set_statistics(True).
+
+        Returns:
+            The statistics of each finished cycle in order.
+
+        Example:
+            >>> chain.set_statistics(True)
+            >>> chain.execute(lambda rule: False)
+            >>> for stats in chain.stats():
+            ...     print(stats.cycle, stats.pairs, stats.failures, stats.seconds)
+        """
+        return [Stats._from(value) for value in self._chain.stats()]
+
+    def profile(self) -> list[Profile]:
+        """Get the profile of each rule since set_profiling(True).
+
+        Returns:
+            The profile of each rule in the knowledge base in the order they were added, where the
+            rules that were never matched have all counts 0.
+
+        Example:
+            >>> chain.set_profiling(True)
+            >>> chain.execute(lambda rule: False)
+            >>> for entry in sorted(chain.profile(), key=lambda entry: entry.seconds, reverse=True):
+            ...     print(entry.attempts, entry.produced, entry.seconds, entry.rule, sep="\t")
+        """
+        return [Profile(Rule(rule), *counts) for rule, *counts in self._chain.profile()]
 
     def __iter__(self) -> typing.Iterator[Rule]:
         """Iterate over inferred rules.
@@ -95,3 +234,34 @@ class Chain:
             if candidate is None:
                 break
             yield Rule(candidate.clone())
+
+    def aiter(self, batch_size: int = 64) -> typing.AsyncIterator[Rule]:
+        """Iterate over inferred rules asynchronously.
+
+        The cycle runs in a worker thread with the GIL released and the rules are delivered in
+        batches, so the event loop is not blocked. Leaving the loop early or cancelling the task
+        stops the cycle and keeps the results produced so far, as with the synchronous iteration.
+        The engine must not be used in other ways until the iteration ends.
+
+        Args:
+            batch_size: The maximum number of rules produced by the worker thread at a time.
+
+        Returns:
+            An asynchronous iterator over Rule objects.
+
+        Raises:
+            ValueError: If the batch size is not positive.
+
+        Example:
+            >>> async for rule in chain.aiter():
+            ...     print(rule)
+        """
+        return aiterate(self._chain.iter(), batch_size)
+
+    def __aiter__(self) -> typing.AsyncIterator[Rule]:
+        """Iterate over inferred rules asynchronously with the default batch size.
+
+        Returns:
+            An asynchronous iterator over Rule objects.
+        """
+        return self.aiter()
@@ -1,9 +1,13 @@
 #include <ds/chain.hh>
 #include <ds/ds.hh>
 #include <ds/generator.hh>
+#include <ds/prove.hh>
+#include <ds/rete.hh>
 #include <ds/search.hh>
+#include <ds/stats.hh>
 #include <pybind11/functional.h>
 #include <pybind11/pybind11.h>
+#include <pybind11/stl.h>
 
 namespace py = pybind11;
 
@@ -25,6 +29,13 @@ class Iterator {
         return result;
     }
 
+    void close() {
+        // 销毁协程以结束当前的cycle，之后next总是返回nullptr
+        generator = ds::generator<ds::rule_t*>();
+        iterator = std::make_unique<iterator_t>(generator.end());
+        initialized = true;
+    }
+
   private:
     ds::generator<ds::rule_t*> generator;
     bool initialized;
@@ -144,6 +155,128 @@ auto rule_rename(ds::rule_t* rule, ds::rule_t* prefix_and_suffix, int length) ->
     return std::unique_ptr<ds::rule_t>(result);
 }
 
+template<typename T>
+auto profile(T& self) -> py::list {
+    py::list result;
+    for (auto& entry : self.profile()) {
+        result.append(
+            py::make_tuple(
+                clone(entry.rule),
+                entry.attempts,
+                entry.successes,
+                entry.oversize,
+                entry.duplicates,
+                entry.subsumed,
+                entry.produced,
+                entry.seconds
+            )
+        );
+    }
+    return result;
+}
+
+// 以下函数检查[head, tail)中的二进制数据，成功时返回对象的尾指针，数据越界或者格式不正确时返回nullptr
+
+auto check_string(std::byte* head, std::byte* tail) -> std::byte* {
+    if (tail - head < static_cast<std::ptrdiff_t>(sizeof(ds::length_t))) [[unlikely]] {
+        return nullptr;
+    }
+    auto string = reinterpret_cast<ds::string_t*>(head);
+    const auto length = string->get_length();
+    // 字符串以\0结尾，并且中间不能出现\0
+    if (length <= 0 || tail - head < string->data_size()) [[unlikely]] {
+        return nullptr;
+    }
+    if (string->get_string()[length - 1] != '\0' || memchr(string->get_string(), '\0', length - 1) != nullptr) [[unlikely]] {
+        return nullptr;
+    }
+    return head + string->data_size();
+}
+
+auto check_list(std::byte* head, std::byte* tail) -> std::byte*;
+
+auto check_term(std::byte* head, std::byte* tail) -> std::byte* {
+    if (tail - head < static_cast<std::ptrdiff_t>(sizeof(ds::term_type_t))) [[unlikely]] {
+        return nullptr;
+    }
+    switch (reinterpret_cast<ds::term_t*>(head)->get_type()) {
+    case ds::term_type_t::variable:
+    case ds::term_type_t::item:
+        return check_string(head + sizeof(ds::term_type_t), tail);
+    case ds::term_type_t::list:
+        return check_list(head + sizeof(ds::term_type_t), tail);
+    default:
+        return nullptr;
+    }
+}
+
+auto check_list(std::byte* head, std::byte* tail) -> std::byte* {
+    if (tail - head < static_cast<std::ptrdiff_t>(sizeof(ds::length_t))) [[unlikely]] {
+        return nullptr;
+    }
+    auto list = reinterpret_cast<ds::list_t*>(head);
+    const auto list_size = list->get_list_size();
+    if (list_size < 0 || tail - head < static_cast<std::ptrdiff_t>(sizeof(ds::length_t) * (list_size + 1))) [[unlikely]] {
+        return nullptr;
+    }
+    // 每个term的偏移由之前的term size决定，需要与term实际的大小一致
+    std::byte* body = head + sizeof(ds::length_t) * (list_size + 1);
+    for (ds::length_t index = 0; index < list_size; ++index) {
+        if (list->term_size(index) <= list->term_size(index - 1) || list->term_size(index) > tail - body) [[unlikely]] {
+            return nullptr;
+        }
+        std::byte* term_tail = body + list->term_size(index);
+        if (check_term(body + list->term_size(index - 1), term_tail) != term_tail) [[unlikely]] {
+            return nullptr;
+        }
+    }
+    return body + list->term_size(list_size - 1);
+}
+
+auto check_rule(std::byte* head, std::size_t size) -> bool {
+    if (size < sizeof(ds::length_t) || reinterpret_cast<ds::rule_t*>(head)->premises_count() < 0) [[unlikely]] {
+        return false;
+    }
+    return check_list(head, head + size) == head + size;
+}
+
+template<typename T>
+auto add_many(T& self, const py::iterable& items) -> std::vector<bool> {
+    // 持有GIL时将每一项整理为文本或者二进制的rule，之后释放GIL依次添加
+    struct item_t {
+        std::string text;
+        ds::rule_t* rule;
+        bool valid;
+    };
+    std::vector<item_t> entries;
+    std::vector<py::object> holders;
+    // 导出的缓冲区在添加完成之前不能释放，否则数据可能被移动或者回收；它们在release之后析构，此时已经重新持有GIL
+    std::vector<py::buffer_info> buffers;
+    for (auto item : items) {
+        if (py::isinstance<py::str>(item)) {
+            entries.push_back({.text = item.cast<std::string>(), .rule = nullptr, .valid = true});
+        } else if (py::isinstance<ds::rule_t>(item)) {
+            holders.push_back(py::reinterpret_borrow<py::object>(item));
+            entries.push_back({.text = {}, .rule = item.cast<ds::rule_t*>(), .valid = true});
+        } else if (py::isinstance<py::buffer>(item)) {
+            // 二进制数据直接作为rule使用，使用前检查其完整的结构都在数据的范围之内
+            py::buffer_info& info = buffers.emplace_back(item.cast<py::buffer>().request());
+            auto head = reinterpret_cast<std::byte*>(info.ptr);
+            bool valid = check_rule(head, static_cast<std::size_t>(info.size * info.itemsize));
+            entries.push_back({.text = {}, .rule = reinterpret_cast<ds::rule_t*>(head), .valid = valid});
+        } else {
+            throw py::type_error("Unsupported type for adding.");
+        }
+    }
+    py::gil_scoped_release release;
+    std::vector<bool> result;
+    result.reserve(entries.size());
+    for (auto& entry : entries) {
+        result.push_back(entry.valid && (entry.rule != nullptr ? self.add(entry.rule) : self.add(entry.text)));
+    }
+    return result;
+}
+
 PYBIND11_MODULE(_ds, m, py::mod_gil_not_used()) {
     auto string_t = py::class_<ds::string_t>(m, "String");
     auto item_t = py::class_<ds::item_t>(m, "Item");
@@ -188,13 +321,73 @@ PYBIND11_MODULE(_ds, m, py::mod_gil_not_used()) {
     term_t.def_static("rename", term_rename);
     rule_t.def_static("rename", rule_rename);
 
+    auto stats_t = py::class_<ds::stats_t>(m, "Stats");
+    stats_t.def_readonly("cycle", &ds::stats_t::cycle);
+    stats_t.def_readonly("pairs", &ds::stats_t::pairs);
+    stats_t.def_readonly("skipped", &ds::stats_t::skipped);
+    stats_t.def_readonly("failures", &ds::stats_t::failures);
+    stats_t.def_readonly("overflows", &ds::stats_t::overflows);
+    stats_t.def_readonly("oversize", &ds::stats_t::oversize);
+    stats_t.def_readonly("duplicates", &ds::stats_t::duplicates);
+    stats_t.def_readonly("subsumed", &ds::stats_t::subsumed);
+    stats_t.def_readonly("rules", &ds::stats_t::rules);
+    stats_t.def_readonly("facts", &ds::stats_t::facts);
+    stats_t.def_readonly("bytes", &ds::stats_t::bytes);
+    stats_t.def_readonly("seconds", &ds::stats_t::seconds);
+
     auto search_t = py::class_<ds::search_t>(m, "Search");
     search_t.def(py::init<ds::length_t, ds::length_t>());
     search_t.def("set_limit_size", &ds::search_t::set_limit_size);
     search_t.def("set_buffer_size", &ds::search_t::set_buffer_size);
+    search_t.def("set_threads", &ds::search_t::set_threads);
+    search_t.def("set_subsumption", &ds::search_t::set_subsumption);
+    search_t.def("set_shard", &ds::search_t::set_shard);
+    search_t.def_static("shard_of", &ds::search_t::shard_of);
+    search_t.def("set_priority", &ds::search_t::set_priority);
+    search_t.def_static("size_cost", &ds::search_t::size_cost);
+    search_t.def_static("depth_cost", &ds::search_t::depth_cost);
+    py::enum_<ds::search_t::eviction_t>(search_t, "Eviction")
+        .value("largest", ds::search_t::eviction_t::largest)
+        .value("oldest", ds::search_t::eviction_t::oldest)
+        .value("least_used", ds::search_t::eviction_t::least_used);
+    search_t.def("set_capacity", &ds::search_t::set_capacity);
     search_t.def("reset", &ds::search_t::reset);
-    search_t.def("add", &ds::search_t::add);
-    search_t.def("execute", &ds::search_t::execute);
+    search_t.def("add", py::overload_cast<std::string_view>(&ds::search_t::add));
+    search_t.def("remove", py::overload_cast<std::string_view>(&ds::search_t::remove));
+    search_t.def("remove", py::overload_cast<ds::rule_t*>(&ds::search_t::remove));
+    search_t.def("contains", &ds::search_t::contains);
+    search_t.def("add_many", add_many<ds::search_t>);
+    search_t.def("add_file", &ds::search_t::add_file, py::call_guard<py::gil_scoped_release>());
+    search_t.def("set_statistics", &ds::search_t::set_statistics);
+    search_t.def("stats", &ds::search_t::stats);
+    search_t.def("set_profiling", &ds::search_t::set_profiling);
+    search_t.def("profile", profile<ds::search_t>);
+    search_t.def("find", &ds::search_t::find, py::call_guard<py::gil_scoped_release>());
+    search_t.def("set_provenance", &ds::search_t::set_provenance);
+    search_t.def("proof", [](ds::search_t& self, ds::rule_t* rule) {
+        py::list result;
+        for (auto& step : self.proof(rule)) {
+            result.append(py::make_tuple(clone(step.rule), step.parent_rule, step.parent_fact, step.cycle));
+        }
+        return result;
+    });
+    search_t.def("save", &ds::search_t::save, py::call_guard<py::gil_scoped_release>());
+    search_t.def("load", &ds::search_t::load, py::call_guard<py::gil_scoped_release>());
+    search_t.def(
+        "execute",
+        [](ds::search_t& self, const std::function<bool(ds::rule_t*)>& callback, double timeout, std::size_t max_results, std::size_t max_pairs) {
+            return self.execute(callback, {.timeout = timeout, .max_results = max_results, .max_pairs = max_pairs});
+        },
+        py::call_guard<py::gil_scoped_release>()
+    );
+    search_t.def(
+        "saturate",
+        [](ds::search_t& self, ds::length_t max_cycles, double timeout, std::size_t max_results, std::size_t max_pairs) {
+            return self.saturate(max_cycles, {.timeout = timeout, .max_results = max_results, .max_pairs = max_pairs});
+        },
+        py::call_guard<py::gil_scoped_release>()
+    );
+    search_t.def("exhausted", &ds::search_t::exhausted);
     search_t.def(
         "iter",
         [](ds::search_t& self) { return Iterator(std::move(self.iterator())); },
@@ -205,8 +398,18 @@ PYBIND11_MODULE(_ds, m, py::mod_gil_not_used()) {
     chain_t.def(py::init<ds::length_t, ds::length_t>());
     chain_t.def("set_limit_size", &ds::chain_t::set_limit_size);
     chain_t.def("set_buffer_size", &ds::chain_t::set_buffer_size);
+    chain_t.def("set_subsumption", &ds::chain_t::set_subsumption);
+    chain_t.def("set_join_ordering", &ds::chain_t::set_join_ordering);
     chain_t.def("reset", &ds::chain_t::reset);
-    chain_t.def("add", &ds::chain_t::add);
+    chain_t.def("add", py::overload_cast<std::string_view>(&ds::chain_t::add));
+    chain_t.def("add_many", add_many<ds::chain_t>);
+    chain_t.def("add_file", &ds::chain_t::add_file, py::call_guard<py::gil_scoped_release>());
+    chain_t.def("set_statistics", &ds::chain_t::set_statistics);
+    chain_t.def("stats", &ds::chain_t::stats);
+    chain_t.def("set_profiling", &ds::chain_t::set_profiling);
+    chain_t.def("profile", profile<ds::chain_t>);
+    chain_t.def("save", &ds::chain_t::save, py::call_guard<py::gil_scoped_release>());
+    chain_t.def("load", &ds::chain_t::load, py::call_guard<py::gil_scoped_release>());
     chain_t.def("execute", &ds::chain_t::execute);
     chain_t.def(
         "iter",
@@ -214,6 +417,51 @@ PYBIND11_MODULE(_ds, m, py::mod_gil_not_used()) {
         py::keep_alive<0, 1>()
     );
 
+    auto prove_t = py::class_<ds::prove_t>(m, "Prove");
+    prove_t.def(py::init<ds::length_t, ds::length_t>());
+    prove_t.def("set_limit_size", &ds::prove_t::set_limit_size);
+    prove_t.def("set_buffer_size", &ds::prove_t::set_buffer_size);
+    prove_t.def("reset", &ds::prove_t::reset);
+    prove_t.def("add", &ds::prove_t::add);
+    prove_t.def("execute", &ds::prove_t::execute, py::call_guard<py::gil_scoped_release>());
+    prove_t.def(
+        "iter",
+        [](ds::prove_t& self, std::string_view goal) { return Iterator(std::move(self.iterator(goal))); },
+        py::keep_alive<0, 1>()
+    );
+
+    auto rete_t = py::class_<ds::rete_t>(m, "Rete");
+    rete_t.def(py::init<ds::length_t, ds::length_t>());
+    rete_t.def("set_limit_size", &ds::rete_t::set_limit_size);
+    rete_t.def("set_buffer_size", &ds::rete_t::set_buffer_size);
+    rete_t.def("reset", &ds::rete_t::reset);
+    rete_t.def("add", py::overload_cast<std::string_view>(&ds::rete_t::add));
+    rete_t.def("add_many", add_many<ds::rete_t>);
+    rete_t.def("pending", &ds::rete_t::pending);
+    rete_t.def("execute", &ds::rete_t::execute);
+    rete_t.def(
+        "iter",
+        [](ds::rete_t& self) { return Iterator(std::move(self.iterator())); },
+        py::keep_alive<0, 1>()
+    );
+
     auto iterator_t = py::class_<Iterator>(m, "Iterator");
-    iterator_t.def("next", &Iterator::next, py::return_value_policy::reference_internal);
+    iterator_t.def("next", &Iterator::next, py::return_value_policy::reference_internal, py::call_guard<py::gil_scoped_release>());
+    iterator_t.def("close", &Iterator::close);
+    iterator_t.def(
+        "next_batch",
+        [](Iterator& self, std::size_t count) {
+            // 结果指向的内存在下一次迭代时可能被覆盖，因此逐个复制
+            std::vector<std::unique_ptr<ds::rule_t>> result;
+            while (result.size() < count) {
+                ds::rule_t* rule = self.next();
+                if (rule == nullptr) {
+                    break;
+                }
+                result.push_back(clone(rule));
+            }
+            return result;
+        },
+        py::call_guard<py::gil_scoped_release>()
+    );
 }
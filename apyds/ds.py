@@ -7,8 +7,12 @@ __all__ = [
     "List",
     "Term",
     "Rule",
+    "Stats",
     "Search",
     "Chain",
+    "Prove",
+    "Rete",
+    "Iterator",
 ]
 
-from ._ds import String, Variable, Item, List, Term, Rule, Search, Chain
+from ._ds import String, Variable, Item, List, Term, Rule, Stats, Search, Chain, Prove, Rete, Iterator
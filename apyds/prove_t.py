@@ -0,0 +1,104 @@
+"""Prove engine for the deductive system."""
+
+__all__ = [
+    "Prove",
+]
+
+import typing
+from . import ds
+from .rule_t import Rule, RuleView
+
+
+class Prove:
+    """Goal-directed prove engine for the deductive system.
+
+    Unlike Search and Chain, which derive everything reachable from the knowledge base,
+    Prove starts from a goal and only expands rules whose conclusion may match it.
+    Each subgoal is tabled, so recursive rules terminate.
+
+    Example:
+        >>> prove = Prove()
+        >>> prove.add("(edge a b)")
+        >>> prove.add("(edge b c)")
+        >>> prove.add("(edge `x `y)\\n(path `x `y)")
+        >>> prove.add("(path `x `y)\\n(edge `y `z)\\n(path `x `z)")
+        >>> for answer in prove.prove("(path a `w)"):
+        ...     print(answer)  # Will find (path a b) and (path a c)
+    """
+
+    def __init__(self, limit_size: int = 1000, buffer_size: int = 10000):
+        """Creates a new prove engine instance.
+
+        Args:
+            limit_size: Size of the buffer for storing the final objects (rules/facts)
+                       in the knowledge base (default: 1000).
+            buffer_size: Size of the buffer for internal operations like conversions
+                        and transformations (default: 10000).
+        """
+        self._prove: ds.Prove = ds.Prove(limit_size, buffer_size)
+
+    def set_limit_size(self, limit_size: int) -> None:
+        """Set the size of the buffer for storing final objects.
+
+        Args:
+            limit_size: The new limit size for storing rules/facts.
+        """
+        self._prove.set_limit_size(limit_size)
+
+    def set_buffer_size(self, buffer_size: int) -> None:
+        """Set the buffer size for internal operations.
+
+        Args:
+            buffer_size: The new buffer size.
+        """
+        self._prove.set_buffer_size(buffer_size)
+
+    def reset(self) -> None:
+        """Reset the prove engine, clearing all rules and facts."""
+        self._prove.reset()
+
+    def add(self, text: str) -> bool:
+        """Add a rule or fact to the knowledge base.
+
+        Args:
+            text: The rule or fact as a string.
+
+        Returns:
+            True if successfully added, False otherwise.
+        """
+        return self._prove.add(text)
+
+    def execute(self, goal: str, callback: typing.Callable[[Rule], bool], view: bool = False) -> int:
+        """Prove a goal with a callback for each answer.
+
+        Args:
+            goal: The goal as a fact string, which may contain variables.
+            callback: Function called for each answer, an instance of the goal.
+                     Return False to continue, True to stop.
+            view: Whether to pass read-only views of the engine buffer instead of copies. A view is
+                 only valid during the callback, call copy() on it to keep the rule.
+
+        Returns:
+            The number of answers processed.
+        """
+        return self._prove.execute(goal, RuleView.wrap(callback, view))
+
+    def prove(self, goal: str) -> typing.Iterator[Rule]:
+        """Iterate over the answers of a goal.
+
+        Args:
+            goal: The goal as a fact string, which may contain variables.
+
+        Returns:
+            An iterator over answers, each an instance of the goal, each returned once.
+
+        Example:
+            >>> for answer in prove.prove("(path a `w)"):
+            ...     print(answer)
+        """
+        iterator = self._prove.iter(goal)
+        while True:
+            candidate = iterator.next()
+            if candidate is None:
+                break
+            yield Rule(candidate.clone())
@@ -0,0 +1,165 @@
+"""Rete engine for the deductive system."""
+
+__all__ = [
+    "Rete",
+]
+
+import typing
+from . import ds
+from .rule_t import Rule, RuleView
+from .aiterate import aiterate
+
+
+class Rete:
+    """Incremental rete engine for the deductive system.
+
+    Unlike Search and Chain, which recompute partial matches every cycle, Rete keeps the partial
+    matches of every rule, so a new fact is only matched against the partial matches that may use it.
+    The facts inferred from each added rule or fact are produced as soon as it has been propagated,
+    which suits facts that arrive continuously while the rules stay fixed. Only facts are produced.
+
+    Example:
+        >>> rete = Rete()
+        >>> rete.add("(edge `x `y)\\n(path `x `y)")
+        >>> rete.add("(path `x `y)\\n(edge `y `z)\\n(path `x `z)")
+        >>> rete.add("(edge a b)")
+        >>> for fact in rete:
+        ...     print(fact)  # Will find (path a b)
+        >>> rete.add("(edge b c)")
+        >>> for fact in rete:
+        ...     print(fact)  # Will find (path b c) and (path a c)
+    """
+
+    def __init__(self, limit_size: int = 1000, buffer_size: int = 10000):
+        """Creates a new rete engine instance.
+
+        Args:
+            limit_size: Size of the buffer for storing the final objects (rules/facts)
+                       in the knowledge base (default: 1000).
+            buffer_size: Size of the buffer for internal operations like conversions
+                        and transformations (default: 10000).
+        """
+        self._rete: ds.Rete = ds.Rete(limit_size, buffer_size)
+
+    def set_limit_size(self, limit_size: int) -> None:
+        """Set the size of the buffer for storing final objects.
+
+        Args:
+            limit_size: The new limit size for storing rules/facts.
+        """
+        self._rete.set_limit_size(limit_size)
+
+    def set_buffer_size(self, buffer_size: int) -> None:
+        """Set the buffer size for internal operations.
+
+        Args:
+            buffer_size: The new buffer size.
+        """
+        self._rete.set_buffer_size(buffer_size)
+
+    def reset(self) -> None:
+        """Reset the rete engine, clearing all rules, partial matches and facts."""
+        self._rete.reset()
+
+    def add(self, text: str) -> bool:
+        """Add a rule or fact to the knowledge base.
+
+        The rule or fact is propagated by the next execute or iteration.
+
+        Args:
+            text: The rule or fact as a string.
+
+        Returns:
+            True if successfully added, False otherwise.
+        """
+        return self._rete.add(text)
+
+    def add_many(self, items: typing.Iterable[str | Rule | bytes]) -> list[bool]:
+        """Add multiple rules or facts to the knowledge base in a single call.
+
+        Texts are parsed natively without holding the GIL, and Rule objects or their binary
+        data from Rule.data() are copied without being parsed again. Binary data is checked in
+        full first, and malformed data is not added.
+
+        Args:
+            items: The rules or facts as strings, Rule objects or binary data.
+
+        Returns:
+            Whether each rule or fact was successfully added.
+
+        Raises:
+            TypeError: If an item has an unsupported type.
+        """
+        return self._rete.add_many(item.value if isinstance(item, Rule) else item for item in items)
+
+    def pending(self) -> int:
+        """Get the number of rules and facts waiting to be propagated.
+
+        Returns:
+            The number of waiting rules and facts, including newly inferred facts.
+        """
+        return self._rete.pending()
+
+    def execute(self, callback: typing.Callable[[Rule], bool], view: bool = False) -> int:
+        """Propagate the waiting rules and facts with a callback for each inferred fact.
+
+        Stopping early loses nothing, the remaining facts and work are kept for the next call.
+
+        Args:
+            callback: Function called for each inferred fact. Return False to continue,
+                     True to stop.
+            view: Whether to pass read-only views of the engine buffer instead of copies. A view is
+                 only valid during the callback, call copy() on it to keep the rule.
+
+        Returns:
+            The number of facts processed.
+        """
+        return self._rete.execute(RuleView.wrap(callback, view))
+
+    def __iter__(self) -> typing.Iterator[Rule]:
+        """Iterate over inferred facts.
+
+        Returns:
+            An iterator over Rule objects.
+
+        Example:
+            >>> for fact in rete:
+            ...     print(fact)
+        """
+        iterator = self._rete.iter()
+        while True:
+            candidate = iterator.next()
+            if candidate is None:
+                break
+            yield Rule(candidate.clone())
+
+    def aiter(self, batch_size: int = 64) -> typing.AsyncIterator[Rule]:
+        """Iterate over inferred facts asynchronously.
+
+        The propagation runs in a worker thread with the GIL released and the facts are delivered in
+        batches, so the event loop is not blocked. Leaving the loop early keeps the remaining work, but
+        the facts of the current batch that were not consumed are not produced again. The engine must
+        not be used in other ways until the iteration ends.
+
+        Args:
+            batch_size: The maximum number of facts produced by the worker thread at a time.
+
+        Returns:
+            An asynchronous iterator over Rule objects.
+
+        Raises:
+            ValueError: If the batch size is not positive.
+
+        Example:
+            >>> async for fact in rete.aiter():
+            ...     print(fact)
+        """
+        return aiterate(self._rete.iter(), batch_size)
+
+    def __aiter__(self) -> typing.AsyncIterator[Rule]:
+        """Iterate over inferred facts asynchronously with the default batch size.
+
+        Returns:
+            An asynchronous iterator over Rule objects.
+        """
+        return self.aiter()
@@ -4,8 +4,10 @@ from __future__ import annotations
 
 __all__ = [
     "Rule",
+    "RuleView",
 ]
 
+import typing
 from . import ds
 from .common import Common
 from .term_t import Term
@@ -25,6 +27,22 @@ class Rule(Common[ds.Rule]):
 
     _base = ds.Rule
 
+    def __init__(self, value: Rule | ds.Rule | str | bytes, size: int | None = None) -> None:
+        """Creates a new rule.
+
+        Args:
+            value: Initial value (can be another rule, base value, string, or memoryview). A RuleView
+                   is copied, so the new rule stays valid after the callback.
+            size: Optional buffer capacity for the internal storage.
+
+        Raises:
+            ValueError: If initialization fails or invalid arguments are provided.
+            TypeError: If value is of an unsupported type.
+        """
+        if isinstance(value, RuleView):
+            value = value.copy()
+        super().__init__(value, size)
+
     def __len__(self) -> int:
         """Get the number of premises in the rule.
 
@@ -142,3 +160,116 @@ class Rule(Common[ds.Rule]):
 
     def __repr__(self) -> str:
         return f"Rule[\n{self}]"
+
+
+class RuleView(Rule):
+    """Read-only view of a rule in the buffer of an inference engine.
+
+    Views are passed to the callbacks of the engines in view mode instead of copies, which saves a
+    copy of every candidate. A view is only valid during the callback, after which any use of it
+    raises ValueError. Use copy() or Rule(view) to keep the rule. Terms and binary data obtained from
+    a view are copies, since the engine reuses the memory of the view.
+
+    Example:
+        >>> kept = []
+        >>> def callback(rule):
+        ...     if len(rule) == 0:
+        ...         kept.append(rule.copy())
+        ...     return False
+        >>> search.execute(callback, view=True)
+    """
+
+    def __init__(self, value: ds.Rule) -> None:
+        """Creates a view of a rule owned by an engine.
+
+        Args:
+            value: The rule in the buffer of the engine, which is not copied.
+        """
+        self._value: ds.Rule | None = value
+        self.capacity = None
+
+    @property
+    def value(self) -> ds.Rule:
+        """Get the viewed rule.
+
+        Returns:
+            The rule in the buffer of the engine.
+
+        Raises:
+            ValueError: If the view is no longer valid.
+        """
+        if self._value is None:
+            raise ValueError("The rule view is no longer valid, use copy() to keep the rule.")
+        return self._value
+
+    def release(self) -> None:
+        """Invalidate the view, after which any use of it raises ValueError."""
+        self._value = None
+
+    def copy(self) -> Rule:
+        """Copy the viewed rule into a rule that stays valid.
+
+        Returns:
+            A Rule owning a copy of the data.
+        """
+        return Rule(self.value.clone(), self.size())
+
+    def __copy__(self) -> Rule:
+        return self.copy()
+
+    def __getitem__(self, index: int) -> Term:
+        """Get a copy of a premise term by index.
+
+        Args:
+            index: The zero-based index of the premise.
+
+        Returns:
+            A copy of the premise term at the specified index.
+        """
+        return self._own(self.value[index])
+
+    @property
+    def conclusion(self) -> Term:
+        """Get a copy of the conclusion of the rule.
+
+        Returns:
+            A copy of the conclusion term.
+        """
+        return self._own(self.value.conclusion())
+
+    def data(self) -> bytes:
+        """Get a copy of the binary representation of the viewed rule.
+
+        Returns:
+            The binary data as bytes.
+        """
+        return bytes(super().data())
+
+    @staticmethod
+    def _own(term: ds.Term | None) -> Term:
+        if term is None:
+            return Term(term)
+        return Term(term.clone(), term.data_size())
+
+    @classmethod
+    def wrap(cls, callback: typing.Callable[[Rule], bool], view: bool) -> typing.Callable[[ds.Rule], bool]:
+        """Adapt a callback on rules to a callback on the native rules of an engine.
+
+        Args:
+            callback: The callback to adapt.
+            view: Whether to pass views that are invalidated once the callback returns, instead of copies.
+
+        Returns:
+            The callback on native rules.
+        """
+        if not view:
+            return lambda candidate: callback(Rule(candidate.clone()))
+
+        def call(candidate: ds.Rule) -> bool:
+            borrowed = cls(candidate)
+            try:
+                return callback(borrowed)
+            finally:
+                borrowed.release()
+
+        return call
@@ -2,11 +2,33 @@
 
 __all__ = [
     "Search",
+    "Step",
 ]
 
+import os
 import typing
 from . import ds
-from .rule_t import Rule
+from .rule_t import Rule, RuleView
+from .aiterate import aiterate
+from .stats_t import Stats, Profile
+
+
+class Step(typing.NamedTuple):
+    """A step in the derivation of a rule or fact.
+
+    Attributes:
+        rule: The rule or fact obtained in this step.
+        parent_rule: Index of the step of the rule that produced it, or None if it was added
+                    or its source has been forgotten.
+        parent_fact: Index of the step of the fact that produced it, or None if it was added
+                    or its source has been forgotten.
+        cycle: The cycle in which it entered the knowledge base.
+    """
+
+    rule: Rule
+    parent_rule: int | None
+    parent_fact: int | None
+    cycle: int
 
 
 class Search:
@@ -14,6 +36,9 @@ class Search:
 
     Manages a knowledge base of rules and performs logical inference.
 
+    A Search must not be used from several threads at once: the GIL is released while
+    matching, so nothing stops another thread from calling add() during execute().
+
     Example:
         >>> search = Search()
         >>> search.add("(parent john mary)")
@@ -24,7 +49,7 @@ class Search:
         >>> search.execute(callback)
     """
 
-    def __init__(self, limit_size: int = 1000, buffer_size: int = 10000):
+    def __init__(self, limit_size: int = 1000, buffer_size: int = 10000, threads: int = 1):
         """Creates a new search engine instance.
 
         Args:
@@ -32,8 +57,11 @@ class Search:
                        in the knowledge base (default: 1000).
             buffer_size: Size of the buffer for internal operations like conversions
                         and transformations (default: 10000).
+            threads: Number of threads used to match rules and facts in each cycle
+                    (default: 1). The results are identical to the single-threaded ones.
         """
         self._search: ds.Search = ds.Search(limit_size, buffer_size)
+        self._search.set_threads(threads)
 
     def set_limit_size(self, limit_size: int) -> None:
         """Set the size of the buffer for storing final objects.
@@ -51,6 +79,140 @@ class Search:
         """
         self._search.set_buffer_size(buffer_size)
 
+    def set_subsumption(self, forward: bool, backward: bool = False) -> None:
+        """Enable or disable subsumption checks on newly inferred facts.
+
+        Args:
+            forward: Drop a new fact if an existing fact is more general than it.
+            backward: Retire existing facts that are instances of a new fact.
+        """
+        self._search.set_subsumption(forward, backward)
+
+    def set_shard(self, shards: int, shard: int) -> None:
+        """Keep only one shard of the inferred facts, to split a knowledge base among processes.
+
+        Inferred facts of other shards are still passed to the callback, but they are not kept and
+        never matched here, so the caller should add them to the engine of their shard. Rules and
+        facts added directly are always kept, and the priority mode is never sharded.
+
+        Args:
+            shards: The total number of shards, 1 means not sharded.
+            shard: The shard kept by this engine, from 0 to shards - 1.
+        """
+        self._search.set_shard(shards, shard)
+
+    @staticmethod
+    def shard_of(rule: Rule | str, shards: int) -> int:
+        """Get the shard of a rule or fact.
+
+        Args:
+            rule: The rule or fact.
+            shards: The total number of shards.
+
+        Returns:
+            The shard, which only depends on the binary data, so it is the same in every process and platform.
+        """
+        target = rule if isinstance(rule, Rule) else Rule(rule)
+        return ds.Search.shard_of(target.value, shards)
+
+    def set_priority(self, cost: typing.Literal["size", "depth"] | typing.Callable[[Rule, int], float] | None) -> None:
+        """Set the cost function of the priority mode.
+
+        In the priority mode, pending rules and facts are activated one at a time from the cheapest,
+        so small or goal-relevant results can be produced before a full breadth-first cycle.
+        It should be set before adding rules and facts, and always runs single-threaded.
+
+        Args:
+            cost: "size" for the data size, "depth" for the derivation depth, a function of the rule
+                 and its derivation depth, or None to restore the default breadth-first mode.
+
+        Raises:
+            ValueError: If the cost is an unsupported string.
+        """
+        if cost is None:
+            self._search.set_priority(None)
+        elif cost == "size":
+            self._search.set_priority(ds.Search.size_cost)
+        elif cost == "depth":
+            self._search.set_priority(ds.Search.depth_cost)
+        elif isinstance(cost, str):
+            raise ValueError("Unsupported priority.")
+        else:
+            self._search.set_priority(lambda candidate, depth: cost(Rule(candidate.clone()), depth))
+
+    def set_capacity(
+        self,
+        max_facts: int = 0,
+        max_bytes: int = 0,
+        eviction: typing.Literal["largest", "oldest", "least_used"] = "oldest",
+        evicted: typing.Callable[[Rule], None] | None = None,
+    ) -> None:
+        """Set the capacity of facts and the eviction policy when it is exceeded.
+
+        The capacity is checked at the end of each cycle. Only facts are evicted, and evicted facts
+        are forgotten, so they may be inferred again later.
+
+        Args:
+            max_facts: The maximum number of facts, 0 means unlimited.
+            max_bytes: The maximum number of bytes used by all rules and facts, 0 means unlimited.
+            eviction: "largest" to evict the largest facts first, "oldest" to evict the facts from the
+                     earliest cycles first, or "least_used" to evict the facts used in the fewest matches first.
+            evicted: Function called for each evicted fact, or None.
+
+        Raises:
+            ValueError: If the eviction policy is unsupported.
+        """
+        if eviction not in ("largest", "oldest", "least_used"):
+            raise ValueError("Unsupported eviction.")
+        self._search.set_capacity(
+            max_facts,
+            max_bytes,
+            getattr(ds.Search.Eviction, eviction),
+            None if evicted is None else lambda candidate: evicted(Rule(candidate.clone())),
+        )
+
+    def set_provenance(self, provenance: bool) -> None:
+        """Enable or disable recording the source of each rule and fact.
+
+        When enabled, each rule and fact added afterwards records the rule and fact that produced
+        it and its cycle as a few integers, so the derivation can be obtained by proof.
+        Disabling it clears the records.
+
+        Args:
+            provenance: Whether to record the sources.
+        """
+        self._search.set_provenance(provenance)
+
+    def set_statistics(self, statistics: bool) -> None:
+        """Enable or disable recording statistics of each cycle.
+
+        When enabled, the skipped pairs, the overflows and the time are also measured, and the
+        statistics of each cycle are kept until reset. Disabling it clears the records.
+
+        Args:
+            statistics: Whether to record the statistics.
+        """
+        self._search.set_statistics(statistics)
+
+    def set_profiling(self, profiling: bool) -> None:
+        """Enable or disable profiling each rule.
+
+        When enabled, the matches with each rule, their results and the time spent are recorded,
+        which costs a lookup and a timer per match. Disabling it clears the records.
+
+        Args:
+            profiling: Whether to profile the rules.
+        """
+        self._search.set_profiling(profiling)
+
+    def set_threads(self, threads: int) -> None:
+        """Set the number of threads used to match rules and facts in each cycle.
+
+        Args:
+            threads: The new number of threads, 1 means single-threaded.
+        """
+        self._search.set_threads(threads)
+
     def reset(self) -> None:
         """Reset the search engine, clearing all rules and facts."""
         self._search.reset()
@@ -66,17 +228,234 @@ class Search:
         """
         return self._search.add(text)
 
-    def execute(self, callback: typing.Callable[[Rule], bool]) -> int:
+    def remove(self, rule: Rule | str) -> int:
+        """Remove a rule or fact that was added, and incrementally maintain what was inferred from it.
+
+        Everything inferred with its help is removed first, and then the part that can still be inferred
+        from the rest is restored, so the result is the same as if it had never been added, without
+        rebuilding everything. It requires set_provenance(True) before adding rules and facts.
+        Results that were dropped by forward subsumption because of a removed fact are not restored.
+
+        Args:
+            rule: The rule or fact to remove.
+
+        Returns:
+            The number of rules and facts removed, including itself, or 0 if it is unknown, was not added,
+            or provenance is disabled.
+
+        Example:
+            >>> search.set_provenance(True)
+            >>> search.add("(a `x) (b `x)")
+            >>> search.add("(a 1)")
+            >>> search.saturate()
+            >>> search.remove("(a 1)")  # 2, (a 1) and (b 1)
+        """
+        return self._search.remove(rule.value if isinstance(rule, Rule) else rule)
+
+    def contains(self, rule: Rule | str) -> bool:
+        """Check whether a rule or fact is in the knowledge base.
+
+        Args:
+            rule: The rule or fact to look up.
+
+        Returns:
+            True if it was added or inferred and has not been evicted, False otherwise.
+        """
+        target = rule if isinstance(rule, Rule) else Rule(rule)
+        return self._search.contains(target.value)
+
+    def add_many(self, items: typing.Iterable[str | Rule | bytes]) -> list[bool]:
+        """Add multiple rules or facts to the knowledge base in a single call.
+
+        Texts are parsed natively without holding the GIL, and Rule objects or their binary
+        data from Rule.data() are copied without being parsed again. Binary data is checked in
+        full first, and malformed data is not added.
+
+        Args:
+            items: The rules or facts as strings, Rule objects or binary data.
+
+        Returns:
+            Whether each rule or fact was successfully added.
+
+        Raises:
+            TypeError: If an item has an unsupported type.
+        """
+        return self._search.add_many(item.value if isinstance(item, Rule) else item for item in items)
+
+    def add_file(self, path: str | os.PathLike[str]) -> list[bool]:
+        """Add all rules and facts from a text file, separated by blank lines.
+
+        Args:
+            path: The path of the file.
+
+        Returns:
+            Whether each rule or fact was successfully added.
+
+        Raises:
+            OSError: If the file cannot be read.
+        """
+        result = self._search.add_file(os.fspath(path))
+        if result is None:
+            raise OSError("Cannot read the file.")
+        return result
+
+    def save(self, path: str | os.PathLike[str]) -> bool:
+        """Save all rules and facts and the progress of the search to a binary file.
+
+        Only the rules and facts in the knowledge base and the facts waiting in the priority mode are saved, settings are not.
+
+        Args:
+            path: The path of the file.
+
+        Returns:
+            True if successfully saved, False otherwise.
+        """
+        return self._search.save(os.fspath(path))
+
+    def load(self, path: str | os.PathLike[str]) -> bool:
+        """Load all rules and facts and the progress of the search from a file written by save.
+
+        The current knowledge base is replaced. The file is read into memory at once and the rules
+        are used in place, so no text parsing or re-inference is needed.
+
+        Args:
+            path: The path of the file.
+
+        Returns:
+            True if successfully loaded, False otherwise, in which case the knowledge base is empty.
+        """
+        return self._search.load(os.fspath(path))
+
+    def execute(
+        self,
+        callback: typing.Callable[[Rule], bool],
+        timeout: float = 0,
+        max_results: int = 0,
+        max_pairs: int = 0,
+        view: bool = False,
+    ) -> int:
         """Execute the search engine with a callback for each inferred rule.
 
+        The cycle stops early when any budget is used up. The results produced so far are kept,
+        and the next call finishes the cycle from the pair where it stopped before starting a
+        new one, so no result is lost.
+
         Args:
             callback: Function called for each candidate rule. Return False to continue,
                      True to stop.
+            timeout: The maximum wall time in seconds, including the time spent in the callback,
+                    0 means unlimited.
+            max_results: The maximum number of rules produced, 0 means unlimited.
+            max_pairs: The maximum number of matched pairs of a rule and a fact, 0 means unlimited.
+            view: Whether to pass read-only views of the engine buffer instead of copies. A view is
+                 only valid during the callback, call copy() on it to keep the rule.
 
         Returns:
             The number of rules processed.
         """
-        return self._search.execute(lambda candidate: callback(Rule(candidate.clone())))
+        return self._search.execute(RuleView.wrap(callback, view), timeout, max_results, max_pairs)
+
+    def saturate(self, max_cycles: int = 0, timeout: float = 0, max_results: int = 0, max_pairs: int = 0) -> int:
+        """Execute cycles with the GIL released until nothing new can be inferred.
+
+        The budgets are shared by all cycles and behave as in execute.
+
+        Args:
+            max_cycles: The maximum number of cycles, 0 means unlimited.
+            timeout: The maximum wall time in seconds, 0 means unlimited.
+            max_results: The maximum number of rules produced, 0 means unlimited.
+            max_pairs: The maximum number of matched pairs of a rule and a fact, 0 means unlimited.
+
+        Returns:
+            The number of rules produced.
+
+        Example:
+            >>> search.saturate(timeout=0.5)
+            >>> if search.exhausted():
+            ...     print("Stopped by the budget")
+        """
+        return self._search.saturate(max_cycles, timeout, max_results, max_pairs)
+
+    def exhausted(self) -> bool:
+        """Whether the last execute or saturate stopped early because a budget was used up.
+
+        Returns:
+            True if a budget was used up, False otherwise.
+        """
+        return self._search.exhausted()
+
+    def find(self, targets: typing.Iterable[Rule | str], patterns: bool = False, max_cycles: int = 0) -> Rule | None:
+        """Execute cycles until one of the targets is inferred.
+
+        This is equivalent to comparing each candidate with the targets in the callback of execute and
+        stopping on a match, but the comparison is done natively, so no Python function is called for each candidate.
+
+        Args:
+            targets: The target rules or facts.
+            patterns: If False, a result must be identical to a target. If True, the targets are patterns
+                     and a result matches if it is an instance of a target.
+            max_cycles: The maximum number of cycles to execute, 0 means unlimited.
+
+        Returns:
+            The first inferred target, or None if none is inferred within the cycles or nothing new can be inferred.
+
+        Example:
+            >>> search.find([Rule("X")])
+        """
+        rules = [target if isinstance(target, Rule) else Rule(target) for target in targets]
+        result = self._search.find([rule.value for rule in rules], patterns, max_cycles)
+        return None if result is None else Rule(result)
+
+    def proof(self, rule: Rule | str) -> list[Step]:
+        """Get the derivation of a rule or fact, which requires set_provenance(True).
+
+        Args:
+            rule: The rule or fact to explain.
+
+        Returns:
+            All steps of the derivation, where the sources of each step come before it and the last
+            step is the rule itself, or an empty list if it is unknown or has no record.
+
+        Example:
+            >>> search.set_provenance(True)
+            >>> search.find(["X"])
+            >>> for step in search.proof("X"):
+            ...     print(step.rule, step.parent_rule, step.parent_fact)
+        """
+        target = rule if isinstance(rule, Rule) else Rule(rule)
+        return [
+            Step(Rule(candidate), parent_rule, parent_fact, cycle)
+            for candidate, parent_rule, parent_fact, cycle in self._search.proof(target.value)
+        ]
+
+    def stats(self) -> list[Stats]:
+        """Get the statistics of each cycle since set_statistics(True).
+
+        Returns:
+            The statistics of each finished cycle in order.
+
+        Example:
+            >>> search.set_statistics(True)
+            >>> search.execute(lambda rule: False)
+            >>> for stats in search.stats():
+            ...     print(stats.cycle, stats.pairs, stats.failures, stats.seconds)
+        """
+        return [Stats._from(value) for value in self._search.stats()]
+
+    def profile(self) -> list[Profile]:
+        """Get the profile of each rule since set_profiling(True).
+
+        Returns:
+            The profile of each rule in the knowledge base in the order they were added, where the
+            rules that were never matched have all counts 0.
+
+        Example:
+            >>> search.set_profiling(True)
+            >>> search.execute(lambda rule: False)
+            >>> for entry in sorted(search.profile(), key=lambda entry: entry.seconds, reverse=True):
+            ...     print(entry.attempts, entry.produced, entry.seconds, entry.rule, sep="\t")
+        """
+        return [Profile(Rule(rule), *counts) for rule, *counts in self._search.profile()]
 
     def __iter__(self) -> typing.Iterator[Rule]:
         """Iterate over inferred rules.
@@ -94,3 +473,34 @@ class Search:
             if candidate is None:
                 break
             yield Rule(candidate.clone())
+
+    def aiter(self, batch_size: int = 64) -> typing.AsyncIterator[Rule]:
+        """Iterate over inferred rules asynchronously.
+
+        The cycle runs in a worker thread with the GIL released and the rules are delivered in
+        batches, so the event loop is not blocked. Leaving the loop early or cancelling the task
+        stops the cycle and keeps the results produced so far, as with the synchronous iteration.
+        The engine must not be used in other ways until the iteration ends.
+
+        Args:
+            batch_size: The maximum number of rules produced by the worker thread at a time.
+
+        Returns:
+            An asynchronous iterator over Rule objects.
+
+        Raises:
+            ValueError: If the batch size is not positive.
+
+        Example:
+            >>> async for rule in search.aiter():
+            ...     print(rule)
+        """
+        return aiterate(self._search.iter(), batch_size)
+
+    def __aiter__(self) -> typing.AsyncIterator[Rule]:
+        """Iterate over inferred rules asynchronously with the default batch size.
+
+        Returns:
+            An asynchronous iterator over Rule objects.
+        """
+        return self.aiter()
@@ -0,0 +1,239 @@
+"""Search engine whose facts are sharded across worker processes."""
+
+from __future__ import annotations
+
+__all__ = [
+    "ShardedSearch",
+]
+
+import multiprocessing
+import multiprocessing.connection
+import os
+import types
+import typing
+from . import ds
+from .rule_t import Rule
+
+
+def _serve(
+    connection: multiprocessing.connection.Connection, shards: int, shard: int, limit_size: int, buffer_size: int
+) -> None:
+    """Run the engine of one shard until the driver closes it.
+
+    Each message is a command and its payload, and None stops the worker. Rules and facts are
+    exchanged as their binary data, so nothing is parsed again.
+
+    Args:
+        connection: The connection to the driver.
+        shards: The total number of shards.
+        shard: The shard kept by this worker.
+        limit_size: Size of the buffer for storing the final objects.
+        buffer_size: Size of the buffer for internal operations.
+    """
+    search = ds.Search(limit_size, buffer_size)
+    search.set_shard(shards, shard)
+    while (message := connection.recv()) is not None:
+        command, payload = message
+        if command == "add":
+            # Reply whether each rule or fact is new to this shard
+            fresh = [not search.contains(ds.Rule.from_binary(memoryview(data))) for data in payload]
+            added = search.add_many(payload)
+            connection.send([new and success for new, success in zip(fresh, added)])
+        elif command == "cycle":
+            rules: list[bytes] = []
+            facts: list[bytes] = []
+            foreign: list[list[bytes]] = [[] for _ in range(shards)]
+
+            def collect(candidate: ds.Rule) -> bool:
+                data = bytes(ds.Rule.to_binary(candidate))
+                if len(candidate) != 0:
+                    rules.append(data)
+                else:
+                    owner = ds.Search.shard_of(candidate, shards)
+                    (facts if owner == shard else foreign[owner]).append(data)
+                return False
+
+            search.execute(collect, 0, 0, 0)
+            connection.send((rules, facts, foreign))
+    connection.close()
+
+
+class ShardedSearch:
+    """Search engine whose facts are sharded across worker processes.
+
+    Every worker process holds all rules and the facts whose shard it keeps, so the facts can exceed the
+    memory of a single process and the cycles use all cores. The workers run each cycle in lock-step,
+    after which the new rules are broadcast to all workers and the new facts are sent to the workers
+    of their shards, where the duplicates are dropped. The results are the same as those of Search,
+    but they are produced in a different order.
+
+    Example:
+        >>> with ShardedSearch(4) as search:
+        ...     search.add("(parent john mary)")
+        ...     search.add("(father `X `Y)\\n----------\\n(parent `X `Y)\\n")
+        ...     search.saturate()
+    """
+
+    def __init__(self, shards: int = 0, limit_size: int = 1000, buffer_size: int = 10000):
+        """Starts the worker processes.
+
+        Args:
+            shards: Number of worker processes, 0 means the number of CPUs (default: 0).
+            limit_size: Size of the buffer for storing the final objects (rules/facts)
+                       in the knowledge base of each worker (default: 1000).
+            buffer_size: Size of the buffer for internal operations like conversions
+                        and transformations (default: 10000).
+        """
+        self._shards: int = shards if shards > 0 else os.cpu_count() or 1
+        self._limit_size: int = limit_size
+        self._connections: list[multiprocessing.connection.Connection] = []
+        self._processes: list[multiprocessing.process.BaseProcess] = []
+        context = multiprocessing.get_context()
+        for shard in range(self._shards):
+            connection, child = context.Pipe()
+            process = context.Process(
+                target=_serve, args=(child, self._shards, shard, limit_size, buffer_size), daemon=True
+            )
+            process.start()
+            child.close()
+            self._connections.append(connection)
+            self._processes.append(process)
+
+    @property
+    def shards(self) -> int:
+        """Get the number of worker processes.
+
+        Returns:
+            The number of shards.
+        """
+        return self._shards
+
+    def _request(self, command: str, payloads: list[typing.Any]) -> list[typing.Any]:
+        for connection, payload in zip(self._connections, payloads):
+            connection.send((command, payload))
+        return [connection.recv() for connection in self._connections]
+
+    def add(self, text: str) -> bool:
+        """Add a rule or fact to the knowledge base.
+
+        Args:
+            text: The rule or fact as a string.
+
+        Returns:
+            True if successfully added, False otherwise.
+        """
+        return self.add_many([text])[0]
+
+    def add_many(self, items: typing.Iterable[str | Rule]) -> list[bool]:
+        """Add multiple rules or facts to the knowledge base.
+
+        Rules are sent to all workers and facts to the workers of their shards.
+
+        Args:
+            items: The rules or facts as strings or Rule objects.
+
+        Returns:
+            Whether each rule or fact was successfully added.
+        """
+        batches: list[list[bytes]] = [[] for _ in range(self._shards)]
+        result = []
+        for item in items:
+            try:
+                rule = item if isinstance(item, Rule) else Rule(item)
+            except ValueError:
+                result.append(False)
+                continue
+            if rule.size() > self._limit_size:
+                result.append(False)
+                continue
+            if len(rule) != 0:
+                for batch in batches:
+                    batch.append(bytes(rule.data()))
+            else:
+                batches[ds.Search.shard_of(rule.value, self._shards)].append(bytes(rule.data()))
+            result.append(True)
+        self._request("add", batches)
+        return result
+
+    def _cycle(self) -> list[bytes]:
+        """Run a cycle in all workers and exchange the results.
+
+        Returns:
+            The binary data of the new rules and facts, each of which appears once.
+        """
+        replies = self._request("cycle", [None] * self._shards)
+        # A rule may be inferred by several workers in the same cycle, but each worker already holds all old rules
+        rules = list(dict.fromkeys(rule for rules, _, _ in replies for rule in rules))
+        # A fact of another shard may also be inferred by several workers, so the worker of its shard gets it once
+        incoming: list[list[bytes]] = [[] for _ in range(self._shards)]
+        for _, _, foreign in replies:
+            for shard, facts in enumerate(foreign):
+                incoming[shard].extend(facts)
+        incoming = [list(dict.fromkeys(facts)) for facts in incoming]
+        fresh = self._request("add", [rules + facts for facts in incoming])
+        results = list(rules)
+        for shard, (_, facts, _) in enumerate(replies):
+            results.extend(facts)
+            received = fresh[shard][len(rules) :]
+            results.extend(fact for fact, new in zip(incoming[shard], received) if new)
+        return results
+
+    def execute(self, callback: typing.Callable[[Rule], bool]) -> int:
+        """Execute a cycle in all workers with a callback for each inferred rule.
+
+        The cycle has finished in all workers before the callback is called, so stopping early only
+        skips the remaining results, which are still kept.
+
+        Args:
+            callback: Function called for each candidate rule. Return False to continue,
+                     True to stop.
+
+        Returns:
+            The number of rules processed.
+        """
+        count = 0
+        for data in self._cycle():
+            count += 1
+            if callback(Rule(memoryview(data))):
+                break
+        return count
+
+    def saturate(self, max_cycles: int = 0) -> int:
+        """Execute cycles until nothing new can be inferred.
+
+        Args:
+            max_cycles: The maximum number of cycles, 0 means unlimited.
+
+        Returns:
+            The number of rules produced.
+        """
+        total = 0
+        cycle = 0
+        while max_cycles <= 0 or cycle < max_cycles:
+            count = len(self._cycle())
+            if count == 0:
+                break
+            total += count
+            cycle += 1
+        return total
+
+    def close(self) -> None:
+        """Stop the worker processes, after which the engine cannot be used."""
+        for connection in self._connections:
+            connection.send(None)
+            connection.close()
+        for process in self._processes:
+            process.join()
+        self._connections.clear()
+        self._processes.clear()
+
+    def __enter__(self) -> ShardedSearch:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: types.TracebackType | None,
+    ) -> None:
+        self.close()
@@ -0,0 +1,78 @@
+"""Statistics of the inference engines."""
+
+__all__ = [
+    "Stats",
+    "Profile",
+]
+
+import typing
+from . import ds
+from .rule_t import Rule
+
+
+class Stats(typing.NamedTuple):
+    """Statistics of a cycle of Search or Chain.
+
+    Each pair of a rule and a fact is either skipped because both have been processed, or matched.
+    A match fails, exceeds the limit size, is a duplicate, is subsumed by an existing fact, or is
+    accepted as a new rule or fact.
+
+    Attributes:
+        cycle: The cycle after this cycle ends.
+        pairs: Number of matched pairs.
+        skipped: Number of pairs in the index that were not matched again because both have been processed.
+        failures: Number of failed matches, including those failed because of the buffer size.
+        overflows: Number of failed matches that succeed with twice the buffer size, which suggests
+                  increasing the buffer size.
+        oversize: Number of successful matches whose results exceed the limit size.
+        duplicates: Number of results dropped because they already exist.
+        subsumed: Number of results dropped by forward subsumption.
+        rules: Number of accepted new rules.
+        facts: Number of accepted new facts.
+        bytes: Number of bytes used by all rules and facts after this cycle.
+        seconds: Wall time of this cycle in seconds, including the time spent in callbacks.
+    """
+
+    cycle: int
+    pairs: int
+    skipped: int
+    failures: int
+    overflows: int
+    oversize: int
+    duplicates: int
+    subsumed: int
+    rules: int
+    facts: int
+    bytes: int
+    seconds: float
+
+    @classmethod
+    def _from(cls, value: ds.Stats) -> "Stats":
+        return cls(*(getattr(value, field) for field in cls._fields))
+
+
+class Profile(typing.NamedTuple):
+    """Profile of a rule in Search or Chain, used to find rules that produce most results or never fire.
+
+    Each match with this rule is counted. A match fails, exceeds the limit size, is a duplicate,
+    is subsumed by an existing fact, or is accepted as a new rule or fact.
+
+    Attributes:
+        rule: The profiled rule.
+        attempts: Number of matches with this rule.
+        successes: Number of successful matches, including those whose results are dropped afterwards.
+        oversize: Number of results dropped because they exceed the limit size.
+        duplicates: Number of results dropped because they already exist.
+        subsumed: Number of results dropped by forward subsumption.
+        produced: Number of accepted new rules and facts.
+        seconds: Time spent in matches with this rule in seconds, excluding the time spent in callbacks.
+    """
+
+    rule: Rule
+    attempts: int
+    successes: int
+    oversize: int
+    duplicates: int
+    subsumed: int
+    produced: int
+    seconds: float
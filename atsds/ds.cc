@@ -1,7 +1,10 @@
 #include <ds/chain.hh>
 #include <ds/ds.hh>
 #include <ds/generator.hh>
+#include <ds/prove.hh>
+#include <ds/rete.hh>
 #include <ds/search.hh>
+#include <ds/stats.hh>
 #include <emscripten/bind.h>
 
 namespace em = emscripten;
@@ -152,12 +155,146 @@ auto rule_rename(ds::rule_t* rule, ds::rule_t* prefix_and_suffix, int length) ->
     return std::unique_ptr<ds::rule_t>(result);
 }
 
+template<typename T>
+auto add_many(T* self, const em::val& items) -> em::val {
+    auto result = em::val::array();
+    const auto length = items["length"].as<unsigned>();
+    for (unsigned index = 0; index < length; ++index) {
+        em::val item = items[index];
+        if (item.isString()) {
+            result.call<void>("push", self->add(item.as<std::string>()));
+        } else {
+            result.call<void>("push", self->add(item.as<ds::rule_t*>(em::allow_raw_pointers())));
+        }
+    }
+    return result;
+}
+
+template<typename T>
+auto add_file(T* self, const std::string& path) -> em::val {
+    auto added = self->add_file(path);
+    if (!added) {
+        return em::val::null();
+    }
+    auto result = em::val::array();
+    for (bool success : *added) {
+        result.call<void>("push", success);
+    }
+    return result;
+}
+
+template<typename T>
+auto stats(T* self) -> em::val {
+    auto result = em::val::array();
+    for (const auto& stats : self->stats()) {
+        auto item = em::val::object();
+        item.set("cycle", stats.cycle);
+        item.set("pairs", stats.pairs);
+        item.set("skipped", stats.skipped);
+        item.set("failures", stats.failures);
+        item.set("overflows", stats.overflows);
+        item.set("oversize", stats.oversize);
+        item.set("duplicates", stats.duplicates);
+        item.set("subsumed", stats.subsumed);
+        item.set("rules", stats.rules);
+        item.set("facts", stats.facts);
+        item.set("bytes", stats.bytes);
+        item.set("seconds", stats.seconds);
+        result.call<void>("push", item);
+    }
+    return result;
+}
+
+template<typename T>
+auto profile(T* self) -> em::val {
+    auto result = em::val::array();
+    for (const auto& entry : self->profile()) {
+        auto item = em::val::object();
+        item.set("rule", to_binary(entry.rule));
+        item.set("attempts", entry.attempts);
+        item.set("successes", entry.successes);
+        item.set("oversize", entry.oversize);
+        item.set("duplicates", entry.duplicates);
+        item.set("subsumed", entry.subsumed);
+        item.set("produced", entry.produced);
+        item.set("seconds", entry.seconds);
+        result.call<void>("push", item);
+    }
+    return result;
+}
+
 auto search_add(ds::search_t* search, const std::string& text) -> bool {
     return search->add(text);
 }
 
-auto search_execute(ds::search_t* search, const em::val& callback) -> ds::length_t {
-    return search->execute([&callback](ds::rule_t* candidate) -> bool { return callback(candidate, em::allow_raw_pointers()).as<bool>(); });
+auto search_execute(ds::search_t* search, const em::val& callback, double timeout, std::size_t max_results, std::size_t max_pairs) -> ds::length_t {
+    return search->execute(
+        [&callback](ds::rule_t* candidate) -> bool { return callback(candidate, em::allow_raw_pointers()).as<bool>(); },
+        {.timeout = timeout, .max_results = max_results, .max_pairs = max_pairs}
+    );
+}
+
+auto search_saturate(ds::search_t* search, ds::length_t max_cycles, double timeout, std::size_t max_results, std::size_t max_pairs) -> std::size_t {
+    return search->saturate(max_cycles, {.timeout = timeout, .max_results = max_results, .max_pairs = max_pairs});
+}
+
+auto search_set_priority(ds::search_t* search, const em::val& cost) -> void {
+    if (cost.isNull() || cost.isUndefined()) {
+        search->set_priority(nullptr);
+    } else if (cost.isString()) {
+        search->set_priority(cost.as<std::string>() == "depth" ? &ds::search_t::depth_cost : &ds::search_t::size_cost);
+    } else {
+        search->set_priority([cost](ds::rule_t* candidate, ds::length_t depth) -> double {
+            return cost(candidate, depth, em::allow_raw_pointers()).as<double>();
+        });
+    }
+}
+
+auto search_set_capacity(ds::search_t* search, std::size_t max_facts, std::size_t max_bytes, const std::string& eviction, const em::val& evicted)
+    -> void {
+    auto policy = eviction == "largest"    ? ds::search_t::eviction_t::largest :
+                  eviction == "least_used" ? ds::search_t::eviction_t::least_used :
+                                             ds::search_t::eviction_t::oldest;
+    if (evicted.isNull() || evicted.isUndefined()) {
+        search->set_capacity(max_facts, max_bytes, policy);
+    } else {
+        search->set_capacity(max_facts, max_bytes, policy, [evicted](ds::rule_t* candidate) { evicted(candidate, em::allow_raw_pointers()); });
+    }
+}
+
+auto search_save(ds::search_t* search, const std::string& path) -> bool {
+    return search->save(path);
+}
+
+auto search_load(ds::search_t* search, const std::string& path) -> bool {
+    return search->load(path);
+}
+
+auto search_find(ds::search_t* search, const em::val& targets, bool patterns, ds::length_t max_cycles) -> em::val {
+    std::vector<ds::rule_t*> rules;
+    const auto length = targets["length"].as<unsigned>();
+    for (unsigned index = 0; index < length; ++index) {
+        rules.push_back(targets[index].as<ds::rule_t*>(em::allow_raw_pointers()));
+    }
+    auto result = search->find(rules, patterns, max_cycles);
+    if (!result) {
+        return em::val::null();
+    }
+    return em::val(to_binary(result.get()));
+}
+
+auto search_proof(ds::search_t* search, ds::rule_t* rule) -> em::val {
+    auto result = em::val::array();
+    auto position = [](const std::optional<std::size_t>& index) { return index ? em::val(*index) : em::val::null(); };
+    for (auto& step : search->proof(rule)) {
+        auto item = em::val::object();
+        item.set("rule", to_binary(step.rule));
+        item.set("parent_rule", position(step.parent_rule));
+        item.set("parent_fact", position(step.parent_fact));
+        item.set("cycle", step.cycle);
+        result.call<void>("push", item);
+    }
+    return result;
 }
 
 auto search_iter(ds::search_t* search) -> std::unique_ptr<Iterator> {
@@ -172,10 +309,42 @@ auto chain_execute(ds::chain_t* chain, const em::val& callback) -> ds::length_t
     return chain->execute([&callback](ds::rule_t* candidate) -> bool { return callback(candidate, em::allow_raw_pointers()).as<bool>(); });
 }
 
+auto chain_save(ds::chain_t* chain, const std::string& path) -> bool {
+    return chain->save(path);
+}
+
+auto chain_load(ds::chain_t* chain, const std::string& path) -> bool {
+    return chain->load(path);
+}
+
 auto chain_iter(ds::chain_t* chain) -> std::unique_ptr<Iterator> {
     return std::make_unique<Iterator>(std::move(chain->iterator()));
 }
 
+auto prove_add(ds::prove_t* prove, const std::string& text) -> bool {
+    return prove->add(text);
+}
+
+auto prove_execute(ds::prove_t* prove, const std::string& goal, const em::val& callback) -> ds::length_t {
+    return prove->execute(goal, [&callback](ds::rule_t* candidate) -> bool { return callback(candidate, em::allow_raw_pointers()).as<bool>(); });
+}
+
+auto prove_iter(ds::prove_t* prove, const std::string& goal) -> std::unique_ptr<Iterator> {
+    return std::make_unique<Iterator>(std::move(prove->iterator(goal)));
+}
+
+auto rete_add(ds::rete_t* rete, const std::string& text) -> bool {
+    return rete->add(text);
+}
+
+auto rete_execute(ds::rete_t* rete, const em::val& callback) -> ds::length_t {
+    return rete->execute([&callback](ds::rule_t* candidate) -> bool { return callback(candidate, em::allow_raw_pointers()).as<bool>(); });
+}
+
+auto rete_iter(ds::rete_t* rete) -> std::unique_ptr<Iterator> {
+    return std::make_unique<Iterator>(std::move(rete->iterator()));
+}
+
 EMSCRIPTEN_BINDINGS(ds) {
     em::register_vector<std::uint8_t>("Buffer");
 
@@ -225,22 +394,74 @@ EMSCRIPTEN_BINDINGS(ds) {
     search_t.constructor<ds::length_t, ds::length_t>();
     search_t.function("set_limit_size", &ds::search_t::set_limit_size);
     search_t.function("set_buffer_size", &ds::search_t::set_buffer_size);
+    search_t.function("set_subsumption", &ds::search_t::set_subsumption);
+    search_t.function("set_shard", &ds::search_t::set_shard);
+    search_t.class_function("shard_of", &ds::search_t::shard_of, em::allow_raw_pointers());
     search_t.function("reset", &ds::search_t::reset);
     // 因为embind的限制，这里无法使用string_view和function。
     search_t.function("add", &search_add, em::allow_raw_pointers());
+    search_t.function("remove", em::select_overload<std::size_t(ds::rule_t*)>(&ds::search_t::remove), em::allow_raw_pointers());
+    search_t.function("contains", &ds::search_t::contains, em::allow_raw_pointers());
+    search_t.function("add_many", &add_many<ds::search_t>, em::allow_raw_pointers());
+    search_t.function("add_file", &add_file<ds::search_t>, em::allow_raw_pointers());
+    search_t.function("save", &search_save, em::allow_raw_pointers());
+    search_t.function("load", &search_load, em::allow_raw_pointers());
     search_t.function("execute", &search_execute, em::allow_raw_pointers());
+    search_t.function("saturate", &search_saturate, em::allow_raw_pointers());
+    search_t.function("exhausted", &ds::search_t::exhausted);
+    search_t.function("set_priority", &search_set_priority, em::allow_raw_pointers());
+    search_t.function("set_capacity", &search_set_capacity, em::allow_raw_pointers());
+    search_t.function("find", &search_find, em::allow_raw_pointers());
+    search_t.function("set_provenance", &ds::search_t::set_provenance);
+    search_t.function("proof", &search_proof, em::allow_raw_pointers());
+    search_t.function("set_statistics", &ds::search_t::set_statistics);
+    search_t.function("stats", &stats<ds::search_t>, em::allow_raw_pointers());
+    search_t.function("set_profiling", &ds::search_t::set_profiling);
+    search_t.function("profile", &profile<ds::search_t>, em::allow_raw_pointers());
     search_t.function("iter", &search_iter, em::return_value_policy::take_ownership());
 
     auto chain_t = em::class_<ds::chain_t>("Chain");
     chain_t.constructor<ds::length_t, ds::length_t>();
     chain_t.function("set_limit_size", &ds::chain_t::set_limit_size);
     chain_t.function("set_buffer_size", &ds::chain_t::set_buffer_size);
+    chain_t.function("set_subsumption", &ds::chain_t::set_subsumption);
+    chain_t.function("set_join_ordering", &ds::chain_t::set_join_ordering);
     chain_t.function("reset", &ds::chain_t::reset);
     // 因为 embind 的限制，这里无法使用 string_view 和 function。
     chain_t.function("add", &chain_add, em::allow_raw_pointers());
+    chain_t.function("add_many", &add_many<ds::chain_t>, em::allow_raw_pointers());
+    chain_t.function("add_file", &add_file<ds::chain_t>, em::allow_raw_pointers());
+    chain_t.function("save", &chain_save, em::allow_raw_pointers());
+    chain_t.function("load", &chain_load, em::allow_raw_pointers());
     chain_t.function("execute", &chain_execute, em::allow_raw_pointers());
+    chain_t.function("set_statistics", &ds::chain_t::set_statistics);
+    chain_t.function("stats", &stats<ds::chain_t>, em::allow_raw_pointers());
+    chain_t.function("set_profiling", &ds::chain_t::set_profiling);
+    chain_t.function("profile", &profile<ds::chain_t>, em::allow_raw_pointers());
     chain_t.function("iter", &chain_iter, em::return_value_policy::take_ownership());
 
+    auto prove_t = em::class_<ds::prove_t>("Prove");
+    prove_t.constructor<ds::length_t, ds::length_t>();
+    prove_t.function("set_limit_size", &ds::prove_t::set_limit_size);
+    prove_t.function("set_buffer_size", &ds::prove_t::set_buffer_size);
+    prove_t.function("reset", &ds::prove_t::reset);
+    // 因为embind的限制，这里无法使用string_view和function。
+    prove_t.function("add", &prove_add, em::allow_raw_pointers());
+    prove_t.function("execute", &prove_execute, em::allow_raw_pointers());
+    prove_t.function("iter", &prove_iter, em::return_value_policy::take_ownership());
+
+    auto rete_t = em::class_<ds::rete_t>("Rete");
+    rete_t.constructor<ds::length_t, ds::length_t>();
+    rete_t.function("set_limit_size", &ds::rete_t::set_limit_size);
+    rete_t.function("set_buffer_size", &ds::rete_t::set_buffer_size);
+    rete_t.function("reset", &ds::rete_t::reset);
+    // 因为embind的限制，这里无法使用string_view和function。
+    rete_t.function("add", &rete_add, em::allow_raw_pointers());
+    rete_t.function("add_many", &add_many<ds::rete_t>, em::allow_raw_pointers());
+    rete_t.function("pending", &ds::rete_t::pending);
+    rete_t.function("execute", &rete_execute, em::allow_raw_pointers());
+    rete_t.function("iter", &rete_iter, em::return_value_policy::take_ownership());
+
     auto iterator_t = em::class_<Iterator>("Iterator");
     iterator_t.function("next", &Iterator::next, em::return_value_policy::reference());
 }
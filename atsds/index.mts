@@ -546,6 +546,79 @@ export class Rule extends _Common<dst.Rule> {
     }
 }
 
+/**
+ * A step in the derivation of a rule or fact.
+ */
+export interface Step {
+    /** The rule or fact obtained in this step. */
+    rule: Rule;
+    /** Index of the step of the rule that produced it, or null if it was added or its source has been forgotten. */
+    parent_rule: number | null;
+    /** Index of the step of the fact that produced it, or null if it was added or its source has been forgotten. */
+    parent_fact: number | null;
+    /** The cycle in which it entered the knowledge base. */
+    cycle: number;
+}
+
+/**
+ * Statistics of a cycle of Search or Chain.
+ *
+ * Each pair of a rule and a fact is either skipped because both have been processed, or matched.
+ * A match fails, exceeds the limit size, is a duplicate, is subsumed by an existing fact, or is
+ * accepted as a new rule or fact.
+ */
+export interface Stats {
+    /** The cycle after this cycle ends. */
+    cycle: number;
+    /** Number of matched pairs. */
+    pairs: number;
+    /** Number of pairs in the index that were not matched again because both have been processed. */
+    skipped: number;
+    /** Number of failed matches, including those failed because of the buffer size. */
+    failures: number;
+    /** Number of failed matches that succeed with twice the buffer size, which suggests increasing the buffer size. */
+    overflows: number;
+    /** Number of successful matches whose results exceed the limit size. */
+    oversize: number;
+    /** Number of results dropped because they already exist. */
+    duplicates: number;
+    /** Number of results dropped by forward subsumption. */
+    subsumed: number;
+    /** Number of accepted new rules. */
+    rules: number;
+    /** Number of accepted new facts. */
+    facts: number;
+    /** Number of bytes used by all rules and facts after this cycle. */
+    bytes: number;
+    /** Wall time of this cycle in seconds, including the time spent in callbacks. */
+    seconds: number;
+}
+
+/**
+ * Profile of a rule in Search or Chain, used to find rules that produce most results or never fire.
+ *
+ * Each match with this rule is counted. A match fails, exceeds the limit size, is a duplicate,
+ * is subsumed by an existing fact, or is accepted as a new rule or fact.
+ */
+export interface Profile {
+    /** The profiled rule. */
+    rule: Rule;
+    /** Number of matches with this rule. */
+    attempts: number;
+    /** Number of successful matches, including those whose results are dropped afterwards. */
+    successes: number;
+    /** Number of results dropped because they exceed the limit size. */
+    oversize: number;
+    /** Number of results dropped because they already exist. */
+    duplicates: number;
+    /** Number of results dropped by forward subsumption. */
+    subsumed: number;
+    /** Number of accepted new rules and facts. */
+    produced: number;
+    /** Time spent in matches with this rule in seconds, excluding the time spent in callbacks. */
+    seconds: number;
+}
+
 /**
  * Search engine for the deductive system.
  * Manages a knowledge base of rules and performs logical inference.
@@ -592,6 +665,136 @@ export class Search {
         this._search.set_buffer_size(buffer_size);
     }
 
+    /**
+     * Enable or disable subsumption checks on newly inferred facts.
+     *
+     * @param forward - Drop a new fact if an existing fact is more general than it.
+     * @param backward - Retire existing facts that are instances of a new fact.
+     */
+    set_subsumption(forward: boolean, backward: boolean = false): void {
+        this._search.set_subsumption(forward, backward);
+    }
+
+    /**
+     * Keep only one shard of the inferred facts, to split a knowledge base among workers.
+     *
+     * Inferred facts of other shards are still passed to the callback, but they are not kept and
+     * never matched here, so the caller should add them to the engine of their shard. Rules and
+     * facts added directly are always kept, and the priority mode is never sharded.
+     *
+     * @param shards - The total number of shards, 1 means not sharded.
+     * @param shard - The shard kept by this engine, from 0 to shards - 1.
+     */
+    set_shard(shards: number, shard: number): void {
+        this._search.set_shard(shards, shard);
+    }
+
+    /**
+     * Get the shard of a rule or fact.
+     *
+     * @param rule - The rule or fact.
+     * @param shards - The total number of shards.
+     * @returns The shard, which only depends on the binary data, so it is the same in every process and platform.
+     */
+    static shard_of(rule: Rule | string, shards: number): number {
+        const target = rule instanceof Rule ? rule : new Rule(rule);
+        return ds.Search.shard_of(target.value, shards);
+    }
+
+    /**
+     * Set the cost function of the priority mode.
+     *
+     * In the priority mode, pending rules and facts are activated one at a time from the cheapest,
+     * so small or goal-relevant results can be produced before a full breadth-first cycle.
+     *
+     * @param cost - "size" for the data size, "depth" for the derivation depth, a function of the rule and its depth,
+     *               or null to restore the default breadth-first mode.
+     * @throws {Error} If the cost is an unsupported string.
+     */
+    set_priority(cost: "size" | "depth" | ((rule: Rule, depth: number) => number) | null): void {
+        if (typeof cost === "function") {
+            this._search.set_priority((candidate: dst.Rule, depth: number): number => {
+                return cost(new Rule(candidate).copy(), depth);
+            });
+        } else {
+            if (cost !== null && cost !== "size" && cost !== "depth") {
+                throw new Error("Unsupported priority.");
+            }
+            this._search.set_priority(cost);
+        }
+    }
+
+    /**
+     * Set the capacity of facts and the eviction policy when it is exceeded.
+     *
+     * The capacity is checked at the end of each cycle. Only facts are evicted, and evicted facts
+     * are forgotten, so they may be inferred again later.
+     *
+     * @param max_facts - The maximum number of facts, 0 means unlimited.
+     * @param max_bytes - The maximum number of bytes used by all rules and facts, 0 means unlimited.
+     * @param eviction - "largest" to evict the largest facts first, "oldest" to evict the facts from the earliest cycles first,
+     *                   or "least_used" to evict the facts used in the fewest matches first.
+     * @param evicted - Function called for each evicted fact, or null.
+     * @throws {Error} If the eviction policy is unsupported.
+     */
+    set_capacity(
+        max_facts: number = 0,
+        max_bytes: number = 0,
+        eviction: "largest" | "oldest" | "least_used" = "oldest",
+        evicted: ((rule: Rule) => void) | null = null,
+    ): void {
+        if (eviction !== "largest" && eviction !== "oldest" && eviction !== "least_used") {
+            throw new Error("Unsupported eviction.");
+        }
+        this._search.set_capacity(
+            max_facts,
+            max_bytes,
+            eviction,
+            evicted === null
+                ? null
+                : (candidate: dst.Rule): void => {
+                      evicted(new Rule(candidate).copy());
+                  },
+        );
+    }
+
+    /**
+     * Enable or disable recording the source of each rule and fact.
+     *
+     * When enabled, each rule and fact added afterwards records the rule and fact that produced
+     * it and its cycle as a few integers, so the derivation can be obtained by proof.
+     * Disabling it clears the records.
+     *
+     * @param provenance - Whether to record the sources.
+     */
+    set_provenance(provenance: boolean): void {
+        this._search.set_provenance(provenance);
+    }
+
+    /**
+     * Enable or disable recording statistics of each cycle.
+     *
+     * When enabled, the skipped pairs, the overflows and the time are also measured, and the
+     * statistics of each cycle are kept until reset. Disabling it clears the records.
+     *
+     * @param statistics - Whether to record the statistics.
+     */
+    set_statistics(statistics: boolean): void {
+        this._search.set_statistics(statistics);
+    }
+
+    /**
+     * Enable or disable profiling each rule.
+     *
+     * When enabled, the matches with each rule, their results and the time spent are recorded,
+     * which costs a lookup and a timer per match. Disabling it clears the records.
+     *
+     * @param profiling - Whether to profile the rules.
+     */
+    set_profiling(profiling: boolean): void {
+        this._search.set_profiling(profiling);
+    }
+
     /**
      * Reset the search engine, clearing all rules and facts.
      */
@@ -609,16 +812,203 @@ export class Search {
         return this._search.add(text);
     }
 
+    /**
+     * Remove a rule or fact that was added, and incrementally maintain what was inferred from it.
+     *
+     * Everything inferred with its help is removed first, and then the part that can still be inferred
+     * from the rest is restored, without rebuilding everything. It requires set_provenance(true) before
+     * adding rules and facts. Results that were dropped by forward subsumption because of a removed fact
+     * are not restored.
+     *
+     * @param rule - The rule or fact to remove.
+     * @returns The number of rules and facts removed, including itself, or 0 if it is unknown, was not
+     *          added, or provenance is disabled.
+     */
+    remove(rule: Rule | string): number {
+        const target = rule instanceof Rule ? rule : new Rule(rule);
+        return this._search.remove(target.value);
+    }
+
+    /**
+     * Check whether a rule or fact is in the knowledge base.
+     *
+     * @param rule - The rule or fact to look up.
+     * @returns True if it was added or inferred and has not been evicted, false otherwise.
+     */
+    contains(rule: Rule | string): boolean {
+        const target = rule instanceof Rule ? rule : new Rule(rule);
+        return this._search.contains(target.value);
+    }
+
+    /**
+     * Add multiple rules or facts to the knowledge base in a single call.
+     *
+     * Rule objects are copied without being parsed again.
+     *
+     * @param items - The rules or facts as strings or Rule objects.
+     * @returns Whether each rule or fact was successfully added.
+     */
+    add_many(items: (string | Rule)[]): boolean[] {
+        return this._search.add_many(items.map((item) => (item instanceof Rule ? item.value : item)));
+    }
+
+    /**
+     * Add all rules and facts from a text file, separated by blank lines.
+     *
+     * In the browser the file lives in the Emscripten virtual file system.
+     *
+     * @param path - The path of the file.
+     * @returns Whether each rule or fact was successfully added.
+     * @throws {Error} If the file cannot be read.
+     */
+    add_file(path: string): boolean[] {
+        const result = this._search.add_file(path);
+        if (result === null) {
+            throw new Error("Cannot read the file.");
+        }
+        return result;
+    }
+
+    /**
+     * Save all rules and facts and the progress of the search to a binary file.
+     *
+     * Only the rules and facts in the knowledge base and the facts waiting in the priority mode are saved, settings are not.
+     * In the browser the file lives in the Emscripten virtual file system.
+     *
+     * @param path - The path of the file.
+     * @returns True if successfully saved, false otherwise.
+     */
+    save(path: string): boolean {
+        return this._search.save(path);
+    }
+
+    /**
+     * Load all rules and facts and the progress of the search from a file written by save.
+     *
+     * The current knowledge base is replaced. The file is read into memory at once and the rules
+     * are used in place, so no text parsing or re-inference is needed.
+     *
+     * @param path - The path of the file.
+     * @returns True if successfully loaded, false otherwise, in which case the knowledge base is empty.
+     */
+    load(path: string): boolean {
+        return this._search.load(path);
+    }
+
     /**
      * Execute the search engine with a callback for each inferred rule.
      *
+     * The cycle stops early when any budget is used up. The results produced so far are kept,
+     * and the next call finishes the cycle from the pair where it stopped before starting a
+     * new one, so no result is lost.
+     *
      * @param callback - Function called for each candidate rule. Return false to continue, true to stop.
+     * @param timeout - The maximum wall time in seconds, including the time spent in the callback, 0 means unlimited.
+     * @param max_results - The maximum number of rules produced, 0 means unlimited.
+     * @param max_pairs - The maximum number of matched pairs of a rule and a fact, 0 means unlimited.
      * @returns The number of rules processed.
      */
-    execute(callback: (candidate: Rule) => boolean): number {
-        return this._search.execute((candidate: dst.Rule): boolean => {
-            return callback(new Rule(candidate).copy());
-        });
+    execute(
+        callback: (candidate: Rule) => boolean,
+        timeout: number = 0,
+        max_results: number = 0,
+        max_pairs: number = 0,
+    ): number {
+        return this._search.execute(
+            (candidate: dst.Rule): boolean => {
+                return callback(new Rule(candidate).copy());
+            },
+            timeout,
+            max_results,
+            max_pairs,
+        );
+    }
+
+    /**
+     * Execute cycles until nothing new can be inferred.
+     *
+     * The budgets are shared by all cycles and behave as in execute.
+     *
+     * @param max_cycles - The maximum number of cycles, 0 means unlimited.
+     * @param timeout - The maximum wall time in seconds, 0 means unlimited.
+     * @param max_results - The maximum number of rules produced, 0 means unlimited.
+     * @param max_pairs - The maximum number of matched pairs of a rule and a fact, 0 means unlimited.
+     * @returns The number of rules produced.
+     */
+    saturate(max_cycles: number = 0, timeout: number = 0, max_results: number = 0, max_pairs: number = 0): number {
+        return this._search.saturate(max_cycles, timeout, max_results, max_pairs);
+    }
+
+    /**
+     * Whether the last execute or saturate stopped early because a budget was used up.
+     *
+     * @returns True if a budget was used up, false otherwise.
+     */
+    exhausted(): boolean {
+        return this._search.exhausted();
+    }
+
+    /**
+     * Execute cycles until one of the targets is inferred.
+     *
+     * This is equivalent to comparing each candidate with the targets in the callback of execute and
+     * stopping on a match, but the comparison is done natively, so no JavaScript function is called for each candidate.
+     *
+     * @param targets - The target rules or facts.
+     * @param patterns - If false, a result must be identical to a target. If true, the targets are patterns
+     *                   and a result matches if it is an instance of a target.
+     * @param max_cycles - The maximum number of cycles to execute, 0 means unlimited.
+     * @returns The first inferred target, or null if none is inferred within the cycles or nothing new can be inferred.
+     */
+    find(targets: (Rule | string)[], patterns: boolean = false, max_cycles: number = 0): Rule | null {
+        const rules = targets.map((target) => (target instanceof Rule ? target : new Rule(target)));
+        const result = this._search.find(
+            rules.map((rule) => rule.value),
+            patterns,
+            max_cycles,
+        );
+        return result === null ? null : new Rule(result);
+    }
+
+    /**
+     * Get the derivation of a rule or fact, which requires set_provenance(true).
+     *
+     * @param rule - The rule or fact to explain.
+     * @returns All steps of the derivation, where the sources of each step come before it and the last
+     *          step is the rule itself, or an empty array if it is unknown or has no record.
+     */
+    proof(rule: Rule | string): Step[] {
+        const target = rule instanceof Rule ? rule : new Rule(rule);
+        return this._search.proof(target.value).map(
+            (step: { rule: dst.Buffer; parent_rule: number | null; parent_fact: number | null; cycle: number }) => ({
+                rule: new Rule(step.rule),
+                parent_rule: step.parent_rule,
+                parent_fact: step.parent_fact,
+                cycle: step.cycle,
+            }),
+        );
+    }
+
+    /**
+     * Get the statistics of each cycle since set_statistics(true).
+     *
+     * @returns The statistics of each finished cycle in order.
+     */
+    stats(): Stats[] {
+        return this._search.stats();
+    }
+
+    /**
+     * Get the profile of each rule since set_profiling(true).
+     *
+     * @returns The profile of each rule in the knowledge base in the order they were added, where the
+     *          rules that were never matched have all counts 0.
+     */
+    profile(): Profile[] {
+        return this._search.profile().map((entry: Omit<Profile, "rule"> & { rule: dst.Buffer }) => ({
+            ...entry,
+            rule: new Rule(entry.rule),
+        }));
     }
 
     /**
@@ -692,6 +1082,53 @@ export class Chain {
         this._chain.set_buffer_size(buffer_size);
     }
 
+    /**
+     * Enable or disable subsumption checks on newly inferred facts.
+     *
+     * @param forward - Drop a new fact if an existing fact is more general than it.
+     * @param backward - Retire existing facts that are instances of a new fact.
+     */
+    set_subsumption(forward: boolean, backward: boolean = false): void {
+        this._chain.set_subsumption(forward, backward);
+    }
+
+    /**
+     * Enable or disable choosing the order of premises by selectivity.
+     *
+     * When enabled, each step matches first the premise with the fewest candidate facts, estimated
+     * from the counts of facts per top symbol, instead of the first premise. The inferred facts are
+     * the same, but the intermediate rules keep the remaining premises, so they differ.
+     *
+     * @param join_ordering - Whether to match first the premise with the fewest candidate facts.
+     */
+    set_join_ordering(join_ordering: boolean): void {
+        this._chain.set_join_ordering(join_ordering);
+    }
+
+    /**
+     * Enable or disable recording statistics of each cycle.
+     *
+     * When enabled, the skipped pairs, the overflows and the time are also measured, and the
+     * statistics of each cycle are kept until reset. Disabling it clears the records.
+     *
+     * @param statistics - Whether to record the statistics.
+     */
+    set_statistics(statistics: boolean): void {
+        this._chain.set_statistics(statistics);
+    }
+
+    /**
+     * Enable or disable profiling each rule.
+     *
+     * When enabled, the matches with each rule, their results and the time spent are recorded,
+     * which costs a lookup and a timer per match. Disabling it clears the records.
+     *
+     * @param profiling - Whether to profile the rules.
+     */
+    set_profiling(profiling: boolean): void {
+        this._chain.set_profiling(profiling);
+    }
+
     /**
      * Reset the chain engine, clearing all rules and facts.
      */
@@ -709,6 +1146,61 @@ export class Chain {
         return this._chain.add(text);
     }
 
+    /**
+     * Add multiple rules or facts to the knowledge base in a single call.
+     *
+     * Rule objects are copied without being parsed again.
+     *
+     * @param items - The rules or facts as strings or Rule objects.
+     * @returns Whether each rule or fact was successfully added.
+     */
+    add_many(items: (string | Rule)[]): boolean[] {
+        return this._chain.add_many(items.map((item) => (item instanceof Rule ? item.value : item)));
+    }
+
+    /**
+     * Add all rules and facts from a text file, separated by blank lines.
+     *
+     * In the browser the file lives in the Emscripten virtual file system.
+     *
+     * @param path - The path of the file.
+     * @returns Whether each rule or fact was successfully added.
+     * @throws {Error} If the file cannot be read.
+     */
+    add_file(path: string): boolean[] {
+        const result = this._chain.add_file(path);
+        if (result === null) {
+            throw new Error("Cannot read the file.");
+        }
+        return result;
+    }
+
+    /**
+     * Save all rules and facts and the progress of the chain to a binary file.
+     *
+     * Only the rules and facts in the knowledge base are saved, settings are not.
+     * In the browser the file lives in the Emscripten virtual file system.
+     *
+     * @param path - The path of the file.
+     * @returns True if successfully saved, false otherwise.
+     */
+    save(path: string): boolean {
+        return this._chain.save(path);
+    }
+
+    /**
+     * Load all rules and facts and the progress of the chain from a file written by save.
+     *
+     * The current knowledge base is replaced. The file is read into memory at once and the rules
+     * are used in place, so no text parsing or re-inference is needed.
+     *
+     * @param path - The path of the file.
+     * @returns True if successfully loaded, false otherwise, in which case the knowledge base is empty.
+     */
+    load(path: string): boolean {
+        return this._chain.load(path);
+    }
+
     /**
      * Execute the chain engine with a callback for each inferred rule.
      *
@@ -721,6 +1213,28 @@ export class Chain {
         });
     }
 
+    /**
+     * Get the statistics of each cycle since set_statistics(true).
+     *
+     * @returns The statistics of each finished cycle in order.
+     */
+    stats(): Stats[] {
+        return this._chain.stats();
+    }
+
+    /**
+     * Get the profile of each rule since set_profiling(true).
+     *
+     * @returns The profile of each rule in the knowledge base in the order they were added, where the
+     *          rules that were never matched have all counts 0.
+     */
+    profile(): Profile[] {
+        return this._chain.profile().map((entry: Omit<Profile, "rule"> & { rule: dst.Buffer }) => ({
+            ...entry,
+            rule: new Rule(entry.rule),
+        }));
+    }
+
     /**
      * Iterate over inferred rules.
      *
@@ -744,3 +1258,228 @@ export class Chain {
         }
     }
 }
+
+/**
+ * Goal-directed prove engine for the deductive system.
+ * Starts from a goal and only expands rules whose conclusion may match it.
+ * Each subgoal is tabled, so recursive rules terminate.
+ *
+ * @example
+ * ```typescript
+ * const prove = new Prove();
+ * prove.add("(edge a b)");
+ * prove.add("(edge b c)");
+ * prove.add("(edge `x `y)\n(path `x `y)");
+ * prove.add("(path `x `y)\n(edge `y `z)\n(path `x `z)");
+ * for (const answer of prove.prove("(path a `w)")) {
+ *     console.log(answer.toString());  // Will find (path a b) and (path a c)
+ * }
+ * ```
+ */
+export class Prove {
+    _prove: dst.Prove;
+
+    /**
+     * Creates a new prove engine instance.
+     *
+     * @param limit_size - Size of the buffer for storing the final objects (rules/facts) in the knowledge base (default: 1000).
+     * @param buffer_size - Size of the buffer for internal operations like conversions and transformations (default: 10000).
+     */
+    constructor(limit_size: number = 1000, buffer_size: number = 10000) {
+        this._prove = new ds.Prove(limit_size, buffer_size);
+    }
+
+    /**
+     * Set the size of the buffer for storing final objects.
+     *
+     * @param limit_size - The new limit size for storing rules/facts.
+     */
+    set_limit_size(limit_size: number): void {
+        this._prove.set_limit_size(limit_size);
+    }
+
+    /**
+     * Set the buffer size for internal operations.
+     *
+     * @param buffer_size - The new buffer size.
+     */
+    set_buffer_size(buffer_size: number): void {
+        this._prove.set_buffer_size(buffer_size);
+    }
+
+    /**
+     * Reset the prove engine, clearing all rules and facts.
+     */
+    reset(): void {
+        this._prove.reset();
+    }
+
+    /**
+     * Add a rule or fact to the knowledge base.
+     *
+     * @param text - The rule or fact as a string.
+     * @returns True if successfully added, false otherwise.
+     */
+    add(text: string): boolean {
+        return this._prove.add(text);
+    }
+
+    /**
+     * Prove a goal with a callback for each answer.
+     *
+     * @param goal - The goal as a fact string, which may contain variables.
+     * @param callback - Function called for each answer, an instance of the goal. Return false to continue, true to stop.
+     * @returns The number of answers processed.
+     */
+    execute(goal: string, callback: (candidate: Rule) => boolean): number {
+        return this._prove.execute(goal, (candidate: dst.Rule): boolean => {
+            return callback(new Rule(candidate).copy());
+        });
+    }
+
+    /**
+     * Iterate over the answers of a goal.
+     *
+     * @param goal - The goal as a fact string, which may contain variables.
+     * @returns An iterator over answers, each an instance of the goal, each returned once.
+     */
+    *prove(goal: string): Generator<Rule> {
+        const iterator = this._prove.iter(goal);
+        while (true) {
+            const candidate = iterator.next();
+            if (candidate === null) {
+                break;
+            }
+            yield new Rule(candidate);
+        }
+    }
+}
+
+/**
+ * Incremental rete engine for the deductive system.
+ * Keeps the partial matches of every rule, so a new fact is only matched against the partial matches that may use it.
+ * The facts inferred from each added rule or fact are produced as soon as it has been propagated. Only facts are produced.
+ *
+ * @example
+ * ```typescript
+ * const rete = new Rete();
+ * rete.add("(edge `x `y)\n(path `x `y)");
+ * rete.add("(path `x `y)\n(edge `y `z)\n(path `x `z)");
+ * rete.add("(edge a b)");
+ * for (const fact of rete) {
+ *     console.log(fact.toString());  // Will find (path a b)
+ * }
+ * rete.add("(edge b c)");
+ * for (const fact of rete) {
+ *     console.log(fact.toString());  // Will find (path b c) and (path a c)
+ * }
+ * ```
+ */
+export class Rete {
+    _rete: dst.Rete;
+
+    /**
+     * Creates a new rete engine instance.
+     *
+     * @param limit_size - Size of the buffer for storing the final objects (rules/facts) in the knowledge base (default: 1000).
+     * @param buffer_size - Size of the buffer for internal operations like conversions and transformations (default: 10000).
+     */
+    constructor(limit_size: number = 1000, buffer_size: number = 10000) {
+        this._rete = new ds.Rete(limit_size, buffer_size);
+    }
+
+    /**
+     * Set the size of the buffer for storing final objects.
+     *
+     * @param limit_size - The new limit size for storing rules/facts.
+     */
+    set_limit_size(limit_size: number): void {
+        this._rete.set_limit_size(limit_size);
+    }
+
+    /**
+     * Set the buffer size for internal operations.
+     *
+     * @param buffer_size - The new buffer size.
+     */
+    set_buffer_size(buffer_size: number): void {
+        this._rete.set_buffer_size(buffer_size);
+    }
+
+    /**
+     * Reset the rete engine, clearing all rules, partial matches and facts.
+     */
+    reset(): void {
+        this._rete.reset();
+    }
+
+    /**
+     * Add a rule or fact to the knowledge base.
+     *
+     * The rule or fact is propagated by the next execute or iteration.
+     *
+     * @param text - The rule or fact as a string.
+     * @returns True if successfully added, false otherwise.
+     */
+    add(text: string): boolean {
+        return this._rete.add(text);
+    }
+
+    /**
+     * Add multiple rules or facts to the knowledge base in a single call.
+     *
+     * Rule objects are copied without being parsed again.
+     *
+     * @param items - The rules or facts as strings or Rule objects.
+     * @returns Whether each rule or fact was successfully added.
+     */
+    add_many(items: (string | Rule)[]): boolean[] {
+        return this._rete.add_many(items.map((item) => (item instanceof Rule ? item.value : item)));
+    }
+
+    /**
+     * Get the number of rules and facts waiting to be propagated.
+     *
+     * @returns The number of waiting rules and facts, including newly inferred facts.
+     */
+    pending(): number {
+        return this._rete.pending();
+    }
+
+    /**
+     * Propagate the waiting rules and facts with a callback for each inferred fact.
+     *
+     * Stopping early loses nothing, the remaining facts and work are kept for the next call.
+     *
+     * @param callback - Function called for each inferred fact. Return false to continue, true to stop.
+     * @returns The number of facts processed.
+     */
+    execute(callback: (candidate: Rule) => boolean): number {
+        return this._rete.execute((candidate: dst.Rule): boolean => {
+            return callback(new Rule(candidate).copy());
+        });
+    }
+
+    /**
+     * Iterate over inferred facts.
+     *
+     * @returns An iterator over Rule objects.
+     *
+     * @example
+     * ```typescript
+     * for (const fact of rete) {
+     *     console.log(fact.toString());
+     * }
+     * ```
+     */
+    *[Symbol.iterator](): Iterator<Rule> {
+        const iterator = this._rete.iter();
+        while (true) {
+            const candidate = iterator.next();
+            if (candidate === null) {
+                break;
+            }
+            yield new Rule(candidate);
+        }
+    }
+}
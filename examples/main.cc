@@ -1,5 +1,5 @@
 #include <chrono>
-#include <cstring>
+#include <cstdio>
 #include <functional>
 #include <iostream>
 
@@ -28,29 +28,9 @@ void run() {
 
     auto target = ds::text_to_rule("X", temp_data_size);
 
-    while (true) {
-        bool success = false;
-
-        auto callback = [&target, &success, &temp_text_size](ds::rule_t* candidate) {
-            if (candidate->data_size() != target->data_size()) {
-                return false;
-            }
-            auto data_size = candidate->data_size();
-            auto equal = memcmp(candidate->head(), target->head(), data_size) == 0;
-            if (equal) {
-                printf("Found!\n");
-                printf("%s", ds::rule_to_text(candidate, temp_text_size).get());
-                success = true;
-                return true;
-            }
-            return false;
-        };
-
-        search.execute(callback);
-        if (success) {
-            break;
-        }
-    }
+    auto result = search.find({target.get()});
+    printf("Found!\n");
+    printf("%s", ds::rule_to_text(result.get(), temp_text_size).get());
 }
 
 void timer(std::function<void()> func) {
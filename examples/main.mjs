@@ -22,24 +22,9 @@ function main() {
 
     const target = new Rule("X");
 
-    while (true) {
-        let success = false;
-
-        const callback = (candidate) => {
-            if (candidate.key() === target.key()) {
-                console.log("Found!");
-                console.log(candidate.toString());
-                success = true;
-                return true;
-            }
-            return false;
-        };
-
-        search.execute(callback);
-        if (success) {
-            break;
-        }
-    }
+    const result = search.find([target]);
+    console.log("Found!");
+    console.log(result.toString());
 }
 
 for (let i = 0; i < 10; i++) {
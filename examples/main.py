@@ -24,21 +24,9 @@ def main():
 
     target = apyds.Rule("X")
 
-    while True:
-        success = False
-
-        def callback(candidate: apyds.Rule) -> bool:
-            if candidate == target:
-                print("Found!")
-                print(candidate)
-                nonlocal success
-                success = True
-                return True
-            return False
-
-        search.execute(callback)
-        if success:
-            break
+    result = search.find([target])
+    print("Found!")
+    print(result)
 
 
 for i in range(10):
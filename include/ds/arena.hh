@@ -0,0 +1,54 @@
+#ifndef DS_ARENA_HH
+#define DS_ARENA_HH
+
+#include <cstddef>
+#include <memory>
+#include <vector>
+
+#include <ds/rule.hh>
+
+namespace ds {
+    /// @brief 连续存放rule的内存池。
+    ///
+    /// 内存以较大的块为单位申请，每次分配只需移动块内的指针，
+    /// 所有分配的内存在reset或析构时一起释放，不支持单独释放。
+    /// 超过块大小的分配会单独占用一个块。
+    ///
+    /// @note 分配出的内存只按照length_t对齐，这与rule内部各个term的对齐方式一致。
+    class arena_t {
+        /// @brief 已经申请的全部块。
+        std::vector<std::unique_ptr<std::byte[]>> blocks;
+        /// @brief 当前块中下一次分配的起始位置。
+        std::byte* top;
+        /// @brief 当前块的结束位置。
+        std::byte* end;
+        /// @brief 已经分配出去的字节数。
+        std::size_t used;
+
+      public:
+        /// @brief 每个块的默认大小。
+        static constexpr std::size_t block_size = 64 * 1024;
+
+        /// @brief 构造一个空的内存池。
+        arena_t();
+
+        /// @brief 释放全部块，之前分配的内存全部失效。
+        void reset();
+
+        /// @brief 分配一段内存。
+        /// @param size 需要的字节数。
+        /// @return 分配出的内存的起始位置。
+        std::byte* allocate(std::size_t size);
+
+        /// @brief 将rule复制到内存池中。
+        /// @param rule 待复制的rule，可以是临时的buffer。
+        /// @return 内存池中的副本，大小恰为rule的数据长度。
+        rule_t* copy(rule_t* rule);
+
+        /// @brief 获取已经分配出去的字节数。
+        /// @return 已经分配出去的字节数，不包括对齐产生的空隙。
+        std::size_t size();
+    };
+} // namespace ds
+
+#endif
@@ -2,32 +2,34 @@
 #define DS_CHAIN_HH
 
 #include <functional>
-#include <map>
 #include <memory>
+#include <optional>
+#include <string>
 #include <string_view>
+#include <unordered_map>
+#include <vector>
 
+#include <ds/arena.hh>
 #include <ds/generator.hh>
+#include <ds/index.hh>
 #include <ds/rule.hh>
+#include <ds/set.hh>
+#include <ds/stats.hh>
 
 namespace ds {
     /// @brief 用于进行链式推理搜索的类。
     /// @note 与 search_t 不同，chain_t 在单轮中会将 rule 的所有 premises 全部匹配完成。
     class chain_t {
-        /// @brief 用于比较rule_t的智能指针大小的类型，用于将其存储在map中。
-        /// @note 该类型比较的是rule_t对象的大小，而不是指针地址。
-        struct less_t {
-            /// @brief 判断两个rule_t的智能指针的大小关系。
-            /// @param lhs 第一个rule_t的智能指针。
-            /// @param rhs 第二个rule_t的智能指针。
-            /// @return 如果第一个rule_t的智能指针小于第二个，则返回true；否则返回false。
-            /// @note 该比较函数比较的是rule_t对象的大小，而不是指针地址。
-            bool operator()(const std::unique_ptr<rule_t>& lhs, const std::unique_ptr<rule_t>& rhs) const;
-        };
-
         /// @brief 每个有效rule_t的最大长度。
         length_t limit_size;
         /// @brief 在搜索过程中使用的缓冲区最大长度。
         length_t buffer_size;
+        /// @brief 是否丢弃被已有facts包含的新facts。
+        bool forward_subsumption;
+        /// @brief 是否在产生新fact时移除被它包含的已有facts。
+        bool backward_subsumption;
+        /// @brief 是否按照选择性决定premises的匹配顺序。
+        bool join_ordering;
 
         /// @brief 已经完成的cycle，表示在此之前的所有rules都已经被处理过。
         /// @note 如果高于last_fact_cycle，则说明所有的facts都已经被处理过。
@@ -37,13 +39,29 @@ namespace ds {
         length_t current_cycle;
         /// @brief facts库的最后更新时间，用于避免重复计算。
         length_t last_fact_cycle;
-        /// @brief 用于存储规则的map，键为rule_t的智能指针，值为其对应的cycle。
-        std::map<std::unique_ptr<rule_t>, length_t, less_t> rules;
-        /// @brief 用于存储事实的map，键为rule_t的智能指针，值为其对应的cycle。
-        std::map<std::unique_ptr<rule_t>, length_t, less_t> facts;
+        /// @brief 持有全部rules和facts的内存。
+        arena_t storage;
+        /// @brief 包含全部rules和facts的集合，用于去重。
+        /// @note 本轮新产生的facts会立即加入此集合，但要在本轮结束时才会加入索引。
+        set_t known;
+        /// @brief 以第一个premise为键的rules索引，按照cycle排列。
+        index_t rule_index;
+        /// @brief 以conclusion为键的facts索引，用于筛选可能与rule的第一个premise匹配的fact。
+        index_t fact_index;
 
         /// @brief 用于存储搜索过程中使用的缓冲区。
         std::unique_ptr<rule_t> buffer;
+        /// @brief 用于解析通过add添加的文本的缓冲区，长度为limit_size，与buffer分开以便在迭代的过程中添加。
+        std::unique_ptr<rule_t> parse_buffer;
+
+        /// @brief 是否保存每轮的统计数据。
+        bool statistics;
+        /// @brief 开启统计后每轮的统计数据。
+        std::vector<stats_t> history;
+        /// @brief 是否对每个rule进行性能分析。
+        bool profiling;
+        /// @brief 开启性能分析后每个rule的统计数据，其中的rule字段不使用。
+        std::unordered_map<rule_t*, profile_t> profiles;
       public:
         /// @brief 构造函数，用于初始化搜索对象
         /// @param _limit_size 每个有效rule_t的最大长度。
@@ -58,6 +76,33 @@ namespace ds {
         /// @param _buffer_size 在搜索过程中使用的缓冲区最大长度。
         void set_buffer_size(length_t _buffer_size);
 
+        /// @brief 设置是否对新产生的facts进行subsumption检查。
+        /// @param forward 如果为true，则丢弃是已有fact的实例的新fact，即已有fact中的variable经过替换后可以得到新fact。
+        /// @param backward 如果为true，则在产生新fact时移除所有是它的实例的已有facts，被移除的facts在本轮结束时离开索引。
+        /// @note 只对搜索中产生的facts进行检查，通过add添加的rules和facts不受影响。
+        void set_subsumption(bool forward, bool backward);
+
+        /// @brief 设置是否按照选择性决定premises的匹配顺序。
+        /// @param _join_ordering 如果为true，则每次优先匹配索引中可能匹配的facts最少的premise，否则按照premises的顺序依次匹配。
+        /// @note 最终产生的facts不变，但中间rules中剩余的premises不同，因此产生的中间rules也不同。
+        void set_join_ordering(bool _join_ordering);
+
+        /// @brief 设置是否保存每轮搜索的统计数据。
+        /// @param _statistics 如果为true，则在每轮结束时保存这一轮的统计数据，关闭时清空已有的数据。
+        /// @note 开启后每次match失败时会在更大的缓冲区中再试一次，以统计buffer_size不足的情况。
+        void set_statistics(bool _statistics);
+
+        /// @brief 获取开启统计后每轮搜索的统计数据。
+        /// @return 按照轮次排列的统计数据，在下一轮结束前有效。
+        const std::vector<stats_t>& stats();
+        /// @brief 设置是否对每个rule进行性能分析。
+        /// @param _profiling 如果为true，则记录以每个rule进行match的次数、结果和花费的时间，关闭时清空已有的数据。
+        /// @note 开启后每次match都需要查找rule对应的记录并计时，关闭时没有额外开销。
+        void set_profiling(bool _profiling);
+        /// @brief 获取开启性能分析后每个rule的统计数据。
+        /// @return 索引中全部rules的统计数据，按照加入索引的顺序排列，从未进行过match的rule各项均为0。
+        std::vector<profile_t> profile();
+
         /// @brief 重置搜索过程中的所有状态。
         void reset();
 
@@ -66,6 +111,34 @@ namespace ds {
         /// @return 如果添加成功则返回true，否则返回false。
         bool add(std::string_view text);
 
+        /// @brief 向本搜索对象添加一个二进制形式的rule或fact。
+        /// @param rule 二进制形式的rule或fact，会被复制，调用者无需保证其生命周期。
+        /// @return 如果添加成功则返回true，否则返回false。
+        bool add(rule_t* rule);
+
+        /// @brief 向本搜索对象依次添加多个rules或facts。
+        /// @param texts 描述rules或facts的文本。
+        /// @return 每个rule或fact是否添加成功。
+        /// @note 与逐个调用add相同，但所有文本都在同一个缓冲区中解析。
+        std::vector<bool> add_many(const std::vector<std::string>& texts);
+
+        /// @brief 从文本文件中依次添加全部rules和facts。
+        /// @param path 文件路径，文件中的rules和facts之间以空行分隔。
+        /// @return 每个rule或fact是否添加成功，如果无法读取文件则返回std::nullopt。
+        std::optional<std::vector<bool>> add_file(std::string_view path);
+
+        /// @brief 将全部rules和facts以及搜索的进度保存到二进制文件中。
+        /// @param path 文件路径。
+        /// @return 如果保存成功则返回true，否则返回false。
+        /// @note 只保存仍在索引中的内容，各项设置不会被保存。
+        bool save(std::string_view path);
+
+        /// @brief 从save生成的文件中读取全部rules和facts以及搜索的进度，替换当前的全部内容。
+        /// @param path 文件路径。
+        /// @return 如果读取成功则返回true，否则返回false，此时本对象被清空。
+        /// @note 文件的内容被一次性读入storage，rules和facts直接使用这块内存，不需要逐个解析。
+        bool load(std::string_view path);
+
         /// @brief 执行一轮搜索操作，遍历所有规则和事实，并对每个匹配的规则执行回调函数。
         /// @param callback 回调函数，每个新中找到的结果都会调用此函数。
         /// @return 搜索到新的结果的数量。
@@ -74,6 +147,7 @@ namespace ds {
 
         /// @brief 执行一轮搜索操作，以生成器方式迭代所有匹配的规则。
         /// @return 生成器，每次迭代返回一个匹配的规则指针。
+        /// @note 采用semi-naive的方式，只枚举至少用到一个新rule或新fact的组合，上一轮已经处理过的组合不会再次匹配。
         generator<rule_t*> iterator();
     };
 } // namespace ds
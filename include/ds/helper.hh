@@ -2,6 +2,7 @@
 #define DS_HELPER_HH
 
 #include <cstddef>
+#include <cstring>
 
 #include <ds/config.hh>
 
@@ -25,6 +26,21 @@ namespace ds {
         }
         return false;
     }
+
+    /// @brief 判断两个scope是否相同。
+    /// @param scope_1 第一个scope。
+    /// @param scope_2 第二个scope。
+    /// @return 如果两个scope相同则返回true，否则返回false。
+    /// @note scope大多来自同一个字符串常量或者同一个字典，因此先比较指针，再比较首字符，最后才比较整个字符串。
+    inline bool scope_equal(const char* scope_1, const char* scope_2) {
+        if (scope_1 == scope_2) {
+            return true;
+        }
+        if (*scope_1 != *scope_2) {
+            return false;
+        }
+        return strcmp(scope_1, scope_2) == 0;
+    }
 } // namespace ds
 
 #endif
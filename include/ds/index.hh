@@ -0,0 +1,108 @@
+#ifndef DS_INDEX_HH
+#define DS_INDEX_HH
+
+#include <cstddef>
+#include <functional>
+#include <limits>
+#include <unordered_map>
+#include <vector>
+
+#include <ds/rule.hh>
+#include <ds/term.hh>
+
+namespace ds {
+    /// @brief 用于快速筛选可能相互匹配的rule的term索引。
+    ///
+    /// 每个条目以某个term作为键插入，例如fact的conclusion或者rule的第一个premise。
+    /// 索引按照键的顶层符号分桶，顶层符号是item的名字或者list的长度；
+    /// 对于list，还会记录其每个子term的符号作为签名。
+    /// 查询时只返回顶层符号相同且签名相容的条目，以及键本身为variable的条目。
+    ///
+    /// @note variable被视为可以匹配任意符号的通配符，因此查询结果是可能匹配的条目的超集，仍然需要进行真正的match。
+    /// @note 索引不拥有rule的内存，使用者需要保证rule在索引中的生命周期。
+    /// @note 条目的cycle需要按照插入顺序单调不减，按cycle的筛选依赖于这一点。
+    class index_t {
+      public:
+        /// @brief 索引中的条目。
+        struct entry_t {
+            /// @brief 条目对应的rule。
+            rule_t* rule;
+            /// @brief 条目对应的cycle。
+            length_t cycle;
+        };
+
+      private:
+        /// @brief 具有相同顶层符号的条目构成的桶。
+        struct bucket_t {
+            /// @brief 键的子term数目，item为0。
+            length_t arity;
+            /// @brief 按照插入顺序存放的条目。
+            std::vector<entry_t> entries;
+            /// @brief 每个条目的签名，依次存放，每个签名的长度为arity。
+            std::vector<std::size_t> signatures;
+            /// @brief 第一个子term的每种符号对应的条目数目，用于估计选择性。
+            std::unordered_map<std::size_t, std::size_t> heads;
+        };
+
+        /// @brief 顶层符号到桶的映射。
+        std::unordered_map<std::size_t, bucket_t> buckets;
+        /// @brief 键为variable的条目，可以与任何term匹配。
+        std::vector<entry_t> variables;
+        /// @brief 按照插入顺序存放的全部条目，用于查询键为variable的情况。
+        std::vector<entry_t> entries;
+
+      public:
+        /// @brief 获取term的符号。
+        /// @param term 待计算符号的term。
+        /// @return term的符号，variable的符号为0，表示通配符。
+        static std::size_t symbol(term_t* term);
+
+        /// @brief 清空索引。
+        void clear();
+
+        /// @brief 向索引中插入一个条目。
+        /// @param key 条目的键。
+        /// @param rule 条目对应的rule。
+        /// @param cycle 条目对应的cycle。
+        void insert(term_t* key, rule_t* rule, length_t cycle);
+
+        /// @brief 删除所有满足条件的条目，其余条目保持原有顺序。
+        /// @param predicate 判断条目对应的rule是否需要删除的函数。
+        /// @note 需要遍历整个索引，适合攒够一批后一起删除。
+        void erase_if(const std::function<bool(rule_t*)>& predicate);
+
+        /// @brief 查询所有可能与给定term匹配的条目。
+        /// @param term 待查询的term。
+        /// @param result 用于存放结果的vector，查询结果会被追加在其末尾。
+        /// @param max_cycle 只返回cycle不超过此值的条目。
+        /// @param after_cycle 只返回cycle大于此值的条目。
+        void candidates(
+            term_t* term,
+            std::vector<entry_t>& result,
+            length_t max_cycle = std::numeric_limits<length_t>::max(),
+            length_t after_cycle = std::numeric_limits<length_t>::min()
+        );
+
+        /// @brief 估计可能与给定term匹配的条目的数目。
+        /// @param term 待查询的term。
+        /// @return 顶层符号和第一个子term的符号都相容的条目与键为variable的条目的总数，是candidates结果数目的上界。
+        /// @note 不比较完整的签名，只需要常数时间，用于在多个term之间比较选择性。
+        std::size_t estimate(term_t* term);
+
+        /// @brief 获取所有cycle大于给定值的条目。
+        /// @param cycle 给定的cycle。
+        /// @param result 用于存放结果的vector，结果会按照插入顺序被追加在其末尾。
+        void recent(length_t cycle, std::vector<entry_t>& result);
+
+        /// @brief 获取索引中的全部条目。
+        /// @return 按照插入顺序排列的全部条目。
+        /// @note 返回的引用在下一次修改索引前有效。
+        const std::vector<entry_t>& all();
+
+        /// @brief 获取索引中条目的数目。
+        /// @return 索引中条目的数目。
+        std::size_t size();
+    };
+} // namespace ds
+
+#endif
@@ -0,0 +1,76 @@
+#ifndef DS_POOL_HH
+#define DS_POOL_HH
+
+#include <condition_variable>
+#include <cstddef>
+#include <functional>
+#include <mutex>
+#include <thread>
+#include <vector>
+
+namespace ds {
+    /// @brief 常驻的线程池，每次将同一个任务分给若干个线程并等待它们全部完成。
+    ///
+    /// 调用run的线程自己作为第0个线程参与执行，因此大小为n的线程池只创建n-1个线程。
+    /// 线程在resize时创建，在下一次resize或析构时退出，两次run之间处于等待状态。
+    ///
+    /// @note 同一时刻只能有一个线程调用run。
+    class pool_t {
+      public:
+        /// @brief 在每个线程中执行的任务，参数为线程的编号。
+        using job_t = std::function<void(std::size_t)>;
+
+      private:
+        /// @brief 除调用者之外的线程，编号依次为1到size()-1。
+        std::vector<std::thread> workers;
+        /// @brief 保护以下状态的锁。
+        std::mutex mutex;
+        /// @brief 通知线程开始任务或者退出。
+        std::condition_variable start;
+        /// @brief 通知调用者所有线程都已完成。
+        std::condition_variable done;
+        /// @brief 当前的任务，只在run期间有效。
+        const job_t* job;
+        /// @brief 当前任务使用的线程数目，编号不小于它的线程跳过这次任务。
+        std::size_t active;
+        /// @brief 尚未完成当前任务的线程数目，不包括调用者。
+        std::size_t pending;
+        /// @brief 每次run时增加，线程据此判断是否有新的任务。
+        std::size_t generation;
+        /// @brief 是否需要退出。
+        bool stopping;
+
+        /// @brief 编号为index的线程的主循环。
+        /// @param index 线程的编号。
+        /// @param seen 线程创建时的generation，只有之后的任务才需要执行。
+        void serve(std::size_t index, std::size_t seen);
+
+        /// @brief 让全部线程退出并等待它们结束。
+        void stop();
+
+      public:
+        /// @brief 构造一个只有调用者自己的线程池。
+        pool_t();
+
+        /// @brief 让全部线程退出并等待它们结束。
+        ~pool_t();
+
+        pool_t(const pool_t&) = delete;
+        pool_t& operator=(const pool_t&) = delete;
+
+        /// @brief 设置线程池的大小。
+        /// @param size 包括调用者在内的线程数目，小于等于1时不创建线程。
+        void resize(std::size_t size);
+
+        /// @brief 获取线程池的大小。
+        /// @return 包括调用者在内的线程数目。
+        std::size_t size();
+
+        /// @brief 在前count个线程中执行任务，并等待全部完成。
+        /// @param count 使用的线程数目，超出线程池大小的部分被忽略。
+        /// @param _job 任务，编号为0的部分在调用者的线程中执行。
+        void run(std::size_t count, const job_t& _job);
+    };
+} // namespace ds
+
+#endif
@@ -0,0 +1,85 @@
+#ifndef DS_PROVE_HH
+#define DS_PROVE_HH
+
+#include <functional>
+#include <memory>
+#include <string_view>
+
+#include <ds/arena.hh>
+#include <ds/generator.hh>
+#include <ds/index.hh>
+#include <ds/rule.hh>
+#include <ds/set.hh>
+
+namespace ds {
+    /// @brief 用于从目标出发进行反向推理的类。
+    ///
+    /// 与search_t和chain_t从全部rules和facts出发正向推理不同，prove_t从目标出发，
+    /// 只使用conclusion可能与目标匹配的rules，并将它们的premises作为新的子目标。
+    /// 每个子目标对应一张表，记录已经找到的答案和等待这些答案的部分rules，
+    /// 同一个子目标只会被展开一次，因此递归的rules不会导致无限循环。
+    ///
+    /// @note 只相差变量名的子目标共享同一张表，因此左递归的rules同样能够终止。
+    /// @note 表只在一次查询内有效，每次查询都从头开始。
+    class prove_t {
+        /// @brief 每个有效rule_t的最大长度，超过此长度的子目标、中间结果和答案都会被丢弃。
+        length_t limit_size;
+        /// @brief 在推理过程中使用的缓冲区最大长度。
+        length_t buffer_size;
+
+        /// @brief 持有全部rules和facts的内存。
+        arena_t storage;
+        /// @brief 包含全部rules和facts的集合，用于去重。
+        set_t known;
+        /// @brief 以conclusion为键的rules索引，存放的是将conclusion复制一份作为第一个premise的rules，以便直接与子目标match。
+        index_t rule_index;
+        /// @brief 以conclusion为键的facts索引。
+        index_t fact_index;
+
+        /// @brief 用于存储推理过程中使用的缓冲区。
+        std::unique_ptr<rule_t> buffer;
+
+        /// @brief 证明一个已经解析好的目标。
+        /// @param goal 目标，如果为nullptr或者不是fact，则不会产生任何答案。
+        /// @return 生成器，每次迭代返回一个答案。
+        /// @note 目标在调用iterator时就被解析，生成器持有解析的结果，因此调用者无需保证目标文本的生命周期。
+        generator<rule_t*> solve(std::unique_ptr<rule_t> goal);
+
+      public:
+        /// @brief 构造函数，用于初始化推理对象。
+        /// @param _limit_size 每个有效rule_t的最大长度。
+        /// @param _buffer_size 在推理过程中使用的缓冲区最大长度。
+        prove_t(length_t _limit_size, length_t _buffer_size);
+
+        /// @brief 设置每个有效rule_t的最大长度。
+        /// @param _limit_size 每个有效rule_t的最大长度。
+        void set_limit_size(length_t _limit_size);
+
+        /// @brief 设置在推理过程中使用的缓冲区最大长度。
+        /// @param _buffer_size 在推理过程中使用的缓冲区最大长度。
+        void set_buffer_size(length_t _buffer_size);
+
+        /// @brief 清空所有的rules和facts。
+        void reset();
+
+        /// @brief 向本推理对象添加一个rule或fact。
+        /// @param text 描述rule或fact的文本。
+        /// @return 如果添加成功则返回true，否则返回false。
+        bool add(std::string_view text);
+
+        /// @brief 证明一个目标，并对每个找到的答案执行回调函数。
+        /// @param goal 描述目标的文本，需要是一个fact。
+        /// @param callback 回调函数，每个找到的答案都会调用此函数。
+        /// @return 找到的答案的数量。
+        /// @note 如果回调函数返回false，则继续推理；如果回调函数返回true，则停止推理。
+        length_t execute(std::string_view goal, const std::function<bool(rule_t*)>& callback);
+
+        /// @brief 证明一个目标，以生成器方式迭代所有找到的答案。
+        /// @param goal 描述目标的文本，需要是一个fact。
+        /// @return 生成器，每次迭代返回一个答案，答案是目标的实例，每个答案只返回一次。
+        /// @note 如果目标无法解析或者不是fact，则不会产生任何答案。
+        generator<rule_t*> iterator(std::string_view goal);
+    };
+} // namespace ds
+
+#endif
@@ -0,0 +1,112 @@
+#ifndef DS_RETE_HH
+#define DS_RETE_HH
+
+#include <deque>
+#include <functional>
+#include <memory>
+#include <string>
+#include <string_view>
+#include <vector>
+
+#include <ds/arena.hh>
+#include <ds/generator.hh>
+#include <ds/index.hh>
+#include <ds/rule.hh>
+#include <ds/set.hh>
+
+namespace ds {
+    /// @brief 用于进行增量推理的类，按照Rete网络的方式保存部分匹配的结果。
+    ///
+    /// 与search_t和chain_t每一轮都重新计算部分匹配不同，rete_t将每个rule及其匹配了若干premises后得到的中间rules
+    /// 作为token保存下来，以它们的第一个premise为键建立索引，相当于beta memory；
+    /// facts以conclusion为键建立索引，相当于alpha memory。
+    /// 新的fact只与可能匹配它的tokens进行match，新的token只与可能匹配它的facts进行match，
+    /// 因此每个新的fact只经过受它影响的部分，推出的facts会立即产出，而不需要等到一轮结束。
+    ///
+    /// @note 相同的中间rule只会被保存一次，来自不同rules的相同部分匹配共享同一个token。
+    /// @note 只产出facts，中间rules作为内部状态保存，不会被产出。
+    class rete_t {
+        /// @brief 每个有效rule_t的最大长度，超过此长度的中间rules和facts都会被丢弃。
+        length_t limit_size;
+        /// @brief 在推理过程中使用的缓冲区最大长度。
+        length_t buffer_size;
+
+        /// @brief 持有全部rules、中间rules和facts的内存。
+        arena_t storage;
+        /// @brief 包含全部rules、中间rules和facts的集合，用于去重。
+        set_t known;
+        /// @brief 以第一个premise为键的tokens索引，包括添加的rules和推理中产生的中间rules。
+        index_t token_index;
+        /// @brief 以conclusion为键的facts索引，只包含已经传播过的facts。
+        index_t fact_index;
+        /// @brief 等待传播的rules和facts，按照加入的顺序排列。
+        std::deque<rule_t*> agenda;
+        /// @brief 已经推出但还没有产出的facts。
+        std::deque<rule_t*> ready;
+
+        /// @brief 用于存储推理过程中使用的缓冲区。
+        std::unique_ptr<rule_t> buffer;
+        /// @brief 用于解析通过add添加的文本的缓冲区，长度为limit_size，与buffer分开以便在迭代的过程中添加。
+        std::unique_ptr<rule_t> parse_buffer;
+
+        /// @brief 将一个token与一个fact进行match，并传播得到的结果。
+        /// @param token 已经保存的token。
+        /// @param fact 已经传播过的fact。
+        /// @note 得到新的中间rule时会立即与已经传播过的facts进行match，得到新的fact时将它加入agenda和ready。
+        void join(rule_t* token, rule_t* fact);
+
+        /// @brief 传播agenda中的一个rule或fact。
+        /// @param rule 待传播的rule或fact。
+        void activate(rule_t* rule);
+
+      public:
+        /// @brief 构造函数，用于初始化推理对象。
+        /// @param _limit_size 每个有效rule_t的最大长度。
+        /// @param _buffer_size 在推理过程中使用的缓冲区最大长度。
+        rete_t(length_t _limit_size, length_t _buffer_size);
+
+        /// @brief 设置每个有效rule_t的最大长度。
+        /// @param _limit_size 每个有效rule_t的最大长度。
+        void set_limit_size(length_t _limit_size);
+
+        /// @brief 设置在推理过程中使用的缓冲区最大长度。
+        /// @param _buffer_size 在推理过程中使用的缓冲区最大长度。
+        void set_buffer_size(length_t _buffer_size);
+
+        /// @brief 清空所有的rules、中间rules和facts。
+        void reset();
+
+        /// @brief 向本推理对象添加一个rule或fact。
+        /// @param text 描述rule或fact的文本。
+        /// @return 如果添加成功则返回true，否则返回false。
+        /// @note 添加的rule或fact在下一次迭代时才会被传播。
+        bool add(std::string_view text);
+
+        /// @brief 向本推理对象添加一个二进制形式的rule或fact。
+        /// @param rule 二进制形式的rule或fact，会被复制，调用者无需保证其生命周期。
+        /// @return 如果添加成功则返回true，否则返回false。
+        bool add(rule_t* rule);
+
+        /// @brief 向本推理对象依次添加多个rules或facts。
+        /// @param texts 描述rules或facts的文本。
+        /// @return 每个rule或fact是否添加成功。
+        std::vector<bool> add_many(const std::vector<std::string>& texts);
+
+        /// @brief 获取等待传播的rules和facts的数目。
+        /// @return 等待传播的rules和facts的数目，包括推理中产生的新facts。
+        std::size_t pending();
+
+        /// @brief 传播全部等待的rules和facts，并对每个推出的fact执行回调函数。
+        /// @param callback 回调函数，每个新推出的fact都会调用此函数。
+        /// @return 产出的facts的数量。
+        /// @note 如果回调函数返回false，则继续推理；如果回调函数返回true，则停止推理，剩余的工作保留到下一次调用。
+        length_t execute(const std::function<bool(rule_t*)>& callback);
+
+        /// @brief 传播全部等待的rules和facts，以生成器方式迭代所有推出的facts。
+        /// @return 生成器，每次迭代返回一个新推出的fact，每个rule或fact传播完毕后立即返回它推出的facts。
+        /// @note 提前停止迭代不会丢失任何结果，剩余的facts和工作保留到下一次迭代。
+        generator<rule_t*> iterator();
+    };
+} // namespace ds
+
+#endif
@@ -116,12 +116,26 @@ namespace ds {
         /// @return 自身，如果匹配失败则返回nullptr，如果尾指针检查失败则返回nullptr，在尾指针检查正常时，匹配失败会将本对象设置为null。
         rule_t* match(rule_t* rule_1, rule_t* rule_2, std::byte* check_tail = nullptr);
 
+        /// @brief 将rule的某个premise移动到最前面，其余terms保持原有顺序，结果更新至本对象。
+        /// @param rule 待被调整顺序的rule。
+        /// @param index 需要移动的premise的指标。
+        /// @param check_tail 可选的尾指针检查。
+        /// @return 自身，是一个rule_t对象的指针，如果index溢出或者尾指针检查失败则返回nullptr。
+        /// @note 本对象不能与rule重叠。
+        rule_t* promote(rule_t* rule, length_t index, std::byte* check_tail = nullptr);
+
         /// @brief 将rule中的所有variable添加prefix和suffix, 结果更新至本对象。
         /// @param rule 待被重命名的rule。
         /// @param prefix_and_suffix 只有一个conclusion的rule，conclusion是含有两个list的list，每个内部list包含0或1个item，分别表示prefix和suffix。
         /// @param check_tail 可选的尾指针检查。
         /// @return 自身，是一个rule_t对象的指针，如果尾指针检查失败则返回nullptr。
         rule_t* rename(rule_t* rule, rule_t* prefix_and_suffix, std::byte* check_tail = nullptr);
+
+        /// @brief 判断本对象是否比给定的rule更一般，即本对象中的variable经过某个替换后与给定的rule完全相同。
+        /// @param instance 待判断的rule，其中的variable被视为常量。
+        /// @return 如果存在这样的替换则返回true，否则返回false。
+        /// @note 所有premises和conclusion共享同一个替换，且要求premises的数目和顺序都相同。
+        bool subsume(rule_t* instance);
     };
 } // namespace ds
 
@@ -1,44 +1,247 @@
 #ifndef DS_SEARCH_HH
 #define DS_SEARCH_HH
 
+#include <chrono>
+#include <cstdint>
 #include <functional>
-#include <map>
 #include <memory>
+#include <optional>
+#include <string>
 #include <string_view>
+#include <unordered_map>
+#include <unordered_set>
+#include <vector>
 
+#include <ds/arena.hh>
 #include <ds/generator.hh>
+#include <ds/index.hh>
+#include <ds/pool.hh>
 #include <ds/rule.hh>
+#include <ds/set.hh>
+#include <ds/stats.hh>
 
 namespace ds {
     /// @brief 用于进行推理搜索的类。
+    /// @note 同一个对象不能同时在多个线程中使用，包括在迭代的过程中从其他线程调用add等函数，需要时由调用者加锁。
     class search_t {
-        /// @brief 用于比较rule_t的智能指针大小的类型，用于将其存储在map中。
-        /// @note 该类型比较的是rule_t对象的大小，而不是指针地址。
-        struct less_t {
-            /// @brief 判断两个rule_t的智能指针的大小关系。
-            /// @param lhs 第一个rule_t的智能指针。
-            /// @param rhs 第二个rule_t的智能指针。
-            /// @return 如果第一个rule_t的智能指针小于第二个，则返回true；否则返回false。
-            /// @note 该比较函数比较的是rule_t对象的大小，而不是指针地址。
-            bool operator()(const std::unique_ptr<rule_t>& lhs, const std::unique_ptr<rule_t>& rhs) const;
+      public:
+        /// @brief 优先模式中计算代价的函数，参数为rule和它的推导深度，代价越小越先被处理。
+        using priority_t = std::function<double(rule_t*, length_t)>;
+
+        /// @brief 超出容量时选择被淘汰的facts的策略。
+        enum class eviction_t : min_uint_t {
+            /// @brief 先淘汰数据长度最大的facts。
+            largest,
+            /// @brief 先淘汰cycle最早的facts。
+            oldest,
+            /// @brief 先淘汰参与成功match次数最少的facts。
+            least_used,
+        };
+
+        /// @brief 报告被淘汰的fact的函数，参数在函数返回后失效。
+        using evicted_t = std::function<void(rule_t*)>;
+
+        /// @brief 推导过程中的一步。
+        struct step_t {
+            /// @brief 这一步得到的rule或fact，在下一轮搜索结束前有效。
+            rule_t* rule;
+            /// @brief 产生它的rule在推导过程中的位置，通过add添加或者来源已被遗忘时为空。
+            std::optional<std::size_t> parent_rule;
+            /// @brief 产生它的fact在推导过程中的位置，通过add添加或者来源已被遗忘时为空。
+            std::optional<std::size_t> parent_fact;
+            /// @brief 它加入索引时的cycle。
+            length_t cycle;
+        };
+        /// @brief execute或saturate的预算，各项为0时不限制，任何一项用完时提前结束。
+        struct budget_t {
+            /// @brief 最多花费的时间，单位为秒，包括回调函数中花费的时间。
+            double timeout;
+            /// @brief 最多产生的结果数目。
+            std::size_t max_results;
+            /// @brief 最多进行match的rule和fact的组合数目。
+            std::size_t max_pairs;
+        };
+
+      private:
+        /// @brief 优先模式中等待被激活的rule或fact。
+        struct pending_t {
+            /// @brief 代价。
+            double cost;
+            /// @brief 加入的顺序，用于在代价相同时保持先来先处理。
+            std::size_t order;
+            /// @brief 等待被激活的rule或fact。
+            rule_t* rule;
+            /// @brief 推导深度，通过add添加的为0。
+            length_t depth;
+        };
+        /// @brief 被提前结束的一轮中下一个需要处理的组合的位置。
+        struct resume_t {
+            /// @brief 是否有被提前结束的一轮。
+            bool active;
+            /// @brief 被提前结束的一轮开始时的current_cycle，这一轮只处理cycle不超过它的rules和facts。
+            length_t limit;
+            /// @brief 任务的编号，新rules在前，新facts在后，与iterator中的顺序一致。
+            std::size_t task;
+            /// @brief 该任务的候选中已经处理过的数目。
+            std::size_t offset;
         };
 
         /// @brief 每个有效rule_t的最大长度。
         length_t limit_size;
         /// @brief 在搜索过程中使用的缓冲区最大长度。
         length_t buffer_size;
+        /// @brief 每轮搜索中用于match的线程数目，为1时不创建额外的线程。
+        length_t threads;
+        /// @brief 是否丢弃被已有facts包含的新facts。
+        bool forward_subsumption;
+        /// @brief 是否在产生新fact时移除被它包含的已有facts。
+        bool backward_subsumption;
+        /// @brief 分片的总数，为1时不分片。
+        length_t shards;
+        /// @brief 本对象负责的分片编号。
+        length_t shard;
+
+        /// @brief facts数目的上限，为0时不限制。
+        std::size_t max_facts;
+        /// @brief storage字节数的上限，为0时不限制。
+        std::size_t max_bytes;
+        /// @brief 超出容量时选择被淘汰的facts的策略。
+        eviction_t eviction;
+        /// @brief 报告被淘汰的fact的函数，可以为空。
+        evicted_t evicted;
+        /// @brief 每个fact参与成功match的次数，只在按照least_used淘汰时记录。
+        std::unordered_map<rule_t*, std::size_t> uses;
+
+        /// @brief 一个rule或fact的来源，只在开启来源记录时使用。
+        struct origin_t {
+            /// @brief 对应的rule或fact，被淘汰后为nullptr。
+            rule_t* rule;
+            /// @brief 产生它的rule的编号，没有时为no_origin。
+            std::uint32_t parent_rule;
+            /// @brief 产生它的fact的编号，没有时为no_origin。
+            std::uint32_t parent_fact;
+            /// @brief 它加入索引时的cycle。
+            length_t cycle;
+        };
 
+        /// @brief 表示没有来源的编号。
+        static constexpr std::uint32_t no_origin = UINT32_MAX;
+
+        /// @brief 是否记录每个rule和fact的来源。
+        bool provenance;
+        /// @brief 按照加入的顺序记录的全部来源，下标即为编号。
+        std::vector<origin_t> origins;
+        /// @brief 每个rule和fact对应的编号。
+        std::unordered_map<rule_t*, std::uint32_t> ids;
+        /// @brief 每个rule和fact在origins之外的其他来源，即之后又推出它的rule和fact的编号，用于remove。
+        std::unordered_map<std::uint32_t, std::vector<std::pair<std::uint32_t, std::uint32_t>>> alternatives;
+
+        /// @brief 是否保存每轮的统计数据。
+        bool statistics;
+        /// @brief 开启统计后每轮的统计数据。
+        std::vector<stats_t> history;
+        /// @brief 是否对每个rule进行性能分析。
+        bool profiling;
+        /// @brief 开启性能分析后每个rule的统计数据，其中的rule字段不使用。
+        std::unordered_map<rule_t*, profile_t> profiles;
+
+        /// @brief 当前的execute或saturate的预算，在其返回后恢复为不限制。
+        budget_t budget;
+        /// @brief 根据预算中的timeout计算出的截止时刻。
+        std::chrono::steady_clock::time_point deadline;
+        /// @brief 当前预算下已经进行match的组合数目。
+        std::size_t budget_pairs;
+        /// @brief 当前或上一次execute或saturate是否用完了预算。
+        bool budget_exhausted;
         /// @brief 已经完成的cycle，表示在此与此之前的所有rules和facts都已经被处理过。
         length_t done_cycle;
+        /// @brief 被提前结束的一轮的位置，下一次iterator从这里继续，之后再开始新的一轮。
+        resume_t resume;
+        /// @brief 被backward subsumption移除但仍然留在索引中的facts。
+        /// @note 一轮被提前结束时推迟从索引中删除，以免改变继续处理时候选的顺序，在这一轮完成时再一起删除。
+        std::unordered_set<rule_t*> retired;
         /// @brief rules库和facts库中最大的cycle，此变量在更新rules和facts前设置。
         length_t current_cycle;
-        /// @brief 用于存储规则的map，键为rule_t的智能指针，值为其对应的cycle。
-        std::map<std::unique_ptr<rule_t>, length_t, less_t> rules;
-        /// @brief 用于存储事实的map，键为rule_t的智能指针，值为其对应的cycle。
-        std::map<std::unique_ptr<rule_t>, length_t, less_t> facts;
+        /// @brief 持有全部rules和facts的内存。
+        arena_t storage;
+        /// @brief 包含全部rules和facts的集合，用于去重。
+        /// @note 本轮新产生的结果会立即加入此集合，但要在本轮结束时才会加入索引。
+        set_t known;
+        /// @brief 以第一个premise为键的rules索引，按照cycle排列，同时用于区分新旧rules。
+        index_t rule_index;
+        /// @brief 以conclusion为键的facts索引，按照cycle排列，同时用于区分新旧facts。
+        index_t fact_index;
+
+        /// @brief 优先模式中的代价函数，为空时不使用优先模式。
+        priority_t priority;
+        /// @brief 优先模式中等待被激活的rules和facts构成的最小堆。
+        std::vector<pending_t> pending;
+        /// @brief 优先模式中下一个加入堆的元素的顺序。
+        std::size_t pending_order;
+        /// @brief 优先模式中已经激活的rules和facts的推导深度。
+        std::unordered_map<rule_t*, length_t> depths;
 
         /// @brief 用于存储搜索过程中使用的缓冲区。
         std::unique_ptr<rule_t> buffer;
+        /// @brief 用于解析通过add添加的文本的缓冲区，长度为limit_size，与buffer分开以便在迭代的过程中添加。
+        std::unique_ptr<rule_t> parse_buffer;
+        /// @brief 多线程时并行match的线程池，由set_threads启动，在析构时结束。
+        pool_t pool;
+        /// @brief 多线程时每个线程自己的缓冲区，长度为buffer_size，单线程时为空。
+        std::vector<std::unique_ptr<rule_t>> scratches;
+        /// @brief 多线程且开启统计时每个线程用于判断缓冲区是否不足的更大的缓冲区，在第一次使用时分配。
+        std::vector<std::unique_ptr<rule_t>> probes;
+
+        /// @brief 等待堆的比较函数，使得代价小的在堆顶，代价相同时先加入的在堆顶。
+        static bool pending_greater(const pending_t& lhs, const pending_t& rhs);
+
+        /// @brief 将rule或fact加入优先模式的等待堆中。
+        /// @param rule 待加入的rule或fact。
+        /// @param depth 推导深度。
+        void push_pending(rule_t* rule, length_t depth);
+
+        /// @brief 是否需要记录facts参与成功match的次数。
+        bool counting();
+        /// @brief 新产生的fact是否属于本对象负责的分片，不属于的只报告而不保留。
+        /// @param fact 新产生的fact。
+        /// @return 如果不分片、处于优先模式或者fact属于本分片则返回true，否则返回false。
+        bool owns(rule_t* fact);
+
+        /// @brief 放弃被提前结束的一轮，并将推迟删除的facts从索引中删除。
+        /// @note 在索引会被改变时调用，之后从done_cycle开始重新处理这一轮，已经处理过的组合产生的结果都是重复的。
+        void drop_resume();
+        /// @brief 如果超出容量，则按照淘汰策略移除facts，并将剩余的全部内容紧凑地复制到新的storage中。
+        /// @note 被淘汰的facts同时离开known，之后可能被再次推出；被backward subsumption移除的facts也会在此时离开known。
+        void evict();
+        /// @brief 移除给定的rules和facts，并将剩余的全部内容紧凑地复制到新的storage中，之前得到的rule_t指针全部失效。
+        /// @param victims 待移除的rules和facts。
+        void compact(const std::unordered_set<rule_t*>& victims);
+
+        /// @brief 获取rule或fact的编号。
+        /// @param rule 已经记录来源的rule或fact，可以为nullptr。
+        /// @return 编号，没有记录时为no_origin。
+        std::uint32_t id_of(rule_t* rule);
+
+        /// @brief 如果开启了来源记录，则为新加入的rule或fact分配编号并记录来源。
+        /// @param rule 新加入的rule或fact。
+        /// @param parent_rule 产生它的rule，通过add添加的为nullptr。
+        /// @param parent_fact 产生它的fact，通过add添加的为nullptr。
+        /// @param cycle 它加入索引时的cycle。
+        void record(rule_t* rule, rule_t* parent_rule, rule_t* parent_fact, length_t cycle);
+        /// @brief 如果开启了来源记录，则为再次推出的已有rule或fact记录新的来源。
+        /// @param rule 已有的rule或fact。
+        /// @param parent_rule 再次推出它的rule。
+        /// @param parent_fact 再次推出它的fact。
+        void support(rule_t* rule, rule_t* parent_rule, rule_t* parent_fact);
+        /// @brief 开始一次有预算的execute或saturate。
+        /// @param _budget 预算。
+        void begin_budget(const budget_t& _budget);
+        /// @brief 检查是否已经用完预算，用完时记录下来，之后总是返回true。
+        /// @param results 当前预算下已经产生的结果数目。
+        /// @param force 为true时总是检查时间，否则每进行一定数目的match才检查一次，以减少读取时钟的开销。
+        /// @return 如果已经用完预算则返回true，否则返回false。
+        bool over_budget(std::size_t results, bool force);
+
       public:
         /// @brief 构造函数，用于初始化搜索对象
         /// @param _limit_size 每个有效rule_t的最大长度。
@@ -53,6 +256,80 @@ namespace ds {
         /// @param _buffer_size 在搜索过程中使用的缓冲区最大长度。
         void set_buffer_size(length_t _buffer_size);
 
+        /// @brief 设置每轮搜索中用于match的线程数目。
+        /// @param _threads 线程数目，小于等于1时在调用者的线程中串行执行。
+        /// @note 多线程时每个线程使用自己的缓冲区并行match，结果按照与串行时相同的顺序合并去重，因此输出与串行时完全一致。
+        /// 线程和缓冲区在此处创建，之后的每轮搜索都复用它们，直到下一次调用此函数或者析构。
+        void set_threads(length_t _threads);
+
+        /// @brief 设置是否对新产生的facts进行subsumption检查。
+        /// @param forward 如果为true，则丢弃是已有fact的实例的新fact，即已有fact中的variable经过替换后可以得到新fact。
+        /// @param backward 如果为true，则在产生新fact时移除所有是它的实例的已有facts，被移除的facts在本轮结束时离开索引。
+        /// @note 只对搜索中产生的facts进行检查，通过add添加的rules和facts不受影响。
+        void set_subsumption(bool forward, bool backward);
+
+        /// @brief 设置本对象负责的分片，用于在多个进程之间按照facts划分知识库。
+        /// @param _shards 分片的总数，小于等于1时不分片。
+        /// @param _shard 本对象负责的分片编号，取值为0到_shards-1。
+        /// @note 搜索中产生的不属于本分片的facts仍然会被报告，但不会加入本对象，之后也不会与rules进行match，需要由调用者转交给负责它的分片。
+        /// @note 通过add添加的rules和facts不受影响，优先模式下不分片。
+        void set_shard(length_t _shards, length_t _shard);
+
+        /// @brief 设置优先模式的代价函数。
+        /// @param _priority 代价函数，为空时恢复默认的逐轮广度优先的方式。
+        /// @note 优先模式下，新的rules和facts先进入等待堆，每次按照代价从小到大取出一个与已激活的rules和facts进行match，然后将其激活，
+        ///       一轮搜索会一直进行直到产生了新的结果，因此只有在所有rules和facts都已激活时才会返回0。
+        /// @note 优先模式总是单线程执行，需要在添加rules和facts之前设置。
+        void set_priority(const priority_t& _priority);
+
+        /// @brief 设置facts的容量和超出容量时的淘汰策略。
+        /// @param _max_facts facts数目的上限，为0时不限制。
+        /// @param _max_bytes 存放全部rules和facts的字节数的上限，为0时不限制。
+        /// @param _eviction 超出容量时选择被淘汰的facts的策略。
+        /// @param _evicted 报告被淘汰的fact的函数，可以为空。
+        /// @note 容量在每轮搜索结束时检查，因此一轮之中可以暂时超出；只有facts会被淘汰，rules和优先模式中等待的内容总是保留。
+        /// @note 设置了容量时，每轮结束后storage可能被重新分配，之前得到的rule_t指针全部失效。
+        void set_capacity(std::size_t _max_facts, std::size_t _max_bytes, eviction_t _eviction = eviction_t::oldest, const evicted_t& _evicted = {});
+
+        /// @brief 设置是否记录每个rule和fact的来源。
+        /// @param _provenance 如果为true，则为之后加入的每个rule和fact记录产生它的rule和fact的编号以及cycle，之后可以通过proof得到推导过程。
+        /// @note 每个rule和fact只在proof中使用第一次被推出时的来源，已经推出的rule或fact被再次add时成为没有来源的输入，关闭时清空已有的记录。
+        void set_provenance(bool _provenance);
+
+        /// @brief 设置是否保存每轮搜索的统计数据。
+        /// @param _statistics 如果为true，则在每轮结束时保存这一轮的统计数据，关闭时清空已有的数据。
+        /// @note 开启后每次match失败时会在更大的缓冲区中再试一次，以统计buffer_size不足的情况。
+        void set_statistics(bool _statistics);
+
+        /// @brief 获取开启统计后每轮搜索的统计数据。
+        /// @return 按照轮次排列的统计数据，在下一轮结束前有效。
+        const std::vector<stats_t>& stats();
+        /// @brief 设置是否对每个rule进行性能分析。
+        /// @param _profiling 如果为true，则记录以每个rule进行match的次数、结果和花费的时间，关闭时清空已有的数据。
+        /// @note 开启后每次match都需要查找rule对应的记录并计时，关闭时没有额外开销。
+        void set_profiling(bool _profiling);
+        /// @brief 获取开启性能分析后每个rule的统计数据。
+        /// @return 索引中全部rules的统计数据，按照加入索引的顺序排列，从未进行过match的rule各项均为0。
+        std::vector<profile_t> profile();
+
+        /// @brief 以rule的数据长度作为代价，用于优先模式。
+        /// @param rule 待计算代价的rule。
+        /// @param depth 推导深度。
+        /// @return rule的数据长度。
+        static double size_cost(rule_t* rule, length_t depth);
+
+        /// @brief 以推导深度作为代价，用于优先模式。
+        /// @param rule 待计算代价的rule。
+        /// @param depth 推导深度。
+        /// @return 推导深度。
+        static double depth_cost(rule_t* rule, length_t depth);
+
+        /// @brief 计算rule或fact所属的分片。
+        /// @param rule 待计算的rule或fact。
+        /// @param _shards 分片的总数。
+        /// @return 分片编号，只由数据内容决定，在不同的进程和平台上都相同。
+        static length_t shard_of(rule_t* rule, length_t _shards);
+
         /// @brief 重置搜索过程中的所有状态。
         void reset();
 
@@ -61,15 +338,95 @@ namespace ds {
         /// @return 如果添加成功则返回true，否则返回false。
         bool add(std::string_view text);
 
+        /// @brief 向本搜索对象添加一个二进制形式的rule或fact。
+        /// @param rule 二进制形式的rule或fact，会被复制，调用者无需保证其生命周期。
+        /// @return 如果添加成功则返回true，否则返回false。
+        bool add(rule_t* rule);
+
+        /// @brief 移除一个通过add添加的rule或fact，并增量地维护由它推出的内容。
+        /// @param text 描述rule或fact的文本。
+        /// @return 被移除的rules和facts的数目，参见remove(rule_t*)。
+        std::size_t remove(std::string_view text);
+
+        /// @brief 移除一个通过add添加的rule或fact，并增量地维护由它推出的内容。
+        /// @param rule 待移除的rule或fact，按照内容查找。
+        /// @return 被移除的rules和facts的数目，包括它本身；如果它不存在、不是通过add添加的或者没有开启来源记录，则返回0。
+        /// @note 采用DRed的方式：先删除所有推导中用到它的rules和facts，再恢复其中仍然可以由剩余内容推出的部分，被恢复的内容在proof中使用新的来源。
+        /// @note 需要在添加rules和facts之前开启来源记录，每次重复推出已有的内容时会额外记录一个来源，多线程时这些重复的结果也需要在当前线程中合并。
+        /// @note 因为被移除的fact而被forward subsumption丢弃过的结果不会被恢复；需要在两轮搜索之间调用，之前得到的rule_t指针全部失效。
+        std::size_t remove(rule_t* rule);
+
+        /// @brief 判断rule或fact是否已经在本搜索对象中。
+        /// @param rule 待查询的rule或fact，按照内容查找。
+        /// @return 如果已经通过add添加或者在搜索中产生过则返回true，否则返回false。
+        /// @note 被淘汰的facts不再被包含。
+        bool contains(rule_t* rule);
+
+        /// @brief 向本搜索对象依次添加多个rules或facts。
+        /// @param texts 描述rules或facts的文本。
+        /// @return 每个rule或fact是否添加成功。
+        /// @note 与逐个调用add相同，但所有文本都在同一个缓冲区中解析。
+        std::vector<bool> add_many(const std::vector<std::string>& texts);
+
+        /// @brief 从文本文件中依次添加全部rules和facts。
+        /// @param path 文件路径，文件中的rules和facts之间以空行分隔。
+        /// @return 每个rule或fact是否添加成功，如果无法读取文件则返回std::nullopt。
+        std::optional<std::vector<bool>> add_file(std::string_view path);
+
+        /// @brief 将全部rules和facts以及搜索的进度保存到二进制文件中。
+        /// @param path 文件路径。
+        /// @return 如果保存成功则返回true，否则返回false。
+        /// @note 只保存仍在索引中的内容和优先模式中等待的内容，各项设置不会被保存。
+        bool save(std::string_view path);
+
+        /// @brief 从save生成的文件中读取全部rules和facts以及搜索的进度，替换当前的全部内容。
+        /// @param path 文件路径。
+        /// @return 如果读取成功则返回true，否则返回false，此时本对象被清空。
+        /// @note 文件的内容被一次性读入storage，rules和facts直接使用这块内存，不需要逐个解析。
+        bool load(std::string_view path);
+
         /// @brief 执行一轮搜索操作，遍历所有规则和事实，并对每个匹配的规则执行回调函数。
         /// @param callback 回调函数，每个新中找到的结果都会调用此函数。
         /// @return 搜索到新的结果的数量。
         /// @note 如果回调函数返回false，则继续搜索；如果回调函数返回true，则停止搜索。
         length_t execute(const std::function<bool(rule_t*)>& callback);
+        /// @brief 在预算内执行一轮搜索操作。
+        /// @param callback 回调函数，每个新中找到的结果都会调用此函数，返回true时停止搜索。
+        /// @param _budget 预算，在每次match之前和每个结果之后检查，用完时本轮提前结束。
+        /// @return 搜索到新的结果的数量。
+        /// @note 提前结束时已经产生的结果会被保留，下一次execute或saturate从停下的组合继续处理这一轮，然后再开始新的一轮，不会丢失结果。
+        /// 在这一轮完成之前，按照容量淘汰facts以及删除被backward subsumption移除的facts都会被推迟。
+        /// @note 多线程时在每批开始前检查预算，优先模式中在每次激活之前检查预算。
+        length_t execute(const std::function<bool(rule_t*)>& callback, const budget_t& _budget);
+        /// @brief 在预算内连续执行多轮搜索，直到不再有新的结果。
+        /// @param max_cycles 最多执行的轮数，小于等于0时不限制。
+        /// @param _budget 所有轮次共享的预算。
+        /// @return 搜索到新的结果的数量。
+        std::size_t saturate(length_t max_cycles, const budget_t& _budget = {});
+        /// @brief 上一次execute或saturate是否因为用完预算而提前结束。
+        /// @return 如果用完了预算则返回true，否则返回false。
+        bool exhausted();
 
         /// @brief 执行一轮搜索操作，以生成器方式迭代所有匹配的规则。
         /// @return 生成器，每次迭代返回一个匹配的规则指针。
+        /// @note 采用semi-naive的方式，只枚举新rules与全部facts，以及旧rules与新facts的组合。
+        /// @note 多线程时match以批为单位并行进行，每批结束后再依次产生结果，提前停止时最多浪费一批的计算。
+        /// @note 提前停止时记录下一个需要处理的组合，下一次调用时先从那里完成这一轮，再开始新的一轮。
         generator<rule_t*> iterator();
+
+        /// @brief 获取rule或fact的推导过程。
+        /// @param rule 待查询的rule或fact，按照内容查找。
+        /// @return 推导过程中的全部步骤，每一步的来源都排在它之前，最后一步即为rule本身；如果没有记录则为空。
+        /// @note 被淘汰的facts的来源会被遗忘，此时推导过程在该处中断。
+        std::vector<step_t> proof(rule_t* rule);
+
+        /// @brief 连续执行多轮搜索，直到推出某个目标。
+        /// @param targets 目标rules，调用期间需要保持有效。
+        /// @param patterns 为false时结果需要与某个目标完全相同，为true时目标被视为模式，结果是某个目标的实例即可。
+        /// @param max_cycles 最多执行的轮数，小于等于0时不限制。
+        /// @return 第一个推出的目标的副本；如果超出轮数或者不再有新的结果仍未推出目标，则返回nullptr。
+        /// @note 与在execute的回调函数中逐个比较并在找到时返回true相同，但不需要为每个结果调用回调函数。
+        std::unique_ptr<rule_t> find(const std::vector<rule_t*>& targets, bool patterns = false, length_t max_cycles = 0);
     };
 } // namespace ds
 
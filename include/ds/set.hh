@@ -0,0 +1,67 @@
+#ifndef DS_SET_HH
+#define DS_SET_HH
+
+#include <cstddef>
+#include <vector>
+
+#include <ds/rule.hh>
+
+namespace ds {
+    /// @brief 按照内容对rule_t去重的哈希集合。
+    ///
+    /// 采用开放寻址和线性探测，每个位置保存rule的指针和预先计算好的哈希值，
+    /// 比较时先比较哈希值，再比较数据长度和数据内容。
+    ///
+    /// @note 集合不拥有rule的内存，使用者需要保证rule在集合中的生命周期。
+    /// @note 查询和插入分为lookup和insert两步，以便在确定不存在后再为rule分配内存，整个过程只需一次查找。
+    class set_t {
+      public:
+        /// @brief 集合中的一个位置。
+        struct slot_t {
+            /// @brief 位置中rule的哈希值。
+            std::size_t hash;
+            /// @brief 位置中的rule，如果为nullptr则表示该位置为空。
+            rule_t* rule;
+        };
+
+      private:
+        /// @brief 所有的位置，数目总是2的幂。
+        std::vector<slot_t> slots;
+        /// @brief 集合中元素的数目。
+        std::size_t count;
+
+        /// @brief 将位置的数目扩大为原来的两倍，并重新放置所有元素。
+        void grow();
+
+      public:
+        /// @brief 计算rule的哈希值。
+        /// @param rule 待计算的rule。
+        /// @return rule的哈希值，只与rule的数据内容有关。
+        static std::size_t hash(rule_t* rule);
+
+        /// @brief 构造一个空的集合。
+        set_t();
+
+        /// @brief 清空集合。
+        void clear();
+
+        /// @brief 获取集合中元素的数目。
+        /// @return 集合中元素的数目。
+        std::size_t size();
+
+        /// @brief 查找与给定rule内容相同的元素。
+        /// @param rule 待查找的rule，可以是临时的buffer。
+        /// @param hash rule的哈希值，需要由set_t::hash计算。
+        /// @return 如果找到则返回保存该元素的位置，否则返回该rule应当被插入的空位置。
+        /// @note 返回的位置只在下一次修改集合前有效。
+        slot_t* lookup(rule_t* rule, std::size_t hash);
+
+        /// @brief 将rule插入到lookup返回的空位置中。
+        /// @param slot lookup返回的空位置。
+        /// @param rule 待插入的rule，需要与传给lookup的rule内容相同。
+        /// @param hash rule的哈希值。
+        void insert(slot_t* slot, rule_t* rule, std::size_t hash);
+    };
+} // namespace ds
+
+#endif
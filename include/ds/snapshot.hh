@@ -0,0 +1,55 @@
+#ifndef DS_SNAPSHOT_HH
+#define DS_SNAPSHOT_HH
+
+#include <cstdint>
+#include <string_view>
+#include <vector>
+
+#include <ds/arena.hh>
+#include <ds/rule.hh>
+
+namespace ds {
+    /// @brief 推理对象中全部rules和facts的二进制快照。
+    ///
+    /// 文件由头部、推理对象的状态和若干段条目组成，每个条目包括cycle、推导深度和rule_t的原始数据。
+    /// 读取时整个条目部分被一次性读入arena_t中的一块内存，条目中的rule直接指向这块内存，不需要逐个解析或复制。
+    ///
+    /// @note 文件保存的是内存中的原始数据，只能在length_t和字节序都相同的平台之间使用，头部中的信息不符时读取会失败。
+    /// @note 读取时只检查每个rule没有越过文件的范围，文件需要由save生成。
+    class snapshot_t {
+      public:
+        /// @brief 快照中的一个条目。
+        struct entry_t {
+            /// @brief 条目对应的rule。
+            rule_t* rule;
+            /// @brief 条目对应的cycle。
+            length_t cycle;
+            /// @brief 条目的推导深度，不需要时为0。
+            length_t depth;
+        };
+
+        /// @brief 文件格式的版本，格式发生不兼容的变化时增加。
+        static constexpr std::uint32_t version = 1;
+
+        /// @brief 生成快照的推理对象的类型，读取时需要与之相同。
+        std::uint32_t kind;
+        /// @brief 推理对象的状态，例如done_cycle和current_cycle，含义由推理对象决定。
+        std::vector<length_t> state;
+        /// @brief 若干段条目，例如rules和facts，含义由推理对象决定。
+        std::vector<std::vector<entry_t>> sections;
+
+        /// @brief 将快照写入文件。
+        /// @param path 文件路径。
+        /// @return 如果写入成功则返回true，否则返回false。
+        bool save(std::string_view path);
+
+        /// @brief 从文件中读取快照。
+        /// @param path 文件路径。
+        /// @param storage 用于持有条目数据的内存池，条目中的rule在其reset前有效。
+        /// @return 如果读取成功且kind与文件中的相同则返回true，否则返回false。
+        /// @note 调用前需要设置kind，读取成功后state和sections会被文件中的内容替换。
+        bool load(std::string_view path, arena_t& storage);
+    };
+} // namespace ds
+
+#endif
@@ -0,0 +1,66 @@
+#ifndef DS_STATS_HH
+#define DS_STATS_HH
+
+#include <cstddef>
+
+#include <ds/config.hh>
+#include <ds/rule.hh>
+
+namespace ds {
+    /// @brief 推理对象在一轮搜索中的统计数据。
+    ///
+    /// 一个rule与一个fact构成一个组合，每个组合或者因为二者都已经处理过而被跳过，或者进行一次match。
+    /// match的结果依次可能是失败、超出limit_size、重复、被已有fact包含，或者作为新的rule或fact被接受。
+    ///
+    /// @note 计数总是进行，只有开启统计时才会额外计算skipped、overflows和seconds，并在每轮结束时保存下来。
+    struct stats_t {
+        /// @brief 这一轮结束后的cycle。
+        length_t cycle;
+        /// @brief 进行了match的组合数目。
+        std::size_t pairs;
+        /// @brief 索引中可能匹配、但是因为已经处理过而没有再次match的组合数目。
+        std::size_t skipped;
+        /// @brief match失败的数目，包括因为buffer_size不足而失败的。
+        std::size_t failures;
+        /// @brief match失败、但是在两倍buffer_size下可以成功的数目，用于判断是否需要增大buffer_size。
+        std::size_t overflows;
+        /// @brief match成功、但是结果超出limit_size而被丢弃的数目。
+        std::size_t oversize;
+        /// @brief 结果已经存在而被丢弃的数目。
+        std::size_t duplicates;
+        /// @brief 结果被已有fact包含而被forward subsumption丢弃的数目。
+        std::size_t subsumed;
+        /// @brief 被接受的新rules的数目。
+        std::size_t rules;
+        /// @brief 被接受的新facts的数目。
+        std::size_t facts;
+        /// @brief 这一轮结束后存放全部rules和facts的字节数。
+        std::size_t bytes;
+        /// @brief 这一轮经过的时间，单位为秒，包括回调函数中花费的时间。
+        double seconds;
+    };
+
+    /// @brief 开启性能分析后一个rule的统计数据，用于找出产生大量结果或者从不产生结果的rules。
+    ///
+    /// 以这个rule为一方的每次match都计入它，match的结果依次可能是失败、超出limit_size、重复、被已有fact包含，或者被接受。
+    struct profile_t {
+        /// @brief 对应的rule，在下一轮搜索结束前有效。
+        rule_t* rule;
+        /// @brief 进行match的次数。
+        std::size_t attempts;
+        /// @brief match成功的次数，包括结果随后被丢弃的。
+        std::size_t successes;
+        /// @brief 结果超出limit_size而被丢弃的数目。
+        std::size_t oversize;
+        /// @brief 结果已经存在而被丢弃的数目。
+        std::size_t duplicates;
+        /// @brief 结果被已有fact包含而被forward subsumption丢弃的数目。
+        std::size_t subsumed;
+        /// @brief 被接受的新rules和facts的数目。
+        std::size_t produced;
+        /// @brief match花费的时间，单位为秒，不包括回调函数中花费的时间。
+        double seconds;
+    };
+} // namespace ds
+
+#endif
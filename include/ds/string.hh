@@ -72,6 +72,15 @@ namespace ds {
         /// @return string_t对象的大小。
         length_t data_size();
 
+        /// @brief 判断两个string_t对象是否相同。
+        /// @param other 另一个string_t对象。
+        /// @return 如果长度和内容都相同则返回true，否则返回false。
+        ///
+        /// 可以在状态3的情况下调用此函数。
+        ///
+        /// @note 先比较长度，长度不同时不会读取字符串本身，与item之间按字节比较的方式一致。
+        bool equal(string_t* other);
+
         /// @brief 获取string_t对象的头字节指针。
         /// @return string_t对象的头字节指针。
         std::byte* head();
@@ -161,6 +161,11 @@ namespace ds {
         /// @param check_tail 可选的尾指针检查。
         /// @return 自身，是一个term_t对象的指针，如果尾指针检查失败则返回nullptr。
         term_t* rename(term_t* term, term_t* prefix_and_suffix, std::byte* check_tail = nullptr);
+
+        /// @brief 判断本对象是否比给定的term更一般，即本对象中的variable经过某个替换后与给定的term完全相同。
+        /// @param instance 待判断的term，其中的variable被视为常量。
+        /// @return 如果存在这样的替换则返回true，否则返回false。
+        bool subsume(term_t* instance);
     };
 } // namespace ds
 
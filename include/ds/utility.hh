@@ -2,6 +2,9 @@
 #define DS_UTILITY_HH
 
 #include <memory>
+#include <string>
+#include <string_view>
+#include <vector>
 
 #include <ds/rule.hh>
 #include <ds/term.hh>
@@ -30,6 +33,14 @@ namespace ds {
     /// @param length 文本形式的rule的文本最大长度。
     /// @return 文本形式的rule，如果长度超过限制，则返回nullptr。
     std::unique_ptr<char> rule_to_text(rule_t* rule, length_t length);
+
+    /// @brief 读取文本文件，并按照空行将其分割为若干段，每段描述一个rule或fact。
+    /// @param path 文件路径。
+    /// @param text 用于存放文件内容的字符串，每段末尾的换行符会被改写为'\0'。
+    /// @param paragraphs 用于存放每段起始位置的vector，结果会被追加在其末尾。
+    /// @return 如果读取成功则返回true，否则返回false。
+    /// @note 只包含空白字符的行被视为空行，连续的空行与单个空行相同。
+    bool read_paragraphs(std::string_view path, std::string& text, std::vector<const char*>& paragraphs);
 } // namespace ds
 
 #endif
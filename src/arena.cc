@@ -0,0 +1,46 @@
+#include <cstring>
+
+#include <ds/arena.hh>
+
+namespace ds {
+    arena_t::arena_t() {
+        reset();
+    }
+
+    void arena_t::reset() {
+        blocks.clear();
+        top = nullptr;
+        end = nullptr;
+        used = 0;
+    }
+
+    std::byte* arena_t::allocate(std::size_t size) {
+        used += size;
+        // 向上取整以保证下一次分配的对齐
+        size = (size + alignof(length_t) - 1) / alignof(length_t) * alignof(length_t);
+        if (size > block_size) {
+            // 大块单独申请，不影响当前块的剩余空间
+            blocks.push_back(std::make_unique_for_overwrite<std::byte[]>(size));
+            return blocks.back().get();
+        }
+        if (static_cast<std::size_t>(end - top) < size) {
+            blocks.push_back(std::make_unique_for_overwrite<std::byte[]>(block_size));
+            top = blocks.back().get();
+            end = top + block_size;
+        }
+        std::byte* result = top;
+        top += size;
+        return result;
+    }
+
+    rule_t* arena_t::copy(rule_t* rule) {
+        const length_t size = rule->data_size();
+        auto result = reinterpret_cast<rule_t*>(allocate(size));
+        memcpy(result, rule, size);
+        return result;
+    }
+
+    std::size_t arena_t::size() {
+        return used;
+    }
+} // namespace ds
@@ -1,33 +1,54 @@
+#include <algorithm>
+#include <chrono>
 #include <cstring>
-#include <set>
+#include <limits>
+#include <unordered_set>
+#include <vector>
 
 #include <ds/chain.hh>
+#include <ds/snapshot.hh>
 #include <ds/utility.hh>
 
 namespace ds {
-    bool chain_t::less_t::operator()(const std::unique_ptr<rule_t>& lhs, const std::unique_ptr<rule_t>& rhs) const {
-        const length_t lhs_size = lhs->data_size();
-        const length_t rhs_size = rhs->data_size();
-        if (lhs_size < rhs_size) {
-            return true;
-        }
-        if (lhs_size > rhs_size) {
-            return false;
+    namespace {
+        /// @brief chain_t生成的快照的类型。
+        constexpr std::uint32_t snapshot_kind = 2;
+
+        /// @brief 判断两个rule_t的大小关系，先比较数据长度，再比较数据内容。
+        /// @param lhs 第一个rule_t。
+        /// @param rhs 第二个rule_t。
+        /// @return 如果第一个rule_t小于第二个，则返回true；否则返回false。
+        /// @note 每轮新产生的结果按照此顺序加入索引，使得较小的结果在之后的轮次中先被处理。
+        bool less(rule_t* lhs, rule_t* rhs) {
+            const length_t lhs_size = lhs->data_size();
+            const length_t rhs_size = rhs->data_size();
+            if (lhs_size != rhs_size) {
+                return lhs_size < rhs_size;
+            }
+            return std::memcmp(lhs->head(), rhs->head(), lhs_size) < 0;
         }
-        if (std::memcmp(lhs->head(), rhs->head(), lhs_size) < 0) {
-            return true;
+
+        /// @brief 计算从给定时刻到现在经过的时间。
+        /// @param begin 开始的时刻。
+        /// @return 经过的时间，单位为秒。
+        double seconds_since(std::chrono::steady_clock::time_point begin) {
+            return std::chrono::duration<double>(std::chrono::steady_clock::now() - begin).count();
         }
-        return false;
-    }
+    } // namespace
 
     chain_t::chain_t(length_t _limit_size, length_t _buffer_size) {
         set_limit_size(_limit_size);
         set_buffer_size(_buffer_size);
+        set_subsumption(false, false);
+        set_join_ordering(false);
+        set_statistics(false);
+        set_profiling(false);
         reset();
     }
 
     void chain_t::set_limit_size(length_t _limit_size) {
         limit_size = _limit_size;
+        parse_buffer = std::unique_ptr<rule_t>(reinterpret_cast<rule_t*>(operator new(limit_size)));
         done_cycle = 0;
     }
 
@@ -37,35 +58,166 @@ namespace ds {
         done_cycle = 0;
     }
 
+    void chain_t::set_subsumption(bool forward, bool backward) {
+        forward_subsumption = forward;
+        backward_subsumption = backward;
+    }
+
+    void chain_t::set_join_ordering(bool _join_ordering) {
+        join_ordering = _join_ordering;
+    }
+
+    void chain_t::set_statistics(bool _statistics) {
+        statistics = _statistics;
+        if (!statistics) {
+            history.clear();
+        }
+    }
+
+    const std::vector<stats_t>& chain_t::stats() {
+        return history;
+    }
+
+    void chain_t::set_profiling(bool _profiling) {
+        profiling = _profiling;
+        if (!profiling) {
+            profiles.clear();
+        }
+    }
+
+    std::vector<profile_t> chain_t::profile() {
+        std::vector<profile_t> result;
+        for (auto& [rule, cycle] : rule_index.all()) {
+            auto it = profiles.find(rule);
+            profile_t entry = it == profiles.end() ? profile_t{} : it->second;
+            entry.rule = rule;
+            result.push_back(entry);
+        }
+        return result;
+    }
+
     void chain_t::reset() {
         done_cycle = 0;
         current_cycle = 0;
         last_fact_cycle = 0;
-        rules.clear();
-        facts.clear();
+        known.clear();
+        rule_index.clear();
+        fact_index.clear();
+        history.clear();
+        profiles.clear();
+        storage.reset();
     }
 
     bool chain_t::add(std::string_view text) {
-        auto candidate = text_to_rule(text.data(), limit_size);
-        if (candidate) {
-            if (done_cycle == current_cycle) {
-                ++current_cycle;
-            }
-            if (candidate->premises_count() != 0) {
-                rules.emplace(std::move(candidate), current_cycle);
-            } else {
-                facts.emplace(std::move(candidate), current_cycle);
-                last_fact_cycle = current_cycle;
+        // 在固定的缓冲区中解析，不需要为每个rule或fact单独申请内存
+        std::byte* head = reinterpret_cast<std::byte*>(parse_buffer.get());
+        if (parse_buffer->scan(text.data(), head + limit_size) == nullptr) {
+            return false;
+        }
+        return add(parse_buffer.get());
+    }
+
+    bool chain_t::add(rule_t* rule) {
+        if (!rule->valid() || rule->data_size() > limit_size) {
+            return false;
+        }
+        if (done_cycle == current_cycle) {
+            ++current_cycle;
+        }
+        std::size_t hash = set_t::hash(rule);
+        auto slot = known.lookup(rule, hash);
+        if (rule->premises_count() != 0) {
+            if (slot->rule == nullptr) {
+                rule_t* new_rule = storage.copy(rule);
+                known.insert(slot, new_rule, hash);
+                rule_index.insert(new_rule->premises(0), new_rule, current_cycle);
             }
-            return true;
         } else {
+            if (slot->rule == nullptr) {
+                rule_t* new_fact = storage.copy(rule);
+                known.insert(slot, new_fact, hash);
+                fact_index.insert(new_fact->conclusion(), new_fact, current_cycle);
+            }
+            last_fact_cycle = current_cycle;
+        }
+        return true;
+    }
+
+    std::vector<bool> chain_t::add_many(const std::vector<std::string>& texts) {
+        std::vector<bool> result;
+        result.reserve(texts.size());
+        for (auto& text : texts) {
+            result.push_back(add(text));
+        }
+        return result;
+    }
+
+    std::optional<std::vector<bool>> chain_t::add_file(std::string_view path) {
+        std::string text;
+        std::vector<const char*> paragraphs;
+        if (!read_paragraphs(path, text, paragraphs)) {
+            return std::nullopt;
+        }
+        std::vector<bool> result;
+        result.reserve(paragraphs.size());
+        for (auto paragraph : paragraphs) {
+            result.push_back(add(paragraph));
+        }
+        return result;
+    }
+
+    bool chain_t::save(std::string_view path) {
+        snapshot_t snapshot{.kind = snapshot_kind, .state = {done_cycle, current_cycle, last_fact_cycle}, .sections = {{}, {}}};
+        for (auto& [rule, cycle] : rule_index.all()) {
+            snapshot.sections[0].push_back({.rule = rule, .cycle = cycle, .depth = 0});
+        }
+        for (auto& [fact, cycle] : fact_index.all()) {
+            snapshot.sections[1].push_back({.rule = fact, .cycle = cycle, .depth = 0});
+        }
+        return snapshot.save(path);
+    }
+
+    bool chain_t::load(std::string_view path) {
+        reset();
+        snapshot_t snapshot{.kind = snapshot_kind, .state = {}, .sections = {}};
+        if (!snapshot.load(path, storage) || snapshot.state.size() != 3 || snapshot.sections.size() != 2) {
+            reset();
             return false;
         }
+        done_cycle = snapshot.state[0];
+        current_cycle = snapshot.state[1];
+        last_fact_cycle = snapshot.state[2];
+        for (auto& section : snapshot.sections) {
+            for (auto& entry : section) {
+                std::size_t hash = set_t::hash(entry.rule);
+                known.insert(known.lookup(entry.rule, hash), entry.rule, hash);
+            }
+        }
+        for (auto& entry : snapshot.sections[0]) {
+            rule_index.insert(entry.rule->premises(0), entry.rule, entry.cycle);
+        }
+        for (auto& entry : snapshot.sections[1]) {
+            fact_index.insert(entry.rule->conclusion(), entry.rule, entry.cycle);
+        }
+        return true;
     }
 
     ds::generator<rule_t*> chain_t::iterator() {
-        std::set<std::unique_ptr<rule_t>, less_t> temp_facts;
-        std::set<std::unique_ptr<rule_t>, less_t> temp_rules;
+        // 本轮新产生的facts，在本轮结束时加入索引
+        std::vector<rule_t*> temp_facts;
+        // 本轮新产生的facts的索引，只在开启subsumption时使用
+        index_t temp_index;
+        // 本轮被backward subsumption移除的facts，在本轮结束时从索引中删除
+        std::unordered_set<rule_t*> retired;
+        // 本轮产生的中间rules只用于本轮内去重，不会被保存
+        set_t temp_rules;
+        arena_t temp_storage;
+        // 本轮的统计数据，开启统计时在本轮结束时保存
+        stats_t counter = {};
+        const auto start = statistics ? std::chrono::steady_clock::now() : std::chrono::steady_clock::time_point();
+        // 开启统计时用于判断match失败是否由buffer_size不足导致的更大的缓冲区
+        const std::size_t probe_size = std::min<std::size_t>(2 * buffer_size, std::numeric_limits<length_t>::max());
+        auto probe = statistics ? std::unique_ptr<rule_t>(reinterpret_cast<rule_t*>(operator new(probe_size))) : nullptr;
 
         // RAII guard，确保无论是否提前退出，清理代码都会执行
         struct guard_t {
@@ -78,59 +230,241 @@ namespace ds {
             if (!temp_facts.empty()) {
                 last_fact_cycle = current_cycle;
             }
-            for (auto it = temp_facts.begin(); it != temp_facts.end();) {
-                auto node = temp_facts.extract(it++);
-                facts.emplace(std::move(node.value()), current_cycle);
+            if (!retired.empty()) {
+                // 被移除的facts仍然留在known中，以免再次被推出
+                auto is_retired = [&](rule_t* fact) { return retired.contains(fact); };
+                fact_index.erase_if(is_retired);
+                std::erase_if(temp_facts, is_retired);
+            }
+            std::sort(temp_facts.begin(), temp_facts.end(), less);
+            for (auto fact : temp_facts) {
+                fact_index.insert(fact->conclusion(), fact, current_cycle);
+            }
+            if (statistics) {
+                counter.cycle = current_cycle;
+                counter.bytes = storage.size();
+                counter.seconds = seconds_since(start);
+                history.push_back(counter);
             }
         }};
 
-        auto chain_recursive = [&](auto& self, rule_t* rule, rule_t* workspace, std::byte* tail) -> ds::generator<rule_t*> {
+        // 查询已有facts和本轮新facts中所有可能与给定fact匹配的facts
+        std::vector<index_t::entry_t> related;
+        auto find_related = [&](rule_t* fact) {
+            related.clear();
+            fact_index.candidates(fact->conclusion(), related);
+            temp_index.candidates(fact->conclusion(), related);
+        };
+
+        // 正在处理的rules库中的rule，以及开启性能分析时它对应的数据，由它开始的全部match都计入它
+        rule_t* top = nullptr;
+        profile_t* entry = nullptr;
+        auto count = [&](std::size_t profile_t::* field) {
+            if (entry != nullptr) {
+                ++(entry->*field);
+            }
+        };
+
+        // 显式栈中的一层，对应一个待与facts进行match的rule
+        struct frame_t {
+            // 用于match的rule，开启join ordering时可能是调整过premises顺序的副本
+            rule_t* rule;
+            // match结果的存放位置，位于rule之后
+            rule_t* workspace;
+            // 已经匹配的premises中是否用到了新的fact，或者rule本身是新的，此时的结果在之前的轮次中没有产生过
+            bool fresh;
+            // 索引筛选出的可能与rule的第一个premise匹配的facts
+            std::vector<index_t::entry_t> candidates;
+            // 下一个待match的candidate
+            std::size_t next;
+        };
+        // 各层的frame在整轮中复用，避免反复分配candidates的内存
+        std::vector<frame_t> frames;
+        // 用于查询之后的premises是否可能匹配新facts，以及统计没有取出的旧facts
+        std::vector<index_t::entry_t> others;
+        std::size_t depth = 0;
+        // 各层的match结果在buffer中依次存放，互不覆盖
+        std::byte* tail = reinterpret_cast<std::byte*>(buffer.get()) + buffer_size;
+
+        // 处理match得到的rule，返回需要产出的结果，如果还有premises则压入新的一层
+        auto visit = [&](rule_t* rule, rule_t* workspace, bool fresh) -> rule_t* {
             if (rule->premises_count() == 0) {
                 if (rule->data_size() > limit_size) {
-                    co_return;
-                }
-                auto new_fact = std::unique_ptr<rule_t>(reinterpret_cast<rule_t*>(operator new(rule->data_size())));
-                memcpy(new_fact->head(), rule->head(), rule->data_size());
-                if (facts.find(new_fact) != facts.end() || temp_facts.find(new_fact) != temp_facts.end()) {
-                    co_return;
-                }
-                temp_facts.emplace(std::move(new_fact));
-                co_yield rule;
-                co_return;
-            } else {
-                do {
-                    if (rule->data_size() > limit_size) {
-                        break;
+                    ++counter.oversize;
+                    count(&profile_t::oversize);
+                    return nullptr;
+                }
+                std::size_t hash = set_t::hash(rule);
+                auto slot = known.lookup(rule, hash);
+                if (slot->rule != nullptr) {
+                    ++counter.duplicates;
+                    count(&profile_t::duplicates);
+                    return nullptr;
+                }
+                if (forward_subsumption) {
+                    find_related(rule);
+                    for (auto& [general, general_cycle] : related) {
+                        if (general->subsume(rule)) {
+                            ++counter.subsumed;
+                            count(&profile_t::subsumed);
+                            return nullptr;
+                        }
                     }
-                    auto new_rule = std::unique_ptr<rule_t>(reinterpret_cast<rule_t*>(operator new(rule->data_size())));
-                    memcpy(new_rule->head(), rule->head(), rule->data_size());
-                    if (rules.find(new_rule) != rules.end() || temp_rules.find(new_rule) != temp_rules.end()) {
-                        break;
+                }
+                rule_t* new_fact = storage.copy(rule);
+                known.insert(slot, new_fact, hash);
+                if (backward_subsumption) {
+                    find_related(new_fact);
+                    for (auto& [instance, instance_cycle] : related) {
+                        if (new_fact->subsume(instance)) {
+                            retired.insert(instance);
+                        }
                     }
-                    temp_rules.emplace(std::move(new_rule));
-                    co_yield rule;
-                } while (false);
+                }
+                if (forward_subsumption || backward_subsumption) {
+                    temp_index.insert(new_fact->conclusion(), new_fact, current_cycle);
+                }
+                temp_facts.push_back(new_fact);
+                ++counter.facts;
+                count(&profile_t::produced);
+                return rule;
             }
 
-            for (auto& [fact, facts_cycle] : facts) {
-                workspace->match(rule, fact.get(), tail);
-                if (!workspace->valid()) {
-                    continue;
+            // rules库中的rule本身不是新的结果，只由旧facts得到的中间rule在之前的轮次中已经产生过，都直接与facts进行match
+            rule_t* result = nullptr;
+            do {
+                if (rule == top || !fresh) {
+                    break;
+                }
+                if (rule->data_size() > limit_size) {
+                    ++counter.oversize;
+                    count(&profile_t::oversize);
+                    break;
+                }
+                std::size_t hash = set_t::hash(rule);
+                if (known.lookup(rule, hash)->rule != nullptr) {
+                    ++counter.duplicates;
+                    count(&profile_t::duplicates);
+                    break;
                 }
-                for (auto yielded : self(self, workspace, reinterpret_cast<rule_t*>(workspace->tail()), tail)) {
-                    co_yield yielded;
+                auto slot = temp_rules.lookup(rule, hash);
+                if (slot->rule != nullptr) {
+                    ++counter.duplicates;
+                    count(&profile_t::duplicates);
+                    break;
+                }
+                temp_rules.insert(slot, temp_storage.copy(rule), hash);
+                ++counter.rules;
+                count(&profile_t::produced);
+                result = rule;
+            } while (false);
+
+            // 开启join ordering时，将可能匹配的facts最少的premise移动到最前面，没有可能匹配的facts时整个rule都不必再match
+            if (join_ordering && rule->premises_count() > 1) {
+                length_t best = 0;
+                std::size_t fewest = fact_index.estimate(rule->premises(0));
+                for (length_t index = 1; index < rule->premises_count() && fewest != 0; ++index) {
+                    std::size_t size = fact_index.estimate(rule->premises(index));
+                    if (size < fewest) {
+                        best = index;
+                        fewest = size;
+                    }
+                }
+                if (fewest == 0) {
+                    return result;
+                }
+                if (best != 0 && workspace->promote(rule, best, tail) != nullptr) {
+                    rule = workspace;
+                    workspace = reinterpret_cast<rule_t*>(workspace->tail());
                 }
             }
+
+            // 只与索引筛选出的可能匹配的fact进行match
+            if (depth == frames.size()) {
+                frames.emplace_back();
+            }
+            frame_t& frame = frames[depth++];
+            frame.rule = rule;
+            frame.workspace = workspace;
+            frame.fresh = fresh;
+            frame.candidates.clear();
+            frame.next = 0;
+            // 采用semi-naive的方式，之前的premises都由旧facts匹配时，之后的premises中至少要有一个由新fact匹配
+            // 如果之后的premises都没有可能匹配的新facts，则这个premise只取新facts，全部由旧facts构成的组合在之前的轮次中已经处理过
+            // 否则取出旧facts和新facts，旧fact之后仍然需要新fact，新fact之后可以是全部facts
+            bool later = false;
+            for (length_t index = 1; !fresh && !later && index < rule->premises_count(); ++index) {
+                others.clear();
+                fact_index.candidates(rule->premises(index), others, std::numeric_limits<length_t>::max(), done_cycle);
+                later = !others.empty();
+            }
+            if (fresh || later) {
+                fact_index.candidates(rule->premises(0), frame.candidates);
+                return result;
+            }
+            fact_index.candidates(rule->premises(0), frame.candidates, std::numeric_limits<length_t>::max(), done_cycle);
+            if (statistics) {
+                others.clear();
+                fact_index.candidates(rule->premises(0), others, done_cycle);
+                counter.skipped += others.size();
+            }
+            return result;
         };
 
+        // 复制一份rules的列表，避免在迭代过程中被修改
+        std::vector<index_t::entry_t> rules = rule_index.all();
         for (auto& [rule, rules_cycle] : rules) {
             if (rules_cycle <= done_cycle && last_fact_cycle <= done_cycle) {
+                if (statistics) {
+                    // rule和全部facts都已经处理过，统计第一个premise可能匹配的facts
+                    std::vector<index_t::entry_t> candidates;
+                    fact_index.candidates(rule->premises(0), candidates);
+                    counter.skipped += candidates.size();
+                }
                 continue;
             }
 
-            for (auto yielded :
-                 chain_recursive(chain_recursive, rule.get(), buffer.get(), reinterpret_cast<std::byte*>(buffer.get()) + buffer_size)) {
+            top = rule;
+            entry = profiling ? &profiles[rule] : nullptr;
+            // 开启性能分析时只计入生成结果所花费的时间，不包括回调函数中花费的时间
+            auto begin = entry != nullptr ? std::chrono::steady_clock::now() : std::chrono::steady_clock::time_point();
+            depth = 0;
+            visit(rule, buffer.get(), rules_cycle > done_cycle);
+            while (depth != 0) {
+                frame_t& frame = frames[depth - 1];
+                if (frame.next == frame.candidates.size()) {
+                    --depth;
+                    continue;
+                }
+                auto [fact, facts_cycle] = frame.candidates[frame.next++];
+                const bool recent = facts_cycle > done_cycle;
+                ++counter.pairs;
+                count(&profile_t::attempts);
+                rule_t* workspace = frame.workspace;
+                workspace->match(frame.rule, fact, tail);
+                if (!workspace->valid()) {
+                    ++counter.failures;
+                    if (probe && probe->match(frame.rule, fact, reinterpret_cast<std::byte*>(probe.get()) + probe_size) != nullptr) {
+                        ++counter.overflows;
+                    }
+                    continue;
+                }
+                count(&profile_t::successes);
+                // visit可能压入新的一层，此后frame不再有效
+                rule_t* yielded = visit(workspace, reinterpret_cast<rule_t*>(workspace->tail()), frame.fresh || recent);
+                if (yielded == nullptr) {
+                    continue;
+                }
+                if (entry != nullptr) {
+                    entry->seconds += seconds_since(begin);
+                }
                 co_yield yielded;
+                if (entry != nullptr) {
+                    begin = std::chrono::steady_clock::now();
+                }
+            }
+            if (entry != nullptr) {
+                entry->seconds += seconds_since(begin);
             }
         }
 
@@ -4,6 +4,7 @@
 #include <ds/item.hh>
 #include <ds/list.hh>
 #include <ds/rule.hh>
+#include <ds/string.hh>
 #include <ds/term.hh>
 #include <ds/variable.hh>
 
@@ -11,7 +12,7 @@ namespace ds {
     term_t* term_t::ground(term_t* term, term_t* dictionary, const char* scope, std::byte* check_tail) {
         switch (term->get_type()) {
         case term_type_t::variable: {
-            char* this_string = term->variable()->name()->get_string();
+            string_t* this_name = term->variable()->name();
             list_t* list = dictionary->list();
             for (length_t index = 0; index < list->get_list_size(); ++index) {
                 list_t* tuple = list->term(index)->list();
@@ -41,10 +42,10 @@ namespace ds {
                 default:
                     return nullptr;
                 }
-                if (scope != nullptr && strcmp(scope, scope_key) != 0) {
+                if (scope != nullptr && !scope_equal(scope, scope_key)) {
                     continue;
                 }
-                if (strcmp(this_string, key->variable()->name()->get_string()) != 0) {
+                if (!key->variable()->name()->equal(this_name)) {
                     continue;
                 }
                 if (this->ground(value, dictionary, scope_value, check_tail) == nullptr) [[unlikely]] {
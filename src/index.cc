@@ -0,0 +1,183 @@
+#include <algorithm>
+#include <functional>
+#include <string_view>
+
+#include <ds/index.hh>
+#include <ds/item.hh>
+#include <ds/list.hh>
+
+namespace ds {
+    std::size_t index_t::symbol(term_t* term) {
+        switch (term->get_type()) {
+        case term_type_t::item: {
+            // item的符号为奇数，list的符号为非零偶数，两者不会冲突
+            string_t* name = term->item()->name();
+            std::size_t hash = std::hash<std::string_view>()(std::string_view(name->get_string(), name->get_length() - 1));
+            return (hash << 1) | 1;
+        }
+        case term_type_t::list:
+            return (static_cast<std::size_t>(term->list()->get_list_size()) + 1) << 1;
+        default:
+            return 0;
+        }
+    }
+
+    void index_t::clear() {
+        buckets.clear();
+        variables.clear();
+        entries.clear();
+    }
+
+    void index_t::insert(term_t* key, rule_t* rule, length_t cycle) {
+        entry_t entry = {.rule = rule, .cycle = cycle};
+        entries.push_back(entry);
+        std::size_t root = symbol(key);
+        if (root == 0) {
+            variables.push_back(entry);
+            return;
+        }
+        auto [it, inserted] = buckets.try_emplace(root);
+        bucket_t& bucket = it->second;
+        list_t* list = key->list();
+        if (inserted) {
+            bucket.arity = list ? list->get_list_size() : 0;
+        }
+        bucket.entries.push_back(entry);
+        for (length_t index = 0; index < bucket.arity; ++index) {
+            bucket.signatures.push_back(symbol(list->term(index)));
+        }
+        if (bucket.arity != 0) {
+            ++bucket.heads[bucket.signatures[bucket.signatures.size() - bucket.arity]];
+        }
+    }
+
+    namespace {
+        /// @brief 找到第一个cycle大于after_cycle的条目。
+        /// @note 条目的cycle单调不减，因此可以二分查找。
+        std::size_t first_after(const std::vector<index_t::entry_t>& entries, length_t after_cycle) {
+            auto begin = std::upper_bound(entries.begin(), entries.end(), after_cycle, [](length_t value, const index_t::entry_t& entry) {
+                return value < entry.cycle;
+            });
+            return begin - entries.begin();
+        }
+
+        /// @brief 将cycle大于after_cycle且不超过max_cycle的条目追加到result末尾。
+        /// @note 条目的cycle单调不减，所以遇到第一个超过max_cycle的条目即可停止。
+        void append_between(
+            const std::vector<index_t::entry_t>& entries,
+            length_t after_cycle,
+            length_t max_cycle,
+            std::vector<index_t::entry_t>& result
+        ) {
+            for (std::size_t index = first_after(entries, after_cycle); index < entries.size(); ++index) {
+                if (entries[index].cycle > max_cycle) {
+                    break;
+                }
+                result.push_back(entries[index]);
+            }
+        }
+    } // namespace
+
+    void index_t::candidates(term_t* term, std::vector<entry_t>& result, length_t max_cycle, length_t after_cycle) {
+        std::size_t root = symbol(term);
+        if (root == 0) {
+            append_between(entries, after_cycle, max_cycle, result);
+            return;
+        }
+        auto it = buckets.find(root);
+        if (it != buckets.end()) {
+            bucket_t& bucket = it->second;
+            if (bucket.arity == 0) {
+                append_between(bucket.entries, after_cycle, max_cycle, result);
+            } else {
+                // 顶层符号相同的list长度一定相同，逐个比较子term的符号即可
+                list_t* list = term->list();
+                std::vector<std::size_t> query(bucket.arity);
+                for (length_t index = 0; index < bucket.arity; ++index) {
+                    query[index] = symbol(list->term(index));
+                }
+                std::size_t first = first_after(bucket.entries, after_cycle);
+                const std::size_t* signature = bucket.signatures.data() + first * bucket.arity;
+                for (std::size_t position = first; position < bucket.entries.size(); ++position) {
+                    const entry_t& entry = bucket.entries[position];
+                    if (entry.cycle > max_cycle) {
+                        break;
+                    }
+                    bool compatible = true;
+                    for (length_t index = 0; index < bucket.arity; ++index) {
+                        if (query[index] != 0 && signature[index] != 0 && query[index] != signature[index]) {
+                            compatible = false;
+                            break;
+                        }
+                    }
+                    if (compatible) {
+                        result.push_back(entry);
+                    }
+                    signature += bucket.arity;
+                }
+            }
+        }
+        append_between(variables, after_cycle, max_cycle, result);
+    }
+
+    std::size_t index_t::estimate(term_t* term) {
+        std::size_t root = symbol(term);
+        if (root == 0) {
+            return entries.size();
+        }
+        auto it = buckets.find(root);
+        if (it == buckets.end()) {
+            return variables.size();
+        }
+        bucket_t& bucket = it->second;
+        std::size_t head = bucket.arity != 0 ? symbol(term->list()->term(0)) : 0;
+        if (head == 0) {
+            return bucket.entries.size() + variables.size();
+        }
+        // 第一个子term为variable的条目也可能匹配
+        auto count = [&](std::size_t symbol) {
+            auto found = bucket.heads.find(symbol);
+            return found != bucket.heads.end() ? found->second : 0;
+        };
+        return count(head) + count(0) + variables.size();
+    }
+
+    void index_t::erase_if(const std::function<bool(rule_t*)>& predicate) {
+        auto erase_entries = [&](std::vector<entry_t>& entries) {
+            std::erase_if(entries, [&](const entry_t& entry) { return predicate(entry.rule); });
+        };
+        erase_entries(entries);
+        erase_entries(variables);
+        for (auto& [root, bucket] : buckets) {
+            // 签名与条目一一对应，需要同步地移动
+            std::size_t kept = 0;
+            for (std::size_t index = 0; index < bucket.entries.size(); ++index) {
+                if (predicate(bucket.entries[index].rule)) {
+                    if (bucket.arity != 0) {
+                        --bucket.heads[bucket.signatures[index * bucket.arity]];
+                    }
+                    continue;
+                }
+                bucket.entries[kept] = bucket.entries[index];
+                std::copy_n(bucket.signatures.begin() + index * bucket.arity, bucket.arity, bucket.signatures.begin() + kept * bucket.arity);
+                ++kept;
+            }
+            bucket.entries.resize(kept);
+            bucket.signatures.resize(kept * bucket.arity);
+        }
+    }
+
+    void index_t::recent(length_t cycle, std::vector<entry_t>& result) {
+        auto begin =
+            std::upper_bound(entries.begin(), entries.end(), cycle, [](length_t value, const entry_t& entry) { return value < entry.cycle; });
+        result.insert(result.end(), begin, entries.end());
+    }
+
+    const std::vector<index_t::entry_t>& index_t::all() {
+        return entries;
+    }
+
+    std::size_t index_t::size() {
+        return entries.size();
+    }
+} // namespace ds
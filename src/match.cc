@@ -46,7 +46,7 @@ namespace ds {
 
         void unify(unify_job_t* job, unify_substitution_t* substitution) {
             if (job->term_1->variable() && job->term_2->variable()) {
-                if (strcmp(job->scope_1, job->scope_2) == 0) {
+                if (scope_equal(job->scope_1, job->scope_2)) {
                     if (term_equal(job->term_1, job->term_2)) {
                         return;
                     }
@@ -175,7 +175,7 @@ namespace ds {
 
         bool occur_check(unify_job_t* job, unify_substitution_t* substitution) {
             if (job->term_2->variable()) {
-                if (strcmp(job->scope_1, job->scope_2) == 0) {
+                if (scope_equal(job->scope_1, job->scope_2)) {
                     if (term_equal(job->term_1, job->term_2)) {
                         return true;
                     }
@@ -205,14 +205,13 @@ namespace ds {
         }
 
         term_t* found_in_substitution(variable_t* variable, const char* scope, unify_substitution_t* substitution) {
-            const char* variable_name = variable->name()->get_string();
+            string_t* variable_name = variable->name();
             term_t* current = substitution->begin;
             while (current != substitution->end) {
                 list_t* tuple = current->list();
                 const char* scope_key = tuple->term(0)->item()->name()->get_string();
-                if (strcmp(scope_key, scope) == 0) {
-                    const char* key_name = tuple->term(2)->variable()->name()->get_string();
-                    if (strcmp(key_name, variable_name) == 0) {
+                if (scope_equal(scope_key, scope)) {
+                    if (tuple->term(2)->variable()->name()->equal(variable_name)) {
                         return current;
                     }
                 }
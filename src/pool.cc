@@ -0,0 +1,79 @@
+#include <algorithm>
+
+#include <ds/pool.hh>
+
+namespace ds {
+    pool_t::pool_t() : job(nullptr), active(0), pending(0), generation(0), stopping(false) { }
+
+    pool_t::~pool_t() {
+        stop();
+    }
+
+    void pool_t::serve(std::size_t index, std::size_t seen) {
+        while (true) {
+            std::unique_lock lock(mutex);
+            start.wait(lock, [&]() { return stopping || generation != seen; });
+            if (stopping) {
+                return;
+            }
+            seen = generation;
+            if (index >= active) {
+                continue;
+            }
+            const job_t* current = job;
+            lock.unlock();
+            (*current)(index);
+            lock.lock();
+            if (--pending == 0) {
+                done.notify_one();
+            }
+        }
+    }
+
+    void pool_t::stop() {
+        {
+            std::lock_guard lock(mutex);
+            stopping = true;
+        }
+        start.notify_all();
+        for (auto& worker : workers) {
+            worker.join();
+        }
+        workers.clear();
+        stopping = false;
+    }
+
+    void pool_t::resize(std::size_t size) {
+        if (size == this->size()) {
+            return;
+        }
+        stop();
+        for (std::size_t index = 1; index < size; ++index) {
+            workers.emplace_back(&pool_t::serve, this, index, generation);
+        }
+    }
+
+    std::size_t pool_t::size() {
+        return workers.size() + 1;
+    }
+
+    void pool_t::run(std::size_t count, const job_t& _job) {
+        count = std::min(count, size());
+        if (count > 1) {
+            std::lock_guard lock(mutex);
+            job = &_job;
+            active = count;
+            pending = count - 1;
+            ++generation;
+        }
+        if (count > 1) {
+            start.notify_all();
+        }
+        _job(0);
+        if (count > 1) {
+            std::unique_lock lock(mutex);
+            done.wait(lock, [&]() { return pending == 0; });
+            job = nullptr;
+        }
+    }
+} // namespace ds
@@ -0,0 +1,312 @@
+#include <cstring>
+#include <deque>
+#include <string>
+#include <string_view>
+#include <unordered_map>
+#include <vector>
+
+#include <ds/helper.hh>
+#include <ds/list.hh>
+#include <ds/prove.hh>
+#include <ds/string.hh>
+#include <ds/term.hh>
+#include <ds/utility.hh>
+#include <ds/variable.hh>
+
+namespace ds {
+    namespace {
+        /// @brief 将若干term依次复制到缓冲区中，构成一个rule。
+        /// @param head 缓冲区的起始位置。
+        /// @param check_tail 缓冲区的尾指针。
+        /// @param terms 依次放置的terms，最后一个是conclusion。
+        /// @return 构成的rule，如果缓冲区不足则返回nullptr。
+        rule_t* make_rule(std::byte* head, std::byte* check_tail, const std::vector<term_t*>& terms) {
+            list_t* list = reinterpret_cast<list_t*>(head);
+            if (list->set_list_size(terms.size(), check_tail) == nullptr) [[unlikely]] {
+                return nullptr;
+            }
+            for (length_t index = 0; index < static_cast<length_t>(terms.size()); ++index) {
+                term_t* term = list->term(index);
+                if (check_before_fail(check_tail, term, terms[index]->data_size())) [[unlikely]] {
+                    return nullptr;
+                }
+                std::memcpy(term, terms[index], terms[index]->data_size());
+                list->update_term_size(index);
+            }
+            return reinterpret_cast<rule_t*>(list);
+        }
+
+        /// @brief 计算子目标的键，只相差变量名的子目标具有相同的键。
+        /// @param term 子目标。
+        /// @param names 已经出现过的变量名，按照第一次出现的顺序排列。
+        /// @param key 用于存放键的字符串，结果会被追加在其末尾。
+        /// @note 变量被替换为其第一次出现的序号，其余部分保留原有的数据，因此键仍然是无歧义的。
+        void variant_key(term_t* term, std::vector<string_t*>& names, std::string& key) {
+            if (term->get_type() == term_type_t::variable) {
+                string_t* name = term->variable()->name();
+                length_t ordinal = 0;
+                while (ordinal < static_cast<length_t>(names.size()) && !names[ordinal]->equal(name)) {
+                    ++ordinal;
+                }
+                if (ordinal == static_cast<length_t>(names.size())) {
+                    names.push_back(name);
+                }
+                term_type_t type = term->get_type();
+                key.append(reinterpret_cast<const char*>(&type), sizeof(type));
+                key.append(reinterpret_cast<const char*>(&ordinal), sizeof(ordinal));
+            } else if (term->get_type() == term_type_t::list) {
+                list_t* list = term->list();
+                length_t list_size = list->get_list_size();
+                term_type_t type = term->get_type();
+                key.append(reinterpret_cast<const char*>(&type), sizeof(type));
+                key.append(reinterpret_cast<const char*>(&list_size), sizeof(list_size));
+                for (length_t index = 0; index < list_size; ++index) {
+                    variant_key(list->term(index), names, key);
+                }
+            } else {
+                key.append(reinterpret_cast<const char*>(term->head()), term->data_size());
+            }
+        }
+    } // namespace
+
+    prove_t::prove_t(length_t _limit_size, length_t _buffer_size) {
+        set_limit_size(_limit_size);
+        set_buffer_size(_buffer_size);
+        reset();
+    }
+
+    void prove_t::set_limit_size(length_t _limit_size) {
+        limit_size = _limit_size;
+    }
+
+    void prove_t::set_buffer_size(length_t _buffer_size) {
+        buffer_size = _buffer_size;
+        buffer = std::unique_ptr<rule_t>(reinterpret_cast<rule_t*>(operator new(buffer_size)));
+    }
+
+    void prove_t::reset() {
+        known.clear();
+        rule_index.clear();
+        fact_index.clear();
+        storage.reset();
+    }
+
+    bool prove_t::add(std::string_view text) {
+        auto candidate = text_to_rule(text.data(), limit_size);
+        if (!candidate) {
+            return false;
+        }
+        std::size_t hash = set_t::hash(candidate.get());
+        auto slot = known.lookup(candidate.get(), hash);
+        if (slot->rule != nullptr) {
+            return true;
+        }
+        if (candidate->premises_count() == 0) {
+            rule_t* new_rule = storage.copy(candidate.get());
+            known.insert(slot, new_rule, hash);
+            fact_index.insert(new_rule->conclusion(), new_rule, 0);
+            return true;
+        }
+        // 将conclusion复制一份作为第一个premise，这样与子目标match后得到的就是以premises为子目标的部分rule
+        std::vector<term_t*> terms{candidate->conclusion()};
+        for (length_t index = 0; index < candidate->premises_count(); ++index) {
+            terms.push_back(candidate->premises(index));
+        }
+        terms.push_back(candidate->conclusion());
+        std::byte* head = reinterpret_cast<std::byte*>(buffer.get());
+        rule_t* head_first = make_rule(head, head + buffer_size, terms);
+        if (head_first == nullptr) [[unlikely]] {
+            return false;
+        }
+        rule_t* new_rule = storage.copy(candidate.get());
+        known.insert(slot, new_rule, hash);
+        rule_t* new_head_first = storage.copy(head_first);
+        rule_index.insert(new_head_first->conclusion(), new_head_first, 0);
+        return true;
+    }
+
+    ds::generator<rule_t*> prove_t::iterator(std::string_view goal) {
+        return solve(text_to_rule(goal.data(), limit_size));
+    }
+
+    ds::generator<rule_t*> prove_t::solve(std::unique_ptr<rule_t> goal) {
+        if (!goal || goal->premises_count() != 0) {
+            co_return;
+        }
+
+        struct table_t;
+        // 等待某个子目标的答案的部分rule，其第一个premise就是该子目标
+        struct consumer_t {
+            rule_t* rule;
+            table_t* owner;
+        };
+        // 一个子目标对应的表
+        struct table_t {
+            // 用于给展开的rules重命名变量的后缀，避免不同表之间的变量名冲突
+            std::unique_ptr<rule_t> suffix;
+            // 按照找到的顺序存放的答案，每个答案都是子目标的实例
+            std::vector<rule_t*> answers;
+            // 答案的集合，用于去重
+            set_t answer_set;
+            // 以此表所属子目标为第一个premise的部分rules，用于去重
+            set_t partial_set;
+            // 等待此子目标的答案的部分rules
+            std::vector<consumer_t> consumers;
+        };
+        // 待处理的工作，分为两种：
+        // 新答案：将table的第index个答案交给加入时已经存在的前count个consumers；
+        // 新consumer：将consumer注册到其第一个premise对应的表中，并与已经存在的答案resolve。
+        struct work_t {
+            table_t* table;
+            rule_t* rule;
+            std::size_t index;
+            std::size_t count;
+        };
+
+        // 本次查询中的全部子目标、部分rules和答案都存放在这里
+        arena_t temp_storage;
+        std::vector<std::unique_ptr<table_t>> tables;
+        std::unordered_map<std::string, table_t*> table_map;
+        std::deque<work_t> works;
+
+        std::byte* head = reinterpret_cast<std::byte*>(buffer.get());
+        std::byte* tail = head + buffer_size;
+        // 重命名使用的第二个缓冲区，因为重命名的结果还需要与子目标match到buffer中
+        std::unique_ptr<rule_t> rename_buffer(reinterpret_cast<rule_t*>(operator new(buffer_size)));
+        std::byte* rename_head = reinterpret_cast<std::byte*>(rename_buffer.get());
+        std::byte* rename_tail = rename_head + buffer_size;
+
+        auto add_answer = [&](table_t* table, rule_t* answer) {
+            if (answer->data_size() > limit_size) {
+                return;
+            }
+            std::size_t hash = set_t::hash(answer);
+            auto slot = table->answer_set.lookup(answer, hash);
+            if (slot->rule != nullptr) {
+                return;
+            }
+            rule_t* new_answer = temp_storage.copy(answer);
+            table->answer_set.insert(slot, new_answer, hash);
+            table->answers.push_back(new_answer);
+            works.push_back({.table = table, .rule = nullptr, .index = table->answers.size() - 1, .count = table->consumers.size()});
+        };
+
+        auto add_partial = [&](table_t* owner, rule_t* partial) {
+            if (partial->premises_count() == 0) {
+                add_answer(owner, partial);
+                return;
+            }
+            if (partial->data_size() > limit_size) {
+                return;
+            }
+            std::size_t hash = set_t::hash(partial);
+            auto slot = owner->partial_set.lookup(partial, hash);
+            if (slot->rule != nullptr) {
+                return;
+            }
+            rule_t* new_partial = temp_storage.copy(partial);
+            owner->partial_set.insert(slot, new_partial, hash);
+            works.push_back({.table = owner, .rule = new_partial, .index = 0, .count = 0});
+        };
+
+        std::vector<index_t::entry_t> candidates;
+        std::vector<string_t*> names;
+        std::string key;
+        // 获取子目标对应的表，如果不存在则新建并用facts和rules展开
+        auto get_table = [&](term_t* subgoal) -> table_t* {
+            // 只相差变量名的子目标共享同一张表，否则左递归的rules会不断产生新的子目标
+            names.clear();
+            key.clear();
+            variant_key(subgoal, names, key);
+            auto found = table_map.find(key);
+            if (found != table_map.end()) {
+                return found->second;
+            }
+            rule_t* fact = make_rule(head, tail, {subgoal});
+            if (fact == nullptr) [[unlikely]] {
+                return nullptr;
+            }
+            fact = temp_storage.copy(fact);
+            subgoal = fact->conclusion();
+            tables.push_back(std::make_unique<table_t>());
+            table_t* table = tables.back().get();
+            table_map.emplace(key, table);
+            table->suffix = text_to_rule(("(() (_" + std::to_string(tables.size()) + "))").c_str(), buffer_size);
+
+            // 子目标被fact直接满足，match的结果就是子目标的实例
+            rule_t* identity = make_rule(head, tail, {subgoal, subgoal});
+            if (identity != nullptr) [[likely]] {
+                identity = temp_storage.copy(identity);
+                candidates.clear();
+                fact_index.candidates(subgoal, candidates);
+                for (auto& [candidate, cycle] : candidates) {
+                    if (buffer->match(identity, candidate, tail)) {
+                        add_answer(table, buffer.get());
+                    }
+                }
+            }
+            // 子目标与rule的conclusion match，得到以该rule的premises为子目标的部分rule
+            candidates.clear();
+            rule_index.candidates(subgoal, candidates);
+            for (auto& [candidate, cycle] : candidates) {
+                if (!rename_buffer->rename(candidate, table->suffix.get(), rename_tail)) [[unlikely]] {
+                    continue;
+                }
+                if (buffer->match(rename_buffer.get(), fact, tail)) {
+                    add_partial(table, buffer.get());
+                }
+            }
+            return table;
+        };
+
+        auto resolve = [&](consumer_t& consumer, rule_t* answer) {
+            if (buffer->match(consumer.rule, answer, tail)) {
+                add_partial(consumer.owner, buffer.get());
+            }
+        };
+
+        table_t* root = get_table(goal->conclusion());
+        if (root == nullptr) [[unlikely]] {
+            co_return;
+        }
+        std::size_t yielded = 0;
+        while (true) {
+            while (yielded < root->answers.size()) {
+                co_yield root->answers[yielded++];
+            }
+            if (works.empty()) {
+                break;
+            }
+            work_t work = works.front();
+            works.pop_front();
+            if (work.rule == nullptr) {
+                rule_t* answer = work.table->answers[work.index];
+                for (std::size_t index = 0; index < work.count; ++index) {
+                    resolve(work.table->consumers[index], answer);
+                }
+            } else {
+                table_t* table = get_table(work.rule->premises(0));
+                if (table == nullptr) [[unlikely]] {
+                    continue;
+                }
+                table->consumers.push_back({.rule = work.rule, .owner = work.table});
+                // 只与注册时已经存在的答案resolve，之后的答案会由新答案的工作交给此consumer
+                const std::size_t count = table->answers.size();
+                for (std::size_t index = 0; index < count; ++index) {
+                    resolve(table->consumers.back(), table->answers[index]);
+                }
+            }
+        }
+    }
+
+    length_t prove_t::execute(std::string_view goal, const std::function<bool(rule_t*)>& callback) {
+        length_t count = 0;
+        for (auto* rule : iterator(goal)) {
+            ++count;
+            if (callback(rule)) {
+                break;
+            }
+        }
+        return count;
+    }
+} // namespace ds
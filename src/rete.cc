@@ -0,0 +1,146 @@
+#include <deque>
+#include <string>
+#include <string_view>
+#include <vector>
+
+#include <ds/rete.hh>
+
+namespace ds {
+    rete_t::rete_t(length_t _limit_size, length_t _buffer_size) {
+        set_limit_size(_limit_size);
+        set_buffer_size(_buffer_size);
+        reset();
+    }
+
+    void rete_t::set_limit_size(length_t _limit_size) {
+        limit_size = _limit_size;
+        parse_buffer = std::unique_ptr<rule_t>(reinterpret_cast<rule_t*>(operator new(limit_size)));
+    }
+
+    void rete_t::set_buffer_size(length_t _buffer_size) {
+        buffer_size = _buffer_size;
+        buffer = std::unique_ptr<rule_t>(reinterpret_cast<rule_t*>(operator new(buffer_size)));
+    }
+
+    void rete_t::reset() {
+        known.clear();
+        token_index.clear();
+        fact_index.clear();
+        agenda.clear();
+        ready.clear();
+        storage.reset();
+    }
+
+    bool rete_t::add(std::string_view text) {
+        // 在固定的缓冲区中解析，不需要为每个rule或fact单独申请内存
+        std::byte* head = reinterpret_cast<std::byte*>(parse_buffer.get());
+        if (parse_buffer->scan(text.data(), head + limit_size) == nullptr) {
+            return false;
+        }
+        return add(parse_buffer.get());
+    }
+
+    bool rete_t::add(rule_t* rule) {
+        if (!rule->valid() || rule->data_size() > limit_size) {
+            return false;
+        }
+        std::size_t hash = set_t::hash(rule);
+        auto slot = known.lookup(rule, hash);
+        if (slot->rule == nullptr) {
+            rule_t* new_rule = storage.copy(rule);
+            known.insert(slot, new_rule, hash);
+            agenda.push_back(new_rule);
+        }
+        return true;
+    }
+
+    std::vector<bool> rete_t::add_many(const std::vector<std::string>& texts) {
+        std::vector<bool> result;
+        result.reserve(texts.size());
+        for (auto& text : texts) {
+            result.push_back(add(text));
+        }
+        return result;
+    }
+
+    std::size_t rete_t::pending() {
+        return agenda.size();
+    }
+
+    void rete_t::join(rule_t* token, rule_t* fact) {
+        // 结果在保存之后就不再需要缓冲区，因此各层递归可以共用同一个缓冲区
+        if (buffer->match(token, fact, reinterpret_cast<std::byte*>(buffer.get()) + buffer_size) == nullptr) {
+            return;
+        }
+        if (buffer->data_size() > limit_size) {
+            return;
+        }
+        std::size_t hash = set_t::hash(buffer.get());
+        auto slot = known.lookup(buffer.get(), hash);
+        if (slot->rule != nullptr) {
+            return;
+        }
+        rule_t* result = storage.copy(buffer.get());
+        known.insert(slot, result, hash);
+        if (result->premises_count() == 0) {
+            // 新的fact等到从agenda中取出时才加入索引，在此之前与它相关的组合都还没有处理
+            agenda.push_back(result);
+            ready.push_back(result);
+            return;
+        }
+        // 新的中间rule作为token保存，并立即与已经传播过的facts进行match，之后传播的facts会在activate中与它进行match
+        token_index.insert(result->premises(0), result, 0);
+        std::vector<index_t::entry_t> candidates;
+        fact_index.candidates(result->premises(0), candidates);
+        for (auto& [candidate, cycle] : candidates) {
+            join(result, candidate);
+        }
+    }
+
+    void rete_t::activate(rule_t* rule) {
+        // 复制一份候选的列表，join过程中新产生的tokens已经与全部facts进行过match，不需要再次处理
+        std::vector<index_t::entry_t> candidates;
+        if (rule->premises_count() == 0) {
+            fact_index.insert(rule->conclusion(), rule, 0);
+            token_index.candidates(rule->conclusion(), candidates);
+            for (auto& [token, cycle] : candidates) {
+                join(token, rule);
+            }
+        } else {
+            token_index.insert(rule->premises(0), rule, 0);
+            fact_index.candidates(rule->premises(0), candidates);
+            for (auto& [fact, cycle] : candidates) {
+                join(rule, fact);
+            }
+        }
+    }
+
+    generator<rule_t*> rete_t::iterator() {
+        while (true) {
+            // 先产出已经推出的facts，再传播下一个等待的rule或fact
+            if (!ready.empty()) {
+                rule_t* fact = ready.front();
+                ready.pop_front();
+                co_yield fact;
+                continue;
+            }
+            if (agenda.empty()) {
+                co_return;
+            }
+            rule_t* rule = agenda.front();
+            agenda.pop_front();
+            activate(rule);
+        }
+    }
+
+    length_t rete_t::execute(const std::function<bool(rule_t*)>& callback) {
+        length_t count = 0;
+        for (auto* rule : iterator()) {
+            ++count;
+            if (callback(rule)) {
+                break;
+            }
+        }
+        return count;
+    }
+} // namespace ds
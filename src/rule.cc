@@ -139,4 +139,25 @@ namespace ds {
         }
         return buffer;
     }
+
+    rule_t* rule_t::promote(rule_t* rule, length_t index, std::byte* check_tail) {
+        if (rule->premises(index) == nullptr) [[unlikely]] {
+            return nullptr;
+        }
+        list_t* dst = this;
+        list_t* src = rule;
+        if (dst->set_list_size(src->get_list_size(), check_tail) == nullptr) [[unlikely]] {
+            return nullptr;
+        }
+        for (length_t position = 0; position < dst->get_list_size(); ++position) {
+            // 第index个premise放在最前面，在它之前的terms依次后移一位
+            term_t* term = src->term(position == 0 ? index : position <= index ? position - 1 : position);
+            if (check_before_fail(check_tail, dst->term(position), term->data_size())) [[unlikely]] {
+                return nullptr;
+            }
+            memcpy(dst->term(position), term, term->data_size());
+            dst->update_term_size(position);
+        }
+        return this;
+    }
 } // namespace ds
@@ -1,69 +1,711 @@
+#include <algorithm>
+#include <atomic>
+#include <chrono>
 #include <cstring>
-#include <set>
+#include <limits>
+#include <type_traits>
+#include <unordered_set>
+#include <vector>
 
 #include <ds/search.hh>
+#include <ds/snapshot.hh>
 #include <ds/utility.hh>
 
 namespace ds {
-    bool search_t::less_t::operator()(const std::unique_ptr<rule_t>& lhs, const std::unique_ptr<rule_t>& rhs) const {
-        const length_t lhs_size = lhs->data_size();
-        const length_t rhs_size = rhs->data_size();
-        if (lhs_size < rhs_size) {
-            return true;
+    namespace {
+        /// @brief 多线程时每批中平均分给每个线程的任务数目。
+        constexpr std::size_t tasks_per_thread = 16;
+
+        /// @brief 有时间预算时，每进行多少次match读取一次时钟。
+        constexpr std::size_t clock_interval = 64;
+
+        /// @brief search_t生成的快照的类型。
+        constexpr std::uint32_t snapshot_kind = 1;
+
+        /// @brief 判断两个rule_t的大小关系，先比较数据长度，再比较数据内容。
+        /// @param lhs 第一个rule_t。
+        /// @param rhs 第二个rule_t。
+        /// @return 如果第一个rule_t小于第二个，则返回true；否则返回false。
+        /// @note 每轮新产生的结果按照此顺序加入索引，使得较小的结果在之后的轮次中先被处理。
+        bool less(rule_t* lhs, rule_t* rhs) {
+            const length_t lhs_size = lhs->data_size();
+            const length_t rhs_size = rhs->data_size();
+            if (lhs_size != rhs_size) {
+                return lhs_size < rhs_size;
+            }
+            return std::memcmp(lhs->head(), rhs->head(), lhs_size) < 0;
         }
-        if (lhs_size > rhs_size) {
-            return false;
+
+        /// @brief 计算从给定时刻到现在经过的时间。
+        /// @param begin 开始的时刻。
+        /// @return 经过的时间，单位为秒。
+        double seconds_since(std::chrono::steady_clock::time_point begin) {
+            return std::chrono::duration<double>(std::chrono::steady_clock::now() - begin).count();
         }
-        if (std::memcmp(lhs->head(), rhs->head(), lhs_size) < 0) {
-            return true;
+
+        /// @brief 将一部分性能分析的数据累加到总的数据中。
+        /// @param total 总的数据。
+        /// @param part 待累加的数据。
+        void merge(profile_t& total, const profile_t& part) {
+            total.attempts += part.attempts;
+            total.successes += part.successes;
+            total.oversize += part.oversize;
+            total.duplicates += part.duplicates;
+            total.subsumed += part.subsumed;
+            total.produced += part.produced;
+            total.seconds += part.seconds;
         }
-        return false;
-    }
+    } // namespace
 
     search_t::search_t(length_t _limit_size, length_t _buffer_size) {
         set_limit_size(_limit_size);
         set_buffer_size(_buffer_size);
+        set_threads(1);
+        set_subsumption(false, false);
+        set_shard(1, 0);
+        set_priority(nullptr);
+        set_capacity(0, 0);
+        set_provenance(false);
+        set_statistics(false);
+        set_profiling(false);
+        begin_budget({});
         reset();
     }
 
     void search_t::set_limit_size(length_t _limit_size) {
         limit_size = _limit_size;
+        parse_buffer = std::unique_ptr<rule_t>(reinterpret_cast<rule_t*>(operator new(limit_size)));
+        drop_resume();
         done_cycle = 0;
     }
 
     void search_t::set_buffer_size(length_t _buffer_size) {
         buffer_size = _buffer_size;
         buffer = std::unique_ptr<rule_t>(reinterpret_cast<rule_t*>(operator new(buffer_size)));
+        for (auto& scratch : scratches) {
+            scratch = std::unique_ptr<rule_t>(reinterpret_cast<rule_t*>(operator new(buffer_size)));
+        }
+        for (auto& probe : probes) {
+            probe.reset();
+        }
+        drop_resume();
         done_cycle = 0;
     }
 
+    void search_t::set_threads(length_t _threads) {
+        threads = _threads;
+        const std::size_t size = threads > 1 ? threads : 0;
+        pool.resize(std::max<std::size_t>(size, 1));
+        scratches.resize(size);
+        probes.resize(size);
+        for (auto& scratch : scratches) {
+            if (scratch == nullptr) {
+                scratch = std::unique_ptr<rule_t>(reinterpret_cast<rule_t*>(operator new(buffer_size)));
+            }
+        }
+    }
+
+    void search_t::set_subsumption(bool forward, bool backward) {
+        forward_subsumption = forward;
+        backward_subsumption = backward;
+    }
+
+    void search_t::set_shard(length_t _shards, length_t _shard) {
+        shards = _shards;
+        shard = _shard;
+    }
+
+    void search_t::set_priority(const priority_t& _priority) {
+        priority = _priority;
+    }
+
+    void search_t::set_capacity(std::size_t _max_facts, std::size_t _max_bytes, eviction_t _eviction, const evicted_t& _evicted) {
+        max_facts = _max_facts;
+        max_bytes = _max_bytes;
+        eviction = _eviction;
+        evicted = _evicted;
+        if (!counting()) {
+            uses.clear();
+        }
+    }
+
+    void search_t::set_provenance(bool _provenance) {
+        provenance = _provenance;
+        if (!provenance) {
+            origins.clear();
+            ids.clear();
+            alternatives.clear();
+        }
+    }
+
+    void search_t::set_statistics(bool _statistics) {
+        statistics = _statistics;
+        if (!statistics) {
+            history.clear();
+        }
+    }
+
+    const std::vector<stats_t>& search_t::stats() {
+        return history;
+    }
+
+    void search_t::set_profiling(bool _profiling) {
+        profiling = _profiling;
+        if (!profiling) {
+            profiles.clear();
+        }
+    }
+
+    std::vector<profile_t> search_t::profile() {
+        std::vector<profile_t> result;
+        for (auto& [rule, cycle] : rule_index.all()) {
+            auto it = profiles.find(rule);
+            profile_t entry = it == profiles.end() ? profile_t{} : it->second;
+            entry.rule = rule;
+            result.push_back(entry);
+        }
+        return result;
+    }
+
+    void search_t::begin_budget(const budget_t& _budget) {
+        budget = _budget;
+        budget_pairs = 0;
+        budget_exhausted = false;
+        if (budget.timeout > 0) {
+            deadline = std::chrono::steady_clock::now() +
+                       std::chrono::duration_cast<std::chrono::steady_clock::duration>(std::chrono::duration<double>(budget.timeout));
+        }
+    }
+
+    bool search_t::over_budget(std::size_t results, bool force) {
+        // 没有预算时不做任何检查，因此用完预算之后的普通迭代不受影响
+        if (budget.timeout <= 0 && budget.max_results == 0 && budget.max_pairs == 0) {
+            return false;
+        }
+        if (budget_exhausted) {
+            return true;
+        }
+        if (budget.max_results != 0 && results >= budget.max_results) {
+            budget_exhausted = true;
+        } else if (budget.max_pairs != 0 && budget_pairs >= budget.max_pairs) {
+            budget_exhausted = true;
+        } else if (budget.timeout > 0 && (force || budget_pairs % clock_interval == 0)) {
+            budget_exhausted = std::chrono::steady_clock::now() >= deadline;
+        }
+        return budget_exhausted;
+    }
+
+    bool search_t::exhausted() {
+        return budget_exhausted;
+    }
+
+    double search_t::size_cost(rule_t* rule, [[maybe_unused]] length_t depth) {
+        return rule->data_size();
+    }
+
+    double search_t::depth_cost([[maybe_unused]] rule_t* rule, length_t depth) {
+        return depth;
+    }
+
+    length_t search_t::shard_of(rule_t* rule, length_t _shards) {
+        if (_shards <= 1) {
+            return 0;
+        }
+        // 使用FNV-1a而不是std::hash，使得不同的标准库实现得到相同的分片
+        std::uint64_t hash = 0xcbf29ce484222325;
+        const auto* head = reinterpret_cast<const unsigned char*>(rule->head());
+        for (length_t i = 0; i < rule->data_size(); ++i) {
+            hash = (hash ^ head[i]) * 0x100000001b3;
+        }
+        return static_cast<length_t>(hash % static_cast<std::uint64_t>(_shards));
+    }
+
+    bool search_t::pending_greater(const pending_t& lhs, const pending_t& rhs) {
+        if (lhs.cost != rhs.cost) {
+            return lhs.cost > rhs.cost;
+        }
+        return lhs.order > rhs.order;
+    }
+
+    void search_t::push_pending(rule_t* rule, length_t depth) {
+        pending.push_back({.cost = priority(rule, depth), .order = pending_order++, .rule = rule, .depth = depth});
+        std::push_heap(pending.begin(), pending.end(), pending_greater);
+    }
+
+    bool search_t::counting() {
+        return (max_facts != 0 || max_bytes != 0) && eviction == eviction_t::least_used;
+    }
+
+    bool search_t::owns(rule_t* fact) {
+        return shards <= 1 || priority || shard_of(fact, shards) == shard;
+    }
+
+    void search_t::drop_resume() {
+        resume = {.active = false, .limit = 0, .task = 0, .offset = 0};
+        if (!retired.empty()) {
+            fact_index.erase_if([&](rule_t* fact) { return retired.contains(fact); });
+            retired.clear();
+        }
+    }
+
+    void search_t::evict() {
+        const std::vector<index_t::entry_t>& facts = fact_index.all();
+        if ((max_facts == 0 || facts.size() <= max_facts) && (max_bytes == 0 || storage.size() <= max_bytes)) {
+            return;
+        }
+        // storage中还有已经离开索引的facts，需要重新统计仍然需要保留的字节数
+        std::size_t bytes = 0;
+        for (auto& [rule, cycle] : rule_index.all()) {
+            bytes += rule->data_size();
+        }
+        for (auto& [fact, cycle] : facts) {
+            bytes += fact->data_size();
+        }
+        for (auto& item : pending) {
+            bytes += item.rule->data_size();
+        }
+
+        // 按照淘汰的先后排列，索引中的条目按照插入顺序排列，因此相同时先淘汰较早的
+        std::vector<rule_t*> order;
+        order.reserve(facts.size());
+        for (auto& [fact, cycle] : facts) {
+            order.push_back(fact);
+        }
+        if (eviction == eviction_t::largest) {
+            std::stable_sort(order.begin(), order.end(), [](rule_t* lhs, rule_t* rhs) { return lhs->data_size() > rhs->data_size(); });
+        } else if (eviction == eviction_t::least_used) {
+            auto uses_of = [&](rule_t* fact) -> std::size_t {
+                auto it = uses.find(fact);
+                return it == uses.end() ? 0 : it->second;
+            };
+            std::stable_sort(order.begin(), order.end(), [&](rule_t* lhs, rule_t* rhs) { return uses_of(lhs) < uses_of(rhs); });
+        }
+        std::unordered_set<rule_t*> victims;
+        std::size_t count = facts.size();
+        for (auto fact : order) {
+            if ((max_facts == 0 || count <= max_facts) && (max_bytes == 0 || bytes <= max_bytes)) {
+                break;
+            }
+            victims.insert(fact);
+            --count;
+            bytes -= fact->data_size();
+            if (evicted) {
+                evicted(fact);
+            }
+        }
+
+        compact(victims);
+    }
+
+    void search_t::compact(const std::unordered_set<rule_t*>& victims) {
+        // 索引中的条目会改变，被提前结束的一轮无法继续
+        drop_resume();
+        // arena不支持单独释放，将保留的内容复制到新的storage中，同时重建known和索引
+        arena_t fresh;
+        std::unordered_map<rule_t*, rule_t*> moved;
+        known.clear();
+        auto keep = [&](rule_t* rule) -> rule_t* {
+            auto [it, inserted] = moved.try_emplace(rule, nullptr);
+            if (inserted) {
+                it->second = fresh.copy(rule);
+                std::size_t hash = set_t::hash(it->second);
+                known.insert(known.lookup(it->second, hash), it->second, hash);
+            }
+            return it->second;
+        };
+        std::vector<index_t::entry_t> entries = rule_index.all();
+        rule_index.clear();
+        for (auto& [rule, cycle] : entries) {
+            if (!victims.contains(rule)) {
+                rule_t* new_rule = keep(rule);
+                rule_index.insert(new_rule->premises(0), new_rule, cycle);
+            }
+        }
+        entries = fact_index.all();
+        fact_index.clear();
+        for (auto& [fact, cycle] : entries) {
+            if (!victims.contains(fact)) {
+                rule_t* new_fact = keep(fact);
+                fact_index.insert(new_fact->conclusion(), new_fact, cycle);
+            }
+        }
+        std::erase_if(pending, [&](const pending_t& item) { return victims.contains(item.rule); });
+        std::make_heap(pending.begin(), pending.end(), pending_greater);
+        for (auto& item : pending) {
+            item.rule = keep(item.rule);
+        }
+        auto remap = [&](auto& table) {
+            std::remove_reference_t<decltype(table)> result;
+            for (auto& [rule, value] : table) {
+                auto it = moved.find(rule);
+                if (it != moved.end()) {
+                    result.emplace(it->second, value);
+                }
+            }
+            table.swap(result);
+        };
+        remap(depths);
+        remap(uses);
+        remap(profiles);
+        // 编号保持不变，被移除的rules和facts只保留来源，推导过程在此中断
+        ids.clear();
+        for (std::uint32_t id = 0; id < origins.size(); ++id) {
+            auto it = moved.find(origins[id].rule);
+            origins[id].rule = it == moved.end() ? nullptr : it->second;
+            if (origins[id].rule != nullptr) {
+                ids.emplace(origins[id].rule, id);
+            }
+        }
+        storage = std::move(fresh);
+    }
+
+    std::uint32_t search_t::id_of(rule_t* rule) {
+        if (rule == nullptr) {
+            return no_origin;
+        }
+        auto it = ids.find(rule);
+        return it == ids.end() ? no_origin : it->second;
+    }
+
+    void search_t::record(rule_t* rule, rule_t* parent_rule, rule_t* parent_fact, length_t cycle) {
+        if (!provenance) {
+            return;
+        }
+        ids.emplace(rule, static_cast<std::uint32_t>(origins.size()));
+        origins.push_back({.rule = rule, .parent_rule = id_of(parent_rule), .parent_fact = id_of(parent_fact), .cycle = cycle});
+    }
+
+    void search_t::support(rule_t* rule, rule_t* parent_rule, rule_t* parent_fact) {
+        if (!provenance) {
+            return;
+        }
+        auto it = ids.find(rule);
+        if (it == ids.end()) {
+            return;
+        }
+        // 通过add添加的内容也需要记录，以便它被移除时如果仍然可以被推出则作为推出的内容恢复
+        const origin_t& origin = origins[it->second];
+        std::pair<std::uint32_t, std::uint32_t> source = {id_of(parent_rule), id_of(parent_fact)};
+        if (source == std::pair(origin.parent_rule, origin.parent_fact)) {
+            return;
+        }
+        auto& sources = alternatives[it->second];
+        if (std::find(sources.begin(), sources.end(), source) == sources.end()) {
+            sources.push_back(source);
+        }
+    }
+
     void search_t::reset() {
         done_cycle = 0;
         current_cycle = 0;
-        rules.clear();
-        facts.clear();
+        resume = {.active = false, .limit = 0, .task = 0, .offset = 0};
+        retired.clear();
+        known.clear();
+        rule_index.clear();
+        fact_index.clear();
+        pending.clear();
+        pending_order = 0;
+        depths.clear();
+        uses.clear();
+        origins.clear();
+        ids.clear();
+        alternatives.clear();
+        history.clear();
+        profiles.clear();
+        storage.reset();
     }
 
     bool search_t::add(std::string_view text) {
-        auto candidate = text_to_rule(text.data(), limit_size);
-        if (candidate) {
+        // 在固定的缓冲区中解析，不需要为每个rule或fact单独申请内存
+        std::byte* head = reinterpret_cast<std::byte*>(parse_buffer.get());
+        if (parse_buffer->scan(text.data(), head + limit_size) == nullptr) {
+            return false;
+        }
+        return add(parse_buffer.get());
+    }
+
+    bool search_t::add(rule_t* rule) {
+        if (!rule->valid() || rule->data_size() > limit_size) {
+            return false;
+        }
+        if (done_cycle == current_cycle) {
+            ++current_cycle;
+        }
+        std::size_t hash = set_t::hash(rule);
+        auto slot = known.lookup(rule, hash);
+        if (slot->rule == nullptr) {
+            rule_t* new_rule = storage.copy(rule);
+            known.insert(slot, new_rule, hash);
+            record(new_rule, nullptr, nullptr, current_cycle);
+            if (priority) {
+                push_pending(new_rule, 0);
+            } else if (new_rule->premises_count() != 0) {
+                rule_index.insert(new_rule->premises(0), new_rule, current_cycle);
+            } else {
+                fact_index.insert(new_rule->conclusion(), new_rule, current_cycle);
+            }
+        } else if (auto id = id_of(slot->rule); id != no_origin) {
+            // 已经推出的内容被再次添加时成为输入，原来的来源作为其他来源保留，以便之后移除时恢复
+            origin_t& origin = origins[id];
+            if (origin.parent_rule != no_origin || origin.parent_fact != no_origin) {
+                alternatives[id].emplace_back(origin.parent_rule, origin.parent_fact);
+                origin.parent_rule = no_origin;
+                origin.parent_fact = no_origin;
+            }
+        }
+        return true;
+    }
+
+    std::size_t search_t::remove(std::string_view text) {
+        std::byte* head = reinterpret_cast<std::byte*>(parse_buffer.get());
+        if (parse_buffer->scan(text.data(), head + limit_size) == nullptr) {
+            return 0;
+        }
+        return remove(parse_buffer.get());
+    }
+
+    std::size_t search_t::remove(rule_t* rule) {
+        if (!provenance || !rule->valid()) {
+            return 0;
+        }
+        auto found = known.lookup(rule, set_t::hash(rule));
+        const std::uint32_t target = found->rule == nullptr ? no_origin : id_of(found->rule);
+        if (target == no_origin || origins[target].parent_rule != no_origin || origins[target].parent_fact != no_origin) {
+            return 0;
+        }
+        const std::size_t count = origins.size();
+        auto given = [&](std::uint32_t id) { return origins[id].parent_rule == no_origin && origins[id].parent_fact == no_origin; };
+        // 对一个rule或fact的每个来源调用函数，输入没有origins中的来源
+        auto for_each_source = [&](std::uint32_t id, auto&& function) {
+            if (!given(id)) {
+                function(std::pair(origins[id].parent_rule, origins[id].parent_fact));
+            }
+            if (auto it = alternatives.find(id); it != alternatives.end()) {
+                for (auto& source : it->second) {
+                    function(source);
+                }
+            }
+        };
+
+        // 以CSR的形式建立从来源到推出内容的反向关系
+        std::vector<std::size_t> offsets(count + 1, 0);
+        std::vector<std::uint32_t> dependents;
+        for (int pass = 0; pass < 2; ++pass) {
+            std::vector<std::size_t> cursor;
+            if (pass == 1) {
+                for (std::size_t id = 0; id < count; ++id) {
+                    offsets[id + 1] += offsets[id];
+                }
+                dependents.resize(offsets[count]);
+                cursor.assign(offsets.begin(), offsets.end() - 1);
+            }
+            for (std::uint32_t id = 0; id < count; ++id) {
+                if (origins[id].rule == nullptr) {
+                    continue;
+                }
+                for_each_source(id, [&](std::pair<std::uint32_t, std::uint32_t> source) {
+                    for (auto parent : {source.first, source.second}) {
+                        if (parent != no_origin) {
+                            if (pass == 0) {
+                                ++offsets[parent + 1];
+                            } else {
+                                dependents[cursor[parent]++] = id;
+                            }
+                        }
+                    }
+                });
+            }
+        }
+
+        // 过度删除：所有有一个来源用到了被删除内容的非输入内容都被删除
+        std::vector<bool> deleted(count, false);
+        std::vector<bool> restored(count, false);
+        std::vector<std::uint32_t> doomed = {target};
+        deleted[target] = true;
+        for (std::size_t i = 0; i < doomed.size(); ++i) {
+            for (std::size_t k = offsets[doomed[i]]; k < offsets[doomed[i] + 1]; ++k) {
+                const std::uint32_t id = dependents[k];
+                if (!deleted[id] && !given(id)) {
+                    deleted[id] = true;
+                    doomed.push_back(id);
+                }
+            }
+        }
+
+        // 重新推导：有一个来源的两方都未被删除或者已经恢复的内容被恢复，并改为以这个来源作为origins中的来源
+        // 只从已经确定的内容出发逐步恢复，因此互相推出的内容不会仅凭彼此而被恢复
+        auto alive = [&](std::uint32_t id) { return id == no_origin || !deleted[id] || restored[id]; };
+        std::vector<std::uint32_t> queue = doomed;
+        for (std::size_t i = 0; i < queue.size(); ++i) {
+            const std::uint32_t id = queue[i];
+            if (restored[id]) {
+                continue;
+            }
+            std::optional<std::pair<std::uint32_t, std::uint32_t>> found_source;
+            for_each_source(id, [&](std::pair<std::uint32_t, std::uint32_t> source) {
+                if (!found_source && alive(source.first) && alive(source.second)) {
+                    found_source = source;
+                }
+            });
+            if (!found_source) {
+                continue;
+            }
+            restored[id] = true;
+            origin_t& origin = origins[id];
+            if (given(id) || *found_source != std::pair(origin.parent_rule, origin.parent_fact)) {
+                auto& sources = alternatives[id];
+                std::erase(sources, *found_source);
+                if (!given(id)) {
+                    sources.emplace_back(origin.parent_rule, origin.parent_fact);
+                }
+                if (sources.empty()) {
+                    alternatives.erase(id);
+                }
+                origin.parent_rule = found_source->first;
+                origin.parent_fact = found_source->second;
+            }
+            for (std::size_t k = offsets[id]; k < offsets[id + 1]; ++k) {
+                if (deleted[dependents[k]] && !restored[dependents[k]]) {
+                    queue.push_back(dependents[k]);
+                }
+            }
+        }
+
+        // 保留下来的内容不再以被删除的内容为来源
+        auto removed = [&](std::uint32_t id) { return id != no_origin && deleted[id] && !restored[id]; };
+        std::unordered_set<rule_t*> victims;
+        for (auto id : doomed) {
+            if (!removed(id)) {
+                continue;
+            }
+            victims.insert(origins[id].rule);
+            alternatives.erase(id);
+            for (std::size_t k = offsets[id]; k < offsets[id + 1]; ++k) {
+                auto it = alternatives.find(dependents[k]);
+                if (it != alternatives.end()) {
+                    std::erase_if(it->second, [&](auto& source) { return removed(source.first) || removed(source.second); });
+                    if (it->second.empty()) {
+                        alternatives.erase(it);
+                    }
+                }
+            }
+        }
+        compact(victims);
+        return victims.size();
+    }
+
+    bool search_t::contains(rule_t* rule) {
+        return known.lookup(rule, set_t::hash(rule))->rule != nullptr;
+    }
+
+    std::vector<bool> search_t::add_many(const std::vector<std::string>& texts) {
+        std::vector<bool> result;
+        result.reserve(texts.size());
+        for (auto& text : texts) {
+            result.push_back(add(text));
+        }
+        return result;
+    }
+
+    std::optional<std::vector<bool>> search_t::add_file(std::string_view path) {
+        std::string text;
+        std::vector<const char*> paragraphs;
+        if (!read_paragraphs(path, text, paragraphs)) {
+            return std::nullopt;
+        }
+        std::vector<bool> result;
+        result.reserve(paragraphs.size());
+        for (auto paragraph : paragraphs) {
+            result.push_back(add(paragraph));
+        }
+        return result;
+    }
+
+    bool search_t::save(std::string_view path) {
+        auto depth_of = [&](rule_t* rule) -> length_t {
+            auto it = depths.find(rule);
+            return it == depths.end() ? 0 : it->second;
+        };
+        snapshot_t snapshot{.kind = snapshot_kind, .state = {done_cycle, current_cycle}, .sections = {{}, {}, {}}};
+        for (auto& [rule, cycle] : rule_index.all()) {
+            snapshot.sections[0].push_back({.rule = rule, .cycle = cycle, .depth = depth_of(rule)});
+        }
+        for (auto& [fact, cycle] : fact_index.all()) {
+            snapshot.sections[1].push_back({.rule = fact, .cycle = cycle, .depth = depth_of(fact)});
+        }
+        // 按照出堆的顺序保存，读取后依次入堆即可保持相同代价时的先后顺序
+        std::vector<pending_t> queue = pending;
+        std::sort(queue.begin(), queue.end(), [](const pending_t& lhs, const pending_t& rhs) { return pending_greater(rhs, lhs); });
+        for (auto& item : queue) {
+            snapshot.sections[2].push_back({.rule = item.rule, .cycle = 0, .depth = item.depth});
+        }
+        return snapshot.save(path);
+    }
+
+    bool search_t::load(std::string_view path) {
+        reset();
+        snapshot_t snapshot{.kind = snapshot_kind, .state = {}, .sections = {}};
+        if (!snapshot.load(path, storage) || snapshot.state.size() != 2 || snapshot.sections.size() != 3) {
+            reset();
+            return false;
+        }
+        done_cycle = snapshot.state[0];
+        current_cycle = snapshot.state[1];
+        auto remember = [&](const snapshot_t::entry_t& entry) {
+            std::size_t hash = set_t::hash(entry.rule);
+            known.insert(known.lookup(entry.rule, hash), entry.rule, hash);
+            // 快照中不保存来源，读取的内容与通过add添加的一样没有来源
+            record(entry.rule, nullptr, nullptr, entry.cycle);
+            if (entry.depth != 0) {
+                depths[entry.rule] = entry.depth;
+            }
+        };
+        for (auto& entry : snapshot.sections[0]) {
+            remember(entry);
+            rule_index.insert(entry.rule->premises(0), entry.rule, entry.cycle);
+        }
+        for (auto& entry : snapshot.sections[1]) {
+            remember(entry);
+            fact_index.insert(entry.rule->conclusion(), entry.rule, entry.cycle);
+        }
+        for (auto& entry : snapshot.sections[2]) {
+            std::size_t hash = set_t::hash(entry.rule);
+            known.insert(known.lookup(entry.rule, hash), entry.rule, hash);
+            record(entry.rule, nullptr, nullptr, current_cycle);
+            if (priority) {
+                push_pending(entry.rule, entry.depth);
+                continue;
+            }
+            // 没有设置优先模式时，等待的内容与通过add添加的一样作为新的rules和facts加入索引
             if (done_cycle == current_cycle) {
                 ++current_cycle;
             }
-            if (candidate->premises_count() != 0) {
-                rules.emplace(std::move(candidate), current_cycle);
+            if (entry.rule->premises_count() != 0) {
+                rule_index.insert(entry.rule->premises(0), entry.rule, current_cycle);
             } else {
-                facts.emplace(std::move(candidate), current_cycle);
+                fact_index.insert(entry.rule->conclusion(), entry.rule, current_cycle);
             }
-            return true;
-        } else {
-            return false;
         }
+        return true;
     }
 
     ds::generator<rule_t*> search_t::iterator() {
-        std::set<std::unique_ptr<rule_t>, less_t> temp_rules;
-        std::set<std::unique_ptr<rule_t>, less_t> temp_facts;
+        // 本轮新产生的rules和facts，在本轮结束时加入索引
+        std::vector<rule_t*> temp_rules;
+        std::vector<rule_t*> temp_facts;
+        // 本轮新产生的facts的索引，只在开启subsumption时使用
+        index_t temp_index;
+        // 本轮处理到的位置，提前结束时保存到resume中，下一次从这里继续
+        resume_t cursor = {.active = false, .limit = 0, .task = 0, .offset = 0};
+        // 本轮的统计数据，开启统计时在本轮结束时保存
+        stats_t counter = {};
+        const auto start = statistics ? std::chrono::steady_clock::now() : std::chrono::steady_clock::time_point();
+        // 开启统计时用于判断match失败是否由buffer_size不足导致的更大的缓冲区
+        const std::size_t probe_size = std::min<std::size_t>(2 * buffer_size, std::numeric_limits<length_t>::max());
+        auto probe = statistics ? std::unique_ptr<rule_t>(reinterpret_cast<rule_t*>(operator new(probe_size))) : nullptr;
+        auto overflowed = [&](rule_t* rule, rule_t* fact, rule_t* scratch) {
+            return scratch != nullptr && scratch->match(rule, fact, reinterpret_cast<std::byte*>(scratch) + probe_size) != nullptr;
+        };
 
         // RAII guard，确保无论是否提前退出，清理代码都会执行
         struct guard_t {
@@ -73,61 +715,560 @@ namespace ds {
             }
         } guard{[&]() {
             ++current_cycle;
-            for (auto it = temp_rules.begin(); it != temp_rules.end();) {
-                auto node = temp_rules.extract(it++);
-                rules.emplace(std::move(node.value()), current_cycle);
+            resume = cursor;
+            if (!retired.empty()) {
+                // 被移除的facts仍然留在known中，以免再次被推出
+                // 被提前结束时已有的facts暂时留在索引中，以免改变继续处理时候选的顺序
+                auto is_retired = [&](rule_t* fact) { return retired.contains(fact); };
+                std::erase_if(temp_facts, is_retired);
+                if (!resume.active) {
+                    fact_index.erase_if(is_retired);
+                    retired.clear();
+                }
+            }
+            std::sort(temp_rules.begin(), temp_rules.end(), less);
+            std::sort(temp_facts.begin(), temp_facts.end(), less);
+            for (auto rule : temp_rules) {
+                rule_index.insert(rule->premises(0), rule, current_cycle);
             }
-            for (auto it = temp_facts.begin(); it != temp_facts.end();) {
-                auto node = temp_facts.extract(it++);
-                facts.emplace(std::move(node.value()), current_cycle);
+            for (auto fact : temp_facts) {
+                fact_index.insert(fact->conclusion(), fact, current_cycle);
+            }
+            // 淘汰会改变索引，因此推迟到被提前结束的一轮完成之后
+            if (!resume.active) {
+                evict();
+            }
+            if (statistics) {
+                counter.cycle = current_cycle;
+                counter.bytes = storage.size();
+                counter.seconds = seconds_since(start);
+                history.push_back(counter);
             }
         }};
 
-        for (auto& [rule, rules_cycle] : rules) {
-            for (auto& [fact, facts_cycle] : facts) {
-                if (rules_cycle <= done_cycle && facts_cycle <= done_cycle) {
-                    continue;
+        // 查询已有facts和本轮新facts中所有可能与给定fact匹配的facts
+        std::vector<index_t::entry_t> related;
+        auto find_related = [&](rule_t* fact) {
+            related.clear();
+            fact_index.candidates(fact->conclusion(), related);
+            temp_index.candidates(fact->conclusion(), related);
+        };
+
+        // 如果结果是新的，则将其复制到storage中并存入temp，返回true；重复的结果不会分配任何内存
+        // rule和fact是产生此结果的rule和fact，只用于记录来源；entry是rule的性能分析数据，未开启时为nullptr
+        auto accept = [&](rule_t* candidate, rule_t* rule, rule_t* fact, profile_t* entry) -> bool {
+            // 只查找一次，如果不存在则直接插入到查找到的位置
+            std::size_t hash = set_t::hash(candidate);
+            auto slot = known.lookup(candidate, hash);
+            if (slot->rule != nullptr) {
+                ++counter.duplicates;
+                if (entry != nullptr) {
+                    ++entry->duplicates;
                 }
-                buffer->match(rule.get(), fact.get(), reinterpret_cast<std::byte*>(buffer.get()) + buffer_size);
-                if (!buffer->valid()) {
-                    continue;
+                support(slot->rule, rule, fact);
+                return false;
+            }
+            if (candidate->premises_count() == 0 && forward_subsumption) {
+                find_related(candidate);
+                for (auto& [general, general_cycle] : related) {
+                    if (general->subsume(candidate)) {
+                        ++counter.subsumed;
+                        if (entry != nullptr) {
+                            ++entry->subsumed;
+                        }
+                        return false;
+                    }
                 }
-                if (buffer->data_size() > limit_size) {
-                    continue;
+            }
+            if (candidate->premises_count() == 0 && !owns(candidate)) {
+                // 不属于本分片的fact只报告给调用者，由调用者转交给负责它的分片
+                ++counter.facts;
+                if (entry != nullptr) {
+                    ++entry->produced;
                 }
-                if (buffer->premises_count() != 0) {
-                    // rule
-                    if (rules.find(buffer) != rules.end() || temp_rules.find(buffer) != temp_rules.end()) {
-                        continue;
+                return true;
+            }
+            rule_t* new_rule = storage.copy(candidate);
+            known.insert(slot, new_rule, hash);
+            // 本轮的结果在本轮结束时以增加后的current_cycle加入索引
+            record(new_rule, rule, fact, current_cycle + 1);
+            if (entry != nullptr) {
+                ++entry->produced;
+            }
+            if (new_rule->premises_count() != 0) {
+                ++counter.rules;
+                temp_rules.push_back(new_rule);
+                return true;
+            }
+            ++counter.facts;
+            if (backward_subsumption) {
+                find_related(new_rule);
+                for (auto& [instance, instance_cycle] : related) {
+                    if (new_rule->subsume(instance)) {
+                        retired.insert(instance);
                     }
-                    auto new_rule = std::unique_ptr<rule_t>(reinterpret_cast<rule_t*>(operator new(buffer->data_size())));
-                    memcpy(new_rule.get(), buffer.get(), buffer->data_size());
-                    temp_rules.emplace(std::move(new_rule));
+                }
+            }
+            if (forward_subsumption || backward_subsumption) {
+                temp_index.insert(new_rule->conclusion(), new_rule, current_cycle);
+            }
+            temp_facts.push_back(new_rule);
+            return true;
+        };
+
+        // 开启性能分析时返回rule对应的数据，否则返回nullptr
+        auto profile_of = [&](rule_t* rule) -> profile_t* { return profiling ? &profiles[rule] : nullptr; };
+
+        // 对一组rule和fact进行match，如果得到了新的结果则将其存入temp中并返回true
+        auto try_match = [&](rule_t* rule, rule_t* fact) -> bool {
+            profile_t* entry = profile_of(rule);
+            const auto begin = entry != nullptr ? std::chrono::steady_clock::now() : std::chrono::steady_clock::time_point();
+            // 开启性能分析时将本次match花费的时间计入rule
+            auto finish = [&](bool result) {
+                if (entry != nullptr) {
+                    entry->seconds += seconds_since(begin);
+                }
+                return result;
+            };
+            ++counter.pairs;
+            ++budget_pairs;
+            if (entry != nullptr) {
+                ++entry->attempts;
+            }
+            buffer->match(rule, fact, reinterpret_cast<std::byte*>(buffer.get()) + buffer_size);
+            if (!buffer->valid()) {
+                ++counter.failures;
+                if (overflowed(rule, fact, probe.get())) {
+                    ++counter.overflows;
+                }
+                return finish(false);
+            }
+            if (entry != nullptr) {
+                ++entry->successes;
+            }
+            if (buffer->data_size() > limit_size) {
+                ++counter.oversize;
+                if (entry != nullptr) {
+                    ++entry->oversize;
+                }
+                return finish(false);
+            }
+            if (counting()) {
+                ++uses[fact];
+            }
+            return finish(accept(buffer.get(), rule, fact, entry));
+        };
+
+        if (priority) {
+            // 每次取出代价最小的一个进行处理，它只需要与已经激活的rules和facts进行match，然后被激活
+            // 每对rule和fact恰好在二者中较晚激活的一个被处理时match一次
+            std::vector<std::pair<rule_t*, length_t>> produced;
+            std::vector<index_t::entry_t> partners;
+            auto depth_of = [&](rule_t* rule) -> length_t {
+                auto it = depths.find(rule);
+                return it == depths.end() ? 0 : it->second;
+            };
+            // 预算在每次激活之前检查，已经取出的rule或fact总是被完整地处理并激活
+            while (produced.empty() && !pending.empty() && !over_budget(0, true)) {
+                std::pop_heap(pending.begin(), pending.end(), pending_greater);
+                pending_t given = pending.back();
+                pending.pop_back();
+                partners.clear();
+                if (given.rule->premises_count() != 0) {
+                    fact_index.candidates(given.rule->premises(0), partners);
+                    for (auto& [fact, facts_cycle] : partners) {
+                        if (try_match(given.rule, fact)) {
+                            rule_t* result = buffer->premises_count() != 0 ? temp_rules.back() : temp_facts.back();
+                            produced.emplace_back(result, std::max(given.depth, depth_of(fact)) + 1);
+                        }
+                    }
+                    rule_index.insert(given.rule->premises(0), given.rule, current_cycle);
                 } else {
-                    // fact
-                    if (facts.find(buffer) != facts.end() || temp_facts.find(buffer) != temp_facts.end()) {
-                        continue;
+                    rule_index.candidates(given.rule->conclusion(), partners);
+                    for (auto& [rule, rules_cycle] : partners) {
+                        if (try_match(rule, given.rule)) {
+                            rule_t* result = buffer->premises_count() != 0 ? temp_rules.back() : temp_facts.back();
+                            produced.emplace_back(result, std::max(given.depth, depth_of(rule)) + 1);
+                        }
                     }
-                    auto new_fact = std::unique_ptr<rule_t>(reinterpret_cast<rule_t*>(operator new(buffer->data_size())));
-                    memcpy(new_fact.get(), buffer.get(), buffer->data_size());
-                    temp_facts.emplace(std::move(new_fact));
+                    fact_index.insert(given.rule->conclusion(), given.rule, current_cycle);
                 }
-                co_yield buffer.get();
+                depths[given.rule] = given.depth;
+            }
+            // 新的结果进入等待堆而不是直接加入索引，在产生结果前全部入堆，保证提前停止时不会丢失
+            temp_rules.clear();
+            temp_facts.clear();
+            for (auto& [rule, depth] : produced) {
+                push_pending(rule, depth);
+            }
+            for (auto& [rule, depth] : produced) {
+                co_yield rule;
             }
+            done_cycle = current_cycle;
+            co_return;
         }
 
-        done_cycle = current_cycle;
+        // cycle大于done_cycle的rules和facts是新的，其余是旧的，旧rules与旧facts的组合已经处理过
+        // 在开始前记录下新的rules和facts，本轮产生的结果在结束时才会被合并进来
+        // 上一次被提前结束时，先以当时的current_cycle为上限从停下的组合继续完成那一轮，再开始新的一轮
+        std::vector<index_t::entry_t> new_rules;
+        std::vector<index_t::entry_t> new_facts;
+        std::vector<index_t::entry_t> candidates;
+        while (true) {
+            const bool resuming = resume.active;
+            const length_t limit = resuming ? resume.limit : current_cycle;
+            const std::size_t first_task = resuming ? resume.task : 0;
+            const std::size_t first_offset = resuming ? resume.offset : 0;
+            cursor = {.active = true, .limit = limit, .task = first_task, .offset = first_offset};
+            new_rules.clear();
+            new_facts.clear();
+            rule_index.recent(done_cycle, new_rules);
+            fact_index.recent(done_cycle, new_facts);
+            // 去掉被提前结束之后才加入的rules和facts，它们留到新的一轮中处理
+            auto later = [&](const index_t::entry_t& entry) { return entry.cycle > limit; };
+            std::erase_if(new_rules, later);
+            std::erase_if(new_facts, later);
+            if (statistics && !resuming) {
+                // 旧rules与旧facts的组合在之前的轮次中已经处理过
+                for (auto& [rule, rules_cycle] : rule_index.all()) {
+                    if (rules_cycle <= done_cycle) {
+                        candidates.clear();
+                        fact_index.candidates(rule->premises(0), candidates, done_cycle);
+                        counter.skipped += candidates.size();
+                    }
+                }
+            }
+
+            // 每个任务对应一个新rule或者一个新fact，新rules在前，新facts在后
+            // 新rule的候选是全部facts，新fact的候选是旧rules，cycle的上限保证继续处理时候选的顺序不变
+            const std::size_t task_count = new_rules.size() + new_facts.size();
+            auto collect = [&](std::size_t task, std::vector<index_t::entry_t>& result) {
+                if (task < new_rules.size()) {
+                    fact_index.candidates(new_rules[task].rule->premises(0), result, limit);
+                } else {
+                    rule_index.candidates(new_facts[task - new_rules.size()].rule->conclusion(), result, done_cycle);
+                }
+            };
+            // 任务与它的一个候选组成的rule和fact
+            auto pair_of = [&](std::size_t task, const index_t::entry_t& candidate) -> std::pair<rule_t*, rule_t*> {
+                if (task < new_rules.size()) {
+                    return {new_rules[task].rule, candidate.rule};
+                }
+                return {candidate.rule, new_facts[task - new_rules.size()].rule};
+            };
+
+            if (threads <= 1) {
+                for (std::size_t task = first_task; task < task_count; ++task) {
+                    candidates.clear();
+                    collect(task, candidates);
+                    cursor.task = task;
+                    for (std::size_t offset = task == first_task ? first_offset : 0; offset < candidates.size(); ++offset) {
+                        // 用完预算时直接结束，记录下这个组合的位置，下一次从这里继续
+                        cursor.offset = offset;
+                        if (over_budget(0, false)) {
+                            co_return;
+                        }
+                        // 产生结果后可能被提前停止，此时这个组合已经处理完毕
+                        cursor.offset = offset + 1;
+                        auto [rule, fact] = pair_of(task, candidates[offset]);
+                        if (try_match(rule, fact)) {
+                            co_yield buffer.get();
+                        }
+                    }
+                }
+            } else {
+                // 各线程并行match，每个任务的结果按顺序首尾相接地存放在该任务自己的结果中
+                // 之后在当前线程中按任务顺序依次去重，因此产生结果的顺序与串行时完全一致
+                const std::size_t batch_size = threads * tasks_per_thread;
+                std::vector<std::vector<std::byte>> results;
+                // 每个任务中每个结果对应的组合在该任务的候选中的位置，用于提前停止时记录继续处理的位置
+                std::vector<std::vector<std::size_t>> positions;
+                // 每个任务中参与成功match的facts，只在需要记录次数时使用，由当前线程统一计数
+                std::vector<std::vector<rule_t*>> used;
+                const bool count_uses = counting();
+                // 每个任务中每个结果对应的rule和fact，只在记录来源或者性能分析时使用
+                std::vector<std::vector<std::pair<rule_t*, rule_t*>>> sources;
+                const bool track_sources = provenance || profiling;
+                // 每个线程自己的统计数据和性能分析数据，在每批结束后合并
+                std::vector<stats_t> counters(threads);
+                std::vector<std::unordered_map<rule_t*, profile_t>> local_profiles(threads);
+                if (statistics) {
+                    for (auto& scratch_probe : probes) {
+                        if (scratch_probe == nullptr) {
+                            scratch_probe = std::unique_ptr<rule_t>(reinterpret_cast<rule_t*>(operator new(probe_size)));
+                        }
+                    }
+                }
+                for (std::size_t begin = first_task; begin < task_count; begin += batch_size) {
+                    // 预算在每批开始前检查
+                    cursor.task = begin;
+                    cursor.offset = begin == first_task ? first_offset : 0;
+                    if (over_budget(0, true)) {
+                        co_return;
+                    }
+                    const std::size_t end = std::min(begin + batch_size, task_count);
+                    results.resize(end - begin);
+                    positions.resize(end - begin);
+                    used.resize(end - begin);
+                    sources.resize(end - begin);
+                    for (auto& result : results) {
+                        result.clear();
+                    }
+                    for (auto& places : positions) {
+                        places.clear();
+                    }
+                    for (auto& facts : used) {
+                        facts.clear();
+                    }
+                    for (auto& pairs : sources) {
+                        pairs.clear();
+                    }
+                    std::atomic<std::size_t> next = begin;
+                    auto worker = [&](std::size_t index) {
+                        rule_t* scratch = scratches[index].get();
+                        rule_t* scratch_probe = statistics ? probes[index].get() : nullptr;
+                        stats_t& local = counters[index];
+                        auto& local_profile = local_profiles[index];
+                        std::vector<index_t::entry_t> scratch_candidates;
+                        auto scratch_match = [&](rule_t* rule,
+                                                 rule_t* fact,
+                                                 std::size_t offset,
+                                                 std::vector<std::byte>& result,
+                                                 std::vector<std::size_t>& places,
+                                                 std::vector<rule_t*>& facts,
+                                                 std::vector<std::pair<rule_t*, rule_t*>>& pairs) {
+                            profile_t* entry = profiling ? &local_profile[rule] : nullptr;
+                            const auto begin = entry != nullptr ? std::chrono::steady_clock::now() : std::chrono::steady_clock::time_point();
+                            auto finish = [&]() {
+                                if (entry != nullptr) {
+                                    entry->seconds += seconds_since(begin);
+                                }
+                            };
+                            ++local.pairs;
+                            if (entry != nullptr) {
+                                ++entry->attempts;
+                            }
+                            scratch->match(rule, fact, reinterpret_cast<std::byte*>(scratch) + buffer_size);
+                            if (!scratch->valid()) {
+                                ++local.failures;
+                                if (overflowed(rule, fact, scratch_probe)) {
+                                    ++local.overflows;
+                                }
+                                return finish();
+                            }
+                            if (entry != nullptr) {
+                                ++entry->successes;
+                            }
+                            if (scratch->data_size() > limit_size) {
+                                ++local.oversize;
+                                if (entry != nullptr) {
+                                    ++entry->oversize;
+                                }
+                                return finish();
+                            }
+                            if (count_uses) {
+                                facts.push_back(fact);
+                            }
+                            // 并行阶段没有线程修改known，可以安全地查询，提前过滤掉之前轮次已有的结果
+                            // 记录来源时重复的结果也需要记录为其他来源，因此留到合并时处理
+                            if (!provenance && known.lookup(scratch, set_t::hash(scratch))->rule != nullptr) {
+                                ++local.duplicates;
+                                if (entry != nullptr) {
+                                    ++entry->duplicates;
+                                }
+                                return finish();
+                            }
+                            auto head = reinterpret_cast<std::byte*>(scratch);
+                            result.insert(result.end(), head, head + scratch->data_size());
+                            places.push_back(offset);
+                            if (track_sources) {
+                                pairs.emplace_back(rule, fact);
+                            }
+                            finish();
+                        };
+                        for (std::size_t task = next++; task < end; task = next++) {
+                            auto& result = results[task - begin];
+                            auto& places = positions[task - begin];
+                            auto& facts = used[task - begin];
+                            auto& pairs = sources[task - begin];
+                            scratch_candidates.clear();
+                            collect(task, scratch_candidates);
+                            for (std::size_t offset = task == first_task ? first_offset : 0; offset < scratch_candidates.size(); ++offset) {
+                                auto [rule, fact] = pair_of(task, scratch_candidates[offset]);
+                                scratch_match(rule, fact, offset, result, places, facts, pairs);
+                            }
+                        }
+                    };
+                    pool.run(std::min<std::size_t>(threads, end - begin), worker);
+                    for (auto& facts : used) {
+                        for (auto fact : facts) {
+                            ++uses[fact];
+                        }
+                    }
+                    for (auto& local : counters) {
+                        counter.pairs += local.pairs;
+                        budget_pairs += local.pairs;
+                        counter.failures += local.failures;
+                        counter.overflows += local.overflows;
+                        counter.oversize += local.oversize;
+                        counter.duplicates += local.duplicates;
+                        local = {};
+                    }
+                    for (auto& table : local_profiles) {
+                        for (auto& [rule, part] : table) {
+                            merge(profiles[rule], part);
+                        }
+                        table.clear();
+                    }
+                    for (std::size_t task = 0; task < results.size(); ++task) {
+                        auto& result = results[task];
+                        cursor.task = begin + task;
+                        std::size_t index = 0;
+                        for (std::size_t offset = 0; offset < result.size(); ++index) {
+                            auto candidate = reinterpret_cast<rule_t*>(result.data() + offset);
+                            offset += candidate->data_size();
+                            auto [rule, fact] = track_sources ? sources[task][index] : std::pair<rule_t*, rule_t*>(nullptr, nullptr);
+                            // 产生结果后可能被提前停止，下一次从这个结果对应的组合之后继续
+                            cursor.offset = positions[task][index] + 1;
+                            if (accept(candidate, rule, fact, profile_of(rule))) {
+                                co_yield candidate;
+                            }
+                        }
+                    }
+                }
+            }
+
+            // 这一轮已经完成
+            done_cycle = limit;
+            cursor.active = false;
+            if (!resuming) {
+                break;
+            }
+            // 被推迟删除的facts在继续完成的那一轮结束时离开索引，新的一轮不再使用它们
+            resume.active = false;
+            if (!retired.empty()) {
+                fact_index.erase_if([&](rule_t* fact) { return retired.contains(fact); });
+            }
+        }
         co_return;
     }
 
     length_t search_t::execute(const std::function<bool(rule_t*)>& callback) {
+        return execute(callback, {});
+    }
+
+    length_t search_t::execute(const std::function<bool(rule_t*)>& callback, const budget_t& _budget) {
+        begin_budget(_budget);
         length_t count = 0;
         for (auto* rule : iterator()) {
             ++count;
-            if (callback(rule)) {
+            if (callback(rule) || over_budget(count, true)) {
                 break;
             }
         }
+        budget = {};
         return count;
     }
+
+    std::size_t search_t::saturate(length_t max_cycles, const budget_t& _budget) {
+        begin_budget(_budget);
+        std::size_t total = 0;
+        for (length_t cycle = 0; max_cycles <= 0 || cycle < max_cycles; ++cycle) {
+            length_t count = 0;
+            for ([[maybe_unused]] auto* rule : iterator()) {
+                ++count;
+                if (over_budget(total + count, false)) {
+                    break;
+                }
+            }
+            total += count;
+            if (count == 0 || budget_exhausted) {
+                break;
+            }
+        }
+        budget = {};
+        return total;
+    }
+
+    std::unique_ptr<rule_t> search_t::find(const std::vector<rule_t*>& targets, bool patterns, length_t max_cycles) {
+        set_t exact;
+        if (!patterns) {
+            for (auto* target : targets) {
+                std::size_t hash = set_t::hash(target);
+                auto slot = exact.lookup(target, hash);
+                if (slot->rule == nullptr) {
+                    exact.insert(slot, target, hash);
+                }
+            }
+        }
+        auto hit = [&](rule_t* candidate) -> bool {
+            if (patterns) {
+                return std::any_of(targets.begin(), targets.end(), [candidate](rule_t* target) { return target->subsume(candidate); });
+            }
+            return exact.lookup(candidate, set_t::hash(candidate))->rule != nullptr;
+        };
+        for (length_t cycle = 0; max_cycles <= 0 || cycle < max_cycles; ++cycle) {
+            length_t count = 0;
+            for (auto* candidate : iterator()) {
+                ++count;
+                if (hit(candidate)) {
+                    // 在结束本轮之前复制结果，因为设置了容量时本轮结束后storage可能被重新分配
+                    auto result = std::unique_ptr<rule_t>(reinterpret_cast<rule_t*>(operator new(candidate->data_size())));
+                    std::memcpy(result.get(), candidate, candidate->data_size());
+                    return result;
+                }
+            }
+            if (count == 0) {
+                break;
+            }
+        }
+        return nullptr;
+    }
+
+    std::vector<search_t::step_t> search_t::proof(rule_t* rule) {
+        std::vector<step_t> result;
+        auto found = known.lookup(rule, set_t::hash(rule));
+        if (found->rule == nullptr) {
+            return result;
+        }
+        auto it = ids.find(found->rule);
+        if (it == ids.end()) {
+            return result;
+        }
+        // 后序遍历来源构成的有向无环图，使得每一步的来源都排在它之前，共同的来源只出现一次
+        std::unordered_map<std::uint32_t, std::size_t> positions;
+        std::vector<std::pair<std::uint32_t, bool>> stack = {{it->second, false}};
+        auto known_parent = [&](std::uint32_t id) { return id != no_origin && origins[id].rule != nullptr; };
+        while (!stack.empty()) {
+            auto [id, expanded] = stack.back();
+            stack.pop_back();
+            if (positions.contains(id)) {
+                continue;
+            }
+            const origin_t& origin = origins[id];
+            if (!expanded) {
+                stack.emplace_back(id, true);
+                for (auto parent : {origin.parent_fact, origin.parent_rule}) {
+                    if (known_parent(parent) && !positions.contains(parent)) {
+                        stack.emplace_back(parent, false);
+                    }
+                }
+                continue;
+            }
+            auto position_of = [&](std::uint32_t parent) -> std::optional<std::size_t> {
+                if (!known_parent(parent)) {
+                    return std::nullopt;
+                }
+                return positions.at(parent);
+            };
+            positions.emplace(id, result.size());
+            result.push_back(
+                {.rule = origin.rule,
+                 .parent_rule = position_of(origin.parent_rule),
+                 .parent_fact = position_of(origin.parent_fact),
+                 .cycle = origin.cycle}
+            );
+        }
+        return result;
+    }
 } // namespace ds
@@ -0,0 +1,69 @@
+#include <cstring>
+#include <functional>
+#include <string_view>
+
+#include <ds/set.hh>
+
+namespace ds {
+    namespace {
+        /// @brief 初始的位置数目，必须是2的幂。
+        constexpr std::size_t initial_capacity = 16;
+    } // namespace
+
+    std::size_t set_t::hash(rule_t* rule) {
+        return std::hash<std::string_view>()(std::string_view(reinterpret_cast<const char*>(rule->head()), rule->data_size()));
+    }
+
+    set_t::set_t() {
+        clear();
+    }
+
+    void set_t::clear() {
+        slots.assign(initial_capacity, slot_t{.hash = 0, .rule = nullptr});
+        count = 0;
+    }
+
+    std::size_t set_t::size() {
+        return count;
+    }
+
+    set_t::slot_t* set_t::lookup(rule_t* rule, std::size_t hash) {
+        const std::size_t mask = slots.size() - 1;
+        const length_t size = rule->data_size();
+        // 集合的负载始终低于3/4，所以一定能找到空位置
+        for (std::size_t position = hash & mask;; position = (position + 1) & mask) {
+            slot_t* slot = &slots[position];
+            if (slot->rule == nullptr) {
+                return slot;
+            }
+            if (slot->hash == hash && slot->rule->data_size() == size && memcmp(slot->rule->head(), rule->head(), size) == 0) {
+                return slot;
+            }
+        }
+    }
+
+    void set_t::insert(slot_t* slot, rule_t* rule, std::size_t hash) {
+        slot->hash = hash;
+        slot->rule = rule;
+        ++count;
+        if (count * 4 >= slots.size() * 3) {
+            grow();
+        }
+    }
+
+    void set_t::grow() {
+        std::vector<slot_t> old_slots(slots.size() * 2, slot_t{.hash = 0, .rule = nullptr});
+        old_slots.swap(slots);
+        const std::size_t mask = slots.size() - 1;
+        for (auto& old_slot : old_slots) {
+            if (old_slot.rule == nullptr) {
+                continue;
+            }
+            std::size_t position = old_slot.hash & mask;
+            while (slots[position].rule != nullptr) {
+                position = (position + 1) & mask;
+            }
+            slots[position] = old_slot;
+        }
+    }
+} // namespace ds
@@ -0,0 +1,146 @@
+#include <cstring>
+#include <fstream>
+#include <string>
+
+#include <ds/snapshot.hh>
+
+namespace ds {
+    namespace {
+        /// @brief 文件开头的标识。
+        constexpr char magic[8] = {'d', 's', '-', 's', 'n', 'a', 'p', '\0'};
+
+        /// @brief 将条目的长度向上取整，使得下一个条目按照length_t对齐。
+        /// @param size 条目的长度。
+        /// @return 取整后的长度。
+        std::size_t align(std::size_t size) {
+            return (size + alignof(length_t) - 1) / alignof(length_t) * alignof(length_t);
+        }
+
+        /// @brief 向文件中写入一个值的原始数据。
+        template<typename T>
+        void write_value(std::ofstream& file, const T& value) {
+            file.write(reinterpret_cast<const char*>(&value), sizeof(T));
+        }
+
+        /// @brief 从文件中读取一个值的原始数据。
+        /// @return 如果读取成功则返回true，否则返回false。
+        template<typename T>
+        bool read_value(std::ifstream& file, T& value) {
+            return static_cast<bool>(file.read(reinterpret_cast<char*>(&value), sizeof(T)));
+        }
+    } // namespace
+
+    bool snapshot_t::save(std::string_view path) {
+        std::ofstream file(std::string(path), std::ios::binary | std::ios::trunc);
+        if (!file) {
+            return false;
+        }
+        file.write(magic, sizeof(magic));
+        write_value(file, version);
+        write_value(file, kind);
+        write_value(file, static_cast<std::uint32_t>(sizeof(length_t)));
+        write_value(file, static_cast<std::uint32_t>(state.size()));
+        write_value(file, static_cast<std::uint32_t>(sections.size()));
+        for (auto value : state) {
+            write_value(file, value);
+        }
+        std::uint64_t payload_size = 0;
+        for (auto& section : sections) {
+            write_value(file, static_cast<std::uint64_t>(section.size()));
+            for (auto& entry : section) {
+                payload_size += align(2 * sizeof(length_t) + entry.rule->data_size());
+            }
+        }
+        write_value(file, payload_size);
+        const char padding[alignof(length_t)] = {};
+        for (auto& section : sections) {
+            for (auto& entry : section) {
+                const std::size_t size = entry.rule->data_size();
+                write_value(file, entry.cycle);
+                write_value(file, entry.depth);
+                file.write(reinterpret_cast<const char*>(entry.rule->head()), size);
+                file.write(padding, align(size) - size);
+            }
+        }
+        return static_cast<bool>(file.flush());
+    }
+
+    bool snapshot_t::load(std::string_view path, arena_t& storage) {
+        std::ifstream file(std::string(path), std::ios::binary);
+        if (!file) {
+            return false;
+        }
+        char file_magic[sizeof(magic)];
+        std::uint32_t file_version;
+        std::uint32_t file_kind;
+        std::uint32_t length_size;
+        std::uint32_t state_count;
+        std::uint32_t section_count;
+        if (!file.read(file_magic, sizeof(file_magic)) || std::memcmp(file_magic, magic, sizeof(magic)) != 0) {
+            return false;
+        }
+        if (!read_value(file, file_version) || !read_value(file, file_kind) || !read_value(file, length_size) || !read_value(file, state_count) ||
+            !read_value(file, section_count)) {
+            return false;
+        }
+        if (file_version != version || file_kind != kind || length_size != sizeof(length_t)) {
+            return false;
+        }
+        state.assign(state_count, 0);
+        for (auto& value : state) {
+            if (!read_value(file, value)) {
+                return false;
+            }
+        }
+        std::vector<std::uint64_t> section_sizes(section_count);
+        for (auto& section_size : section_sizes) {
+            if (!read_value(file, section_size)) {
+                return false;
+            }
+        }
+        std::uint64_t payload_size;
+        if (!read_value(file, payload_size)) {
+            return false;
+        }
+        // 在分配内存前确认文件中确实有这么多数据，避免损坏的文件导致过大的分配
+        const auto position = file.tellg();
+        file.seekg(0, std::ios::end);
+        if (file.tellg() - position != static_cast<std::streamoff>(payload_size)) {
+            return false;
+        }
+        file.seekg(position);
+
+        // 条目部分一次性读入内存池，之后的rule直接使用这块内存
+        std::byte* payload = storage.allocate(payload_size);
+        if (!file.read(reinterpret_cast<char*>(payload), payload_size)) {
+            return false;
+        }
+        std::byte* end = payload + payload_size;
+        std::byte* current = payload;
+        sections.assign(section_count, {});
+        for (std::uint32_t index = 0; index < section_count; ++index) {
+            auto& section = sections[index];
+            for (std::uint64_t count = 0; count < section_sizes[index]; ++count) {
+                // 在读取rule的长度前，先确认条目的头部和rule的各个term_size都在文件范围内
+                if (end - current < static_cast<std::ptrdiff_t>(3 * sizeof(length_t))) {
+                    return false;
+                }
+                entry_t entry;
+                std::memcpy(&entry.cycle, current, sizeof(length_t));
+                std::memcpy(&entry.depth, current + sizeof(length_t), sizeof(length_t));
+                entry.rule = reinterpret_cast<rule_t*>(current + 2 * sizeof(length_t));
+                const length_t list_size = entry.rule->premises_count() + 1;
+                if (list_size <= 0 || end - entry.rule->head() < static_cast<std::ptrdiff_t>(sizeof(length_t) * (list_size + 1))) {
+                    return false;
+                }
+                const length_t size = entry.rule->data_size();
+                if (size <= 0 || end - entry.rule->head() < size) {
+                    return false;
+                }
+                current += align(2 * sizeof(length_t) + size);
+                section.push_back(entry);
+            }
+        }
+        return current == end;
+    }
+} // namespace ds
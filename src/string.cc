@@ -60,6 +60,13 @@ namespace ds {
         return sizeof(length_t) + sizeof(char) * get_length();
     }
 
+    bool string_t::equal(string_t* other) {
+        if (get_length() != other->get_length()) {
+            return false;
+        }
+        return memcmp(get_string(), other->get_string(), get_length()) == 0;
+    }
+
     std::byte* string_t::head() {
         return reinterpret_cast<std::byte*>(this);
     }
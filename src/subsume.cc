@@ -0,0 +1,68 @@
+#include <cstring>
+#include <vector>
+
+#include <ds/list.hh>
+#include <ds/rule.hh>
+#include <ds/string.hh>
+#include <ds/term.hh>
+#include <ds/variable.hh>
+
+namespace ds {
+    namespace {
+        // 与match不同，这里是单向的匹配：只替换general一侧的变量，instance一侧的变量被视为常量。
+        struct subsume_binding_t {
+            string_t* name;
+            term_t* value;
+        };
+
+        bool subsume(term_t* general, term_t* instance, std::vector<subsume_binding_t>& bindings) {
+            if (general->get_type() == term_type_t::variable) {
+                string_t* name = general->variable()->name();
+                for (auto& binding : bindings) {
+                    if (binding.name->equal(name)) {
+                        // 同一个变量必须被替换为相同的term
+                        return binding.value->data_size() == instance->data_size() && memcmp(binding.value, instance, instance->data_size()) == 0;
+                    }
+                }
+                bindings.push_back({.name = name, .value = instance});
+                return true;
+            }
+            if (general->get_type() != instance->get_type()) {
+                return false;
+            }
+            if (general->get_type() == term_type_t::list) {
+                list_t* list_1 = general->list();
+                list_t* list_2 = instance->list();
+                if (list_1->get_list_size() != list_2->get_list_size()) {
+                    return false;
+                }
+                for (length_t index = 0; index < list_1->get_list_size(); ++index) {
+                    if (!subsume(list_1->term(index), list_2->term(index), bindings)) {
+                        return false;
+                    }
+                }
+                return true;
+            }
+            return general->data_size() == instance->data_size() && memcmp(general, instance, instance->data_size()) == 0;
+        }
+    } // namespace
+
+    bool term_t::subsume(term_t* instance) {
+        std::vector<subsume_binding_t> bindings;
+        return ds::subsume(this, instance, bindings);
+    }
+
+    bool rule_t::subsume(rule_t* instance) {
+        if (get_list_size() != instance->get_list_size()) {
+            return false;
+        }
+        // 整个rule共享同一组替换
+        std::vector<subsume_binding_t> bindings;
+        for (length_t index = 0; index < get_list_size(); ++index) {
+            if (!ds::subsume(term(index), instance->term(index), bindings)) {
+                return false;
+            }
+        }
+        return true;
+    }
+} // namespace ds
@@ -1,3 +1,6 @@
+#include <fstream>
+#include <iterator>
+
 #include <ds/utility.hh>
 
 namespace ds {
@@ -42,4 +45,42 @@ namespace ds {
         *print_result = '\0';
         return std::unique_ptr<char>(result);
     }
+
+    bool read_paragraphs(std::string_view path, std::string& text, std::vector<const char*>& paragraphs) {
+        std::ifstream file(std::string(path), std::ios::binary);
+        if (!file) {
+            return false;
+        }
+        text.assign(std::istreambuf_iterator<char>(file), std::istreambuf_iterator<char>());
+        if (file.bad()) {
+            return false;
+        }
+        // 先记录每段的起始位置，最后再取指针，因为之后不会再修改text的长度
+        std::vector<std::size_t> begins;
+        std::size_t begin = std::string::npos;
+        for (std::size_t position = 0; position < text.size();) {
+            std::size_t end = text.find('\n', position);
+            if (end == std::string::npos) {
+                end = text.size();
+            }
+            if (text.find_first_not_of(" \t\r", position) >= end) {
+                if (begin != std::string::npos) {
+                    // 空行之前一定是上一行的换行符
+                    text[position - 1] = '\0';
+                    begins.push_back(begin);
+                    begin = std::string::npos;
+                }
+            } else if (begin == std::string::npos) {
+                begin = position;
+            }
+            position = end + 1;
+        }
+        if (begin != std::string::npos) {
+            begins.push_back(begin);
+        }
+        for (auto offset : begins) {
+            paragraphs.push_back(text.data() + offset);
+        }
+        return true;
+    }
 } // namespace ds
@@ -0,0 +1,42 @@
+#include <cstring>
+#include <string>
+#include <vector>
+
+#include <ds/arena.hh>
+#include <ds/utility.hh>
+#include <gtest/gtest.h>
+
+TEST(TestArena, copy) {
+    auto a = ds::text_to_rule("(a b)", 1000);
+    auto b = ds::text_to_rule("`x\n----\n(f `x)\n", 1000);
+    ds::arena_t arena;
+    EXPECT_EQ(arena.size(), 0);
+
+    auto a_copy = arena.copy(a.get());
+    auto b_copy = arena.copy(b.get());
+    EXPECT_NE(a_copy, a.get());
+    EXPECT_EQ(a_copy->data_size(), a->data_size());
+    EXPECT_EQ(memcmp(a_copy, a.get(), a->data_size()), 0);
+    EXPECT_EQ(memcmp(b_copy, b.get(), b->data_size()), 0);
+    EXPECT_EQ(arena.size(), a->data_size() + b->data_size());
+
+    arena.reset();
+    EXPECT_EQ(arena.size(), 0);
+}
+
+TEST(TestArena, blocks) {
+    ds::arena_t arena;
+    std::vector<std::string> texts;
+    std::vector<ds::rule_t*> copies;
+    for (int i = 0; i < 10000; ++i) {
+        texts.push_back("(f " + std::to_string(i) + ")");
+        auto rule = ds::text_to_rule(texts.back().c_str(), 1000);
+        copies.push_back(arena.copy(rule.get()));
+    }
+    // 超过块大小的分配单独占用一个块
+    auto large = arena.allocate(ds::arena_t::block_size * 2);
+    memset(large, 0, ds::arena_t::block_size * 2);
+    for (int i = 0; i < 10000; ++i) {
+        EXPECT_STREQ(ds::rule_to_text(copies[i], 1000).get(), ("----\n" + texts[i] + "\n").c_str());
+    }
+}
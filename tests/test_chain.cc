@@ -1,3 +1,8 @@
+#include <filesystem>
+#include <fstream>
+#include <string>
+#include <vector>
+
 #include <ds/chain.hh>
 #include <ds/utility.hh>
 #include <gtest/gtest.h>
@@ -160,3 +165,210 @@ TEST_F(TestChain, iterator) {
     }
     EXPECT_EQ(count, 2);
 }
+
+TEST_F(TestChain, forward_subsumption) {
+    chain->set_subsumption(true, false);
+    chain->add("(`p -> `q)");
+    chain->add("x");
+    chain->add("x (a -> b)");
+    chain->add("x (c d)");
+    EXPECT_EQ(chain->execute([](ds::rule_t* rule) { return false; }), 1);
+}
+
+TEST_F(TestChain, backward_subsumption) {
+    chain->set_subsumption(false, true);
+    chain->add("(a -> b)");
+    chain->add("x");
+    chain->add("x (`p -> `q)");
+    EXPECT_EQ(chain->execute([](ds::rule_t* rule) { return false; }), 1);
+    // (a -> b)已经被移除，只有更一般的fact参与之后的匹配
+    chain->add("(`x -> b) (got `x)");
+    EXPECT_EQ(chain->execute([](ds::rule_t* rule) { return false; }), 1);
+}
+
+TEST_F(TestChain, save_and_load) {
+    auto path = (std::filesystem::temp_directory_path() / "ds_test_chain_save_and_load.bin").string();
+    auto run = [this](ds::chain_t& chain) {
+        std::vector<std::string> result;
+        while (chain.execute([&](ds::rule_t* rule) {
+            result.push_back(ds::rule_to_text(rule, buffer_size).get());
+            return false;
+        })) {
+        }
+        return result;
+    };
+    chain->add("p q r");
+    chain->add("r s");
+    chain->add("p");
+    chain->add("q");
+    EXPECT_EQ(chain->execute([](ds::rule_t* rule) { return false; }), 2);
+    EXPECT_TRUE(chain->save(path));
+
+    ds::chain_t loaded(limit_size, buffer_size);
+    EXPECT_TRUE(loaded.load(path));
+    auto expected = run(*chain);
+    EXPECT_FALSE(expected.empty());
+    EXPECT_EQ(run(loaded), expected);
+    std::filesystem::remove(path);
+    EXPECT_FALSE(loaded.load(path));
+}
+
+TEST_F(TestChain, add_binary) {
+    auto rule = ds::text_to_rule("p q r", limit_size);
+    EXPECT_TRUE(chain->add(rule.get()));
+    EXPECT_EQ(chain->add_many({"p", "q"}), (std::vector<bool>{true, true}));
+    auto path = (std::filesystem::temp_directory_path() / "ds_test_chain_add_file.txt").string();
+    std::ofstream(path) << "r\n----\ns\n";
+    EXPECT_EQ(chain->add_file(path), (std::vector<bool>{true}));
+    std::filesystem::remove(path);
+    EXPECT_EQ(chain->execute([](ds::rule_t* rule) { return false; }), 2);
+}
+
+TEST_F(TestChain, stats) {
+    chain->set_statistics(true);
+    chain->add("p q r");
+    chain->add("p");
+    chain->add("q");
+    EXPECT_EQ(chain->execute([](ds::rule_t* rule) { return false; }), 2);
+    auto& stats = chain->stats();
+    ASSERT_EQ(stats.size(), 1);
+    // p q r本身不是match的结果，q r和r是新的
+    EXPECT_EQ(stats[0].pairs, 2);
+    EXPECT_EQ(stats[0].duplicates, 0);
+    EXPECT_EQ(stats[0].rules, 1);
+    EXPECT_EQ(stats[0].facts, 1);
+    EXPECT_GT(stats[0].bytes, 0);
+    // 上一轮产生了新的fact，只需要处理用到新fact的组合，之后rules和facts都已经处理过
+    // 新的fact r不可能匹配任何一个premise，因此不需要进行任何match
+    chain->execute([](ds::rule_t* rule) { return false; });
+    EXPECT_EQ(chain->execute([](ds::rule_t* rule) { return false; }), 0);
+    ASSERT_EQ(stats.size(), 3);
+    EXPECT_EQ(stats[1].pairs, 0);
+    EXPECT_EQ(stats[1].skipped, 1);
+    EXPECT_EQ(stats[1].facts, 0);
+    EXPECT_EQ(stats[2].pairs, 0);
+    EXPECT_EQ(stats[2].skipped, 1);
+    chain->set_statistics(false);
+    EXPECT_TRUE(chain->stats().empty());
+}
+
+TEST_F(TestChain, profile) {
+    chain->set_profiling(true);
+    chain->add("p q r");
+    chain->add("p r s");
+    chain->add("(t `x) (u `x)");
+    chain->add("p");
+    chain->add("q");
+    chain->execute([](ds::rule_t* rule) { return false; });
+    auto profile = chain->profile();
+    ASSERT_EQ(profile.size(), 3);
+    std::size_t total = 0;
+    for (auto& entry : profile) {
+        EXPECT_LE(entry.successes, entry.attempts);
+        EXPECT_GE(entry.seconds, 0);
+        total += entry.produced;
+        if (entry.rule->premises_count() == 1) {
+            // 没有可以匹配的fact
+            EXPECT_EQ(entry.attempts, 0);
+            EXPECT_EQ(entry.produced, 0);
+        }
+    }
+    // q r、r和r s，r在本轮结束后才加入索引，因此s要在下一轮才能推出
+    EXPECT_EQ(total, 3);
+    chain->set_profiling(false);
+    EXPECT_EQ(chain->profile()[0].attempts, 0);
+}
+
+TEST_F(TestChain, semi_naive) {
+    chain->set_statistics(true);
+    chain->add("(a `x) (b `y) (c `x `y)");
+    for (int i = 0; i < 10; ++i) {
+        chain->add(("(a " + std::to_string(i) + ")").c_str());
+        chain->add(("(b " + std::to_string(i) + ")").c_str());
+    }
+    // 10个中间rules和100个facts
+    EXPECT_EQ(chain->execute([](ds::rule_t* rule) { return false; }), 110);
+    EXPECT_EQ(chain->execute([](ds::rule_t* rule) { return false; }), 0);
+    chain->add("(b 10)");
+    std::vector<std::string> results;
+    EXPECT_EQ(
+        chain->execute([this, &results](ds::rule_t* rule) {
+            results.push_back(ds::rule_to_text(rule, buffer_size).get());
+            return false;
+        }),
+        10
+    );
+    for (auto& text : results) {
+        EXPECT_NE(text.find(" 10)"), std::string::npos);
+    }
+    // 只有新的fact与各个中间rule进行了match，旧的组合都被跳过
+    auto& stats = chain->stats();
+    ASSERT_EQ(stats.size(), 3);
+    EXPECT_EQ(stats[2].pairs, 10 + 10);
+    EXPECT_EQ(stats[2].skipped, 100);
+}
+
+TEST_F(TestChain, semi_naive_first_premise) {
+    chain->set_statistics(true);
+    chain->add("(a `x) (b `y) (c `x `y)");
+    for (int i = 0; i < 10; ++i) {
+        chain->add(("(a " + std::to_string(i) + ")").c_str());
+        chain->add(("(b " + std::to_string(i) + ")").c_str());
+    }
+    EXPECT_EQ(chain->execute([](ds::rule_t* rule) { return false; }), 110);
+    EXPECT_EQ(chain->execute([](ds::rule_t* rule) { return false; }), 0);
+    chain->add("(a 10)");
+    // 第二个premise没有可能匹配的新facts，第一个premise只取新fact，旧facts开始的组合不再逐个展开
+    EXPECT_EQ(chain->execute([](ds::rule_t* rule) { return false; }), 11);
+    auto& stats = chain->stats();
+    ASSERT_EQ(stats.size(), 3);
+    EXPECT_EQ(stats[2].pairs, 1 + 10);
+    EXPECT_EQ(stats[2].skipped, 10);
+}
+
+TEST_F(TestChain, join_ordering) {
+    auto run = [this](bool join_ordering) {
+        ds::chain_t engine(limit_size, buffer_size);
+        engine.set_join_ordering(join_ordering);
+        engine.set_statistics(true);
+        engine.add("(big `x) (small `x) (both `x)");
+        engine.add("(big `x) (none `x) (never `x)");
+        for (int i = 0; i < 20; ++i) {
+            engine.add(("(big " + std::to_string(i) + ")").c_str());
+        }
+        engine.add("(small 3)");
+        std::vector<std::string> facts;
+        while (engine.execute([this, &facts](ds::rule_t* rule) {
+            if (rule->premises_count() == 0) {
+                facts.push_back(ds::rule_to_text(rule, buffer_size).get());
+            }
+            return false;
+        })) {
+        }
+        return std::make_pair(facts, engine.stats()[0].pairs);
+    };
+    auto [ordered, ordered_pairs] = run(true);
+    auto [plain, plain_pairs] = run(false);
+    EXPECT_EQ(ordered, plain);
+    EXPECT_EQ(ordered, (std::vector<std::string>{"----\n(both 3)\n"}));
+    // 先匹配只有一个fact的(small `x)，没有facts的(none `x)使得第二个rule不必match
+    EXPECT_EQ(ordered_pairs, 2);
+    EXPECT_EQ(plain_pairs, 41);
+}
+
+TEST_F(TestChain, many_premises) {
+    chain->set_limit_size(200);
+    chain->add("(p `a) (p `b) (p `c) (p `d) (q `a `b `c `d)");
+    chain->add("(p 0)");
+    chain->add("(p 1)");
+    // 各层的中间rules：2 + 4 + 8个，以及16个facts
+    EXPECT_EQ(chain->execute([](ds::rule_t* rule) { return false; }), 2 + 4 + 8 + 16);
+    EXPECT_EQ(chain->execute([](ds::rule_t* rule) { return false; }), 0);
+    chain->add("(p 2)");
+    std::size_t facts = 0;
+    chain->execute([&facts](ds::rule_t* rule) {
+        facts += rule->premises_count() == 0;
+        return false;
+    });
+    EXPECT_EQ(facts, 81 - 16);
+}
@@ -148,3 +148,94 @@ test("iterator", () => {
     }
     expect(count).toBe(expected.length);
 });
+
+test("forward_subsumption", () => {
+    chain.set_subsumption(true);
+    chain.add("(`p -> `q)");
+    chain.add("x");
+    chain.add("x (a -> b)");
+    chain.add("x (c d)");
+    expect(chain.execute((rule) => false)).toBe(1);
+});
+
+test("backward_subsumption", () => {
+    chain.set_subsumption(false, true);
+    chain.add("(a -> b)");
+    chain.add("x");
+    chain.add("x (`p -> `q)");
+    expect(chain.execute((rule) => false)).toBe(1);
+    chain.add("(`x -> b) (got `x)");
+    expect(chain.execute((rule) => false)).toBe(1);
+});
+
+test("join_ordering", () => {
+    chain.set_join_ordering(true);
+    chain.add("(big `x) (small `x) (both `x)");
+    for (let i = 0; i < 5; ++i) {
+        chain.add(`(big ${i})`);
+    }
+    chain.add("(small 3)");
+    const results = [];
+    chain.execute((rule) => {
+        results.push(rule.toString());
+        return false;
+    });
+    expect(results).toEqual(["(big 3)\n-------\n(both 3)\n", "----\n(both 3)\n"]);
+});
+
+test("save_and_load", () => {
+    chain.add("p q r");
+    chain.add("r s");
+    chain.add("p");
+    chain.add("q");
+    expect(chain.save("/tmp/chain.bin")).toBe(true);
+    const loaded = new Chain();
+    expect(loaded.load("/tmp/chain.bin")).toBe(true);
+    const result = [];
+    while (
+        loaded.execute((rule) => {
+            result.push(rule.toString());
+            return false;
+        })
+    ) {}
+    expect(result).toContain("----\ns\n");
+    expect(loaded.load("/tmp/missing.bin")).toBe(false);
+});
+
+test("add_many", () => {
+    expect(chain.add_many([new Rule("p q r"), "p", "q"])).toEqual([true, true, true]);
+    expect(chain.execute((rule) => false)).toBe(2);
+});
+
+test("add_file", () => {
+    expect(() => chain.add_file("/tmp/missing.txt")).toThrow();
+});
+
+test("stats", () => {
+    expect(chain.stats()).toEqual([]);
+    chain.set_statistics(true);
+    chain.add("p q r");
+    chain.add("p");
+    chain.add("q");
+    chain.execute((candidate) => false);
+    const stats = chain.stats();
+    expect(stats.length).toBe(1);
+    expect(stats[0].facts).toBe(1);
+    expect(stats[0].bytes).toBeGreaterThan(0);
+    chain.set_statistics(false);
+    expect(chain.stats()).toEqual([]);
+});
+
+test("profile", () => {
+    chain.set_profiling(true);
+    chain.add("p q r");
+    chain.add("p");
+    chain.add("q");
+    chain.execute((candidate) => false);
+    const profile = chain.profile();
+    expect(profile.length).toBe(1);
+    expect(profile[0].attempts).toBe(2);
+    expect(profile[0].produced).toBe(2);
+    chain.set_profiling(false);
+    expect(chain.profile()[0].attempts).toBe(0);
+});
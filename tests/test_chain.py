@@ -1,3 +1,5 @@
+import asyncio
+import pathlib
 import pytest
 import apyds
 
@@ -153,3 +155,109 @@ def test_iterator(chain: apyds.Chain) -> None:
         assert str(rule) == expected[count]
         count += 1
     assert count == len(expected)
+
+
+def test_forward_subsumption(chain: apyds.Chain) -> None:
+    chain.set_subsumption(True)
+    chain.add("(`p -> `q)")
+    chain.add("x")
+    chain.add("x (a -> b)")
+    chain.add("x (c d)")
+    assert chain.execute(lambda rule: False) == 1
+
+
+def test_backward_subsumption(chain: apyds.Chain) -> None:
+    chain.set_subsumption(False, True)
+    chain.add("(a -> b)")
+    chain.add("x")
+    chain.add("x (`p -> `q)")
+    assert chain.execute(lambda rule: False) == 1
+    chain.add("(`x -> b) (got `x)")
+    assert chain.execute(lambda rule: False) == 1
+
+
+def test_join_ordering(chain: apyds.Chain) -> None:
+    chain.set_join_ordering(True)
+    chain.add("(big `x) (small `x) (both `x)")
+    for i in range(5):
+        chain.add(f"(big {i})")
+    chain.add("(small 3)")
+    results = []
+    chain.execute(lambda rule: results.append(str(rule)) and False)
+    assert results == ["(big 3)\n-------\n(both 3)\n", "----\n(both 3)\n"]
+
+
+def test_save_and_load(chain: apyds.Chain, tmp_path: pathlib.Path) -> None:
+    chain.add("p q r")
+    chain.add("r s")
+    chain.add("p")
+    chain.add("q")
+    assert chain.save(tmp_path / "chain.bin")
+    loaded = apyds.Chain()
+    assert loaded.load(tmp_path / "chain.bin")
+    result = []
+    while loaded.execute(lambda rule: result.append(str(rule)) and False):
+        pass
+    assert "----\ns\n" in result
+    assert not loaded.load(tmp_path / "missing.bin")
+
+
+def test_add_many(chain: apyds.Chain) -> None:
+    assert chain.add_many([apyds.Rule("p q r"), "p", b"xx"]) == [True, True, False]
+    assert chain.add_many(["q"]) == [True]
+    result = []
+    assert chain.execute(lambda rule: result.append(str(rule)) and False) == 2
+    assert "----\nr\n" in result
+    with pytest.raises(TypeError):
+        chain.add_many([1])
+
+
+def test_add_file(chain: apyds.Chain, tmp_path: pathlib.Path) -> None:
+    (tmp_path / "rules.txt").write_text("p\nq\n----\nr\n\np\n\nq\n")
+    assert chain.add_file(tmp_path / "rules.txt") == [True, True, True]
+    assert chain.execute(lambda rule: False) == 2
+    with pytest.raises(OSError):
+        chain.add_file(tmp_path / "missing.txt")
+
+
+def test_stats(chain: apyds.Chain) -> None:
+    assert chain.stats() == []
+    chain.set_statistics(True)
+    chain.add("p q r")
+    chain.add("p")
+    chain.add("q")
+    chain.execute(lambda candidate: False)
+    stats = chain.stats()
+    assert len(stats) == 1
+    assert isinstance(stats[0], apyds.Stats)
+    assert stats[0].facts == 1
+    assert stats[0].bytes > 0
+    chain.set_statistics(False)
+    assert chain.stats() == []
+
+
+def test_profile(chain: apyds.Chain) -> None:
+    chain.set_profiling(True)
+    chain.add("p q r")
+    chain.add("p")
+    chain.add("q")
+    chain.execute(lambda candidate: False)
+    profile = chain.profile()
+    assert len(profile) == 1
+    assert isinstance(profile[0], apyds.Profile)
+    assert profile[0].rule == apyds.Rule("p q r")
+    assert profile[0].attempts == 2
+    assert profile[0].produced == 2
+    chain.set_profiling(False)
+    assert chain.profile()[0].attempts == 0
+
+
+def test_aiter(chain: apyds.Chain) -> None:
+    chain.add("p q r")
+    chain.add("p")
+    chain.add("q")
+
+    async def collect() -> list[str]:
+        return [str(rule) async for rule in chain]
+
+    assert asyncio.run(collect()) == ["q\n----\nr\n", "----\nr\n"]
@@ -0,0 +1,152 @@
+#include <limits>
+#include <vector>
+
+#include <ds/index.hh>
+#include <ds/utility.hh>
+#include <gtest/gtest.h>
+
+namespace {
+    std::vector<ds::rule_t*> query(ds::index_t& index, const char* text) {
+        auto term = ds::text_to_term(text, 1000);
+        std::vector<ds::index_t::entry_t> candidates;
+        index.candidates(term.get(), candidates);
+        std::vector<ds::rule_t*> result;
+        for (auto& entry : candidates) {
+            result.push_back(entry.rule);
+        }
+        return result;
+    }
+} // namespace
+
+TEST(TestIndex, symbol) {
+    auto a = ds::text_to_term("a", 1000);
+    auto b = ds::text_to_term("b", 1000);
+    auto x = ds::text_to_term("`x", 1000);
+    auto l = ds::text_to_term("(a b)", 1000);
+    EXPECT_EQ(ds::index_t::symbol(x.get()), 0);
+    EXPECT_NE(ds::index_t::symbol(a.get()), 0);
+    EXPECT_NE(ds::index_t::symbol(l.get()), 0);
+    EXPECT_NE(ds::index_t::symbol(a.get()), ds::index_t::symbol(b.get()));
+    EXPECT_NE(ds::index_t::symbol(a.get()), ds::index_t::symbol(l.get()));
+}
+
+TEST(TestIndex, candidates) {
+    auto f1 = ds::text_to_rule("(a -> b)", 1000);
+    auto f2 = ds::text_to_rule("(! a)", 1000);
+    auto f3 = ds::text_to_rule("(a <- b)", 1000);
+    auto f4 = ds::text_to_rule("`x", 1000);
+    auto f5 = ds::text_to_rule("a", 1000);
+    ds::index_t index;
+    index.insert(f1->conclusion(), f1.get(), 1);
+    index.insert(f2->conclusion(), f2.get(), 1);
+    index.insert(f3->conclusion(), f3.get(), 1);
+    index.insert(f4->conclusion(), f4.get(), 1);
+    index.insert(f5->conclusion(), f5.get(), 2);
+    EXPECT_EQ(index.size(), 5);
+
+    EXPECT_EQ(query(index, "(`p -> `q)"), (std::vector<ds::rule_t*>{f1.get(), f4.get()}));
+    EXPECT_EQ(query(index, "(`p `o `q)"), (std::vector<ds::rule_t*>{f1.get(), f3.get(), f4.get()}));
+    EXPECT_EQ(query(index, "(! (! `p))"), (std::vector<ds::rule_t*>{f4.get()}));
+    EXPECT_EQ(query(index, "(`n a)"), (std::vector<ds::rule_t*>{f2.get(), f4.get()}));
+    EXPECT_EQ(query(index, "a"), (std::vector<ds::rule_t*>{f5.get(), f4.get()}));
+    EXPECT_EQ(query(index, "b"), (std::vector<ds::rule_t*>{f4.get()}));
+    EXPECT_EQ(query(index, "`y"), (std::vector<ds::rule_t*>{f1.get(), f2.get(), f3.get(), f4.get(), f5.get()}));
+
+    index.clear();
+    EXPECT_EQ(index.size(), 0);
+    EXPECT_EQ(query(index, "`y"), (std::vector<ds::rule_t*>{}));
+}
+
+TEST(TestIndex, cycle) {
+    auto f1 = ds::text_to_rule("(a b)", 1000);
+    auto f2 = ds::text_to_rule("(a c)", 1000);
+    auto f3 = ds::text_to_rule("`x", 1000);
+    ds::index_t index;
+    index.insert(f1->conclusion(), f1.get(), 1);
+    index.insert(f2->conclusion(), f2.get(), 2);
+    index.insert(f3->conclusion(), f3.get(), 3);
+
+    std::vector<ds::index_t::entry_t> candidates;
+    auto term = ds::text_to_term("(a `y)", 1000);
+    index.candidates(term.get(), candidates, 1);
+    ASSERT_EQ(candidates.size(), 1);
+    EXPECT_EQ(candidates[0].rule, f1.get());
+    candidates.clear();
+    index.candidates(term.get(), candidates, 3);
+    EXPECT_EQ(candidates.size(), 3);
+    candidates.clear();
+    index.candidates(term.get(), candidates, 2, 1);
+    ASSERT_EQ(candidates.size(), 1);
+    EXPECT_EQ(candidates[0].rule, f2.get());
+    candidates.clear();
+    index.candidates(term.get(), candidates, std::numeric_limits<ds::length_t>::max(), 2);
+    ASSERT_EQ(candidates.size(), 1);
+    EXPECT_EQ(candidates[0].rule, f3.get());
+    candidates.clear();
+    auto any = ds::text_to_term("`z", 1000);
+    index.candidates(any.get(), candidates, std::numeric_limits<ds::length_t>::max(), 1);
+    EXPECT_EQ(candidates.size(), 2);
+
+    std::vector<ds::index_t::entry_t> recent;
+    index.recent(1, recent);
+    ASSERT_EQ(recent.size(), 2);
+    EXPECT_EQ(recent[0].rule, f2.get());
+    EXPECT_EQ(recent[1].rule, f3.get());
+    recent.clear();
+    index.recent(3, recent);
+    EXPECT_EQ(recent.size(), 0);
+}
+
+TEST(TestIndex, erase_if) {
+    auto f1 = ds::text_to_rule("(a b)", 1000);
+    auto f2 = ds::text_to_rule("(a c)", 1000);
+    auto f3 = ds::text_to_rule("`x", 1000);
+    auto f4 = ds::text_to_rule("(a d)", 1000);
+    ds::index_t index;
+    index.insert(f1->conclusion(), f1.get(), 1);
+    index.insert(f2->conclusion(), f2.get(), 1);
+    index.insert(f3->conclusion(), f3.get(), 1);
+    index.insert(f4->conclusion(), f4.get(), 2);
+
+    index.erase_if([&](ds::rule_t* rule) { return rule == f2.get() || rule == f3.get(); });
+    EXPECT_EQ(index.size(), 2);
+    EXPECT_EQ(query(index, "(a `y)"), (std::vector<ds::rule_t*>{f1.get(), f4.get()}));
+    EXPECT_EQ(query(index, "(a d)"), (std::vector<ds::rule_t*>{f4.get()}));
+    EXPECT_EQ(query(index, "`y"), (std::vector<ds::rule_t*>{f1.get(), f4.get()}));
+    std::vector<ds::index_t::entry_t> recent;
+    index.recent(1, recent);
+    ASSERT_EQ(recent.size(), 1);
+    EXPECT_EQ(recent[0].rule, f4.get());
+}
+
+TEST(TestIndex, estimate) {
+    auto f1 = ds::text_to_rule("(a b)", 1000);
+    auto f2 = ds::text_to_rule("(a c)", 1000);
+    auto f3 = ds::text_to_rule("(a b c)", 1000);
+    auto f4 = ds::text_to_rule("d", 1000);
+    ds::index_t index;
+    index.insert(f1->conclusion(), f1.get(), 1);
+    index.insert(f2->conclusion(), f2.get(), 1);
+    index.insert(f3->conclusion(), f3.get(), 1);
+    index.insert(f4->conclusion(), f4.get(), 1);
+
+    auto estimate = [&](const char* text) { return index.estimate(ds::text_to_term(text, 1000).get()); };
+    EXPECT_EQ(estimate("(`x `y)"), 2);
+    EXPECT_EQ(estimate("(a d)"), 2);
+    EXPECT_EQ(estimate("(b `y)"), 0);
+    EXPECT_EQ(estimate("(a `y `z)"), 1);
+    EXPECT_EQ(estimate("d"), 1);
+    EXPECT_EQ(estimate("e"), 0);
+    EXPECT_EQ(estimate("`x"), 4);
+
+    auto f5 = ds::text_to_rule("`x", 1000);
+    index.insert(f5->conclusion(), f5.get(), 2);
+    EXPECT_EQ(estimate("(`x `y)"), 3);
+    EXPECT_EQ(estimate("(b `y)"), 1);
+    EXPECT_EQ(estimate("e"), 1);
+    EXPECT_EQ(estimate("`x"), 5);
+
+    index.erase_if([&](ds::rule_t* rule) { return rule == f1.get() || rule == f5.get(); });
+    EXPECT_EQ(estimate("(a d)"), 1);
+    EXPECT_EQ(estimate("(b `y)"), 0);
+}
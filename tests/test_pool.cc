@@ -0,0 +1,49 @@
+#include <atomic>
+#include <vector>
+
+#include <ds/pool.hh>
+#include <gtest/gtest.h>
+
+TEST(TestPool, run) {
+    ds::pool_t pool;
+    EXPECT_EQ(pool.size(), 1);
+
+    pool.resize(4);
+    EXPECT_EQ(pool.size(), 4);
+    for (int round = 0; round < 100; ++round) {
+        std::vector<int> hits(4, 0);
+        pool.run(4, [&](std::size_t index) { ++hits[index]; });
+        EXPECT_EQ(hits, std::vector<int>(4, 1));
+    }
+}
+
+TEST(TestPool, count) {
+    ds::pool_t pool;
+    pool.resize(4);
+    std::atomic<int> calls = 0;
+    pool.run(2, [&](std::size_t index) {
+        EXPECT_LT(index, 2);
+        ++calls;
+    });
+    EXPECT_EQ(calls, 2);
+
+    calls = 0;
+    pool.run(8, [&](std::size_t) { ++calls; });
+    EXPECT_EQ(calls, 4);
+}
+
+TEST(TestPool, resize) {
+    ds::pool_t pool;
+    std::atomic<int> calls = 0;
+    pool.run(4, [&](std::size_t) { ++calls; });
+    EXPECT_EQ(calls, 1);
+
+    pool.resize(3);
+    pool.run(3, [&](std::size_t) { ++calls; });
+    EXPECT_EQ(calls, 4);
+
+    pool.resize(2);
+    EXPECT_EQ(pool.size(), 2);
+    pool.run(2, [&](std::size_t) { ++calls; });
+    EXPECT_EQ(calls, 6);
+}
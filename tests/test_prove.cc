@@ -0,0 +1,86 @@
+#include <set>
+#include <string>
+#include <vector>
+
+#include <ds/prove.hh>
+#include <ds/utility.hh>
+#include <gtest/gtest.h>
+
+class TestProve : public ::testing::Test {
+  protected:
+    const ds::length_t limit_size = 1000;
+    const ds::length_t buffer_size = 10000;
+
+    TestProve() { }
+    ~TestProve() override { }
+    void SetUp() override {
+        prove = new ds::prove_t(limit_size, buffer_size);
+    }
+    void TearDown() override {
+        delete prove;
+    }
+
+    std::set<std::string> answers(const char* goal) {
+        std::set<std::string> result;
+        prove->execute(goal, [&result](ds::rule_t* rule) {
+            result.insert(ds::rule_to_text(rule, 1000).get());
+            return false;
+        });
+        return result;
+    }
+
+    ds::prove_t* prove;
+};
+
+TEST_F(TestProve, reset_parameters) {
+    prove->set_limit_size(50);
+    prove->set_buffer_size(500);
+    prove->reset();
+}
+
+TEST_F(TestProve, add_fail) {
+    prove->set_limit_size(10);
+    EXPECT_FALSE(prove->add("a-long-facts-that-exceeds-limit"));
+}
+
+TEST_F(TestProve, invalid_goal) {
+    prove->add("a");
+    EXPECT_EQ(prove->execute("a b", [](ds::rule_t* rule) { return false; }), 0);
+}
+
+TEST_F(TestProve, chain) {
+    prove->add("p q r");
+    prove->add("r s");
+    prove->add("p");
+    prove->add("q");
+    EXPECT_EQ(answers("s"), (std::set<std::string>{"----\ns\n"}));
+    EXPECT_EQ(answers("t"), (std::set<std::string>{}));
+}
+
+TEST_F(TestProve, variables) {
+    prove->add("(parent a b)");
+    prove->add("(parent b c)");
+    prove->add("(parent c d)");
+    prove->add("(parent `x `y)\n(ancestor `x `y)");
+    prove->add("(parent `x `y)\n(ancestor `y `z)\n(ancestor `x `z)");
+    EXPECT_EQ(answers("(ancestor a `w)"), (std::set<std::string>{"----\n(ancestor a b)\n", "----\n(ancestor a c)\n", "----\n(ancestor a d)\n"}));
+    EXPECT_EQ(answers("(ancestor `y d)"), (std::set<std::string>{"----\n(ancestor a d)\n", "----\n(ancestor b d)\n", "----\n(ancestor c d)\n"}));
+    EXPECT_EQ(answers("(ancestor d `w)"), (std::set<std::string>{}));
+}
+
+TEST_F(TestProve, left_recursion) {
+    prove->add("(edge a b)");
+    prove->add("(edge b c)");
+    prove->add("(edge c a)");
+    prove->add("(edge `x `y)\n(path `x `y)");
+    prove->add("(path `x `y)\n(edge `y `z)\n(path `x `z)");
+    EXPECT_EQ(answers("(path a `w)"), (std::set<std::string>{"----\n(path a a)\n", "----\n(path a b)\n", "----\n(path a c)\n"}));
+}
+
+TEST_F(TestProve, stop) {
+    prove->add("(n 1)");
+    prove->add("(n 2)");
+    prove->add("(n 3)");
+    auto count = prove->execute("(n `x)", [](ds::rule_t* rule) { return true; });
+    EXPECT_EQ(count, 1);
+}
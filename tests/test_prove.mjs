@@ -0,0 +1,65 @@
+import { Prove, Rule } from "../atsds/index.mts";
+
+let prove = null;
+
+beforeEach(() => {
+    prove = new Prove(1000, 10000);
+});
+
+test("reset_parameters", () => {
+    prove.set_limit_size(50);
+    prove.set_buffer_size(500);
+    prove.reset();
+});
+
+test("add_fail", () => {
+    prove.set_limit_size(10);
+    expect(prove.add("a-long-facts-that-exceeds-limit")).toBe(false);
+});
+
+test("invalid_goal", () => {
+    prove.add("a");
+    expect([...prove.prove("a b")]).toEqual([]);
+});
+
+test("execute_chain", () => {
+    prove.add("p q r");
+    prove.add("r s");
+    prove.add("p");
+    prove.add("q");
+    const answers = [];
+    const count = prove.execute("s", (rule) => {
+        answers.push(rule.key());
+        return false;
+    });
+    expect(count).toBe(1);
+    expect(answers).toEqual([new Rule("s").key()]);
+    expect(prove.execute("t", (rule) => false)).toBe(0);
+});
+
+test("prove_variables", () => {
+    prove.add("(parent a b)");
+    prove.add("(parent b c)");
+    prove.add("(parent c d)");
+    prove.add("(parent `x `y)\n(ancestor `x `y)");
+    prove.add("(parent `x `y)\n(ancestor `y `z)\n(ancestor `x `z)");
+    const answers = new Set([...prove.prove("(ancestor `y d)")].map((rule) => rule.key()));
+    expect(answers).toEqual(new Set(["a", "b", "c"].map((name) => new Rule(`(ancestor ${name} d)`).key())));
+});
+
+test("prove_left_recursion", () => {
+    prove.add("(edge a b)");
+    prove.add("(edge b c)");
+    prove.add("(edge c a)");
+    prove.add("(edge `x `y)\n(path `x `y)");
+    prove.add("(path `x `y)\n(edge `y `z)\n(path `x `z)");
+    const answers = new Set([...prove.prove("(path a `w)")].map((rule) => rule.key()));
+    expect(answers).toEqual(new Set(["a", "b", "c"].map((name) => new Rule(`(path a ${name})`).key())));
+});
+
+test("prove_stop", () => {
+    prove.add("(n 1)");
+    prove.add("(n 2)");
+    prove.add("(n 3)");
+    expect(prove.execute("(n `x)", (rule) => true)).toBe(1);
+});
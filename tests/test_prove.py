@@ -0,0 +1,66 @@
+import pytest
+import apyds
+
+
+@pytest.fixture
+def prove() -> apyds.Prove:
+    return apyds.Prove(1000, 10000)
+
+
+def test_reset_parameters(prove: apyds.Prove) -> None:
+    prove.set_limit_size(50)
+    prove.set_buffer_size(500)
+    prove.reset()
+
+
+def test_add_fail(prove: apyds.Prove) -> None:
+    prove.set_limit_size(10)
+    assert not prove.add("a-long-facts-that-exceeds-limit")
+
+
+def test_invalid_goal(prove: apyds.Prove) -> None:
+    prove.add("a")
+    assert list(prove.prove("a b")) == []
+
+
+def test_execute_chain(prove: apyds.Prove) -> None:
+    prove.add("p q r")
+    prove.add("r s")
+    prove.add("p")
+    prove.add("q")
+    answers = []
+
+    def callback(rule: apyds.Rule) -> bool:
+        answers.append(rule)
+        return False
+
+    assert prove.execute("s", callback) == 1
+    assert answers == [apyds.Rule("s")]
+    assert prove.execute("t", callback) == 0
+
+
+def test_prove_variables(prove: apyds.Prove) -> None:
+    prove.add("(parent a b)")
+    prove.add("(parent b c)")
+    prove.add("(parent c d)")
+    prove.add("(parent `x `y)\n(ancestor `x `y)")
+    prove.add("(parent `x `y)\n(ancestor `y `z)\n(ancestor `x `z)")
+    answers = {str(rule) for rule in prove.prove("(ancestor `y d)")}
+    assert answers == {str(apyds.Rule(f"(ancestor {name} d)")) for name in "abc"}
+
+
+def test_prove_left_recursion(prove: apyds.Prove) -> None:
+    prove.add("(edge a b)")
+    prove.add("(edge b c)")
+    prove.add("(edge c a)")
+    prove.add("(edge `x `y)\n(path `x `y)")
+    prove.add("(path `x `y)\n(edge `y `z)\n(path `x `z)")
+    answers = {str(rule) for rule in prove.prove("(path a `w)")}
+    assert answers == {str(apyds.Rule(f"(path a {name})")) for name in "abc"}
+
+
+def test_prove_stop(prove: apyds.Prove) -> None:
+    prove.add("(n 1)")
+    prove.add("(n 2)")
+    prove.add("(n 3)")
+    assert prove.execute("(n `x)", lambda rule: True) == 1
@@ -0,0 +1,123 @@
+#include <set>
+#include <string>
+#include <vector>
+
+#include <ds/chain.hh>
+#include <ds/rete.hh>
+#include <ds/utility.hh>
+#include <gtest/gtest.h>
+
+class TestRete : public ::testing::Test {
+  protected:
+    const ds::length_t limit_size = 1000;
+    const ds::length_t buffer_size = 10000;
+
+    TestRete() { }
+    ~TestRete() override { }
+    void SetUp() override {
+        rete = new ds::rete_t(limit_size, buffer_size);
+    }
+    void TearDown() override {
+        delete rete;
+    }
+
+    std::vector<std::string> results() {
+        std::vector<std::string> result;
+        rete->execute([this, &result](ds::rule_t* rule) {
+            result.push_back(ds::rule_to_text(rule, buffer_size).get());
+            return false;
+        });
+        return result;
+    }
+
+    ds::rete_t* rete;
+};
+
+TEST_F(TestRete, reset_parameters) {
+    rete->set_limit_size(50);
+    rete->set_buffer_size(500);
+    rete->reset();
+}
+
+TEST_F(TestRete, add_fail) {
+    rete->set_limit_size(10);
+    EXPECT_FALSE(rete->add("a-long-facts-that-exceeds-limit"));
+}
+
+TEST_F(TestRete, chain) {
+    rete->add("p q r");
+    rete->add("r s");
+    rete->add("p");
+    rete->add("q");
+    EXPECT_EQ(rete->pending(), 4);
+    EXPECT_EQ(results(), (std::vector<std::string>{"----\nr\n", "----\ns\n"}));
+    EXPECT_EQ(rete->pending(), 0);
+    EXPECT_EQ(results(), (std::vector<std::string>{}));
+}
+
+TEST_F(TestRete, streaming) {
+    rete->add("(edge `x `y) (path `x `y)");
+    rete->add("(path `x `y) (edge `y `z) (path `x `z)");
+    EXPECT_EQ(results(), (std::vector<std::string>{}));
+    rete->add("(edge a b)");
+    EXPECT_EQ(results(), (std::vector<std::string>{"----\n(path a b)\n"}));
+    rete->add("(edge b c)");
+    EXPECT_EQ(results(), (std::vector<std::string>{"----\n(path b c)\n", "----\n(path a c)\n"}));
+    // 重复的fact不会再次传播
+    rete->add("(edge a b)");
+    EXPECT_EQ(rete->pending(), 0);
+    rete->add("(edge c a)");
+    EXPECT_EQ(results().size(), 9 - 3);
+}
+
+TEST_F(TestRete, same_fact) {
+    rete->add("(e `x `y) (e `y `z) (p `x `z)");
+    rete->add("(e a a)");
+    EXPECT_EQ(results(), (std::vector<std::string>{"----\n(p a a)\n"}));
+}
+
+TEST_F(TestRete, rule_after_facts) {
+    rete->add("(n 1)");
+    rete->add("(n 2)");
+    EXPECT_EQ(results(), (std::vector<std::string>{}));
+    rete->add("(n `x) (n `y) (pair `x `y)");
+    EXPECT_EQ(results().size(), 4);
+}
+
+TEST_F(TestRete, stop) {
+    rete->add("(n `x) (m `x)");
+    rete->add("(n 1)");
+    rete->add("(n 2)");
+    rete->add("(n 3)");
+    EXPECT_EQ(rete->execute([](ds::rule_t* rule) { return true; }), 1);
+    EXPECT_EQ(results().size(), 2);
+}
+
+TEST_F(TestRete, same_as_chain) {
+    ds::chain_t chain(limit_size, buffer_size);
+    const char* texts[] = {
+        "(parent `x `y) (ancestor `x `y)",
+        "(parent `x `y) (ancestor `y `z) (ancestor `x `z)",
+        "(ancestor `x `y) (ancestor `y `z) (ancestor `x `z)",
+        "(parent a b)",
+        "(parent b c)",
+        "(parent c d)",
+        "(parent d e)",
+        "(parent b f)",
+    };
+    std::set<std::string> expected;
+    for (auto text : texts) {
+        chain.add(text);
+        rete->add(text);
+    }
+    while (chain.execute([this, &expected](ds::rule_t* rule) {
+        if (rule->premises_count() == 0) {
+            expected.insert(ds::rule_to_text(rule, buffer_size).get());
+        }
+        return false;
+    })) {
+    }
+    auto facts = results();
+    EXPECT_EQ(std::set<std::string>(facts.begin(), facts.end()), expected);
+    EXPECT_EQ(facts.size(), expected.size());
+}
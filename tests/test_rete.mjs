@@ -0,0 +1,53 @@
+import { Rete, Rule } from "../atsds/index.mts";
+
+let rete = null;
+
+beforeEach(() => {
+    rete = new Rete(1000, 10000);
+});
+
+test("reset_parameters", () => {
+    rete.set_limit_size(50);
+    rete.set_buffer_size(500);
+    rete.reset();
+});
+
+test("add_fail", () => {
+    rete.set_limit_size(10);
+    expect(rete.add("a-long-facts-that-exceeds-limit")).toBe(false);
+});
+
+test("execute", () => {
+    rete.add("p q r");
+    rete.add("r s");
+    rete.add("p");
+    rete.add("q");
+    expect(rete.pending()).toBe(4);
+    const facts = [];
+    const count = rete.execute((rule) => {
+        facts.push(rule.key());
+        return false;
+    });
+    expect(count).toBe(2);
+    expect(facts).toEqual([new Rule("r").key(), new Rule("s").key()]);
+    expect(rete.pending()).toBe(0);
+    expect(rete.execute((rule) => false)).toBe(0);
+});
+
+test("streaming", () => {
+    rete.add_many(["(edge `x `y)\n(path `x `y)", "(path `x `y)\n(edge `y `z)\n(path `x `z)"]);
+    expect([...rete]).toEqual([]);
+    rete.add("(edge a b)");
+    expect([...rete].map((rule) => rule.key())).toEqual([new Rule("(path a b)").key()]);
+    rete.add("(edge b c)");
+    expect([...rete].map((rule) => rule.key())).toEqual([new Rule("(path b c)").key(), new Rule("(path a c)").key()]);
+});
+
+test("stop", () => {
+    rete.add("(n `x)\n(m `x)");
+    for (let index = 0; index < 3; ++index) {
+        rete.add(`(n ${index})`);
+    }
+    expect(rete.execute((rule) => true)).toBe(1);
+    expect([...rete].length).toBe(2);
+});
@@ -0,0 +1,74 @@
+import asyncio
+import pytest
+import apyds
+
+
+@pytest.fixture
+def rete() -> apyds.Rete:
+    return apyds.Rete(1000, 10000)
+
+
+def test_reset_parameters(rete: apyds.Rete) -> None:
+    rete.set_limit_size(50)
+    rete.set_buffer_size(500)
+    rete.reset()
+
+
+def test_add_fail(rete: apyds.Rete) -> None:
+    rete.set_limit_size(10)
+    assert not rete.add("a-long-facts-that-exceeds-limit")
+
+
+def test_execute(rete: apyds.Rete) -> None:
+    rete.add("p q r")
+    rete.add("r s")
+    rete.add("p")
+    rete.add("q")
+    assert rete.pending() == 4
+    facts = []
+
+    def callback(rule: apyds.Rule) -> bool:
+        facts.append(rule)
+        return False
+
+    assert rete.execute(callback) == 2
+    assert facts == [apyds.Rule("r"), apyds.Rule("s")]
+    assert rete.pending() == 0
+    assert rete.execute(callback) == 0
+
+
+def test_streaming(rete: apyds.Rete) -> None:
+    rete.add_many(["(edge `x `y)\n(path `x `y)", "(path `x `y)\n(edge `y `z)\n(path `x `z)"])
+    assert list(rete) == []
+    rete.add("(edge a b)")
+    assert list(rete) == [apyds.Rule("(path a b)")]
+    rete.add("(edge b c)")
+    assert list(rete) == [apyds.Rule("(path b c)"), apyds.Rule("(path a c)")]
+
+
+def test_stop(rete: apyds.Rete) -> None:
+    rete.add("(n `x)\n(m `x)")
+    for index in range(3):
+        rete.add(f"(n {index})")
+    assert rete.execute(lambda rule: True) == 1
+    assert len(list(rete)) == 2
+
+
+def test_execute_view(rete: apyds.Rete) -> None:
+    rete.add("(n `x)\n(m `x)")
+    rete.add("(n 1)")
+    rete.add("(n 2)")
+    facts = []
+    assert rete.execute(lambda rule: facts.append(rule.copy()), view=True) == 2
+    assert facts == [apyds.Rule("(m 1)"), apyds.Rule("(m 2)")]
+
+
+def test_aiter(rete: apyds.Rete) -> None:
+    rete.add("(n `x)\n(m `x)")
+    for index in range(3):
+        rete.add(f"(n {index})")
+
+    async def collect() -> list[str]:
+        return [str(rule) async for rule in rete]
+
+    assert asyncio.run(collect()) == [str(apyds.Rule(f"(m {index})")) for index in range(3)]
@@ -1,3 +1,5 @@
+#include <cstring>
+
 #include <ds/item.hh>
 #include <ds/list.hh>
 #include <ds/rule.hh>
@@ -180,3 +182,29 @@ TEST_F(TestRule, scan) {
         EXPECT_EQ(r2->scan(input_2, reinterpret_cast<std::byte*>(r2) + i), nullptr);
     }
 }
+
+TEST_F(TestRule, promote) {
+    const char* input = "a\n"
+                        "b\n"
+                        "c\n"
+                        "----\n"
+                        "d\n";
+    r1->scan(input, nullptr);
+    EXPECT_EQ(r2->promote(r1, 2, nullptr), r2);
+    EXPECT_EQ(r2->premises_count(), 3);
+    EXPECT_STREQ(r2->premises(0)->item()->name()->get_string(), "c");
+    EXPECT_STREQ(r2->premises(1)->item()->name()->get_string(), "a");
+    EXPECT_STREQ(r2->premises(2)->item()->name()->get_string(), "b");
+    EXPECT_STREQ(r2->conclusion()->item()->name()->get_string(), "d");
+    EXPECT_EQ(r2->data_size(), r1->data_size());
+
+    EXPECT_EQ(r2->promote(r1, 0, nullptr), r2);
+    EXPECT_EQ(memcmp(r2, r1, r1->data_size()), 0);
+    EXPECT_EQ(r2->promote(r1, 3, nullptr), nullptr);
+
+    ds::length_t correct_length = r1->data_size();
+    EXPECT_NE(r2->promote(r1, 1, reinterpret_cast<std::byte*>(r2) + correct_length), nullptr);
+    for (ds::length_t i = 0; i < correct_length; ++i) {
+        EXPECT_EQ(r2->promote(r1, 1, reinterpret_cast<std::byte*>(r2) + i), nullptr);
+    }
+}
@@ -1,3 +1,11 @@
+#include <chrono>
+#include <filesystem>
+#include <fstream>
+#include <memory>
+#include <stdexcept>
+#include <string>
+#include <vector>
+
 #include <ds/search.hh>
 #include <ds/utility.hh>
 #include <gtest/gtest.h>
@@ -116,3 +124,743 @@ TEST_F(TestSearch, iterator) {
     }
     EXPECT_EQ(count, 1);
 }
+
+TEST_F(TestSearch, execute_indexed) {
+    search->add("(a `x) (b `x)");
+    search->add("(a 1)");
+    search->add("(c 2)");
+    search->add("(a 3 4)");
+    search->add("`y");
+    auto count = search->execute([](ds::rule_t* rule) { return false; });
+    EXPECT_EQ(count, 2);
+}
+
+TEST_F(TestSearch, execute_incremental) {
+    search->add("(a `x) (b `x)");
+    search->add("(b `x) (c `x)");
+    search->add("(a 1)");
+    EXPECT_EQ(search->execute([](ds::rule_t* rule) { return false; }), 1);
+    EXPECT_EQ(search->execute([](ds::rule_t* rule) { return false; }), 1);
+    EXPECT_EQ(search->execute([](ds::rule_t* rule) { return false; }), 0);
+    search->add("(a 2)");
+    EXPECT_EQ(search->execute([](ds::rule_t* rule) { return false; }), 1);
+    EXPECT_EQ(search->execute([](ds::rule_t* rule) { return false; }), 1);
+    EXPECT_EQ(search->execute([](ds::rule_t* rule) { return false; }), 0);
+}
+
+TEST_F(TestSearch, execute_threads) {
+    auto run = [this](ds::length_t threads) {
+        ds::search_t search(limit_size, buffer_size);
+        search.set_threads(threads);
+        search.add("(a `x) (b `x)");
+        search.add("(b `x) (c `x)");
+        for (int i = 0; i < 50; ++i) {
+            search.add("(a " + std::to_string(i) + ")");
+        }
+        std::vector<std::string> result;
+        for (int i = 0; i < 3; ++i) {
+            search.execute([&](ds::rule_t* rule) {
+                result.push_back(ds::rule_to_text(rule, buffer_size).get());
+                return false;
+            });
+        }
+        return result;
+    };
+    auto serial = run(1);
+    EXPECT_EQ(serial.size(), 100);
+    EXPECT_EQ(run(4), serial);
+}
+
+TEST_F(TestSearch, forward_subsumption) {
+    search->set_subsumption(true, false);
+    search->add("(`p -> `q)");
+    search->add("x");
+    search->add("x (a -> b)");
+    search->add("x (c d)");
+    EXPECT_EQ(search->execute([](ds::rule_t* rule) { return false; }), 1);
+}
+
+TEST_F(TestSearch, backward_subsumption) {
+    search->set_subsumption(false, true);
+    search->add("(a -> b)");
+    search->add("x");
+    search->add("x (`p -> `q)");
+    EXPECT_EQ(search->execute([](ds::rule_t* rule) { return false; }), 1);
+    // (a -> b)已经被移除，只有更一般的fact参与之后的匹配
+    search->add("(`x -> b) (got `x)");
+    EXPECT_EQ(search->execute([](ds::rule_t* rule) { return false; }), 1);
+}
+
+TEST_F(TestSearch, priority) {
+    search->set_priority(ds::search_t::size_cost);
+    search->add("(g (a b c d e))");
+    search->add("(g a)");
+    search->add("(g `x) (h `x)");
+    std::vector<std::string> result;
+    EXPECT_EQ(
+        search->execute([&](ds::rule_t* rule) {
+            result.push_back(ds::rule_to_text(rule, buffer_size).get());
+            return false;
+        }),
+        1
+    );
+    EXPECT_EQ(result, (std::vector<std::string>{"----\n(h a)\n"}));
+    EXPECT_EQ(search->execute([](ds::rule_t* rule) { return false; }), 1);
+    EXPECT_EQ(search->execute([](ds::rule_t* rule) { return false; }), 0);
+}
+
+TEST_F(TestSearch, priority_incremental) {
+    search->set_priority(ds::search_t::depth_cost);
+    search->add("(a `x) (b `x)");
+    search->add("(b `x) (c `x)");
+    search->add("(a 1)");
+    EXPECT_EQ(search->execute([](ds::rule_t* rule) { return false; }), 1);
+    EXPECT_EQ(search->execute([](ds::rule_t* rule) { return false; }), 1);
+    EXPECT_EQ(search->execute([](ds::rule_t* rule) { return false; }), 0);
+    search->add("(a 2)");
+    EXPECT_EQ(search->execute([](ds::rule_t* rule) { return false; }), 1);
+    EXPECT_EQ(search->execute([](ds::rule_t* rule) { return false; }), 1);
+    EXPECT_EQ(search->execute([](ds::rule_t* rule) { return false; }), 0);
+}
+
+TEST_F(TestSearch, capacity_oldest) {
+    std::vector<std::string> evicted;
+    search->set_capacity(2, 0, ds::search_t::eviction_t::oldest, [&](ds::rule_t* rule) {
+        evicted.push_back(ds::rule_to_text(rule, buffer_size).get());
+    });
+    search->add("(a `x) (b `x)");
+    search->add("(a 1)");
+    search->add("(a 2)");
+    EXPECT_EQ(search->execute([](ds::rule_t* rule) { return false; }), 2);
+    EXPECT_EQ(evicted, (std::vector<std::string>{"----\n(a 1)\n", "----\n(a 2)\n"}));
+}
+
+TEST_F(TestSearch, capacity_largest) {
+    std::vector<std::string> evicted;
+    search->set_capacity(2, 0, ds::search_t::eviction_t::largest, [&](ds::rule_t* rule) {
+        evicted.push_back(ds::rule_to_text(rule, buffer_size).get());
+    });
+    search->add("(a `x) (b `x)");
+    search->add("(a (1 2 3))");
+    search->add("(a 1)");
+    EXPECT_EQ(search->execute([](ds::rule_t* rule) { return false; }), 2);
+    EXPECT_EQ(evicted, (std::vector<std::string>{"----\n(a (1 2 3))\n", "----\n(b (1 2 3))\n"}));
+}
+
+TEST_F(TestSearch, capacity_least_used) {
+    auto run = [this](ds::length_t threads) {
+        ds::search_t search(limit_size, buffer_size);
+        std::vector<std::string> evicted;
+        search.set_threads(threads);
+        search.set_capacity(2, 0, ds::search_t::eviction_t::least_used, [&](ds::rule_t* rule) {
+            evicted.push_back(ds::rule_to_text(rule, buffer_size).get());
+        });
+        search.add("(a `x) (b `x)");
+        search.add("(a 1)");
+        search.add("(c 1)");
+        EXPECT_EQ(search.execute([](ds::rule_t* rule) { return false; }), 1);
+        return evicted;
+    };
+    EXPECT_EQ(run(1), (std::vector<std::string>{"----\n(c 1)\n"}));
+    EXPECT_EQ(run(4), (std::vector<std::string>{"----\n(c 1)\n"}));
+}
+
+TEST_F(TestSearch, capacity_incremental) {
+    search->set_capacity(1, 0, ds::search_t::eviction_t::oldest);
+    search->add("(a `x) (b `x)");
+    search->add("(b `x) (c `x)");
+    search->add("(a 1)");
+    // 每轮结束时只保留最新的fact，rules在重新分配storage后仍然有效
+    EXPECT_EQ(search->execute([](ds::rule_t* rule) { return false; }), 1);
+    EXPECT_EQ(search->execute([](ds::rule_t* rule) { return false; }), 1);
+    EXPECT_EQ(search->execute([](ds::rule_t* rule) { return false; }), 0);
+}
+
+TEST_F(TestSearch, capacity_bytes) {
+    int count = 0;
+    search->set_capacity(0, 1, ds::search_t::eviction_t::oldest, [&](ds::rule_t* rule) { ++count; });
+    search->add("(a `x) (b `x)");
+    search->add("(b `x) (c `x)");
+    search->add("(a 1)");
+    // rules已经超出字节数的上限，因此每轮结束时全部facts都会被淘汰
+    EXPECT_EQ(search->execute([](ds::rule_t* rule) { return false; }), 1);
+    EXPECT_EQ(count, 2);
+    EXPECT_EQ(search->execute([](ds::rule_t* rule) { return false; }), 0);
+}
+
+TEST_F(TestSearch, capacity_priority) {
+    search->set_priority(ds::search_t::depth_cost);
+    search->set_capacity(1, 0, ds::search_t::eviction_t::oldest);
+    search->add("(a `x) (b `x)");
+    search->add("(b `x) (c `x)");
+    search->add("(a 1)");
+    EXPECT_EQ(search->execute([](ds::rule_t* rule) { return false; }), 1);
+    EXPECT_EQ(search->execute([](ds::rule_t* rule) { return false; }), 1);
+    EXPECT_EQ(search->execute([](ds::rule_t* rule) { return false; }), 0);
+}
+
+TEST_F(TestSearch, save_and_load) {
+    auto path = (std::filesystem::temp_directory_path() / "ds_test_search_save_and_load.bin").string();
+    auto run = [this](ds::search_t& search) {
+        std::vector<std::string> result;
+        while (search.execute([&](ds::rule_t* rule) {
+            result.push_back(ds::rule_to_text(rule, buffer_size).get());
+            return false;
+        })) {
+        }
+        return result;
+    };
+    search->add("(a `x) (b `x)");
+    search->add("(b `x) (c `x)");
+    search->add("(a 1)");
+    EXPECT_EQ(search->execute([](ds::rule_t* rule) { return false; }), 1);
+    EXPECT_TRUE(search->save(path));
+
+    ds::search_t loaded(limit_size, buffer_size);
+    EXPECT_TRUE(loaded.load(path));
+    EXPECT_EQ(run(loaded), run(*search));
+    // 已经读入的内容参与去重，之后添加的内容与读入的内容一起推理
+    loaded.add("(a 1)");
+    loaded.add("(a 2)");
+    EXPECT_EQ(run(loaded), (std::vector<std::string>{"----\n(b 2)\n", "----\n(c 2)\n"}));
+    std::filesystem::remove(path);
+    EXPECT_FALSE(loaded.load(path));
+}
+
+TEST_F(TestSearch, save_and_load_priority) {
+    auto path = (std::filesystem::temp_directory_path() / "ds_test_search_save_and_load_priority.bin").string();
+    auto run = [this](ds::search_t& search) {
+        std::vector<std::string> result;
+        while (search.execute([&](ds::rule_t* rule) {
+            result.push_back(ds::rule_to_text(rule, buffer_size).get());
+            return false;
+        })) {
+        }
+        return result;
+    };
+    search->set_priority(ds::search_t::depth_cost);
+    search->add("(a `x) (b `x)");
+    search->add("(b `x) (c `x)");
+    search->add("(a 1)");
+    search->add("(a 2)");
+    EXPECT_EQ(search->execute([](ds::rule_t* rule) { return false; }), 1);
+    EXPECT_TRUE(search->save(path));
+
+    // 优先模式的设置不会被保存，需要在读取前重新设置
+    ds::search_t loaded(limit_size, buffer_size);
+    loaded.set_priority(ds::search_t::depth_cost);
+    EXPECT_TRUE(loaded.load(path));
+    auto expected = run(*search);
+    EXPECT_EQ(expected.size(), 3);
+    EXPECT_EQ(run(loaded), expected);
+    std::filesystem::remove(path);
+}
+
+TEST_F(TestSearch, add_binary) {
+    auto rule = ds::text_to_rule("(a `x) (b `x)", limit_size);
+    auto fact = ds::text_to_rule("(a 1)", limit_size);
+    EXPECT_TRUE(search->add(rule.get()));
+    EXPECT_TRUE(search->add(fact.get()));
+    EXPECT_EQ(search->execute([](ds::rule_t* rule) { return false; }), 1);
+    auto large = ds::text_to_rule("a-long-facts-that-exceeds-limit", limit_size);
+    search->set_limit_size(10);
+    EXPECT_FALSE(search->add(large.get()));
+}
+
+TEST_F(TestSearch, add_many) {
+    EXPECT_EQ(search->add_many({"(a `x) (b `x)", "(a 1)", "(a 1)"}), (std::vector<bool>{true, true, true}));
+    EXPECT_EQ(search->execute([](ds::rule_t* rule) { return false; }), 1);
+    search->set_limit_size(30);
+    EXPECT_EQ(search->add_many({"(a 2)", "a-long-facts-that-exceeds-limit"}), (std::vector<bool>{true, false}));
+}
+
+TEST_F(TestSearch, add_file) {
+    auto path = (std::filesystem::temp_directory_path() / "ds_test_search_add_file.txt").string();
+    std::ofstream(path) << "(a `x)\n----\n(b `x)\n\n  \n(a 1)\n\n(a 2)\n(a 3)\n";
+    EXPECT_EQ(search->add_file(path), (std::vector<bool>{true, true, true}));
+    // 最后一段被读作以(a 2)为premise的rule，因此只有(a 1)能推出新的fact
+    EXPECT_EQ(search->execute([](ds::rule_t* rule) { return false; }), 1);
+    std::filesystem::remove(path);
+    EXPECT_EQ(search->add_file(path), std::nullopt);
+}
+
+TEST_F(TestSearch, find) {
+    search->add("(a `x) (b `x)");
+    search->add("(b `x) (c `x)");
+    search->add("(a 1)");
+    search->add("(a 2)");
+    auto target = ds::text_to_rule("(c 2)", limit_size);
+    auto other = ds::text_to_rule("(d 1)", limit_size);
+    auto result = search->find({other.get(), target.get()});
+    ASSERT_NE(result, nullptr);
+    EXPECT_EQ(ds::rule_to_text(result.get(), buffer_size).get(), std::string("----\n(c 2)\n"));
+    EXPECT_EQ(search->find({target.get()}), nullptr);
+}
+
+TEST_F(TestSearch, find_patterns) {
+    search->add("(a `x) (b `x)");
+    search->add("(b `x) (c `x)");
+    search->add("(a 1)");
+    search->add("(a 2)");
+    auto target = ds::text_to_rule("(c `y)", limit_size);
+    EXPECT_EQ(search->find({target.get()}, true, 1), nullptr);
+    auto result = search->find({target.get()}, true);
+    ASSERT_NE(result, nullptr);
+    EXPECT_EQ(ds::rule_to_text(result.get(), buffer_size).get(), std::string("----\n(c 1)\n"));
+}
+
+TEST_F(TestSearch, proof) {
+    search->set_provenance(true);
+    search->add("(a `x) (b `x)");
+    search->add("(b `x) (c `x)");
+    search->add("(a 1)");
+    auto target = ds::text_to_rule("(c 1)", limit_size);
+    ASSERT_NE(search->find({target.get()}), nullptr);
+    auto steps = search->proof(target.get());
+    ASSERT_EQ(steps.size(), 5);
+    std::vector<std::string> texts;
+    for (auto& step : steps) {
+        texts.push_back(ds::rule_to_text(step.rule, buffer_size).get());
+    }
+    EXPECT_EQ(texts[4], "----\n(c 1)\n");
+    auto& last = steps[4];
+    ASSERT_TRUE(last.parent_rule.has_value() && last.parent_fact.has_value());
+    EXPECT_EQ(texts[*last.parent_rule], "(b `x)\n------\n(c `x)\n");
+    EXPECT_EQ(texts[*last.parent_fact], "----\n(b 1)\n");
+    auto& middle = steps[*last.parent_fact];
+    ASSERT_TRUE(middle.parent_rule.has_value() && middle.parent_fact.has_value());
+    EXPECT_EQ(texts[*middle.parent_rule], "(a `x)\n------\n(b `x)\n");
+    EXPECT_EQ(texts[*middle.parent_fact], "----\n(a 1)\n");
+    EXPECT_FALSE(steps[*middle.parent_fact].parent_rule.has_value());
+    EXPECT_LT(steps[*middle.parent_fact].cycle, middle.cycle);
+    EXPECT_LT(middle.cycle, last.cycle);
+    auto unknown = ds::text_to_rule("(d 1)", limit_size);
+    EXPECT_TRUE(search->proof(unknown.get()).empty());
+}
+
+TEST_F(TestSearch, proof_threads) {
+    search->set_provenance(true);
+    search->set_threads(4);
+    search->add("(a `x) (b `x)");
+    search->add("(a 1)");
+    search->add("(a 2)");
+    EXPECT_EQ(search->execute([](ds::rule_t* rule) { return false; }), 2);
+    auto target = ds::text_to_rule("(b 2)", limit_size);
+    auto steps = search->proof(target.get());
+    ASSERT_EQ(steps.size(), 3);
+    EXPECT_EQ(ds::rule_to_text(steps[*steps[2].parent_fact].rule, buffer_size).get(), std::string("----\n(a 2)\n"));
+}
+
+TEST_F(TestSearch, proof_disabled) {
+    search->add("(a `x) (b `x)");
+    search->add("(a 1)");
+    EXPECT_EQ(search->execute([](ds::rule_t* rule) { return false; }), 1);
+    auto target = ds::text_to_rule("(b 1)", limit_size);
+    EXPECT_TRUE(search->proof(target.get()).empty());
+}
+
+TEST_F(TestSearch, proof_evicted) {
+    search->set_provenance(true);
+    search->set_capacity(1, 0);
+    search->add("(a `x) (b `x)");
+    search->add("(a 1)");
+    EXPECT_EQ(search->execute([](ds::rule_t* rule) { return false; }), 1);
+    // (a 1)被淘汰后，(b 1)的推导过程在此中断
+    auto target = ds::text_to_rule("(b 1)", limit_size);
+    auto steps = search->proof(target.get());
+    ASSERT_EQ(steps.size(), 2);
+    EXPECT_TRUE(steps[1].parent_rule.has_value());
+    EXPECT_FALSE(steps[1].parent_fact.has_value());
+}
+
+TEST_F(TestSearch, stats) {
+    search->set_statistics(true);
+    search->add("(a `x) (b `x)");
+    search->add("(a 1)");
+    search->add("(a 2)");
+    search->add("(c 1)");
+    EXPECT_EQ(search->execute([](ds::rule_t* rule) { return false; }), 2);
+    EXPECT_EQ(search->execute([](ds::rule_t* rule) { return false; }), 0);
+    auto& stats = search->stats();
+    ASSERT_EQ(stats.size(), 2);
+    EXPECT_EQ(stats[0].pairs, 2);
+    EXPECT_EQ(stats[0].facts, 2);
+    EXPECT_EQ(stats[0].rules, 0);
+    EXPECT_EQ(stats[0].failures, 0);
+    EXPECT_GT(stats[0].bytes, 0);
+    EXPECT_EQ(stats[1].pairs, 0);
+    EXPECT_EQ(stats[1].skipped, 2);
+    EXPECT_LT(stats[0].cycle, stats[1].cycle);
+    search->set_statistics(false);
+    EXPECT_TRUE(search->stats().empty());
+}
+
+TEST_F(TestSearch, stats_rejections) {
+    search->set_statistics(true);
+    search->set_limit_size(64);
+    search->add("(a `x) (b `x `x `x `x)");
+    search->add("(a `x) (c `x)");
+    search->add("(a long-item)");
+    search->add("(a 1)");
+    search->add("(c 1)");
+    search->execute([](ds::rule_t* rule) { return false; });
+    auto& stats = search->stats();
+    ASSERT_EQ(stats.size(), 1);
+    EXPECT_EQ(stats[0].pairs, 4);
+    EXPECT_EQ(stats[0].oversize, 1);
+    EXPECT_EQ(stats[0].duplicates, 1);
+    EXPECT_EQ(stats[0].facts, 2);
+}
+
+TEST_F(TestSearch, stats_overflows) {
+    search->set_statistics(true);
+    search->set_buffer_size(128);
+    search->add("(a `x) (b `x)");
+    search->add("(a (x y z w))");
+    search->add("(a 1)");
+    search->execute([](ds::rule_t* rule) { return false; });
+    auto& stats = search->stats();
+    ASSERT_EQ(stats.size(), 1);
+    EXPECT_EQ(stats[0].pairs, 2);
+    EXPECT_EQ(stats[0].failures, 1);
+    EXPECT_EQ(stats[0].overflows, 1);
+}
+
+TEST_F(TestSearch, stats_threads) {
+    search->set_statistics(true);
+    search->set_threads(4);
+    search->add("(a `x) (b `x)");
+    search->add("(a 1)");
+    search->add("(a 2)");
+    search->execute([](ds::rule_t* rule) { return false; });
+    auto& stats = search->stats();
+    ASSERT_EQ(stats.size(), 1);
+    EXPECT_EQ(stats[0].pairs, 2);
+    EXPECT_EQ(stats[0].facts, 2);
+}
+
+TEST_F(TestSearch, profile) {
+    search->set_profiling(true);
+    search->add("(a `x) (b `x)");
+    search->add("(b `x) (c `x `x `x `x `x `x `x `x)");
+    search->add("(d `x) (e `x)");
+    search->add("(a long-item)");
+    search->add("(a 1)");
+    search->add("(b 1)");
+    search->set_limit_size(64);
+    search->execute([](ds::rule_t* rule) { return false; });
+    search->execute([](ds::rule_t* rule) { return false; });
+    auto profile = search->profile();
+    ASSERT_EQ(profile.size(), 3);
+    auto find = [&](const char* text) -> ds::profile_t& {
+        std::string expected = ds::rule_to_text(ds::text_to_rule(text, buffer_size).get(), buffer_size).get();
+        for (auto& entry : profile) {
+            if (expected == ds::rule_to_text(entry.rule, buffer_size).get()) {
+                return entry;
+            }
+        }
+        throw std::out_of_range(text);
+    };
+    auto& ab = find("(a `x) (b `x)");
+    EXPECT_EQ(ab.attempts, 2);
+    EXPECT_EQ(ab.successes, 2);
+    EXPECT_EQ(ab.duplicates, 1);
+    EXPECT_EQ(ab.produced, 1);
+    EXPECT_GE(ab.seconds, 0);
+    auto& bc = find("(b `x) (c `x `x `x `x `x `x `x `x)");
+    EXPECT_EQ(bc.attempts, 2);
+    EXPECT_EQ(bc.oversize, 2);
+    EXPECT_EQ(bc.produced, 0);
+    auto& de = find("(d `x) (e `x)");
+    EXPECT_EQ(de.attempts, 0);
+    search->set_profiling(false);
+    EXPECT_EQ(search->profile()[0].attempts, 0);
+}
+
+TEST_F(TestSearch, profile_threads) {
+    auto run = [](ds::length_t threads) {
+        ds::search_t search(1000, 10000);
+        search.set_threads(threads);
+        search.set_profiling(true);
+        search.add("(a `x) (b `x)");
+        search.add("(b `x) (a (s `x))");
+        search.add("(a 0)");
+        for (int i = 0; i < 5; ++i) {
+            search.execute([](ds::rule_t* rule) { return false; });
+        }
+        return search.profile();
+    };
+    auto serial = run(1);
+    auto parallel = run(4);
+    ASSERT_EQ(serial.size(), parallel.size());
+    for (std::size_t i = 0; i < serial.size(); ++i) {
+        EXPECT_EQ(serial[i].attempts, parallel[i].attempts);
+        EXPECT_EQ(serial[i].successes, parallel[i].successes);
+        EXPECT_EQ(serial[i].duplicates, parallel[i].duplicates);
+        EXPECT_EQ(serial[i].produced, parallel[i].produced);
+        EXPECT_GT(serial[i].produced, 0);
+    }
+}
+
+TEST_F(TestSearch, budget_pairs) {
+    search->add("(a `x) (b `x)");
+    for (int i = 0; i < 10; ++i) {
+        search->add(("(a " + std::to_string(i) + ")").c_str());
+    }
+    EXPECT_EQ(search->execute([](ds::rule_t* rule) { return false; }, {.max_pairs = 4}), 4);
+    EXPECT_TRUE(search->exhausted());
+    // 没有处理的组合在下一轮中继续处理，已经产生的结果不会重复产生
+    EXPECT_EQ(search->execute([](ds::rule_t* rule) { return false; }), 6);
+    EXPECT_FALSE(search->exhausted());
+    EXPECT_EQ(search->execute([](ds::rule_t* rule) { return false; }), 0);
+}
+
+TEST_F(TestSearch, budget_results) {
+    search->add("(a `x) (b `x)");
+    search->add("(b `x) (c `x)");
+    search->add("(a 1)");
+    search->add("(a 2)");
+    search->add("(a 3)");
+    EXPECT_EQ(search->execute([](ds::rule_t* rule) { return false; }, {.max_results = 2}), 2);
+    EXPECT_TRUE(search->exhausted());
+    EXPECT_EQ(search->saturate(0, {.max_results = 3}), 3);
+    EXPECT_TRUE(search->exhausted());
+    EXPECT_EQ(search->saturate(0), 1);
+    EXPECT_FALSE(search->exhausted());
+    EXPECT_EQ(search->saturate(0), 0);
+}
+
+TEST_F(TestSearch, budget_timeout) {
+    // 结果的数目随轮数迅速增长，无法在时间预算内完成
+    search->set_limit_size(1000);
+    search->add("(a `x) (a `y) (a (p `x `y))");
+    search->add("(a 0)");
+    auto start = std::chrono::steady_clock::now();
+    search->saturate(0, {.timeout = 0.05});
+    auto elapsed = std::chrono::duration<double>(std::chrono::steady_clock::now() - start).count();
+    EXPECT_TRUE(search->exhausted());
+    EXPECT_LT(elapsed, 1.0);
+    // 用完预算后的调用不受之前预算的影响
+    EXPECT_EQ(search->execute([](ds::rule_t* rule) { return true; }), 1);
+    EXPECT_FALSE(search->exhausted());
+}
+
+TEST_F(TestSearch, saturate) {
+    search->add("(a `x) (b `x)");
+    search->add("(b `x) (c `x)");
+    search->add("(a 1)");
+    EXPECT_EQ(search->saturate(1), 1);
+    EXPECT_EQ(search->saturate(0), 1);
+    EXPECT_FALSE(search->exhausted());
+    EXPECT_EQ(search->saturate(0), 0);
+}
+
+TEST_F(TestSearch, budget_threads) {
+    search->set_threads(4);
+    search->add("(a `x) (b `x)");
+    for (int i = 0; i < 200; ++i) {
+        search->add(("(a " + std::to_string(i) + ")").c_str());
+    }
+    search->add("(b `x) (c `x)");
+    // 多线程时在每批开始前检查预算，因此第一批总是被完整地处理
+    auto first = search->saturate(0, {.max_pairs = 1});
+    EXPECT_TRUE(search->exhausted());
+    EXPECT_LT(first, 400);
+    EXPECT_EQ(first + search->saturate(0), 400);
+}
+
+TEST_F(TestSearch, budget_resume) {
+    search->add("(a `x) (b `x)");
+    for (int i = 0; i < 50; ++i) {
+        search->add(("(a " + std::to_string(i) + ")").c_str());
+    }
+    // 每次从上一次停下的组合继续，而不是从这一轮的开头重新开始
+    for (int i = 0; i < 5; ++i) {
+        EXPECT_EQ(search->execute([](ds::rule_t*) { return false; }, {.max_pairs = 10}), 10);
+    }
+    EXPECT_EQ(search->execute([](ds::rule_t*) { return false; }, {.max_pairs = 10}), 0);
+    EXPECT_FALSE(search->exhausted());
+    for (int i = 0; i < 50; ++i) {
+        EXPECT_TRUE(search->contains(ds::text_to_rule(("(b " + std::to_string(i) + ")").c_str(), limit_size).get()));
+    }
+}
+
+TEST_F(TestSearch, budget_resume_saturate) {
+    auto run = [this](ds::length_t threads) {
+        search->reset();
+        search->set_threads(threads);
+        search->add("(a `x) (b `x)");
+        search->add("(b `x) (c `x)");
+        for (int i = 0; i < 50; ++i) {
+            search->add(("(a " + std::to_string(i) + ")").c_str());
+        }
+        std::size_t total = 0;
+        for (int calls = 0; calls < 100; ++calls) {
+            auto count = search->saturate(0, {.max_pairs = 10});
+            total += count;
+            if (count == 0 && !search->exhausted()) {
+                break;
+            }
+        }
+        return total;
+    };
+    EXPECT_EQ(run(1), 100);
+    EXPECT_EQ(run(4), 100);
+}
+
+TEST_F(TestSearch, resume_after_stop) {
+    search->set_threads(4);
+    search->add("(a `x) (b `x)");
+    for (int i = 0; i < 50; ++i) {
+        search->add(("(a " + std::to_string(i) + ")").c_str());
+    }
+    // 回调函数要求停止时同样从停下的位置继续，每次只产生一个结果
+    for (int i = 0; i < 50; ++i) {
+        EXPECT_EQ(search->execute([](ds::rule_t*) { return true; }), 1);
+    }
+    EXPECT_EQ(search->execute([](ds::rule_t*) { return false; }), 0);
+}
+
+TEST_F(TestSearch, contains) {
+    search->add("(a `x) (b `x)");
+    search->add("(a 1)");
+    auto fact = ds::text_to_rule("(b 1)", limit_size);
+    EXPECT_TRUE(search->contains(ds::text_to_rule("(a 1)", limit_size).get()));
+    EXPECT_FALSE(search->contains(fact.get()));
+    search->execute([](ds::rule_t* rule) { return false; });
+    EXPECT_TRUE(search->contains(fact.get()));
+}
+
+TEST_F(TestSearch, shard_of) {
+    auto fact = ds::text_to_rule("(a 1)", limit_size);
+    EXPECT_EQ(ds::search_t::shard_of(fact.get(), 1), 0);
+    EXPECT_LT(ds::search_t::shard_of(fact.get(), 7), 7);
+    EXPECT_EQ(ds::search_t::shard_of(fact.get(), 7), ds::search_t::shard_of(ds::text_to_rule("(a 1)", limit_size).get(), 7));
+}
+
+TEST_F(TestSearch, shard) {
+    // 两个分片共享全部rules，facts交给各自的分片，每轮结束后将不属于自己的facts转交出去
+    const ds::length_t shards = 2;
+    std::vector<std::unique_ptr<ds::search_t>> parts;
+    for (ds::length_t index = 0; index < shards; ++index) {
+        parts.push_back(std::make_unique<ds::search_t>(limit_size, buffer_size));
+        parts.back()->set_shard(shards, index);
+        parts.back()->add("(a `x) (b `x)");
+        parts.back()->add("(b `x) (c `x)");
+    }
+    search->add("(a `x) (b `x)");
+    search->add("(b `x) (c `x)");
+    for (int i = 0; i < 20; ++i) {
+        auto fact = ds::text_to_rule(("(a " + std::to_string(i) + ")").c_str(), limit_size);
+        parts[ds::search_t::shard_of(fact.get(), shards)]->add(fact.get());
+        search->add(fact.get());
+    }
+    std::vector<std::string> results;
+    for (bool running = true; running;) {
+        running = false;
+        std::vector<std::unique_ptr<ds::rule_t>> foreign;
+        for (ds::length_t index = 0; index < shards; ++index) {
+            parts[index]->execute([&](ds::rule_t* rule) {
+                running = true;
+                results.push_back(ds::rule_to_text(rule, buffer_size).get());
+                if (ds::search_t::shard_of(rule, shards) != index) {
+                    foreign.push_back(ds::text_to_rule(ds::rule_to_text(rule, buffer_size).get(), limit_size));
+                }
+                return false;
+            });
+        }
+        for (auto& fact : foreign) {
+            auto& owner = parts[ds::search_t::shard_of(fact.get(), shards)];
+            EXPECT_FALSE(owner->contains(fact.get()));
+            owner->add(fact.get());
+        }
+    }
+    EXPECT_EQ(results.size(), 40);
+    for (auto& text : results) {
+        auto fact = ds::text_to_rule(text.c_str(), limit_size);
+        for (ds::length_t index = 0; index < shards; ++index) {
+            EXPECT_EQ(parts[index]->contains(fact.get()), ds::search_t::shard_of(fact.get(), shards) == index);
+        }
+    }
+    EXPECT_EQ(search->saturate(0), 40);
+}
+
+TEST_F(TestSearch, remove) {
+    search->set_provenance(true);
+    search->add("(a `x) (b `x)");
+    search->add("(b `x) (c `x)");
+    search->add("(a 1)");
+    search->add("(a 2)");
+    EXPECT_EQ(search->saturate(0), 4);
+    EXPECT_EQ(search->remove("(a 1)"), 3);
+    EXPECT_FALSE(search->contains(ds::text_to_rule("(b 1)", limit_size).get()));
+    EXPECT_FALSE(search->contains(ds::text_to_rule("(c 1)", limit_size).get()));
+    EXPECT_TRUE(search->contains(ds::text_to_rule("(c 2)", limit_size).get()));
+    EXPECT_EQ(search->remove("(a 1)"), 0);
+    // 推出的内容不能被直接移除
+    EXPECT_EQ(search->remove("(c 2)"), 0);
+    // 移除之后可以继续搜索
+    search->add("(a 1)");
+    EXPECT_EQ(search->saturate(0), 2);
+    EXPECT_EQ(search->proof(ds::text_to_rule("(c 1)", limit_size).get()).size(), 5);
+}
+
+TEST_F(TestSearch, remove_rederive) {
+    search->set_provenance(true);
+    search->add("(a `x) (b `x)");
+    search->add("(d `x) (b `x)");
+    search->add("(b `x) (c `x)");
+    search->add("(a 1)");
+    search->add("(d 1)");
+    EXPECT_EQ(search->saturate(0), 2);
+    // (b 1)还可以由(d 1)推出，因此被恢复
+    EXPECT_EQ(search->remove("(a 1)"), 1);
+    auto target = ds::text_to_rule("(c 1)", limit_size);
+    auto steps = search->proof(target.get());
+    ASSERT_EQ(steps.size(), 5);
+    EXPECT_EQ(ds::rule_to_text(steps[*steps[*steps[4].parent_fact].parent_fact].rule, buffer_size).get(), std::string("----\n(d 1)\n"));
+    EXPECT_EQ(search->remove("(d 1)"), 3);
+    EXPECT_FALSE(search->contains(target.get()));
+}
+
+TEST_F(TestSearch, remove_cycle) {
+    search->set_provenance(true);
+    search->add("(a `x) (b `x)");
+    search->add("(b `x) (c `x)");
+    search->add("(c `x) (b `x)");
+    search->add("(a 1)");
+    EXPECT_EQ(search->saturate(0), 2);
+    // (b 1)与(c 1)互相推出，但是不能仅凭彼此被恢复
+    EXPECT_EQ(search->remove("(a 1)"), 3);
+    EXPECT_FALSE(search->contains(ds::text_to_rule("(b 1)", limit_size).get()));
+}
+
+TEST_F(TestSearch, remove_given) {
+    EXPECT_EQ(search->remove("(a 1)"), 0);
+    search->set_provenance(true);
+    search->add("(a `x) (b `x)");
+    search->add("(a 1)");
+    EXPECT_EQ(search->saturate(0), 1);
+    // 已经推出的fact被再次添加后成为输入，移除推出它的fact时仍然保留
+    search->add("(b 1)");
+    EXPECT_EQ(search->remove("(a 1)"), 1);
+    EXPECT_TRUE(search->contains(ds::text_to_rule("(b 1)", limit_size).get()));
+    // 移除一个仍然可以被推出的输入时，它作为推出的内容被恢复
+    search->add("(a 1)");
+    EXPECT_EQ(search->saturate(0), 0);
+    EXPECT_EQ(search->remove("(b 1)"), 0);
+    EXPECT_TRUE(search->contains(ds::text_to_rule("(b 1)", limit_size).get()));
+    EXPECT_EQ(search->remove("(a 1)"), 2);
+}
+
+TEST_F(TestSearch, remove_rule) {
+    search->set_provenance(true);
+    search->set_threads(4);
+    search->add("(a `x) (b `y) (c `x `y)");
+    search->add("(a 1)");
+    search->add("(b 2)");
+    EXPECT_EQ(search->saturate(0), 2);
+    EXPECT_EQ(search->remove("(a `x) (b `y) (c `x `y)"), 3);
+    EXPECT_FALSE(search->contains(ds::text_to_rule("(c 1 2)", limit_size).get()));
+    EXPECT_TRUE(search->contains(ds::text_to_rule("(b 2)", limit_size).get()));
+}
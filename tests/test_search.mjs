@@ -102,3 +102,276 @@ test("iterator", () => {
     }
     expect(count).toBe(expected.length);
 });
+
+test("execute_indexed", () => {
+    search.add("(a `x) (b `x)");
+    search.add("(a 1)");
+    search.add("(c 2)");
+    search.add("(a 3 4)");
+    search.add("`y");
+    const count = search.execute((rule) => false);
+    expect(count).toBe(2);
+});
+
+test("execute_incremental", () => {
+    search.add("(a `x) (b `x)");
+    search.add("(b `x) (c `x)");
+    search.add("(a 1)");
+    expect(search.execute((rule) => false)).toBe(1);
+    expect(search.execute((rule) => false)).toBe(1);
+    expect(search.execute((rule) => false)).toBe(0);
+    search.add("(a 2)");
+    expect(search.execute((rule) => false)).toBe(1);
+    expect(search.execute((rule) => false)).toBe(1);
+    expect(search.execute((rule) => false)).toBe(0);
+});
+
+test("forward_subsumption", () => {
+    search.set_subsumption(true);
+    search.add("(`p -> `q)");
+    search.add("x");
+    search.add("x (a -> b)");
+    search.add("x (c d)");
+    expect(search.execute((rule) => false)).toBe(1);
+});
+
+test("backward_subsumption", () => {
+    search.set_subsumption(false, true);
+    search.add("(a -> b)");
+    search.add("x");
+    search.add("x (`p -> `q)");
+    expect(search.execute((rule) => false)).toBe(1);
+    search.add("(`x -> b) (got `x)");
+    expect(search.execute((rule) => false)).toBe(1);
+});
+
+test("priority", () => {
+    search.set_priority("size");
+    search.add("(g (a b c d e))");
+    search.add("(g a)");
+    search.add("(g `x) (h `x)");
+    const result = [];
+    expect(
+        search.execute((rule) => {
+            result.push(rule.toString());
+            return false;
+        }),
+    ).toBe(1);
+    expect(result).toEqual(["----\n(h a)\n"]);
+    expect(search.execute((rule) => false)).toBe(1);
+    expect(search.execute((rule) => false)).toBe(0);
+});
+
+test("priority_callable", () => {
+    search.set_priority((rule, depth) => -rule.toString().length);
+    search.add("(g (a b c d e))");
+    search.add("(g a)");
+    search.add("(g `x) (h `x)");
+    const result = [];
+    expect(
+        search.execute((rule) => {
+            result.push(rule.toString());
+            return false;
+        }),
+    ).toBe(1);
+    expect(result).toEqual(["----\n(h (a b c d e))\n"]);
+});
+
+test("priority_invalid", () => {
+    expect(() => search.set_priority("unknown")).toThrow();
+});
+
+test("capacity", () => {
+    const evicted = [];
+    search.set_capacity(2, 0, "oldest", (rule) => {
+        evicted.push(rule.toString());
+    });
+    search.add("(a `x) (b `x)");
+    search.add("(a 1)");
+    search.add("(a 2)");
+    expect(search.execute((rule) => false)).toBe(2);
+    expect(evicted).toEqual(["----\n(a 1)\n", "----\n(a 2)\n"]);
+});
+
+test("capacity_least_used", () => {
+    const evicted = [];
+    search.set_capacity(2, 0, "least_used", (rule) => {
+        evicted.push(rule.toString());
+    });
+    search.add("(a `x) (b `x)");
+    search.add("(a 1)");
+    search.add("(c 1)");
+    expect(search.execute((rule) => false)).toBe(1);
+    expect(evicted).toEqual(["----\n(c 1)\n"]);
+});
+
+test("capacity_invalid", () => {
+    expect(() => search.set_capacity(1, 0, "unknown")).toThrow();
+});
+
+test("save_and_load", () => {
+    search.add("(a `x) (b `x)");
+    search.add("(b `x) (c `x)");
+    search.add("(a 1)");
+    expect(search.execute((rule) => false)).toBe(1);
+    expect(search.save("/tmp/search.bin")).toBe(true);
+    const loaded = new Search();
+    expect(loaded.load("/tmp/search.bin")).toBe(true);
+    const result = [];
+    expect(
+        loaded.execute((rule) => {
+            result.push(rule.toString());
+            return false;
+        }),
+    ).toBe(1);
+    expect(result).toEqual(["----\n(c 1)\n"]);
+    expect(loaded.load("/tmp/missing.bin")).toBe(false);
+});
+
+test("add_many", () => {
+    expect(search.add_many([new Rule("(a `x) (b `x)"), "(a 1)", "(a 2)", "a-long-facts-that-exceeds-the-limit".repeat(10)])).toEqual([
+        true,
+        true,
+        true,
+        false,
+    ]);
+    const result = [];
+    expect(
+        search.execute((rule) => {
+            result.push(rule.toString());
+            return false;
+        }),
+    ).toBe(2);
+    expect(result).toEqual(["----\n(b 1)\n", "----\n(b 2)\n"]);
+});
+
+test("add_file", () => {
+    expect(() => search.add_file("/tmp/missing.txt")).toThrow();
+});
+
+test("find", () => {
+    search.add("(a `x) (b `x)");
+    search.add("(b `x) (c `x)");
+    search.add("(a 1)");
+    search.add("(a 2)");
+    expect(search.find(["(c `y)"], true, 1)).toBe(null);
+    expect(search.find([new Rule("(d 1)"), "(c 2)"]).toString()).toBe("----\n(c 2)\n");
+    expect(search.find(["(c 2)"])).toBe(null);
+});
+
+test("proof", () => {
+    search.set_provenance(true);
+    search.add("(a `x) (b `x)");
+    search.add("(b `x) (c `x)");
+    search.add("(a 1)");
+    expect(search.find(["(c 1)"])).not.toBe(null);
+    const steps = search.proof("(c 1)");
+    expect(steps.length).toBe(5);
+    const last = steps[4];
+    expect(last.rule.toString()).toBe("----\n(c 1)\n");
+    const middle = steps[last.parent_fact];
+    expect(middle.rule.toString()).toBe("----\n(b 1)\n");
+    expect(steps[middle.parent_fact].rule.toString()).toBe("----\n(a 1)\n");
+    expect(steps[middle.parent_fact].parent_rule).toBe(null);
+    expect(search.proof("(d 1)")).toEqual([]);
+});
+
+test("stats", () => {
+    expect(search.stats()).toEqual([]);
+    search.set_statistics(true);
+    search.add("(a `x) (b `x)");
+    search.add("(a 1)");
+    search.add("(a 2)");
+    search.execute((candidate) => false);
+    const stats = search.stats();
+    expect(stats.length).toBe(1);
+    expect(stats[0].pairs).toBe(2);
+    expect(stats[0].facts).toBe(2);
+    expect(stats[0].failures).toBe(0);
+    expect(stats[0].bytes).toBeGreaterThan(0);
+    search.set_statistics(false);
+    expect(search.stats()).toEqual([]);
+});
+
+test("profile", () => {
+    search.set_profiling(true);
+    search.add("(a `x) (b `x)");
+    search.add("(d `x) (e `x)");
+    search.add("(a 1)");
+    search.add("(a 2)");
+    search.execute((candidate) => false);
+    const profile = search.profile();
+    expect(profile.length).toBe(2);
+    expect(profile[0].rule.toString()).toBe("(a `x)\n------\n(b `x)\n");
+    expect(profile[0].attempts).toBe(2);
+    expect(profile[0].produced).toBe(2);
+    expect(profile[1].attempts).toBe(0);
+    search.set_profiling(false);
+    expect(search.profile()[0].attempts).toBe(0);
+});
+
+test("execute_budget", () => {
+    search.add("(a `x) (b `x)");
+    for (let i = 0; i < 10; ++i) {
+        search.add(`(a ${i})`);
+    }
+    expect(search.execute((candidate) => false, 0, 0, 4)).toBe(4);
+    expect(search.exhausted()).toBe(true);
+    expect(search.execute((candidate) => false, 0, 3)).toBe(3);
+    expect(search.execute((candidate) => false)).toBe(3);
+    expect(search.exhausted()).toBe(false);
+});
+
+test("saturate", () => {
+    search.add("(a `x) (b `x)");
+    search.add("(b `x) (c `x)");
+    search.add("(a 1)");
+    search.add("(a 2)");
+    expect(search.saturate(0, 0, 1)).toBe(1);
+    expect(search.exhausted()).toBe(true);
+    expect(search.saturate()).toBe(3);
+    expect(search.exhausted()).toBe(false);
+});
+
+test("contains", () => {
+    search.add("(a `x) (b `x)");
+    search.add("(a 1)");
+    expect(search.contains("(a 1)")).toBe(true);
+    expect(search.contains(new Rule("(b 1)"))).toBe(false);
+    search.execute((candidate) => false);
+    expect(search.contains("(b 1)")).toBe(true);
+});
+
+test("shard", () => {
+    expect(Search.shard_of("(a 0)", 1)).toBe(0);
+    search.set_shard(2, 0);
+    search.add("(a `x) (b `x)");
+    for (let i = 0; i < 20; ++i) {
+        search.add(`(a ${i})`);
+    }
+    const results = [];
+    search.execute((candidate) => {
+        results.push(candidate);
+        return false;
+    });
+    // Facts of the other shard are reported but not kept
+    expect(results.length).toBe(20);
+    for (const rule of results) {
+        expect(search.contains(rule)).toBe(Search.shard_of(rule, 2) === 0);
+    }
+});
+
+test("remove", () => {
+    search.set_provenance(true);
+    search.add("(a `x) (b `x)");
+    search.add("(d `x) (b `x)");
+    search.add("(a 1)");
+    search.add("(a 2)");
+    search.add("(d 2)");
+    expect(search.saturate()).toBe(2);
+    expect(search.remove("(a 1)")).toBe(2);
+    expect(search.contains("(b 1)")).toBe(false);
+    // (b 2) can still be inferred from (d 2)
+    expect(search.remove(new Rule("(a 2)"))).toBe(1);
+    expect(search.contains("(b 2)")).toBe(true);
+});
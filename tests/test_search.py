@@ -1,3 +1,8 @@
+import asyncio
+import contextlib
+import threading
+import time
+import pathlib
 import pytest
 import apyds
 
@@ -107,3 +112,499 @@ def test_iterator(search: apyds.Search) -> None:
         assert str(rule) == expected[count]
         count += 1
     assert count == len(expected)
+
+
+def test_execute_indexed(search: apyds.Search) -> None:
+    search.add("(a `x) (b `x)")
+    search.add("(a 1)")
+    search.add("(c 2)")
+    search.add("(a 3 4)")
+    search.add("`y")
+    count = search.execute(lambda rule: False)
+    assert count == 2
+
+
+def test_execute_incremental(search: apyds.Search) -> None:
+    search.add("(a `x) (b `x)")
+    search.add("(b `x) (c `x)")
+    search.add("(a 1)")
+    assert search.execute(lambda rule: False) == 1
+    assert search.execute(lambda rule: False) == 1
+    assert search.execute(lambda rule: False) == 0
+    search.add("(a 2)")
+    assert search.execute(lambda rule: False) == 1
+    assert search.execute(lambda rule: False) == 1
+    assert search.execute(lambda rule: False) == 0
+
+
+def test_execute_threads() -> None:
+    def run(threads: int) -> list[str]:
+        search = apyds.Search(100, 1000, threads=threads)
+        search.add("(a `x) (b `x)")
+        search.add("(b `x) (c `x)")
+        for i in range(50):
+            search.add(f"(a {i})")
+        result = []
+        for _ in range(3):
+            search.execute(lambda rule: result.append(str(rule)) and False)
+        return result
+
+    serial = run(1)
+    assert len(serial) == 100
+    assert run(4) == serial
+
+
+def test_forward_subsumption(search: apyds.Search) -> None:
+    search.set_subsumption(True)
+    search.add("(`p -> `q)")
+    search.add("x")
+    search.add("x (a -> b)")
+    search.add("x (c d)")
+    assert search.execute(lambda rule: False) == 1
+
+
+def test_backward_subsumption(search: apyds.Search) -> None:
+    search.set_subsumption(False, True)
+    search.add("(a -> b)")
+    search.add("x")
+    search.add("x (`p -> `q)")
+    assert search.execute(lambda rule: False) == 1
+    search.add("(`x -> b) (got `x)")
+    assert search.execute(lambda rule: False) == 1
+
+
+def test_priority(search: apyds.Search) -> None:
+    search.set_priority("size")
+    search.add("(g (a b c d e))")
+    search.add("(g a)")
+    search.add("(g `x) (h `x)")
+    result = []
+    assert search.execute(lambda rule: result.append(str(rule)) and False) == 1
+    assert result == ["----\n(h a)\n"]
+    assert search.execute(lambda rule: False) == 1
+    assert search.execute(lambda rule: False) == 0
+
+
+def test_priority_callable(search: apyds.Search) -> None:
+    search.set_priority(lambda rule, depth: -len(str(rule)))
+    search.add("(g (a b c d e))")
+    search.add("(g a)")
+    search.add("(g `x) (h `x)")
+    result = []
+    assert search.execute(lambda rule: result.append(str(rule)) and False) == 1
+    assert result == ["----\n(h (a b c d e))\n"]
+
+
+def test_priority_invalid(search: apyds.Search) -> None:
+    with pytest.raises(ValueError):
+        search.set_priority("unknown")
+
+
+def test_capacity(search: apyds.Search) -> None:
+    evicted = []
+    search.set_capacity(2, 0, "oldest", lambda rule: evicted.append(str(rule)))
+    search.add("(a `x) (b `x)")
+    search.add("(a 1)")
+    search.add("(a 2)")
+    assert search.execute(lambda rule: False) == 2
+    assert evicted == ["----\n(a 1)\n", "----\n(a 2)\n"]
+
+
+def test_capacity_least_used(search: apyds.Search) -> None:
+    evicted = []
+    search.set_capacity(2, eviction="least_used", evicted=lambda rule: evicted.append(str(rule)))
+    search.add("(a `x) (b `x)")
+    search.add("(a 1)")
+    search.add("(c 1)")
+    assert search.execute(lambda rule: False) == 1
+    assert evicted == ["----\n(c 1)\n"]
+
+
+def test_capacity_invalid(search: apyds.Search) -> None:
+    with pytest.raises(ValueError):
+        search.set_capacity(1, 0, "unknown")
+
+
+def test_save_and_load(search: apyds.Search, tmp_path: pathlib.Path) -> None:
+    search.add("(a `x) (b `x)")
+    search.add("(b `x) (c `x)")
+    search.add("(a 1)")
+    assert search.execute(lambda rule: False) == 1
+    assert search.save(tmp_path / "search.bin")
+    loaded = apyds.Search()
+    assert loaded.load(tmp_path / "search.bin")
+    result = []
+    assert loaded.execute(lambda rule: result.append(str(rule)) and False) == 1
+    assert result == ["----\n(c 1)\n"]
+    assert not loaded.load(tmp_path / "missing.bin")
+
+
+def test_add_many(search: apyds.Search) -> None:
+    rule = apyds.Rule("(a `x) (b `x)")
+    items = [rule, "(a 1)", "(a 2)", "a-long-facts-that-exceeds-the-limit" * 10, b"xx"]
+    assert search.add_many(items) == [True, True, True, False, False]
+    assert search.add_many(item for item in [rule.data()]) == [True]
+    result = []
+    assert search.execute(lambda rule: result.append(str(rule)) and False) == 2
+    assert result == ["----\n(b 1)\n", "----\n(b 2)\n"]
+    with pytest.raises(TypeError):
+        search.add_many([1])
+
+
+def test_add_many_corrupted(search: apyds.Search) -> None:
+    rule = apyds.Rule("(a `x) (b `x)")
+    data = bytes(rule.data())
+    name = data.index(b"a\x00")
+    # The sizes in the header stay consistent, only the body is broken
+    too_long = bytearray(data)
+    too_long[name - 2] = 0x7F
+    unterminated = bytearray(data)
+    unterminated[name + 1] = ord("c")
+    bad_type = bytearray(data)
+    bad_type[name - 3] = 7
+    assert search.add_many([bytes(too_long), bytes(unterminated), bytes(bad_type)]) == [False, False, False]
+    assert search.execute(lambda rule: False) == 0
+    assert search.add_many([data]) == [True]
+
+
+def test_add_many_holds_buffers(search: apyds.Search) -> None:
+    rule = apyds.Rule("(a `x) (b `x)")
+    data = bytes(rule.data())
+
+    def items():
+        buffer = bytearray(data)
+        yield buffer
+        # The buffer is still exported until all items are added, so it cannot be resized under the engine
+        buffer.clear()
+
+    with pytest.raises(BufferError):
+        search.add_many(items())
+
+
+def test_add_file(search: apyds.Search, tmp_path: pathlib.Path) -> None:
+    (tmp_path / "rules.txt").write_text("(a `x)\n----\n(b `x)\n\n(a 1)\n\n\n(a 2)\n")
+    assert search.add_file(tmp_path / "rules.txt") == [True, True, True]
+    assert search.execute(lambda rule: False) == 2
+    with pytest.raises(OSError):
+        search.add_file(tmp_path / "missing.txt")
+
+
+def test_find(search: apyds.Search) -> None:
+    search.add("(a `x) (b `x)")
+    search.add("(b `x) (c `x)")
+    search.add("(a 1)")
+    search.add("(a 2)")
+    assert search.find([apyds.Rule("(d 1)"), "(c 2)"]) == apyds.Rule("(c 2)")
+    assert search.find(["(c 2)"]) is None
+
+
+def test_find_patterns(search: apyds.Search) -> None:
+    search.add("(a `x) (b `x)")
+    search.add("(b `x) (c `x)")
+    search.add("(a 1)")
+    search.add("(a 2)")
+    assert search.find(["(c `y)"], patterns=True, max_cycles=1) is None
+    assert str(search.find(["(c `y)"], patterns=True)) == "----\n(c 1)\n"
+
+
+def test_proof(search: apyds.Search) -> None:
+    search.set_provenance(True)
+    search.add("(a `x) (b `x)")
+    search.add("(b `x) (c `x)")
+    search.add("(a 1)")
+    assert search.find(["(c 1)"]) is not None
+    steps = search.proof("(c 1)")
+    assert len(steps) == 5
+    last = steps[-1]
+    assert last.rule == apyds.Rule("(c 1)")
+    assert steps[last.parent_rule].rule == apyds.Rule("(b `x) (c `x)")
+    middle = steps[last.parent_fact]
+    assert middle.rule == apyds.Rule("(b 1)")
+    assert steps[middle.parent_fact].rule == apyds.Rule("(a 1)")
+    assert steps[middle.parent_fact].parent_rule is None
+    assert middle.cycle < last.cycle
+    assert search.proof(apyds.Rule("(d 1)")) == []
+    search.set_provenance(False)
+    assert search.proof("(c 1)") == []
+
+
+def test_stats(search: apyds.Search) -> None:
+    assert search.stats() == []
+    search.set_statistics(True)
+    search.add("(a `x) (b `x)")
+    search.add("(a 1)")
+    search.add("(a 2)")
+    search.execute(lambda candidate: False)
+    stats = search.stats()
+    assert len(stats) == 1
+    assert isinstance(stats[0], apyds.Stats)
+    assert stats[0].pairs == 2
+    assert stats[0].facts == 2
+    assert stats[0].failures == 0
+    assert stats[0].bytes > 0
+    assert stats[0].seconds >= 0
+    search.set_statistics(False)
+    assert search.stats() == []
+
+
+def test_profile(search: apyds.Search) -> None:
+    search.set_profiling(True)
+    search.add("(a `x) (b `x)")
+    search.add("(d `x) (e `x)")
+    search.add("(a 1)")
+    search.add("(a 2)")
+    search.execute(lambda candidate: False)
+    profile = search.profile()
+    assert len(profile) == 2
+    assert isinstance(profile[0], apyds.Profile)
+    assert profile[0].rule == apyds.Rule("(a `x) (b `x)")
+    assert profile[0].attempts == 2
+    assert profile[0].successes == 2
+    assert profile[0].produced == 2
+    assert profile[0].seconds >= 0
+    assert profile[1].rule == apyds.Rule("(d `x) (e `x)")
+    assert profile[1].attempts == 0
+    search.set_profiling(False)
+    assert search.profile()[0].attempts == 0
+
+
+def test_aiter(search: apyds.Search) -> None:
+    search.add("(a `x) (b `x)")
+    search.add("(a 1)")
+    search.add("(a 2)")
+    search.add("(a 3)")
+
+    async def collect() -> list[str]:
+        return [str(rule) async for rule in search.aiter(batch_size=2)]
+
+    assert sorted(asyncio.run(collect())) == ["----\n(b 1)\n", "----\n(b 2)\n", "----\n(b 3)\n"]
+    assert asyncio.run(collect()) == []
+
+
+def test_aiter_stop(search: apyds.Search) -> None:
+    search.add("(a `x) (b `x)")
+    search.add("(b `x) (c `x)")
+    search.add("(a 1)")
+    search.add("(a 2)")
+
+    async def first() -> apyds.Rule:
+        async with contextlib.aclosing(search.aiter(batch_size=1)) as iterator:
+            async for rule in iterator:
+                return rule
+
+    assert str(asyncio.run(first())) == "----\n(b 1)\n"
+    # The stopped cycle keeps (b 1), so the next cycle derives (c 1) from it
+    assert "----\n(c 1)\n" in [str(rule) for rule in search]
+
+
+def test_aiter_break(search: apyds.Search) -> None:
+    search.add("(a `x) (b `x)")
+    search.add("(b `x) (c `x)")
+    search.add("(a 1)")
+    search.add("(a 2)")
+
+    async def first() -> list[str]:
+        async for rule in search.aiter(batch_size=1):
+            break
+        # The cycle stops at the break, before the event loop finalizes anything
+        result = []
+        search.execute(lambda rule: result.append(str(rule)) and False)
+        return result
+
+    result = asyncio.run(first())
+    assert "----\n(c 1)\n" in result
+    assert "----\n(b 1)\n" not in result
+
+
+def test_aiter_cancel(search: apyds.Search) -> None:
+    search.add("(a `x) (b `x)")
+    search.add("(a 1)")
+    search.add("(a 2)")
+
+    async def cancel() -> None:
+        received = asyncio.Event()
+
+        async def consume() -> None:
+            async for rule in search:
+                received.set()
+                await asyncio.sleep(10)
+
+        task = asyncio.create_task(consume())
+        await received.wait()
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(cancel())
+    assert search.find(["(b 1)", "(b 2)"]) is None
+
+
+def test_aiter_invalid(search: apyds.Search) -> None:
+    with pytest.raises(ValueError):
+        search.aiter(batch_size=0)
+
+
+def test_aiter_cancel_in_batch(search: apyds.Search) -> None:
+    started = threading.Event()
+
+    def cost(rule: apyds.Rule, depth: int) -> float:
+        if depth > 0:
+            started.set()
+            time.sleep(0.1)
+        return depth
+
+    search.set_priority(cost)
+    search.add("(a `x) (b `x)")
+    search.add("(a 1)")
+
+    async def cancel() -> None:
+        task = asyncio.create_task(anext(search.aiter()))
+        await asyncio.to_thread(started.wait)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(cancel())
+    # The batch finished before the cancellation took effect, so its result is kept
+    assert search.find(["(b 1)"]) is None
+
+
+def test_execute_budget(search: apyds.Search) -> None:
+    search.add("(a `x) (b `x)")
+    for i in range(10):
+        search.add(f"(a {i})")
+    assert search.execute(lambda candidate: False, max_pairs=4) == 4
+    assert search.exhausted()
+    assert search.execute(lambda candidate: False, max_results=3) == 3
+    assert search.execute(lambda candidate: False) == 3
+    assert not search.exhausted()
+
+
+def test_budget_resume(search: apyds.Search) -> None:
+    search.add("(a `x) (b `x)")
+    for i in range(50):
+        search.add(f"(a {i})")
+    # Each call continues from the pair where the previous one stopped
+    assert [search.execute(lambda candidate: False, max_pairs=10) for _ in range(6)] == [10] * 5 + [0]
+    assert not search.exhausted()
+    assert all(search.contains(f"(b {i})") for i in range(50))
+
+
+def test_saturate_resume(search: apyds.Search) -> None:
+    search.add("(a `x) (b `x)")
+    search.add("(b `x) (c `x)")
+    for i in range(50):
+        search.add(f"(a {i})")
+    total = 0
+    while True:
+        count = search.saturate(max_pairs=10)
+        total += count
+        if count == 0 and not search.exhausted():
+            break
+    assert total == 100
+
+
+def test_execute_view(search: apyds.Search) -> None:
+    search.add("p q")
+    search.add("p")
+    views = []
+    kept = []
+
+    def callback(rule: apyds.Rule) -> bool:
+        assert isinstance(rule, apyds.RuleView)
+        assert rule == apyds.Rule("q")
+        assert str(rule.conclusion) == "q"
+        views.append(rule)
+        kept.append(rule.copy())
+        return False
+
+    assert search.execute(callback, view=True) == 1
+    assert kept == [apyds.Rule("q")]
+    assert type(kept[0]) is apyds.Rule
+    with pytest.raises(ValueError):
+        str(views[0])
+    with pytest.raises(ValueError):
+        views[0].copy()
+
+
+def test_execute_view_kept(search: apyds.Search) -> None:
+    search.add("(a `x) (b `x)")
+    search.add("(a 2)")
+    kept = []
+
+    def callback(rule: apyds.Rule) -> bool:
+        kept.extend([apyds.Rule(rule), rule.conclusion, rule.data()])
+        return False
+
+    search.execute(callback, view=True)
+    # The next cycle reuses the memory of the view
+    search.add("(a 333333)")
+    search.execute(lambda rule: False, view=True)
+    rule, conclusion, data = kept
+    assert type(rule) is apyds.Rule
+    assert str(rule) == "----\n(b 2)\n"
+    assert str(conclusion) == "(b 2)"
+    assert apyds.Rule(memoryview(data)) == apyds.Rule("(b 2)")
+
+
+def test_saturate(search: apyds.Search) -> None:
+    search.add("(a `x) (b `x)")
+    search.add("(b `x) (c `x)")
+    search.add("(a 1)")
+    search.add("(a 2)")
+    assert search.saturate(max_results=1) == 1
+    assert search.exhausted()
+    assert search.saturate() == 3
+    assert not search.exhausted()
+    assert search.saturate(max_cycles=1) == 0
+
+
+def test_saturate_timeout() -> None:
+    search = apyds.Search(1000, 10000)
+    search.add("(a `x) (a `y) (a (p `x `y))")
+    search.add("(a 0)")
+    start = time.monotonic()
+    search.saturate(timeout=0.05)
+    assert time.monotonic() - start < 1
+    assert search.exhausted()
+
+
+def test_contains(search: apyds.Search) -> None:
+    search.add("(a `x) (b `x)")
+    search.add("(a 1)")
+    assert search.contains("(a 1)")
+    assert not search.contains(apyds.Rule("(b 1)"))
+    search.execute(lambda rule: False)
+    assert search.contains("(b 1)")
+
+
+def test_shard(search: apyds.Search) -> None:
+    facts = [f"(a {i})" for i in range(20)]
+    assert all(0 <= apyds.Search.shard_of(fact, 3) < 3 for fact in facts)
+    assert apyds.Search.shard_of(facts[0], 1) == 0
+    search.set_shard(2, 0)
+    search.add("(a `x) (b `x)")
+    search.add_many(facts)
+    results = []
+    search.execute(lambda rule: results.append(rule) or False)
+    # Facts of the other shard are reported but not kept
+    assert len(results) == 20
+    for rule in results:
+        assert search.contains(rule) == (apyds.Search.shard_of(rule, 2) == 0)
+
+
+def test_remove(search: apyds.Search) -> None:
+    assert search.remove("(a 1)") == 0
+    search.set_provenance(True)
+    search.add("(a `x) (b `x)")
+    search.add("(d `x) (b `x)")
+    search.add("(b `x) (c `x)")
+    search.add_many(["(a 1)", "(a 2)", "(d 2)"])
+    assert search.saturate() == 4
+    assert search.remove("(a 1)") == 3
+    assert not search.contains("(c 1)")
+    # (b 2) can still be inferred from (d 2)
+    assert search.remove(apyds.Rule("(a 2)")) == 1
+    assert search.contains("(c 2)")
+    assert search.proof("(b 2)")[-1].parent_fact is not None
+    assert search.remove("(c 2)") == 0
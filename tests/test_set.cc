@@ -0,0 +1,57 @@
+#include <memory>
+#include <string>
+#include <vector>
+
+#include <ds/set.hh>
+#include <ds/utility.hh>
+#include <gtest/gtest.h>
+
+TEST(TestSet, hash) {
+    auto a1 = ds::text_to_rule("(a b)", 1000);
+    auto a2 = ds::text_to_rule("(a b)", 100);
+    auto b = ds::text_to_rule("(a c)", 1000);
+    EXPECT_EQ(ds::set_t::hash(a1.get()), ds::set_t::hash(a2.get()));
+    EXPECT_NE(ds::set_t::hash(a1.get()), ds::set_t::hash(b.get()));
+}
+
+TEST(TestSet, lookup_and_insert) {
+    auto a = ds::text_to_rule("(a b)", 1000);
+    auto a_copy = ds::text_to_rule("(a b)", 1000);
+    auto b = ds::text_to_rule("a b", 1000);
+    ds::set_t set;
+    EXPECT_EQ(set.size(), 0);
+
+    auto slot = set.lookup(a.get(), ds::set_t::hash(a.get()));
+    EXPECT_EQ(slot->rule, nullptr);
+    set.insert(slot, a.get(), ds::set_t::hash(a.get()));
+    EXPECT_EQ(set.size(), 1);
+
+    slot = set.lookup(a_copy.get(), ds::set_t::hash(a_copy.get()));
+    EXPECT_EQ(slot->rule, a.get());
+
+    slot = set.lookup(b.get(), ds::set_t::hash(b.get()));
+    EXPECT_EQ(slot->rule, nullptr);
+    set.insert(slot, b.get(), ds::set_t::hash(b.get()));
+    EXPECT_EQ(set.size(), 2);
+
+    set.clear();
+    EXPECT_EQ(set.size(), 0);
+    EXPECT_EQ(set.lookup(a.get(), ds::set_t::hash(a.get()))->rule, nullptr);
+}
+
+TEST(TestSet, grow) {
+    std::vector<std::unique_ptr<ds::rule_t>> rules;
+    ds::set_t set;
+    for (int i = 0; i < 1000; ++i) {
+        auto rule = ds::text_to_rule(("(f " + std::to_string(i) + ")").c_str(), 1000);
+        auto hash = ds::set_t::hash(rule.get());
+        auto slot = set.lookup(rule.get(), hash);
+        ASSERT_EQ(slot->rule, nullptr);
+        set.insert(slot, rule.get(), hash);
+        rules.push_back(std::move(rule));
+    }
+    EXPECT_EQ(set.size(), 1000);
+    for (auto& rule : rules) {
+        EXPECT_EQ(set.lookup(rule.get(), ds::set_t::hash(rule.get()))->rule, rule.get());
+    }
+}
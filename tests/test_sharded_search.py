@@ -0,0 +1,67 @@
+import typing
+import pytest
+import apyds
+
+
+@pytest.fixture
+def sharded_search() -> typing.Iterator[apyds.ShardedSearch]:
+    with apyds.ShardedSearch(3, 100, 1000) as sharded_search:
+        yield sharded_search
+
+
+def test_shards(sharded_search: apyds.ShardedSearch) -> None:
+    assert sharded_search.shards == 3
+
+
+def test_add(sharded_search: apyds.ShardedSearch) -> None:
+    assert sharded_search.add("(a `x) (b `x)")
+    assert sharded_search.add_many(["(a 1)", apyds.Rule("(a 2)"), "a-long-fact-" * 10]) == [True, True, False]
+
+
+def test_execute(sharded_search: apyds.ShardedSearch) -> None:
+    sharded_search.add("p q")
+    sharded_search.add("p")
+    results = []
+    assert sharded_search.execute(lambda rule: results.append(rule) or False) == 1
+    assert results == [apyds.Rule("q")]
+    assert sharded_search.execute(lambda rule: False) == 0
+
+
+def test_execute_stop(sharded_search: apyds.ShardedSearch) -> None:
+    sharded_search.add("(a `x) (b `x)")
+    sharded_search.add_many(f"(a {i})" for i in range(10))
+    assert sharded_search.execute(lambda rule: True) == 1
+    # The rest of the cycle is kept
+    assert sharded_search.execute(lambda rule: False) == 0
+
+
+def test_same_as_search(sharded_search: apyds.ShardedSearch) -> None:
+    search = apyds.Search(100, 1000)
+    items = ["(a `x) (b `x)", "(b `x) (c `x)", "(a `x) (b `y) (d `x `y)"] + [f"(a {i})" for i in range(10)]
+    sharded_search.add_many(items)
+    search.add_many(items)
+    expected = []
+    while search.execute(lambda rule: expected.append(str(rule)) or False):
+        pass
+    results = []
+    while sharded_search.execute(lambda rule: results.append(str(rule)) or False):
+        pass
+    assert sorted(results) == sorted(expected)
+
+
+def test_saturate(sharded_search: apyds.ShardedSearch) -> None:
+    sharded_search.add("(a `x) (b `x)")
+    sharded_search.add("(b `x) (c `x)")
+    sharded_search.add_many(f"(a {i})" for i in range(10))
+    assert sharded_search.saturate(1) == 10
+    assert sharded_search.saturate() == 10
+    assert sharded_search.saturate() == 0
+
+
+def test_same_fact_from_several_shards() -> None:
+    # (a 1) and (a 2) are kept by different workers, which both infer c for a third one
+    with apyds.ShardedSearch(4, 100, 1000) as sharded_search:
+        sharded_search.add_many(["(a `x) c", "(a 1)", "(a 2)"])
+        results = []
+        sharded_search.execute(lambda rule: results.append(str(rule)) or False)
+    assert results == ["----\nc\n"]
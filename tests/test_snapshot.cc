@@ -0,0 +1,55 @@
+#include <cstring>
+#include <filesystem>
+#include <fstream>
+#include <string>
+
+#include <ds/snapshot.hh>
+#include <ds/utility.hh>
+#include <gtest/gtest.h>
+
+namespace {
+    std::string temp_path(const char* name) {
+        return (std::filesystem::temp_directory_path() / name).string();
+    }
+} // namespace
+
+TEST(TestSnapshot, round_trip) {
+    auto a = ds::text_to_rule("(a b)", 1000);
+    auto b = ds::text_to_rule("`x\n----\n(f `x)\n", 1000);
+    auto path = temp_path("ds_test_snapshot_round_trip.bin");
+    ds::snapshot_t saved{.kind = 7, .state = {3, 4}, .sections = {{{a.get(), 1, 0}}, {{b.get(), 2, 5}, {a.get(), 3, 0}}}};
+    EXPECT_TRUE(saved.save(path));
+
+    ds::arena_t storage;
+    ds::snapshot_t loaded{.kind = 7};
+    EXPECT_TRUE(loaded.load(path, storage));
+    EXPECT_EQ(loaded.state, (std::vector<ds::length_t>{3, 4}));
+    ASSERT_EQ(loaded.sections.size(), 2);
+    ASSERT_EQ(loaded.sections[0].size(), 1);
+    ASSERT_EQ(loaded.sections[1].size(), 2);
+    EXPECT_EQ(memcmp(loaded.sections[0][0].rule, a.get(), a->data_size()), 0);
+    EXPECT_EQ(memcmp(loaded.sections[1][0].rule, b.get(), b->data_size()), 0);
+    EXPECT_EQ(loaded.sections[1][0].cycle, 2);
+    EXPECT_EQ(loaded.sections[1][0].depth, 5);
+    EXPECT_EQ(loaded.sections[1][1].cycle, 3);
+    std::filesystem::remove(path);
+}
+
+TEST(TestSnapshot, load_fail) {
+    auto a = ds::text_to_rule("(a b)", 1000);
+    auto path = temp_path("ds_test_snapshot_load_fail.bin");
+    ds::snapshot_t saved{.kind = 1, .state = {}, .sections = {{{a.get(), 1, 0}}}};
+    EXPECT_TRUE(saved.save(path));
+
+    ds::arena_t storage;
+    ds::snapshot_t other_kind{.kind = 2};
+    EXPECT_FALSE(other_kind.load(path, storage));
+
+    std::filesystem::resize_file(path, std::filesystem::file_size(path) - 1);
+    ds::snapshot_t truncated{.kind = 1};
+    EXPECT_FALSE(truncated.load(path, storage));
+
+    std::filesystem::remove(path);
+    ds::snapshot_t missing{.kind = 1};
+    EXPECT_FALSE(missing.load(path, storage));
+}
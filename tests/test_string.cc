@@ -101,6 +101,17 @@ TEST_F(TestString, data_size) {
     EXPECT_EQ(s3->data_size(), sizeof(ds::length_t) + sizeof(char) * s3->get_length());
 }
 
+TEST_F(TestString, equal) {
+    auto s4 = reinterpret_cast<ds::string_t*>(operator new(buffer_size));
+    s4->set_null_string(s3_string, nullptr);
+    EXPECT_TRUE(s3->equal(s4));
+    s4->set_null_string("Hellp", nullptr);
+    EXPECT_FALSE(s3->equal(s4));
+    s4->set_null_string("Hell", nullptr);
+    EXPECT_FALSE(s3->equal(s4));
+    operator delete(s4);
+}
+
 TEST_F(TestString, head_tail) {
     EXPECT_EQ(s1->head(), reinterpret_cast<std::byte*>(s1));
     EXPECT_EQ(s2->head(), reinterpret_cast<std::byte*>(s2));
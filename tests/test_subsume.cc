@@ -0,0 +1,42 @@
+#include <ds/rule.hh>
+#include <ds/term.hh>
+#include <ds/utility.hh>
+#include <gtest/gtest.h>
+
+namespace {
+    bool term_subsume(const char* general_text, const char* instance_text) {
+        auto general = ds::text_to_term(general_text, 1000);
+        auto instance = ds::text_to_term(instance_text, 1000);
+        return general->subsume(instance.get());
+    }
+
+    bool rule_subsume(const char* general_text, const char* instance_text) {
+        auto general = ds::text_to_rule(general_text, 1000);
+        auto instance = ds::text_to_rule(instance_text, 1000);
+        return general->subsume(instance.get());
+    }
+} // namespace
+
+TEST(TestSubsume, term) {
+    EXPECT_TRUE(term_subsume("a", "a"));
+    EXPECT_FALSE(term_subsume("a", "b"));
+    EXPECT_TRUE(term_subsume("`x", "a"));
+    EXPECT_TRUE(term_subsume("`x", "(a b)"));
+    EXPECT_TRUE(term_subsume("(`p -> `q)", "(a -> b)"));
+    EXPECT_TRUE(term_subsume("(`p -> `q)", "(a -> a)"));
+    EXPECT_TRUE(term_subsume("(`p -> `p)", "(a -> a)"));
+    EXPECT_FALSE(term_subsume("(`p -> `p)", "(a -> b)"));
+    EXPECT_FALSE(term_subsume("(`p -> `q `r)", "(a -> b)"));
+    // instance中的variable被视为常量
+    EXPECT_TRUE(term_subsume("`x", "`y"));
+    EXPECT_FALSE(term_subsume("a", "`x"));
+    EXPECT_FALSE(term_subsume("(`p -> `p)", "(`p -> `q)"));
+    EXPECT_TRUE(term_subsume("(`p -> `q)", "(`q -> `q)"));
+}
+
+TEST(TestSubsume, rule) {
+    EXPECT_TRUE(rule_subsume("(`p -> `q)", "(a -> b)"));
+    EXPECT_TRUE(rule_subsume("`p\n----\n(f `p)\n", "a\n----\n(f a)\n"));
+    EXPECT_FALSE(rule_subsume("`p\n----\n(f `p)\n", "a\n----\n(f b)\n"));
+    EXPECT_FALSE(rule_subsume("`p\n----\n(f `p)\n", "(f a)"));
+}